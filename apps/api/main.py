@@ -1,7 +1,7 @@
 from fastapi import FastAPI
 
 from apps.api.routes import health
-from apps.api.routes.v1 import meta, webhooks
+from apps.api.routes.v1 import meta, metrics, webhooks
 from packages.core.config import settings
 from packages.core.logging import setup_logging
 
@@ -16,6 +16,7 @@ app = FastAPI(
 
 app.include_router(health.router)
 app.include_router(meta.router)
+app.include_router(metrics.router)
 app.include_router(webhooks.router)
 
 
@@ -0,0 +1,13 @@
+from typing import Any
+
+from fastapi import APIRouter
+
+from packages.core.metrics import registry
+
+router = APIRouter(prefix="/v1")
+
+
+@router.get("/metrics")
+async def get_metrics() -> dict[str, Any]:
+    """Get a snapshot of in-process metrics."""
+    return registry.snapshot()
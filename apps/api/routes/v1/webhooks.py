@@ -4,7 +4,11 @@ from fastapi import APIRouter, Header, HTTPException, Request, status
 
 from packages.core.config import settings
 from packages.core.schemas.webhooks import WebhookReceipt, WebhookSource
-from packages.core.webhook_watcher import GitHubWebhookVerifier, WebhookWatcher
+from packages.core.webhook_watcher import (
+    GitHubWebhookVerifier,
+    WebhookWatcher,
+    registered_subscribers,
+)
 
 router = APIRouter(prefix="/v1")
 
@@ -37,7 +41,7 @@ async def github_webhook(
     else:
         payload = {}
 
-    watcher = WebhookWatcher()
+    watcher = WebhookWatcher(subscribers=registered_subscribers())
     event = watcher.handle_github_event(x_github_event, x_github_delivery, payload)
 
     return WebhookReceipt(
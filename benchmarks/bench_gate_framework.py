@@ -0,0 +1,194 @@
+"""Gate framework throughput with regression thresholds.
+
+For every skip_staging/skip_production combination, measures full mock runs
+per second, the cost of each gate a run passes through, traced memory per
+live run (stopped mid-pipeline) and ``GateRun.model_dump_json`` of a
+completed run. ``create_mock_gate_run`` and ``build_pipeline`` are measured
+once. Throughputs are the best of ``--repeats`` interleaved rounds, each
+timed for at least ``--round-seconds`` with the garbage collector paused,
+which keeps the comparison stable on a busy machine.
+
+Results are compared with the stored baseline; the command exits with status
+1 if any throughput is worse than its baseline by more than ``--threshold``,
+or any memory figure by more than ``--memory-threshold``. Memory is traced
+rather than timed and does not vary between runs, so its tolerance is
+tighter. Baselines depend on the machine: run with ``--update-baseline`` to
+record them before comparing. ``--tolerance`` sets the tolerance of a single
+metric.
+
+Usage:
+    python -m benchmarks.bench_gate_framework
+    python -m benchmarks.bench_gate_framework --update-baseline
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+
+from benchmarks.harness import load_baseline, regressions, save_baseline
+from packages.core.gate_framework import GateFramework, GateRunConfig, create_mock_gate_run
+
+BASELINE = Path(__file__).parent / "baselines" / "gate_framework.json"
+
+CONFIGS = {
+    "default": {},
+    "skip_staging": {"skip_staging": True},
+    "skip_production": {"skip_production": True},
+    "skip_both": {"skip_staging": True, "skip_production": True},
+}
+
+
+def _config(options: dict[str, bool]) -> GateRunConfig:
+    return GateRunConfig(pr_number=1, run_id="bench", **options)
+
+
+def call_rate(fn, seconds: float) -> float:
+    """Calls of ``fn`` per second over one round of at least ``seconds``."""
+    calls = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < seconds:
+        fn()
+        calls += 1
+    return calls / elapsed
+
+
+def gate_rates(config: GateRunConfig, runs: int, seconds: float) -> dict[str, float]:
+    """Executions per second of each gate a run reaches.
+
+    Advances batches of ``runs`` fresh runs one gate at a time and times
+    executing the gate across each batch, until every gate was timed for at
+    least ``seconds``.
+    """
+    elapsed: dict[str, float] = {}
+    executed = 0
+    while not elapsed or min(elapsed.values()) < seconds:
+        frameworks = [GateFramework(config) for _ in range(runs)]
+        for framework in frameworks:
+            framework._start()
+        while frameworks[0].is_running:
+            gate = frameworks[0].current_gate
+            started = time.perf_counter()
+            for framework in frameworks:
+                framework.execute_gate(gate)
+            name = f"{gate.value}_gates_per_s"
+            elapsed[name] = elapsed.get(name, 0.0) + time.perf_counter() - started
+        executed += runs
+    return {name: executed / gate_seconds for name, gate_seconds in elapsed.items()}
+
+
+def bytes_per_live_run(config: GateRunConfig, runs: int) -> float:
+    """Traced memory per run held after its safety gate passed."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    frameworks = [GateFramework(config) for _ in range(runs)]
+    for framework in frameworks:
+        framework._start()
+        framework.execute_safety_gate()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / runs
+
+
+def _full_run(config: GateRunConfig) -> None:
+    GateFramework(config).execute_full_mock_run()
+
+
+def _build_pipeline() -> Callable[[], object]:
+    framework = GateFramework(_config({}))
+    pipeline = framework.execute_full_mock_run().pipeline
+    return lambda: framework.build_pipeline(
+        safety_result=pipeline.safety_gate,
+        planning_result=pipeline.planning_gate,
+        ci_result=pipeline.ci_gate,
+        staging_result=pipeline.staging_gate,
+        production_result=pipeline.production_gate,
+        learning_result=pipeline.learning_gate,
+    )
+
+
+def measure(args: argparse.Namespace) -> dict[str, float]:
+    """Every metric; rates are the best of ``args.repeats`` interleaved rounds."""
+    scenarios: dict[str, Callable[[], object]] = {}
+    for label, options in CONFIGS.items():
+        config = _config(options)
+        scenarios[f"{label}.full_runs_per_s"] = partial(_full_run, config)
+        completed = GateFramework(config).execute_full_mock_run()
+        scenarios[f"{label}.dump_json_per_s"] = completed.model_dump_json
+    scenarios["create_mock_gate_run_per_s"] = partial(create_mock_gate_run, 1, "bench")
+    scenarios["build_pipeline_per_s"] = _build_pipeline()
+
+    # Rounds of every scenario alternate, so a slow spell on a shared machine
+    # costs each metric one round rather than all of its rounds.
+    rates: dict[str, float] = {}
+    for _ in range(args.repeats):
+        round_rates = {name: call_rate(fn, args.round_seconds) for name, fn in scenarios.items()}
+        for label, options in CONFIGS.items():
+            for name, rate in gate_rates(_config(options), args.runs, args.round_seconds).items():
+                round_rates[f"{label}.{name}"] = rate
+        for name, rate in round_rates.items():
+            rates[name] = max(rate, rates.get(name, 0.0))
+
+    metrics = {}
+    for label, options in CONFIGS.items():
+        metrics.update({name: rate for name, rate in rates.items() if name.startswith(f"{label}.")})
+        metrics[f"{label}.bytes_per_live_run"] = bytes_per_live_run(_config(options), args.runs)
+    metrics.update({name: rate for name, rate in rates.items() if "." not in name})
+    return {name: round(value, 1) for name, value in metrics.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5000, help="runs per gate round")
+    parser.add_argument("--round-seconds", type=float, default=0.1)
+    parser.add_argument("--repeats", type=int, default=9)
+    parser.add_argument("--threshold", type=float, default=0.3)
+    parser.add_argument("--memory-threshold", type=float, default=0.05)
+    parser.add_argument(
+        "--tolerance",
+        action="append",
+        default=[],
+        metavar="METRIC=FRACTION",
+        help="tolerance of one metric, overriding the thresholds; repeatable",
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    gc.disable()
+    try:
+        metrics = measure(args)
+    finally:
+        gc.enable()
+    baseline = load_baseline(args.baseline)
+    lower_is_better = {name for name in metrics if name.endswith("bytes_per_live_run")}
+    tolerances = dict.fromkeys(lower_is_better, args.memory_threshold)
+    for item in args.tolerance:
+        name, _, fraction = item.partition("=")
+        tolerances[name] = float(fraction)
+    worse = regressions(metrics, baseline, args.threshold, lower_is_better, tolerances)
+
+    width = max(len(name) for name in metrics)
+    print(f"{'metric':<{width}}  {'value':>12}  {'baseline':>12}  {'change':>8}")
+    for name, value in metrics.items():
+        expected = baseline.get(name)
+        change = f"{(value - expected) / expected:+8.1%}" if expected else f"{'-':>8}"
+        flag = "  REGRESSED" if name in worse else ""
+        print(f"{name:<{width}}  {value:>12.1f}  {expected or 0:>12.1f}  {change}{flag}")
+    print(f"measured in {time.perf_counter() - started:.1f}s")
+
+    if args.update_baseline:
+        save_baseline(args.baseline, metrics)
+        print(f"baseline written to {args.baseline}")
+    elif worse:
+        print(f"{len(worse)} metrics regressed beyond their threshold")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
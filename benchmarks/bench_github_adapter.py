@@ -0,0 +1,112 @@
+"""GitHubAdapter throughput and latency against the fake GitHub API.
+
+Usage:
+    python -m benchmarks.bench_github_adapter --latency 0.005 --error-rate 0.02
+"""
+
+import argparse
+import itertools
+import threading
+
+from benchmarks.harness import BenchResult, bench, print_results
+from packages.core.adapters.fanout import FanOutExecutor
+from packages.core.adapters.github_adapter import GitHubAdapter
+from packages.core.adapters.head_sha_cache import HeadShaCache
+from packages.core.adapters.retry import RetryBudget, RetryPolicy
+from packages.core.testing import FakeGitHub
+
+REPO = "owner/repo"
+
+
+def build_fake(latency: float, error_rate: float, repos: int) -> FakeGitHub:
+    fake = FakeGitHub(latency=latency, error_rate=error_rate, rate_limit=10**9, seed=42)
+    for index in range(repos):
+        slug = REPO if index == 0 else f"owner/repo{index}"
+        fake.add_repo(slug)
+        pr = fake.add_pull_request(slug, "feature")
+        for name in ("lint", "unit-tests", "security-scan", "dependency-check"):
+            fake.add_check_run(slug, pr["head"]["sha"], name)
+        fake.add_status(slug, pr["head"]["sha"], "ci/legacy")
+    return fake
+
+
+def build_adapter(fake: FakeGitHub) -> GitHubAdapter:
+    return GitHubAdapter(
+        token="bench",
+        transport=fake.transport(),
+        head_sha_cache=HeadShaCache(),
+        retry_policy=RetryPolicy(base_delay=0.001, max_delay=0.01),
+        retry_budget=RetryBudget(ratio=1.0, max_tokens=1000.0),
+    )
+
+
+def run(latency: float, error_rate: float, iterations: int, repos: int) -> list[BenchResult]:
+    fake = build_fake(latency, error_rate, repos)
+    adapter = build_adapter(fake)
+    results = []
+
+    results.append(bench("get_pr_status", lambda: adapter.get_pr_status(REPO, 1), iterations))
+
+    def status_and_checks_cold() -> None:
+        adapter.head_sha_cache.clear()
+        adapter.get_pr_status(REPO, 1)
+        adapter.get_check_runs(REPO, 1)
+
+    results.append(bench("status+check_runs", status_and_checks_cold, iterations))
+    results.append(bench("get_pr_snapshot", lambda: adapter.get_pr_snapshot(REPO, 1), iterations))
+
+    def coalesced_reads(threads: int = 8) -> None:
+        workers = [
+            threading.Thread(target=adapter.get_pr_status, args=(REPO, 1)) for _ in range(threads)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    results.append(
+        bench(
+            "8 concurrent identical reads", coalesced_reads, max(1, iterations // 4), ops_per_call=8
+        )
+    )
+
+    counter = itertools.count()
+
+    def workflow() -> None:
+        branch = f"bench-{next(counter)}"
+        adapter.create_branch(REPO, "main", branch)
+        adapter.create_commit(REPO, branch, "bench.txt", "payload", "Benchmark commit")
+        adapter.create_pr(REPO, "main", branch, "Benchmark", "")
+
+    results.append(bench("branch+commit+pr workflow", workflow, max(1, iterations // 4)))
+
+    slugs = [REPO] + [f"owner/repo{index}" for index in range(1, repos)]
+    for concurrency in (1, 4, 16):
+        executor = FanOutExecutor(adapter, max_concurrency=concurrency, per_repo_concurrency=4)
+        jobs = [(slug, "get_pr_status", (1,)) for slug in slugs] * 4
+        results.append(
+            bench(
+                f"fan-out x{concurrency} ({len(jobs)} jobs)",
+                lambda executor=executor, jobs=jobs: executor.run_all(jobs),
+                max(1, iterations // 20),
+                warmup=1,
+                ops_per_call=len(jobs),
+            )
+        )
+
+    adapter.client.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.002, help="Injected latency (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Injected 503 rate")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--repos", type=int, default=16)
+    args = parser.parse_args()
+    print_results(run(args.latency, args.error_rate, args.iterations, args.repos))
+
+
+if __name__ == "__main__":
+    main()
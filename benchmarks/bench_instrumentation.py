@@ -0,0 +1,70 @@
+"""Per-call overhead of the adapter's instrumentation hooks.
+
+Times ``request_hook`` plus ``response_hook`` on a prebuilt response, so the
+numbers are the cost added to every GitHub API call, independent of I/O.
+
+Usage:
+    python -m benchmarks.bench_instrumentation
+"""
+
+import argparse
+import itertools
+
+import httpx
+
+from benchmarks.harness import bench
+from packages.core.adapters.instrumentation import (
+    endpoint_template,
+    request_hook,
+    response_hook,
+    trace_requests,
+)
+
+BATCH = 1000
+
+
+def build_response(path: str) -> httpx.Response:
+    request = httpx.Request("GET", f"https://api.github.com{path}")
+    return httpx.Response(
+        200,
+        content=b"{}",
+        headers={"Content-Length": "2", "X-RateLimit-Remaining": "4999"},
+        request=request,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    response = build_response("/repos/owner/repo/pulls/1")
+    numbers = itertools.count()
+
+    def hooks() -> None:
+        for _ in range(BATCH):
+            request_hook(response.request)
+            response_hook(response)
+
+    def traced() -> None:
+        with trace_requests("bench"):
+            hooks()
+
+    def uncached_template() -> None:
+        for _ in range(BATCH):
+            endpoint_template(f"/repos/owner/repo/pulls/{next(numbers)}")
+
+    scenarios = [
+        ("hooks", hooks),
+        ("hooks + trace", traced),
+        ("template cache miss", uncached_template),
+    ]
+    print(f"{'scenario':<20}  {'us/call p50':>11}  {'us/call p95':>11}")
+    for name, fn in scenarios:
+        result = bench(name, fn, iterations=args.iterations, ops_per_call=BATCH)
+        p50, p95 = result.percentile(50) * 1e6, result.percentile(95) * 1e6
+        print(f"{name:<20}  {p50:>11.2f}  {p95:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
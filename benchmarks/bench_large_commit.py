@@ -0,0 +1,119 @@
+"""Peak memory of committing a large artifact: contents API vs streamed blob.
+
+Each mode runs in a fresh subprocess so ``ru_maxrss`` is not polluted by the
+other. Requests go to a sink transport that consumes the body chunk by chunk,
+so only the adapter's own allocations are measured.
+
+Usage:
+    python -m benchmarks.bench_large_commit --size-mb 50
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import httpx
+
+from packages.core.adapters.github_adapter import GitHubAdapter
+
+REPO = "owner/repo"
+HEAD, TREE, COMMIT = "c" * 40, "t" * 40, "d" * 40
+
+
+class SinkTransport(httpx.BaseTransport):
+    """Answers the adapter's commit endpoints while discarding request bodies."""
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        for _ in request.stream:
+            pass
+        path, method = request.url.path, request.method
+        ref = {"ref": "refs/heads/main", "url": "", "object": {"sha": HEAD}}
+        commit = {"sha": COMMIT, "message": "m", "html_url": ""}
+        if "/contents/" in path:
+            if method == "GET":
+                return httpx.Response(404, json={"message": "Not Found"})
+            return httpx.Response(201, json={"commit": commit})
+        if path.endswith("/git/blobs"):
+            return httpx.Response(201, json={"sha": "b" * 40})
+        if path.endswith("/git/trees"):
+            return httpx.Response(201, json={"sha": TREE})
+        if path.endswith("/git/commits"):
+            return httpx.Response(201, json=commit)
+        if "/git/commits/" in path:
+            return httpx.Response(200, json={"sha": HEAD, "tree": {"sha": TREE}})
+        if method == "PATCH":
+            return httpx.Response(200, json={**ref, "object": {"sha": COMMIT}})
+        return httpx.Response(200, json=ref)
+
+
+def measure(mode: str, path: Path) -> dict[str, float]:
+    adapter = GitHubAdapter(token="bench", transport=SinkTransport())
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    started = time.perf_counter()
+    if mode == "contents":
+        # The pre-streaming behaviour: whole file, its base64 and the JSON body in memory.
+        adapter._put_contents(REPO, "main", "artifact.bin", path.read_bytes(), "Add")
+    else:
+        adapter.create_commit(REPO, "main", "artifact.bin", path, "Add")
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    adapter.client.close()
+    return {
+        "seconds": round(elapsed, 3),
+        "tracemalloc_peak_mb": round(peak / 2**20, 1),
+        # ru_maxrss is KiB on Linux.
+        "rss_growth_mb": round((rss_after - rss_before) / 1024, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--mode", choices=["contents", "streamed"])
+    parser.add_argument("--path", type=Path)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(measure(args.mode, args.path)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "artifact.bin"
+        with path.open("wb") as handle:
+            for _ in range(args.size_mb):
+                handle.write(os.urandom(2**20))
+        print(f"{'mode':<10}  {'seconds':>8}  {'py peak MB':>10}  {'RSS growth MB':>13}")
+        for mode in ("contents", "streamed"):
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.bench_large_commit",
+                    "--mode",
+                    mode,
+                    "--path",
+                    str(path),
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output)
+            print(
+                f"{mode:<10}  {result['seconds']:>8}  {result['tracemalloc_peak_mb']:>10}  "
+                f"{result['rss_growth_mb']:>13}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Simulated merge-queue throughput by batch size and failure rate.
+
+Queues ``--prs`` runs that are ready for merge, each of which breaks staging
+with probability ``--failure-rate``, and drains them through a
+``MergeQueue`` for every batch size. A combined staging/production run is
+assumed to take ``--run-minutes`` regardless of how many pull requests it
+holds, so simulated time is the number of combined runs times that duration.
+Batch size 1 is gating every pull request on its own.
+
+Usage:
+    python -m benchmarks.bench_merge_queue --prs 512 --failure-rate 0.05
+"""
+
+import argparse
+import asyncio
+import random
+from collections.abc import Sequence
+
+from packages.core.gate_framework import GateFramework, GateRun, GateRunConfig
+from packages.core.merge_queue import MergeQueue
+from packages.core.schemas.gates import GateType
+
+
+class SimulatedGate:
+    """Fails staging whenever a broken pull request is part of the combined run."""
+
+    def __init__(self, broken: set[int]) -> None:
+        self.broken = broken
+
+    async def run(self, gate: GateType, runs: Sequence[GateRun]) -> bool:
+        return gate != GateType.STAGING or not any(run.pr_number in self.broken for run in runs)
+
+
+def _ready(pr_number: int) -> GateFramework:
+    framework = GateFramework(GateRunConfig(pr_number=pr_number, run_id=f"bench-{pr_number}"))
+    framework.start_run()
+    for gate in (GateType.SAFETY, GateType.PLANNING, GateType.CI):
+        framework.execute_gate(gate)
+    return framework
+
+
+async def simulate(prs: int, broken: set[int], batch_size: int) -> tuple[int, int]:
+    """Merged pull requests and combined runs for draining ``prs`` runs."""
+    queue = MergeQueue(SimulatedGate(broken), batch_size=batch_size)
+    for pr_number in range(prs):
+        queue.enqueue(_ready(pr_number))
+    results = await queue.drain()
+    return sum(len(r.merged) for r in results), sum(r.runs for r in results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--prs", type=int, default=512)
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    parser.add_argument("--run-minutes", type=float, default=30.0)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    broken = {pr for pr in range(args.prs) if rng.random() < args.failure_rate}
+    print(
+        f"{args.prs} PRs, {len(broken)} broken ({args.failure_rate:.0%}), "
+        f"{args.run_minutes:g} min per combined run"
+    )
+    print(f"{'batch':>5}  {'runs':>6}  {'runs/PR':>7}  {'merged':>6}  {'PRs/hour':>8}")
+    for batch_size in args.batch_sizes:
+        merged, runs = asyncio.run(simulate(args.prs, broken, batch_size))
+        hours = runs * args.run_minutes / 60
+        print(
+            f"{batch_size:>5}  {runs:>6}  {runs / args.prs:>7.2f}  {merged:>6}  "
+            f"{merged / hours:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
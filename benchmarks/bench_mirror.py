@@ -0,0 +1,83 @@
+"""Content reads from a local bare mirror vs the contents API.
+
+The API side runs against ``FakeGitHub`` with ``--latency`` seconds per
+request; the mirror side runs git against a local mirror of an equivalent
+repository.
+
+Usage:
+    python -m benchmarks.bench_mirror --files 50 --latency 0.05
+"""
+
+import argparse
+import subprocess
+import tempfile
+from pathlib import Path
+
+from benchmarks.harness import bench, print_results
+from packages.core.adapters.github_adapter import GitHubAdapter
+from packages.core.adapters.mirror import MirrorCache
+from packages.core.testing import FakeGitHub
+
+REPO = "owner/repo"
+
+
+def build_source(path: Path, files: int) -> list[str]:
+    paths = [f"src/module_{index}.py" for index in range(files)]
+    for name in paths:
+        (path / name).parent.mkdir(parents=True, exist_ok=True)
+        (path / name).write_text(f"# {name}\n" * 50)
+    git = ["git", "-c", "user.name=bench", "-c", "user.email=bench@example.com"]
+    subprocess.run([*git, "init", "-q", "-b", "main"], cwd=path, check=True)
+    subprocess.run([*git, "add", "-A"], cwd=path, check=True)
+    subprocess.run([*git, "commit", "-q", "-m", "seed"], cwd=path, check=True)
+    return paths
+
+
+def build_fake(source: Path, paths: list[str], latency: float) -> FakeGitHub:
+    fake = FakeGitHub(latency=latency, rate_limit=10**9)
+    repo = fake.add_repo(REPO)
+    tree = {name: repo.put_blob((source / name).read_bytes()) for name in paths}
+    repo.refs["main"] = repo.put_commit(repo.put_tree(tree), [repo.refs["main"]], "seed")
+    return fake
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "source"
+        source.mkdir()
+        paths = build_source(source, args.files)
+        fake = build_fake(source, paths, args.latency)
+        mirrors = MirrorCache(Path(tmp) / "mirrors", remote_url=lambda slug: str(source))
+        mirrors.add(REPO)
+        api = GitHubAdapter(token="bench", transport=fake.transport())
+        local = GitHubAdapter(token="bench", transport=fake.transport(), mirror_cache=mirrors)
+
+        results = [
+            bench("api list_tree", lambda: api.list_tree(REPO, "main"), args.iterations),
+            bench("mirror list_tree", lambda: local.list_tree(REPO, "main"), args.iterations),
+            bench(
+                f"api get_files x{args.files}",
+                lambda: api.get_files(REPO, paths, "main"),
+                args.iterations,
+            ),
+            bench(
+                f"mirror get_files x{args.files}",
+                lambda: local.get_files(REPO, paths, "main"),
+                args.iterations,
+            ),
+        ]
+        print_results(results)
+        print(f"API requests: {len(fake.requests)} (mirror reads issue none)")
+        api.client.close()
+        local.client.close()
+        mirrors.close()
+
+
+if __name__ == "__main__":
+    main()
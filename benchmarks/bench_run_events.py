@@ -0,0 +1,65 @@
+"""Transition log append throughput and replay latency.
+
+Appends ``--transitions`` transitions spread over ``--runs`` runs, in memory
+and to a JSON-lines file, then times replaying a run from its nearest
+snapshot.
+
+Usage:
+    python -m benchmarks.bench_run_events --transitions 200000 --runs 1000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.harness import BenchResult, bench, print_results
+from packages.core.gate_framework import GateRun, GateRunConfig, RunState, RunTransition
+from packages.core.run_events import TransitionLog
+from packages.core.schemas.gates import GateType
+
+CYCLE = [
+    (RunState.RUNNING_SAFETY, RunState.RUNNING_PLANNING, GateType.PLANNING),
+    (RunState.RUNNING_PLANNING, RunState.RUNNING_CI, GateType.CI),
+    (RunState.RUNNING_CI, RunState.RUNNING_SAFETY, GateType.SAFETY),
+]
+
+
+def append_all(log: TransitionLog, runs: list[GateRun], transitions: int) -> BenchResult:
+    started = time.perf_counter()
+    for index in range(transitions):
+        run = runs[index % len(runs)]
+        from_state, to_state, gate = CYCLE[index // len(runs) % len(CYCLE)]
+        log.append(RunTransition(run.run_id, from_state, to_state, gate, time.time()), run)
+    log.flush()
+    total = time.perf_counter() - started
+    return BenchResult(f"append ({'file' if log.path else 'memory'})", transitions, total, [])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transitions", type=int, default=200_000)
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--snapshot-every", type=int, default=32)
+    args = parser.parse_args()
+
+    runs = [
+        GateRun(
+            run_id=f"run-{i}", pr_number=i, config=GateRunConfig(pr_number=i, run_id=f"run-{i}")
+        )
+        for i in range(args.runs)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = TransitionLog(snapshot_every=args.snapshot_every)
+        on_disk = TransitionLog(Path(tmp) / "transitions.jsonl", args.snapshot_every)
+        results = [
+            append_all(memory, runs, args.transitions),
+            append_all(on_disk, runs, args.transitions),
+            bench("replay current", lambda: on_disk.replay("run-0"), 1000),
+        ]
+        on_disk.close()
+        print_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Run manager throughput, queue wait and memory with many active runs.
+
+Submits ``--runs`` runs across ``--repos`` repositories at once, so every run
+is active concurrently; each CI gate awaits a ``--check-ms`` check. Reports
+gates per second, mean queue wait per gate (``gate_queue_wait_seconds``) and
+traced memory per active run. A second phase pushes a new head commit for
+every run's pull request while the runs are in flight and reports how long
+stopping the superseded runs took (``gate_run_supersede_seconds``).
+
+Usage:
+    python -m benchmarks.bench_run_manager --runs 10000 --repos 100 --workers 256
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from packages.core.gate_framework import GateRunConfig, RunState
+from packages.core.gate_graph import GateCheck, GateGraph
+from packages.core.gate_run_manager import GateRunManager, gate_queue_wait, supersede_latency
+from packages.core.schemas.gates import GateType
+
+
+async def run(args: argparse.Namespace) -> None:
+    async def ci_check() -> bool:
+        await asyncio.sleep(args.check_ms / 1000)
+        return True
+
+    graph = GateGraph({GateType.CI: [GateCheck("unit_tests_passed", ci_check)]})
+    manager = GateRunManager(max_workers=args.workers, graph=graph)
+    gate_queue_wait.reset()
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    run_ids = [
+        manager.submit(
+            GateRunConfig(pr_number=i, run_id=f"run-{i}", repo_slug=f"o/r{i % args.repos}")
+        )
+        for i in range(args.runs)
+    ]
+    submitted, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    active = manager.stats()["active"]
+
+    started = time.perf_counter()
+    await manager.join()
+    elapsed = time.perf_counter() - started
+    await manager.close()
+
+    completed = sum(manager.status(i).state == RunState.COMPLETED for i in run_ids)
+    gates = sum(gate_queue_wait.count(gate=gate.value) for gate in GateType)
+    print(f"{completed}/{args.runs} runs completed, {active} active at once")
+    print(f"memory per active run: {(submitted - baseline) / args.runs / 1024:.1f} KiB")
+    print(f"{gates / elapsed:.0f} gates/s over {elapsed:.2f}s")
+    for gate in GateType:
+        count = gate_queue_wait.count(gate=gate.value)
+        mean = gate_queue_wait.sum(gate=gate.value) / count if count else 0.0
+        print(f"  queue wait {gate.value:<10} mean {mean * 1000:8.1f} ms over {count} gates")
+
+    await supersede(args, graph)
+
+
+async def supersede(args: argparse.Namespace, graph: GateGraph) -> None:
+    manager = GateRunManager(max_workers=args.workers, graph=graph)
+    supersede_latency.reset()
+
+    def push(index: int, sha: str) -> str:
+        config = GateRunConfig(
+            pr_number=index, run_id="", repo_slug=f"o/r{index % args.repos}", head_sha=sha
+        )
+        return manager.submit(config)
+
+    for index in range(args.runs):
+        push(index, "old")
+    await asyncio.sleep(args.check_ms / 2000)
+    started = time.perf_counter()
+    for index in range(args.runs):
+        push(index, "new")
+    elapsed = time.perf_counter() - started
+    await manager.join()
+    await manager.close()
+
+    stopped = supersede_latency.count()
+    print(f"superseded {stopped} runs; pushes submitted in {elapsed * 1000:.0f} ms")
+    print(
+        f"  stop latency mean {supersede_latency.sum() / stopped * 1000:.2f} ms, "
+        f"p99 {supersede_latency.quantile(0.99) * 1000:.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10_000)
+    parser.add_argument("--repos", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=256)
+    parser.add_argument("--check-ms", type=float, default=5.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
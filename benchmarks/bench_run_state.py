@@ -0,0 +1,80 @@
+"""Compact run state against the pydantic ``GateRun``.
+
+Compares the cost of one state transition applied to a ``GateRun`` (how the
+framework tracked runs before ``RunCore``) with the same transition on a
+``RunCore``, the memory held per live run by each, and full mock runs per
+second through ``GateFramework``.
+
+Usage:
+    python -m benchmarks.bench_run_state --runs 10000 --iterations 20000
+"""
+
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks.harness import bench, print_results
+from packages.core.gate_framework import (
+    GATE_CODES,
+    STATE_CODES,
+    GateFramework,
+    GateRun,
+    GateRunConfig,
+    RunCore,
+    RunState,
+    RunTransition,
+)
+from packages.core.schemas.gates import GateType
+
+CONFIG = GateRunConfig(pr_number=1, run_id="bench")
+
+
+def pydantic_transition() -> None:
+    run = GateRun(run_id="bench", pr_number=1, config=CONFIG)
+    RunTransition("bench", run.state, RunState.RUNNING_CI, GateType.CI, time.time(), None).apply(
+        run
+    )
+
+
+def compact_transition() -> None:
+    core = RunCore(datetime.now(timezone.utc))
+    core.move(STATE_CODES[RunState.RUNNING_CI], GATE_CODES[GateType.CI])
+
+
+def bytes_per_run(make, runs: int) -> float:
+    tracemalloc.start()
+    held = [make() for _ in range(runs)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return size / runs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10_000)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    results = [
+        bench("GateRun + transition", pydantic_transition, args.iterations),
+        bench("RunCore + transition", compact_transition, args.iterations),
+        bench(
+            "full mock run (GateFramework)",
+            lambda: GateFramework(CONFIG).execute_full_mock_run(),
+            args.iterations // 10,
+        ),
+    ]
+    print_results(results)
+
+    pydantic_bytes = bytes_per_run(
+        lambda: GateRun(run_id="bench", pr_number=1, config=CONFIG), args.runs
+    )
+    compact_bytes = bytes_per_run(lambda: RunCore(datetime.now(timezone.utc)), args.runs)
+    print(f"GateRun: {pydantic_bytes:.0f} bytes per run")
+    print(f"RunCore: {compact_bytes:.0f} bytes per run")
+
+
+if __name__ == "__main__":
+    main()
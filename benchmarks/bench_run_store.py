@@ -0,0 +1,88 @@
+"""Run store query latency at scale.
+
+Seeds a database with ``--runs`` runs (a ``--blocked`` fraction of them
+BLOCKED, spread over a year of start times), then times the indexed queries
+and the cost of queueing a transition snapshot.
+
+Usage:
+    python -m benchmarks.bench_run_store --runs 1000000 --blocked 0.0001
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.harness import bench, print_results
+from packages.core.gate_framework import GateRun, GateRunConfig, RunState
+from packages.core.run_store import _UPSERT, RunStore
+
+STATES = [RunState.COMPLETED, RunState.FAILED, RunState.RUNNING_CI]
+
+
+def seed(store: RunStore, runs: int, blocked: float) -> None:
+    template = GateRun(
+        run_id="template", pr_number=0, config=GateRunConfig(pr_number=0, run_id="template")
+    ).model_dump_json()
+    rng = random.Random(0)
+    now = time.time()
+    rows = []
+    for index in range(runs):
+        state = RunState.BLOCKED if rng.random() < blocked else rng.choice(STATES)
+        started = now - rng.random() * 365 * 86400
+        rows.append(
+            (
+                f"run-{index}",
+                index % 5000,
+                "owner/repo",
+                state.value,
+                "pending",
+                started,
+                None,
+                template,
+            )
+        )
+        if len(rows) == 50_000:
+            _insert(store, rows)
+            rows = []
+    _insert(store, rows)
+
+
+def _insert(store: RunStore, rows: list[tuple]) -> None:
+    with store._writer:
+        store._writer.execute("BEGIN")
+        store._writer.executemany(_UPSERT, rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=1_000_000)
+    parser.add_argument("--blocked", type=float, default=0.0001)
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = RunStore(Path(tmp) / "runs.db")
+        started = time.perf_counter()
+        seed(store, args.runs, args.blocked)
+        print(f"seeded {args.runs} runs in {time.perf_counter() - started:.1f}s")
+        blocked = store.count(state=RunState.BLOCKED)
+
+        run = GateRun(run_id="live", pr_number=1, config=GateRunConfig(pr_number=1, run_id="live"))
+        results = [
+            bench(
+                f"query BLOCKED ({blocked} runs)",
+                lambda: store.query(state=RunState.BLOCKED),
+                args.iterations,
+            ),
+            bench("count BLOCKED", lambda: store.count(state=RunState.BLOCKED), args.iterations),
+            bench("query by PR", lambda: store.query(pr_number=42), args.iterations),
+            bench("save (queue snapshot)", lambda: store.save(run), args.iterations),
+        ]
+        print_results(results)
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Minimal timing harness shared by the benchmark modules."""
+
+import json
+import statistics
+import time
+from collections.abc import Callable, Collection, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class BenchResult:
+    """Timing summary for one benchmark scenario."""
+
+    name: str
+    iterations: int
+    total_seconds: float
+    samples: list[float]
+
+    @property
+    def ops_per_second(self) -> float:
+        return self.iterations / self.total_seconds if self.total_seconds else float("inf")
+
+    def percentile(self, q: float) -> float:
+        """Latency percentile in seconds (``q`` in 0..100)."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "ops_per_second": round(self.ops_per_second, 2),
+            "p50_ms": round(self.percentile(50) * 1000, 4),
+            "p95_ms": round(self.percentile(95) * 1000, 4),
+            "mean_ms": round(statistics.fmean(self.samples) * 1000, 4) if self.samples else 0.0,
+        }
+
+
+def bench(
+    name: str,
+    fn: Callable[[], object],
+    iterations: int = 100,
+    warmup: int = 5,
+    ops_per_call: int = 1,
+) -> BenchResult:
+    """Time ``fn`` over ``iterations`` calls after ``warmup`` untimed calls.
+
+    ``ops_per_call`` scales throughput when one call performs several operations.
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - call_started) / ops_per_call)
+    total = time.perf_counter() - started
+    return BenchResult(name, iterations * ops_per_call, total, samples)
+
+
+def print_results(results: list[BenchResult]) -> None:
+    width = max(len(result.name) for result in results)
+    print(f"{'scenario':<{width}}  {'ops/s':>12}  {'p50 ms':>10}  {'p95 ms':>10}")
+    for result in results:
+        summary = result.as_dict()
+        print(
+            f"{result.name:<{width}}  {summary['ops_per_second']:>12.1f}  "
+            f"{summary['p50_ms']:>10.3f}  {summary['p95_ms']:>10.3f}"
+        )
+
+
+def load_baseline(path: Path) -> dict[str, float]:
+    """Baseline metrics stored at ``path``; empty if there is none yet."""
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_baseline(path: Path, metrics: dict[str, float]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(metrics, indent=2, sort_keys=True) + "\n")
+
+
+def regressions(
+    metrics: dict[str, float],
+    baseline: dict[str, float],
+    threshold: float,
+    lower_is_better: Collection[str] = (),
+    tolerances: Mapping[str, float] | None = None,
+) -> dict[str, float]:
+    """Metrics worse than their baseline by more than their tolerance (a fraction).
+
+    Metrics named in ``tolerances`` use their own tolerance there, the rest
+    use ``threshold``, so a noisy timing and a deterministic count need not
+    share one. Metrics are higher-is-better unless named in
+    ``lower_is_better``. Metrics without a baseline are not compared.
+
+    Returns:
+        Metric name -> relative change against the baseline (negative is worse).
+    """
+    worse = {}
+    for name, value in metrics.items():
+        expected = baseline.get(name)
+        if not expected:
+            continue
+        change = (value - expected) / expected
+        if name in lower_is_better:
+            change = -change
+        if change < -(tolerances or {}).get(name, threshold):
+            worse[name] = change
+    return worse
@@ -1,5 +1,18 @@
 """Adapters for external services."""
 
+from packages.core.adapters.auth import InstallationTokenProvider, StaticTokenProvider
+from packages.core.adapters.fanout import FanOutExecutor, FanOutJob, FanOutResult
 from packages.core.adapters.github_adapter import GitHubAdapter
+from packages.core.adapters.mirror import MirrorCache
+from packages.core.adapters.pr_state_cache import PRStateCache
 
-__all__ = ["GitHubAdapter"]
+__all__ = [
+    "FanOutExecutor",
+    "FanOutJob",
+    "FanOutResult",
+    "GitHubAdapter",
+    "InstallationTokenProvider",
+    "MirrorCache",
+    "PRStateCache",
+    "StaticTokenProvider",
+]
@@ -0,0 +1,284 @@
+"""Token providers for authenticating GitHub API requests.
+
+``GitHubAdapter`` authenticates through a ``TokenProvider`` wrapped in
+``TokenAuth``, an ``httpx.Auth`` that sets the bearer token per request and
+retries once with a fresh token on 401. Streamed request bodies are never
+buffered for that retry: their 401 is returned to the caller.
+
+``InstallationTokenProvider`` mints GitHub App installation tokens and keeps
+them in an ``InstallationTokenCache`` shared by every provider (and thus every
+adapter) in the process. Tokens are refreshed ahead of expiry in a background
+thread while the current token keeps being served; only a missing or nearly
+expired token blocks, and concurrent callers then share a single mint.
+"""
+
+import random
+import threading
+import time
+from collections.abc import Callable, Generator, Hashable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Protocol
+
+import httpx
+
+from packages.core.adapters.errors import GitHubAuthError
+from packages.core.adapters.singleflight import SingleFlight
+from packages.core.logging import get_logger
+from packages.core.metrics import registry
+
+token_refreshes = registry.counter(
+    "github_installation_token_refreshes_total",
+    "Installation tokens minted, by mode (blocking or background) and outcome",
+)
+
+
+class TokenProvider(Protocol):
+    """Source of bearer tokens for GitHub API requests."""
+
+    def get_token(self) -> str:
+        """Return a token valid for at least the next request."""
+
+    def invalidate(self, token: str) -> None:
+        """Drop ``token`` after GitHub rejected it."""
+
+
+class StaticTokenProvider:
+    """Provider for a fixed token such as a PAT or ``GITHUB_TOKEN``."""
+
+    def __init__(self, token: str) -> None:
+        self._token = token
+
+    def get_token(self) -> str:
+        return self._token
+
+    def invalidate(self, token: str) -> None:
+        pass
+
+
+class TokenAuth(httpx.Auth):
+    """``httpx.Auth`` applying a ``TokenProvider`` to every request."""
+
+    def __init__(self, provider: TokenProvider) -> None:
+        self.provider = provider
+
+    def auth_flow(self, request: httpx.Request) -> Generator[httpx.Request, httpx.Response, None]:
+        token = self.provider.get_token()
+        request.headers["Authorization"] = f"Bearer {token}"
+        response = yield request
+        if response.status_code == 401:
+            # Revoked or expired early: retry once with a freshly minted token.
+            self.provider.invalidate(token)
+            if not isinstance(request.stream, httpx.ByteStream):
+                # A streamed body cannot be replayed without holding it in memory.
+                return
+            retry_token = self.provider.get_token()
+            if retry_token != token:
+                request.headers["Authorization"] = f"Bearer {retry_token}"
+                yield request
+
+
+@dataclass(frozen=True)
+class InstallationToken:
+    """An installation access token and its schedule (epoch seconds)."""
+
+    token: str
+    expires_at: float
+    refresh_at: float
+
+
+class InstallationTokenCache:
+    """Installation tokens keyed by ``(api_url, app_id, installation_id)``.
+
+    A module-level instance (``shared_token_cache``) is used by default so
+    every adapter in a process shares tokens and refreshes. Deployments with
+    several worker processes can subclass it to back ``get``/``set``/``discard``
+    with a shared store; per-process refresh times are jittered so workers do
+    not all refresh at once.
+    """
+
+    def __init__(self) -> None:
+        self._tokens: dict[Hashable, InstallationToken] = {}
+        self._lock = threading.Lock()
+        self.refreshes = SingleFlight("installation_token")
+        self._background: set[Hashable] = set()
+
+    def get(self, key: Hashable) -> InstallationToken | None:
+        return self._tokens.get(key)
+
+    def set(self, key: Hashable, token: InstallationToken) -> None:
+        with self._lock:
+            self._tokens[key] = token
+
+    def discard(self, key: Hashable, token: str) -> None:
+        """Drop the entry for ``key`` if it still holds ``token``."""
+        with self._lock:
+            current = self._tokens.get(key)
+            if current is not None and current.token == token:
+                del self._tokens[key]
+
+    def claim_background(self, key: Hashable) -> bool:
+        """Return True if the caller should start the background refresh for ``key``."""
+        with self._lock:
+            if key in self._background:
+                return False
+            self._background.add(key)
+            return True
+
+    def release_background(self, key: Hashable) -> None:
+        with self._lock:
+            self._background.discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+
+
+shared_token_cache = InstallationTokenCache()
+
+
+def github_app_jwt_factory(app_id: str | int, private_key: str) -> Callable[[], str]:
+    """Return a callable producing RS256 GitHub App JWTs.
+
+    Requires the optional ``PyJWT[crypto]`` package.
+    """
+    try:
+        import jwt
+    except ImportError as exc:
+        raise GitHubAuthError(
+            "GitHub App authentication requires PyJWT. Install it with "
+            "'pip install PyJWT[crypto]' or pass a jwt_factory."
+        ) from exc
+
+    def factory() -> str:
+        now = int(time.time())
+        # Backdate iat to tolerate clock drift; GitHub caps exp at 10 minutes.
+        payload = {"iat": now - 60, "exp": now + 540, "iss": str(app_id)}
+        return jwt.encode(payload, private_key, algorithm="RS256")
+
+    return factory
+
+
+class InstallationTokenProvider:
+    """Mint and cache GitHub App installation tokens.
+
+    Args:
+        app_id: GitHub App ID.
+        installation_id: Installation (org or user account) to mint tokens for.
+        private_key: App private key (PEM). Ignored when ``jwt_factory`` is given.
+        jwt_factory: Callable returning a signed app JWT.
+        base_url: GitHub API base URL.
+        refresh_margin: Seconds before expiry at which a background refresh starts.
+        min_validity: Tokens with less validity left are refreshed synchronously.
+        cache: Token cache; defaults to the process-wide ``shared_token_cache``.
+        transport: Optional httpx transport for the token endpoint.
+        clock: Wall-clock source (epoch seconds), matching ``expires_at``.
+    """
+
+    def __init__(
+        self,
+        app_id: str | int,
+        installation_id: int,
+        private_key: str | None = None,
+        jwt_factory: Callable[[], str] | None = None,
+        base_url: str = "https://api.github.com",
+        refresh_margin: float = 300.0,
+        min_validity: float = 60.0,
+        cache: InstallationTokenCache | None = None,
+        transport: httpx.BaseTransport | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if jwt_factory is None:
+            if not private_key:
+                raise GitHubAuthError(
+                    "GitHub App authentication needs a private_key or jwt_factory."
+                )
+            jwt_factory = github_app_jwt_factory(app_id, private_key)
+        self.app_id = app_id
+        self.installation_id = installation_id
+        self.base_url = base_url.rstrip("/")
+        self.refresh_margin = refresh_margin
+        self.min_validity = min_validity
+        self._jwt_factory = jwt_factory
+        self._cache = cache or shared_token_cache
+        self._transport = transport
+        self._clock = clock
+        self._key = (self.base_url, str(app_id), installation_id)
+        self._logger = get_logger("github_auth")
+
+    def get_token(self) -> str:
+        entry = self._cache.get(self._key)
+        now = self._clock()
+        if entry is not None and entry.expires_at - now > self.min_validity:
+            if now >= entry.refresh_at:
+                self._refresh_in_background()
+            return entry.token
+        return self._refresh("blocking").token
+
+    def invalidate(self, token: str) -> None:
+        self._cache.discard(self._key, token)
+
+    def _refresh(self, mode: str) -> InstallationToken:
+        # One mint per installation at a time, across all providers sharing the cache.
+        return self._cache.refreshes.do(self._key, lambda: self._mint_if_needed(mode))
+
+    def _mint_if_needed(self, mode: str) -> InstallationToken:
+        # Another caller may have refreshed between our cache read and taking the lead.
+        entry = self._cache.get(self._key)
+        now = self._clock()
+        if entry is not None and entry.expires_at - now > self.min_validity:
+            if mode == "blocking" or now < entry.refresh_at:
+                return entry
+        return self._mint(mode)
+
+    def _refresh_in_background(self) -> None:
+        if not self._cache.claim_background(self._key):
+            return
+
+        def run() -> None:
+            try:
+                self._refresh("background")
+            except Exception as exc:
+                # The current token is still valid; the next access retries.
+                self._logger.warning(
+                    "installation_id=%s background token refresh failed: %s",
+                    self.installation_id,
+                    exc,
+                )
+            finally:
+                self._cache.release_background(self._key)
+
+        threading.Thread(target=run, name="github-token-refresh", daemon=True).start()
+
+    def _mint(self, mode: str) -> InstallationToken:
+        url = f"{self.base_url}/app/installations/{self.installation_id}/access_tokens"
+        headers = {
+            "Authorization": f"Bearer {self._jwt_factory()}",
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+        try:
+            with httpx.Client(transport=self._transport, timeout=30.0) as client:
+                response = client.post(url, headers=headers)
+        except httpx.TransportError:
+            token_refreshes.inc(mode=mode, outcome="error")
+            raise
+
+        if response.status_code != 201:
+            token_refreshes.inc(mode=mode, outcome="error")
+            raise GitHubAuthError(
+                f"Failed to create installation token for installation "
+                f"{self.installation_id} ({response.status_code}).",
+                status_code=response.status_code,
+            )
+
+        data = response.json()
+        expires_at = datetime.fromisoformat(data["expires_at"].replace("Z", "+00:00")).timestamp()
+        # Spread refreshes of processes sharing a store over the last 20% of the margin.
+        margin = self.refresh_margin * (1 - 0.2 * random.random())
+        token = InstallationToken(
+            token=data["token"], expires_at=expires_at, refresh_at=expires_at - margin
+        )
+        self._cache.set(self._key, token)
+        token_refreshes.inc(mode=mode, outcome="ok")
+        return token
@@ -0,0 +1,41 @@
+"""Exceptions raised by the GitHub adapter."""
+
+
+class GitHubError(Exception):
+    """Base exception for GitHub adapter errors."""
+
+    def __init__(self, message: str, status_code: int | None = None, response: dict | None = None):
+        self.message = message
+        self.status_code = status_code
+        self.response = response
+        super().__init__(self.message)
+
+
+class GitHubAuthError(GitHubError):
+    """Authentication error (401)."""
+
+    ...
+
+
+class GitHubForbiddenError(GitHubError):
+    """Forbidden error (403)."""
+
+    ...
+
+
+class GitHubRateLimitError(GitHubForbiddenError):
+    """Rate limit or GraphQL point budget exhausted (403)."""
+
+    ...
+
+
+class GitHubNotFoundError(GitHubError):
+    """Not found error (404)."""
+
+    ...
+
+
+class GitHubValidationError(GitHubError):
+    """Validation error (422)."""
+
+    ...
@@ -0,0 +1,192 @@
+"""Bounded-concurrency fan-out of adapter operations across repositories.
+
+Jobs are dispatched round-robin across repositories onto a thread pool with
+a global concurrency cap and a per-repository cap, so a long queue for one
+repository cannot starve the others. Results are streamed as they complete
+and GitHub errors are captured per job instead of aborting the batch.
+"""
+
+import contextvars
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from packages.core.adapters.github_adapter import GitHubAdapter, GitHubError
+from packages.core.metrics import registry
+
+fanout_jobs = registry.counter(
+    "github_fanout_jobs_total", "Fan-out jobs completed, by operation and outcome"
+)
+
+
+@dataclass(frozen=True)
+class FanOutJob:
+    """One adapter call: ``operation(repo_slug, *args, **kwargs)``.
+
+    ``operation`` is either a ``GitHubAdapter`` method name or a callable that
+    takes the repository slug as its first argument.
+    """
+
+    repo_slug: str
+    operation: str | Callable[..., Any]
+    args: tuple[Any, ...] = ()
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def operation_name(self) -> str:
+        if isinstance(self.operation, str):
+            return self.operation
+        return getattr(self.operation, "__name__", repr(self.operation))
+
+
+@dataclass
+class FanOutResult:
+    """Outcome of a single fan-out job."""
+
+    index: int
+    job: FanOutJob
+    value: Any = None
+    error: Exception | None = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class FanOutReport:
+    """All results of a fan-out batch, in submission order."""
+
+    results: list[FanOutResult]
+
+    @property
+    def succeeded(self) -> list[FanOutResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> list[FanOutResult]:
+        return [result for result in self.results if not result.ok]
+
+    def errors_by_type(self) -> dict[str, list[FanOutResult]]:
+        """Group failed jobs by exception class name (e.g. ``GitHubNotFoundError``)."""
+        grouped: dict[str, list[FanOutResult]] = {}
+        for result in self.failed:
+            grouped.setdefault(type(result.error).__name__, []).append(result)
+        return grouped
+
+
+JobSpec = FanOutJob | tuple
+
+
+def _as_job(spec: JobSpec) -> FanOutJob:
+    if isinstance(spec, FanOutJob):
+        return spec
+    repo_slug, operation, *rest = spec
+    args = rest[0] if rest else ()
+    kwargs = rest[1] if len(rest) > 1 else {}
+    return FanOutJob(repo_slug, operation, tuple(args), dict(kwargs))
+
+
+class FanOutExecutor:
+    """Run adapter operations across many repositories in parallel.
+
+    Example:
+        >>> executor = FanOutExecutor(adapter, max_concurrency=16, per_repo_concurrency=2)
+        >>> jobs = [(repo, "get_pr_status", (pr,)) for repo, pr in open_prs]
+        >>> for result in executor.run(jobs):
+        ...     print(result.job.repo_slug, result.ok)
+    """
+
+    def __init__(
+        self,
+        adapter: GitHubAdapter,
+        max_concurrency: int = 16,
+        per_repo_concurrency: int = 4,
+    ) -> None:
+        if max_concurrency < 1 or per_repo_concurrency < 1:
+            raise ValueError("Concurrency limits must be at least 1")
+        self.adapter = adapter
+        self.max_concurrency = max_concurrency
+        self.per_repo_concurrency = per_repo_concurrency
+
+    def run(self, jobs: Iterable[JobSpec]) -> Iterator[FanOutResult]:
+        """Execute jobs, yielding each result as soon as it completes.
+
+        ``GitHubError`` and transport errors are captured on the result; any
+        other exception is treated as a bug and propagates.
+        """
+        queues: dict[str, deque[tuple[int, FanOutJob]]] = {}
+        for index, spec in enumerate(jobs):
+            job = _as_job(spec)
+            queues.setdefault(job.repo_slug, deque()).append((index, job))
+
+        repo_order: deque[str] = deque(queues)
+        active: dict[str, int] = dict.fromkeys(queues, 0)
+        in_flight: dict[Future, str] = {}
+        pool = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="github-fanout"
+        )
+        try:
+            while repo_order or in_flight:
+                self._dispatch(pool, queues, repo_order, active, in_flight)
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    repo_slug = in_flight.pop(future)
+                    active[repo_slug] -= 1
+                    # Saturated repos were dropped from the rotation; rejoin at the back.
+                    if queues[repo_slug] and active[repo_slug] == self.per_repo_concurrency - 1:
+                        repo_order.append(repo_slug)
+                    yield future.result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def run_all(self, jobs: Iterable[JobSpec]) -> FanOutReport:
+        """Execute jobs and return every result in submission order."""
+        results = sorted(self.run(jobs), key=lambda result: result.index)
+        return FanOutReport(results=results)
+
+    def _dispatch(
+        self,
+        pool: ThreadPoolExecutor,
+        queues: dict[str, deque[tuple[int, FanOutJob]]],
+        repo_order: deque[str],
+        active: dict[str, int],
+        in_flight: dict[Future, str],
+    ) -> None:
+        """Submit jobs round-robin across repositories until a cap is reached.
+
+        ``repo_order`` only holds repositories with queued jobs and spare
+        per-repository capacity; saturated ones are re-queued on completion.
+        """
+        while repo_order and len(in_flight) < self.max_concurrency:
+            repo_slug = repo_order.popleft()
+            index, job = queues[repo_slug].popleft()
+            context = contextvars.copy_context()
+            in_flight[pool.submit(context.run, self._execute, index, job)] = repo_slug
+            active[repo_slug] += 1
+            if queues[repo_slug] and active[repo_slug] < self.per_repo_concurrency:
+                repo_order.append(repo_slug)
+
+    def _execute(self, index: int, job: FanOutJob) -> FanOutResult:
+        if isinstance(job.operation, str):
+            operation = getattr(self.adapter, job.operation)
+        else:
+            operation = job.operation
+
+        started = time.perf_counter()
+        result = FanOutResult(index=index, job=job)
+        try:
+            result.value = operation(job.repo_slug, *job.args, **job.kwargs)
+        except (GitHubError, httpx.TransportError) as exc:
+            result.error = exc
+        result.elapsed = time.perf_counter() - started
+        fanout_jobs.inc(
+            operation=job.operation_name, outcome="ok" if result.ok else type(result.error).__name__
+        )
+        return result
@@ -1,44 +1,47 @@
 """GitHub API Adapter following BLUEPRINT — PR-13: GitHub Adapter v1."""
 
 import base64
+import contextvars
 import os
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
 
 import httpx
 
-
-class GitHubError(Exception):
-    """Base exception for GitHub adapter errors."""
-
-    def __init__(self, message: str, status_code: int | None = None, response: dict | None = None):
-        self.message = message
-        self.status_code = status_code
-        self.response = response
-        super().__init__(self.message)
-
-
-class GitHubAuthError(GitHubError):
-    """Authentication error (401)."""
-
-    ...
-
-
-class GitHubForbiddenError(GitHubError):
-    """Forbidden error (403)."""
-
-    ...
-
-
-class GitHubNotFoundError(GitHubError):
-    """Not found error (404)."""
-
-    ...
-
-
-class GitHubValidationError(GitHubError):
-    """Validation error (422)."""
-
-    ...
+from packages.core.adapters import github_graphql
+from packages.core.adapters.auth import TokenAuth, TokenProvider
+from packages.core.adapters.errors import (
+    GitHubAuthError,
+    GitHubError,
+    GitHubForbiddenError,
+    GitHubNotFoundError,
+    GitHubRateLimitError,
+    GitHubValidationError,
+)
+from packages.core.adapters.head_sha_cache import HeadShaCache
+from packages.core.adapters.instrumentation import event_hooks
+from packages.core.adapters.mirror import MirrorCache
+from packages.core.adapters.pr_state_cache import PRStateCache
+from packages.core.adapters.retry import Retrier, RetryBudget, RetryPolicy
+from packages.core.adapters.singleflight import SingleFlight, request_key
+from packages.core.adapters.streaming import (
+    BLOB_THRESHOLD,
+    FileContent,
+    blob_request_body,
+    blob_request_length,
+    chunk_source,
+    content_size,
+    is_binary,
+)
+from packages.core.schemas.github import (
+    CheckRunSummary,
+    CommitStatusSummary,
+    FileChange,
+    PRSnapshot,
+    TreeEntry,
+)
 
 
 class GitHubAdapter:
@@ -48,32 +51,100 @@ class GitHubAdapter:
     Implements contract-first design following BLUEPRINT — PR-13: GitHub Adapter v1.
     """
 
-    def __init__(self, token: str | None = None, base_url: str = "https://api.github.com"):
+    def __init__(
+        self,
+        token: str | None = None,
+        base_url: str = "https://api.github.com",
+        head_sha_cache: HeadShaCache | None = None,
+        retry_policy: RetryPolicy | None = None,
+        retry_budget: RetryBudget | None = None,
+        transport: httpx.BaseTransport | None = None,
+        pr_state_cache: PRStateCache | None = None,
+        token_provider: TokenProvider | None = None,
+        mirror_cache: MirrorCache | None = None,
+    ):
         """
         Initialize GitHub adapter.
 
         Args:
             token: GitHub token (PAT or GitHub App token). If None, reads from GITHUB_TOKEN env var.
             base_url: GitHub API base URL. Default: https://api.github.com
+            head_sha_cache: Shared PR head SHA cache. Pass the instance registered as a
+                webhook subscriber so ``pull_request.synchronize`` invalidates it;
+                without one head SHAs are not cached, so a push is never missed.
+                Defaults to the ``pr_state_cache``'s, which it must be if both
+                are given.
+            retry_policy: Retry policy for transient failures on idempotent calls.
+                Pass ``RetryPolicy(max_attempts=1)`` to disable retries.
+            retry_budget: Retry budget, shareable between adapters to cap retries
+                process-wide.
+            transport: Optional httpx transport, e.g. ``FakeGitHub.transport()`` for
+                offline tests and benchmarks.
+            pr_state_cache: Webhook-maintained PR state cache consulted before PR
+                status and check run reads. Register the same instance as a webhook
+                subscriber; without one every read goes to the API.
+            token_provider: Token source used instead of ``token``, e.g. an
+                ``InstallationTokenProvider`` for GitHub App installations.
+            mirror_cache: Local bare mirrors serving ``list_tree``, ``get_file(s)``
+                and ``compare_commits`` from disk; repositories without a mirror
+                are read through the API.
         """
-        self.token = token or os.getenv("GITHUB_TOKEN")
-        if not self.token:
-            raise GitHubAuthError(
-                "GitHub token not provided. Set GITHUB_TOKEN environment variable "
-                "or pass token parameter."
-            )
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+        if token_provider is not None:
+            self.token = None
+            auth = TokenAuth(token_provider)
+        else:
+            self.token = token or os.getenv("GITHUB_TOKEN")
+            if not self.token:
+                raise GitHubAuthError(
+                    "GitHub token not provided. Set GITHUB_TOKEN environment variable "
+                    "or pass token parameter."
+                )
+            headers["Authorization"] = f"Bearer {self.token}"
+            auth = None
 
         self.base_url = base_url.rstrip("/")
         self.client = httpx.Client(
             base_url=self.base_url,
-            headers={
-                "Authorization": f"Bearer {self.token}",
-                "Accept": "application/vnd.github+json",
-                "X-GitHub-Api-Version": "2022-11-28",
-            },
+            headers=headers,
+            auth=auth,
+            event_hooks=event_hooks(),
             timeout=30.0,
+            transport=transport,
+        )
+        self._inflight = SingleFlight()
+        self._retrier = Retrier(retry_policy, retry_budget)
+        if pr_state_cache is not None:
+            if head_sha_cache not in (None, pr_state_cache.head_sha_cache):
+                raise ValueError("head_sha_cache must be the pr_state_cache's head SHA cache")
+            head_sha_cache = pr_state_cache.head_sha_cache
+        self.head_sha_cache = head_sha_cache
+        self.pr_state_cache = pr_state_cache
+        self.mirror_cache = mirror_cache
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _get(
+        self,
+        path: str,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        """Issue a retried GET, sharing the response with identical concurrent GETs."""
+        key = request_key("GET", path, params)
+        return self._inflight.do(
+            key,
+            lambda: self._retrier.call(
+                lambda: self.client.get(path, params=params, headers=headers), "GET"
+            ),
         )
 
+    def _remember_head(self, repo_slug: str, pr_number: int, head_sha: str) -> None:
+        if self.head_sha_cache is not None:
+            self.head_sha_cache.set(repo_slug, pr_number, head_sha)
+
     def _handle_error(self, response: httpx.Response) -> None:
         """Handle HTTP error responses."""
         try:
@@ -143,7 +214,7 @@ class GitHubAdapter:
             GitHubValidationError: Invalid input (422)
         """
         # First, get the SHA of the base branch
-        response = self.client.get(f"/repos/{repo_slug}/git/ref/heads/{base_branch}")
+        response = self._get(f"/repos/{repo_slug}/git/ref/heads/{base_branch}")
         if response.status_code != 200:
             self._handle_error(response)
 
@@ -168,17 +239,94 @@ class GitHubAdapter:
             "url": data["url"],
         }
 
+    def update_ref(
+        self,
+        repo_slug: str,
+        branch: str,
+        sha: str,
+        expected_sha: str | None = None,
+        force: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Move a branch to a commit SHA.
+
+        With ``expected_sha`` every attempt first reads the ref: if it already
+        points at ``sha`` (an earlier attempt succeeded) the update is done; if
+        it points anywhere other than ``expected_sha`` the update is refused.
+        That makes the update safe to retry on transient failures; without
+        ``expected_sha`` it is sent once.
+
+        Args:
+            repo_slug: Repository in format "owner/repo"
+            branch: Branch name to update
+            sha: Commit SHA the branch should point to
+            expected_sha: SHA the branch must currently point to
+            force: Allow non-fast-forward updates
+
+        Returns:
+            dict with branch information including:
+                - ref: Full reference name
+                - sha: Commit SHA
+                - url: API URL for the reference
+
+        Raises:
+            GitHubAuthError: Authentication failed (401)
+            GitHubForbiddenError: Permission denied (403)
+            GitHubNotFoundError: Repository or branch not found (404)
+            GitHubValidationError: Branch moved past ``expected_sha`` or invalid update (422)
+        """
+        ref_path = f"/repos/{repo_slug}/git/refs/heads/{branch}"
+
+        def patch_ref() -> httpx.Response:
+            return self.client.patch(ref_path, json={"sha": sha, "force": force})
+
+        def compare_and_patch() -> httpx.Response:
+            current = self.client.get(f"/repos/{repo_slug}/git/ref/heads/{branch}")
+            if current.status_code != 200:
+                return current
+            current_sha = current.json()["object"]["sha"]
+            if current_sha == sha:
+                return current
+            if current_sha != expected_sha:
+                raise GitHubValidationError(
+                    f"Validation failed: {branch} is at {current_sha}, expected {expected_sha}. "
+                    "Please re-read the branch before updating it.",
+                    status_code=422,
+                )
+            return patch_ref()
+
+        if expected_sha is None:
+            response = patch_ref()
+        else:
+            response = self._retrier.call(compare_and_patch, "PATCH")
+
+        if response.status_code != 200:
+            self._handle_error(response)
+
+        data = response.json()
+        return {
+            "ref": data["ref"],
+            "sha": data["object"]["sha"],
+            "url": data["url"],
+        }
+
     def create_commit(
-        self, repo_slug: str, branch: str, file_path: str, content: str, message: str
+        self, repo_slug: str, branch: str, file_path: str, content: FileContent, message: str
     ) -> dict[str, Any]:
         """
         Create a commit with file content on a branch.
 
+        Small text files go through the contents API. Binary files, files over
+        ``BLOB_THRESHOLD`` and iterators are streamed to the git blob API in
+        base64-encoded chunks and committed via tree, commit and ref updates, so
+        memory use does not grow with the file size.
+
         Args:
             repo_slug: Repository in format "owner/repo"
             branch: Branch name to commit to
             file_path: Path to the file in the repository
-            content: File content (will be base64 encoded)
+            content: File content as text, bytes, a local file path or an
+                iterable of byte chunks
             message: Commit message
 
         Returns:
@@ -191,24 +339,31 @@ class GitHubAdapter:
             GitHubAuthError: Authentication failed (401)
             GitHubForbiddenError: Permission denied (403)
             GitHubNotFoundError: Repository or branch not found (404)
-            GitHubValidationError: Invalid input (422)
+            GitHubValidationError: Invalid input, or the branch moved during the commit (422)
         """
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        size = content_size(content)
+        if size is not None and size <= BLOB_THRESHOLD:
+            data = content if isinstance(content, bytes) else Path(content).read_bytes()
+            if not is_binary(data[:8000]):
+                return self._put_contents(repo_slug, branch, file_path, data, message)
+        return self._commit_blob(repo_slug, branch, file_path, content, size, message)
+
+    def _put_contents(
+        self, repo_slug: str, branch: str, file_path: str, content: bytes, message: str
+    ) -> dict[str, Any]:
+        """Create or update a file through the contents API."""
         # Get current file SHA if it exists (for updates)
         file_sha = None
-        response = self.client.get(
-            f"/repos/{repo_slug}/contents/{file_path}", params={"ref": branch}
-        )
+        response = self._get(f"/repos/{repo_slug}/contents/{file_path}", params={"ref": branch})
         if response.status_code == 200:
             file_sha = response.json().get("sha")
 
-        # Encode content to base64
-        content_bytes = content.encode("utf-8")
-        encoded_content = base64.b64encode(content_bytes).decode("utf-8")
-
         # Create or update the file
         payload: dict[str, Any] = {
             "message": message,
-            "content": encoded_content,
+            "content": base64.b64encode(content).decode("utf-8"),
             "branch": branch,
         }
         if file_sha:
@@ -230,6 +385,74 @@ class GitHubAdapter:
             "html_url": commit_data["html_url"],
         }
 
+    def _commit_blob(
+        self,
+        repo_slug: str,
+        branch: str,
+        file_path: str,
+        content: FileContent,
+        size: int | None,
+        message: str,
+    ) -> dict[str, Any]:
+        """Commit a file through the git data API with a streamed blob."""
+        response = self._get(f"/repos/{repo_slug}/git/ref/heads/{branch}")
+        if response.status_code != 200:
+            self._handle_error(response)
+        head_sha = response.json()["object"]["sha"]
+
+        response = self._get(f"/repos/{repo_slug}/git/commits/{head_sha}")
+        if response.status_code != 200:
+            self._handle_error(response)
+        base_tree = response.json()["tree"]["sha"]
+
+        blob_sha = self._create_blob(repo_slug, content, size)
+
+        tree_entry = {"path": file_path, "mode": "100644", "type": "blob", "sha": blob_sha}
+        response = self.client.post(
+            f"/repos/{repo_slug}/git/trees",
+            json={"base_tree": base_tree, "tree": [tree_entry]},
+        )
+        if response.status_code != 201:
+            self._handle_error(response)
+        tree_sha = response.json()["sha"]
+
+        response = self.client.post(
+            f"/repos/{repo_slug}/git/commits",
+            json={"message": message, "tree": tree_sha, "parents": [head_sha]},
+        )
+        if response.status_code != 201:
+            self._handle_error(response)
+        commit_data = response.json()
+
+        # Fails instead of discarding commits pushed to the branch in the meantime.
+        self.update_ref(repo_slug, branch, commit_data["sha"], expected_sha=head_sha)
+        return {
+            "sha": commit_data["sha"],
+            "message": commit_data["message"],
+            "html_url": commit_data["html_url"],
+        }
+
+    def _create_blob(self, repo_slug: str, content: FileContent, size: int | None) -> str:
+        """Upload ``content`` as a git blob with a streamed base64 body."""
+        make_chunks, replayable = chunk_source(content)
+        headers = {"Content-Type": "application/json"}
+        if size is not None:
+            # A known length avoids chunked transfer encoding.
+            headers["Content-Length"] = str(blob_request_length(size))
+
+        def post() -> httpx.Response:
+            return self.client.post(
+                f"/repos/{repo_slug}/git/blobs",
+                content=blob_request_body(make_chunks()),
+                headers=headers,
+            )
+
+        # Blobs are content-addressed, so re-uploading is safe when the body can be replayed.
+        response = self._retrier.call(post, "POST") if replayable else post()
+        if response.status_code != 201:
+            self._handle_error(response)
+        return response.json()["sha"]
+
     def create_pr(
         self, repo_slug: str, base: str, head: str, title: str, body: str
     ) -> dict[str, Any]:
@@ -252,26 +475,53 @@ class GitHubAdapter:
                 - html_url: Web URL for the PR
                 - user: PR author info
 
+        Transient failures are retried. Because a retried request may already
+        have created the PR server-side, a 422 is reconciled by looking up an
+        open PR for the same head and base, which is returned if found.
+
         Raises:
             GitHubAuthError: Authentication failed (401)
             GitHubForbiddenError: Permission denied (403)
             GitHubNotFoundError: Repository not found (404)
-            GitHubValidationError: Invalid input or PR already exists (422)
+            GitHubValidationError: Invalid input (422)
         """
-        response = self.client.post(
-            f"/repos/{repo_slug}/pulls",
-            json={
-                "title": title,
-                "body": body,
-                "head": head,
-                "base": base,
-            },
+        response = self._retrier.call(
+            lambda: self.client.post(
+                f"/repos/{repo_slug}/pulls",
+                json={
+                    "title": title,
+                    "body": body,
+                    "head": head,
+                    "base": base,
+                },
+            ),
+            "POST",
         )
 
+        if response.status_code == 422:
+            existing = self._find_open_pr(repo_slug, base, head)
+            if existing is not None:
+                return self._pr_summary(existing)
+
         if response.status_code not in (200, 201):
             self._handle_error(response)
 
-        data = response.json()
+        return self._pr_summary(response.json())
+
+    def _find_open_pr(self, repo_slug: str, base: str, head: str) -> dict[str, Any] | None:
+        """Return the open PR for ``head`` into ``base``, if one exists."""
+        owner = repo_slug.split("/", 1)[0]
+        head_ref = head if ":" in head else f"{owner}:{head}"
+        response = self._get(
+            f"/repos/{repo_slug}/pulls", params={"head": head_ref, "base": base, "state": "open"}
+        )
+        if response.status_code != 200:
+            return None
+        pulls = response.json()
+        return pulls[0] if pulls else None
+
+    @staticmethod
+    def _pr_summary(data: dict[str, Any]) -> dict[str, Any]:
         return {
             "number": data["number"],
             "title": data["title"],
@@ -288,6 +538,10 @@ class GitHubAdapter:
         """
         Get PR status including merge status and review state.
 
+        Served from the PR state cache when one is configured and its entry is
+        fresh; open PRs whose mergeability GitHub has not computed yet are
+        always fetched.
+
         Args:
             repo_slug: Repository in format "owner/repo"
             pr_number: PR number
@@ -305,12 +559,22 @@ class GitHubAdapter:
             GitHubForbiddenError: Permission denied (403)
             GitHubNotFoundError: PR not found (404)
         """
-        response = self.client.get(f"/repos/{repo_slug}/pulls/{pr_number}")
+        if self.pr_state_cache is not None:
+            cached = self.pr_state_cache.get_status(repo_slug, pr_number)
+            if cached is not None:
+                return cached
+
+        response = self._get(f"/repos/{repo_slug}/pulls/{pr_number}")
 
         if response.status_code != 200:
             self._handle_error(response)
 
         data = response.json()
+        head_sha = data.get("head", {}).get("sha")
+        if head_sha:
+            self._remember_head(repo_slug, pr_number, head_sha)
+        if self.pr_state_cache is not None:
+            self.pr_state_cache.store_pull_request(repo_slug, pr_number, data)
         return {
             "state": data["state"],
             "mergeable": data.get("mergeable"),
@@ -323,6 +587,11 @@ class GitHubAdapter:
         """
         Get check runs for a PR (CI status, tests, etc.).
 
+        With a head SHA cache, the PR head SHA is taken from it when fresh, so
+        a ``get_pr_status`` followed by ``get_check_runs`` costs two requests.
+        With a PR state cache, seeded check runs kept current by ``check_run``
+        webhooks are returned without any request.
+
         Args:
             repo_slug: Repository in format "owner/repo"
             pr_number: PR number
@@ -340,15 +609,344 @@ class GitHubAdapter:
             GitHubForbiddenError: Permission denied (403)
             GitHubNotFoundError: PR not found (404)
         """
-        # First get the PR to get the head SHA
-        pr_response = self.client.get(f"/repos/{repo_slug}/pulls/{pr_number}")
-        if pr_response.status_code != 200:
-            self._handle_error(pr_response)
+        state_cache = self.pr_state_cache
+        if state_cache is not None:
+            cached = state_cache.get_check_runs(repo_slug, pr_number)
+            if cached is not None:
+                return [run.model_dump() for run in cached]
+
+        head_sha = None
+        if self.head_sha_cache is not None:
+            head_sha = self.head_sha_cache.get(repo_slug, pr_number)
+        if head_sha is None:
+            pr_response = self._get(f"/repos/{repo_slug}/pulls/{pr_number}")
+            if pr_response.status_code != 200:
+                self._handle_error(pr_response)
+
+            pr_data = pr_response.json()
+            head_sha = pr_data["head"]["sha"]
+            self._remember_head(repo_slug, pr_number, head_sha)
+            if state_cache is not None:
+                state_cache.store_pull_request(repo_slug, pr_number, pr_data)
+
+        check_runs = self._fetch_check_runs(repo_slug, head_sha)
+        if state_cache is not None:
+            state_cache.store_check_runs(repo_slug, pr_number, head_sha, check_runs)
+        return [run.model_dump() for run in check_runs]
+
+    def get_pr_snapshot(self, repo_slug: str, pr_number: int) -> PRSnapshot:
+        """
+        Get PR status, check runs and combined commit status in one call.
+
+        The PR is fetched once; check runs and the combined status for its head
+        SHA are then fetched concurrently.
 
-        head_sha = pr_response.json()["head"]["sha"]
+        Args:
+            repo_slug: Repository in format "owner/repo"
+            pr_number: PR number
 
-        # Get check runs for the head SHA
-        response = self.client.get(
+        Returns:
+            PRSnapshot with merge state, head SHA, check runs and combined status.
+
+        Raises:
+            GitHubAuthError: Authentication failed (401)
+            GitHubForbiddenError: Permission denied (403)
+            GitHubNotFoundError: PR not found (404)
+        """
+        response = self._get(f"/repos/{repo_slug}/pulls/{pr_number}")
+        if response.status_code != 200:
+            self._handle_error(response)
+
+        data = response.json()
+        head_sha = data["head"]["sha"]
+        self._remember_head(repo_slug, pr_number, head_sha)
+
+        executor = self._get_executor()
+        # Run in copies of the caller's context so request traces follow the work.
+        checks_future = executor.submit(
+            contextvars.copy_context().run, self._fetch_check_runs, repo_slug, head_sha
+        )
+        status_future = executor.submit(
+            contextvars.copy_context().run, self._fetch_combined_status, repo_slug, head_sha
+        )
+        check_runs = checks_future.result()
+        combined_state, statuses = status_future.result()
+        if self.pr_state_cache is not None:
+            self.pr_state_cache.store_pull_request(repo_slug, pr_number, data)
+            self.pr_state_cache.store_check_runs(repo_slug, pr_number, head_sha, check_runs)
+
+        return PRSnapshot(
+            repo_slug=repo_slug,
+            pr_number=pr_number,
+            head_sha=head_sha,
+            state=data["state"],
+            mergeable=data.get("mergeable"),
+            merged=data["merged"],
+            mergeable_state=data.get("mergeable_state"),
+            draft=data.get("draft", False),
+            check_runs=check_runs,
+            combined_state=combined_state,
+            statuses=statuses,
+        )
+
+    def get_pr_statuses_batch(
+        self,
+        prs: Iterable[tuple[str, int]],
+        max_prs_per_query: int = 50,
+        max_points_per_query: int = 10,
+        check_suites: int = 10,
+        check_runs: int = 50,
+    ) -> dict[tuple[str, int], dict[str, Any]]:
+        """
+        Get status and check runs for many PRs using batched GraphQL queries.
+
+        PRs are chunked so each aliased query stays within ``max_prs_per_query``,
+        ``max_points_per_query`` (estimated rate-limit points) and GitHub's node
+        limit. The ``rateLimit`` block of every response is checked before the
+        next chunk is sent.
+
+        Args:
+            prs: ``(repo_slug, pr_number)`` pairs; repositories may be mixed.
+            max_prs_per_query: Upper bound on PRs per query.
+            max_points_per_query: Upper bound on estimated points per query.
+            check_suites: Check suites fetched per head commit.
+            check_runs: Check runs fetched per check suite.
+
+        Returns:
+            dict keyed by ``(repo_slug, pr_number)`` with:
+                - head_sha: PR head commit SHA
+                - status: dict shaped like ``get_pr_status``
+                - check_runs: list shaped like ``get_check_runs``
+            PRs that do not exist are omitted. PRs whose status and check runs
+            are fresh in the PR state cache are answered without a query.
+
+        Raises:
+            GitHubAuthError: Authentication failed (401)
+            GitHubForbiddenError: Permission denied (403)
+            GitHubRateLimitError: Remaining GraphQL points cannot cover the next chunk
+            GitHubError: GraphQL query rejected
+        """
+        unique_prs = list(dict.fromkeys((repo, int(number)) for repo, number in prs))
+        results: dict[tuple[str, int], dict[str, Any]] = {}
+        if self.pr_state_cache is not None:
+            unique_prs = [
+                key for key in unique_prs if not self._batch_entry_from_cache(key, results)
+            ]
+        chunk_size = github_graphql.max_prs_per_query(
+            max_prs_per_query, max_points_per_query, check_suites, check_runs
+        )
+
+        remaining: int | None = None
+        for chunk in github_graphql.chunked(unique_prs, chunk_size):
+            cost = github_graphql.estimate_query_cost(len(chunk), check_suites)
+            if remaining is not None and remaining < cost:
+                raise GitHubRateLimitError(
+                    f"GraphQL rate limit budget exhausted: {remaining} points remaining, "
+                    f"next query needs {cost}.",
+                    status_code=403,
+                )
+
+            query, aliases = github_graphql.build_batch_query(chunk, check_suites, check_runs)
+            data = self._graphql(query)
+            remaining = data.get("rateLimit", {}).get("remaining", remaining)
+
+            for key, value in github_graphql.map_batch_response(data, aliases).items():
+                self._remember_head(key[0], key[1], value["head_sha"])
+                if self.pr_state_cache is not None:
+                    # Check runs may be truncated by the query limits; seed only the status.
+                    pull_request = {**value["status"], "head": {"sha": value["head_sha"]}}
+                    self.pr_state_cache.store_pull_request(key[0], key[1], pull_request)
+                results[key] = value
+
+        return results
+
+    def list_tree(self, repo_slug: str, ref: str) -> list[TreeEntry]:
+        """
+        List the files in the tree of a commit, branch or tag.
+
+        Served from the local mirror when one is configured for the repository.
+
+        Args:
+            repo_slug: Repository in format "owner/repo"
+            ref: Commit SHA, branch or tag
+
+        Returns:
+            Files (blobs) in the tree, recursively
+
+        Raises:
+            GitHubNotFoundError: Repository or ref not found (404)
+        """
+        if self.mirror_cache is not None:
+            entries = self.mirror_cache.list_tree(repo_slug, ref)
+            if entries is not None:
+                return entries
+
+        response = self._get(f"/repos/{repo_slug}/git/trees/{ref}", params={"recursive": "1"})
+        if response.status_code != 200:
+            self._handle_error(response)
+        return [
+            TreeEntry(path=item["path"], mode=item["mode"], sha=item["sha"], size=item["size"])
+            for item in response.json()["tree"]
+            if item["type"] == "blob"
+        ]
+
+    def get_file(self, repo_slug: str, path: str, ref: str) -> bytes:
+        """
+        Read a file at a commit, branch or tag.
+
+        Served from the local mirror when one is configured for the repository.
+
+        Args:
+            repo_slug: Repository in format "owner/repo"
+            path: File path within the repository
+            ref: Commit SHA, branch or tag
+
+        Returns:
+            Raw file content
+
+        Raises:
+            GitHubNotFoundError: Repository, ref or file not found (404)
+        """
+        if self.mirror_cache is not None:
+            files = self.mirror_cache.read_files(repo_slug, [path], ref)
+            if files is not None:
+                if path not in files:
+                    raise GitHubNotFoundError(
+                        f"Not found: {path} does not exist at {ref} in {repo_slug}.",
+                        status_code=404,
+                    )
+                return files[path]
+
+        response = self._get(f"/repos/{repo_slug}/contents/{path}", params={"ref": ref})
+        if response.status_code != 200:
+            self._handle_error(response)
+        data = response.json()
+        if not isinstance(data, dict) or data.get("type") != "file":
+            raise GitHubNotFoundError(
+                f"Not found: {path} is not a file at {ref} in {repo_slug}.", status_code=404
+            )
+        if data.get("encoding") == "base64":
+            return base64.b64decode(data["content"])
+
+        # Files over 1 MB come back without content; read them through the blob API.
+        response = self._get(f"/repos/{repo_slug}/git/blobs/{data['sha']}")
+        if response.status_code != 200:
+            self._handle_error(response)
+        return base64.b64decode(response.json()["content"])
+
+    def get_files(self, repo_slug: str, paths: Iterable[str], ref: str) -> dict[str, bytes]:
+        """
+        Read several files at a commit, branch or tag.
+
+        With a local mirror all files are read by one git process; otherwise
+        each file costs a contents API request.
+
+        Args:
+            repo_slug: Repository in format "owner/repo"
+            paths: File paths within the repository
+            ref: Commit SHA, branch or tag
+
+        Returns:
+            dict of path to raw content; paths that do not exist are omitted
+        """
+        paths = list(paths)
+        if self.mirror_cache is not None:
+            files = self.mirror_cache.read_files(repo_slug, paths, ref)
+            if files is not None:
+                return files
+
+        files = {}
+        for path in paths:
+            try:
+                files[path] = self.get_file(repo_slug, path, ref)
+            except GitHubNotFoundError:
+                continue
+        return files
+
+    def compare_commits(self, repo_slug: str, base: str, head: str) -> list[FileChange]:
+        """
+        List files changed between two commits, as GitHub's compare API does.
+
+        Changes are taken from the merge base of ``base`` and ``head`` to
+        ``head``. Served from the local mirror when one is configured.
+
+        Args:
+            repo_slug: Repository in format "owner/repo"
+            base: Base commit SHA, branch or tag
+            head: Head commit SHA, branch or tag
+
+        Returns:
+            Changed files with their status (added, removed, modified, renamed)
+
+        Raises:
+            GitHubNotFoundError: Repository or either ref not found (404)
+        """
+        if self.mirror_cache is not None:
+            changes = self.mirror_cache.compare(repo_slug, base, head)
+            if changes is not None:
+                return changes
+
+        response = self._get(f"/repos/{repo_slug}/compare/{base}...{head}")
+        if response.status_code != 200:
+            self._handle_error(response)
+        return [
+            FileChange(
+                path=item["filename"],
+                status=item["status"],
+                previous_path=item.get("previous_filename"),
+            )
+            for item in response.json().get("files", [])
+        ]
+
+    def _batch_entry_from_cache(
+        self, key: tuple[str, int], results: dict[tuple[str, int], dict[str, Any]]
+    ) -> bool:
+        """Fill ``results[key]`` from the PR state cache; return False on a miss."""
+        cache = self.pr_state_cache
+        status = cache.get_status(*key)
+        check_runs = cache.get_check_runs(*key) if status is not None else None
+        head_sha = cache.get_head_sha(*key)
+        if status is None or check_runs is None or head_sha is None:
+            return False
+        results[key] = {
+            "head_sha": head_sha,
+            "status": status,
+            "check_runs": [run.model_dump() for run in check_runs],
+        }
+        return True
+
+    def _graphql(self, query: str) -> dict[str, Any]:
+        """Execute a GraphQL query and return its ``data`` object."""
+        response = self.client.post(self._graphql_url(), json={"query": query})
+        if response.status_code != 200:
+            self._handle_error(response)
+
+        body = response.json()
+        errors = body.get("errors") or []
+        if any(error.get("type") == "RATE_LIMITED" for error in errors):
+            raise GitHubRateLimitError(
+                f"GraphQL rate limited: {errors[0].get('message', 'rate limit exceeded')}",
+                status_code=403,
+                response=body,
+            )
+        data = body.get("data")
+        if data is None:
+            message = "; ".join(error.get("message", str(error)) for error in errors)
+            raise GitHubError(
+                f"GraphQL query failed: {message or 'no data returned'}", response=body
+            )
+        # Missing PRs surface as NOT_FOUND errors alongside partial data.
+        return data
+
+    def _graphql_url(self) -> str:
+        # GitHub Enterprise serves GraphQL at /api/graphql next to the /api/v3 REST root.
+        if self.base_url.endswith("/api/v3"):
+            return self.base_url[: -len("/v3")] + "/graphql"
+        return "/graphql"
+
+    def _fetch_check_runs(self, repo_slug: str, head_sha: str) -> list[CheckRunSummary]:
+        """Fetch check runs for a commit SHA."""
+        response = self._get(
             f"/repos/{repo_slug}/commits/{head_sha}/check-runs",
             headers={"Accept": "application/vnd.github+json"},
         )
@@ -357,21 +955,46 @@ class GitHubAdapter:
             self._handle_error(response)
 
         data = response.json()
-        check_runs = []
-        for run in data.get("check_runs", []):
-            check_runs.append(
-                {
-                    "id": run["id"],
-                    "name": run["name"],
-                    "status": run["status"],
-                    "conclusion": run.get("conclusion"),
-                    "html_url": run["html_url"],
-                }
+        return [
+            CheckRunSummary(
+                id=run["id"],
+                name=run["name"],
+                status=run["status"],
+                conclusion=run.get("conclusion"),
+                html_url=run["html_url"],
+            )
+            for run in data.get("check_runs", [])
+        ]
+
+    def _fetch_combined_status(
+        self, repo_slug: str, head_sha: str
+    ) -> tuple[str | None, list[CommitStatusSummary]]:
+        """Fetch the combined commit status for a commit SHA."""
+        response = self._get(f"/repos/{repo_slug}/commits/{head_sha}/status")
+
+        if response.status_code != 200:
+            self._handle_error(response)
+
+        data = response.json()
+        statuses = [
+            CommitStatusSummary(
+                context=status["context"],
+                state=status["state"],
+                target_url=status.get("target_url"),
+                description=status.get("description"),
             )
+            for status in data.get("statuses", [])
+        ]
+        return data.get("state"), statuses
 
-        return check_runs
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="github-adapter")
+        return self._executor
 
     def __del__(self):
         """Clean up HTTP client on deletion."""
+        if getattr(self, "_executor", None) is not None:
+            self._executor.shutdown(wait=False)
         if hasattr(self, "client"):
             self.client.close()
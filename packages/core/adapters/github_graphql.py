@@ -0,0 +1,143 @@
+"""Aliased GraphQL queries for batch PR status lookups.
+
+Builds one query per chunk of PRs, estimates its point cost using GitHub's
+published formula, and maps the response onto the dict shapes returned by
+``GitHubAdapter.get_pr_status`` and ``GitHubAdapter.get_check_runs``.
+"""
+
+import json
+import math
+import re
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+# GitHub refuses queries that could return more than this many nodes.
+MAX_NODES_PER_QUERY = 500_000
+
+_NAME_RE = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+_MERGEABLE = {"MERGEABLE": True, "CONFLICTING": False}
+
+PRKey = tuple[str, int]
+
+
+def split_repo_slug(repo_slug: str) -> tuple[str, str]:
+    """Split and validate an ``owner/repo`` slug."""
+    owner, _, name = repo_slug.partition("/")
+    if not owner or not name or not _NAME_RE.match(owner) or not _NAME_RE.match(name):
+        raise ValueError(f"Invalid repository slug: {repo_slug!r}")
+    return owner, name
+
+
+def estimate_query_cost(pr_count: int, check_suites: int) -> int:
+    """Estimate the rate-limit points charged for a batch query.
+
+    GitHub sums the requests needed to fulfil every connection (one for
+    ``commits``, one for ``checkSuites`` and one ``checkRuns`` per suite, per
+    PR), divides by 100 and rounds up, with a minimum of one point.
+    """
+    requests = pr_count * (2 + check_suites)
+    return max(1, math.ceil(requests / 100))
+
+
+def max_prs_per_query(max_prs: int, max_points: int, check_suites: int, check_runs: int) -> int:
+    """Largest chunk size that respects the PR, point and node limits."""
+    by_points = (max_points * 100) // (2 + check_suites)
+    by_nodes = MAX_NODES_PER_QUERY // max(1, check_suites * check_runs)
+    return max(1, min(max_prs, by_points, by_nodes))
+
+
+def build_batch_query(
+    prs: Sequence[PRKey], check_suites: int, check_runs: int
+) -> tuple[str, dict[str, str]]:
+    """Build an aliased query fetching status and check rollups for ``prs``.
+
+    Returns:
+        The query text and a mapping of repository alias to requested slug.
+    """
+    by_repo: dict[str, list[int]] = {}
+    for repo_slug, pr_number in prs:
+        by_repo.setdefault(repo_slug, []).append(int(pr_number))
+
+    aliases: dict[str, str] = {}
+    repo_blocks = []
+    for repo_index, (repo_slug, numbers) in enumerate(by_repo.items()):
+        owner, name = split_repo_slug(repo_slug)
+        alias = f"r{repo_index}"
+        aliases[alias] = repo_slug
+        pulls = " ".join(f"pr{n}: pullRequest(number: {n}) {{ ...PRStatus }}" for n in numbers)
+        repo_blocks.append(
+            f"{alias}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) "
+            f"{{ {pulls} }}"
+        )
+
+    query = (
+        "query { rateLimit { cost remaining resetAt } "
+        + " ".join(repo_blocks)
+        + " } fragment PRStatus on PullRequest { number state merged mergeable "
+        "mergeStateStatus isDraft headRefOid commits(last: 1) { nodes { commit { "
+        f"checkSuites(first: {check_suites}) {{ nodes {{ checkRuns(first: {check_runs}) {{ "
+        "nodes { databaseId name status conclusion url } } } } } } } }"
+    )
+    return query, aliases
+
+
+def map_pull_request(node: dict[str, Any]) -> dict[str, Any]:
+    """Map a ``PRStatus`` fragment onto the REST adapter dict shapes."""
+    merge_state = node.get("mergeStateStatus")
+    check_runs = []
+    for commit_node in node.get("commits", {}).get("nodes", []):
+        suites = commit_node.get("commit", {}).get("checkSuites", {}).get("nodes", [])
+        for suite in suites:
+            for run in suite.get("checkRuns", {}).get("nodes", []):
+                conclusion = run.get("conclusion")
+                check_runs.append(
+                    {
+                        "id": run["databaseId"],
+                        "name": run["name"],
+                        "status": run["status"].lower(),
+                        "conclusion": conclusion.lower() if conclusion else None,
+                        "html_url": run.get("url"),
+                    }
+                )
+
+    return {
+        "head_sha": node["headRefOid"],
+        "status": {
+            "state": "open" if node["state"] == "OPEN" else "closed",
+            "mergeable": _MERGEABLE.get(node.get("mergeable")),
+            "merged": node["merged"],
+            "mergeable_state": merge_state.lower() if merge_state else None,
+            "draft": node.get("isDraft", False),
+        },
+        "check_runs": check_runs,
+    }
+
+
+def map_batch_response(
+    data: dict[str, Any], aliases: dict[str, str]
+) -> dict[PRKey, dict[str, Any]]:
+    """Map aliased repository/pullRequest data back to ``(repo, number)`` keys.
+
+    PRs or repositories that could not be resolved (null nodes) are omitted.
+    """
+    results: dict[PRKey, dict[str, Any]] = {}
+    for alias, repo_slug in aliases.items():
+        repo = data.get(alias)
+        if not repo:
+            continue
+        for node in repo.values():
+            if node:
+                results[(repo_slug, node["number"])] = map_pull_request(node)
+    return results
+
+
+def chunked(items: Iterable[PRKey], size: int) -> Iterable[list[PRKey]]:
+    chunk: list[PRKey] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
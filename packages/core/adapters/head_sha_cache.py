@@ -0,0 +1,63 @@
+"""Short-lived cache of PR head SHAs shared by adapter reads."""
+
+import threading
+import time
+from collections.abc import Callable
+
+from packages.core.schemas.webhooks import WebhookEvent
+
+# pull_request actions after which a cached head SHA can no longer be trusted.
+INVALIDATING_ACTIONS = frozenset({"synchronize", "reopened", "closed", "edited"})
+
+
+class HeadShaCache:
+    """TTL cache mapping ``(repo_slug, pr_number)`` to the PR head SHA.
+
+    Also acts as a webhook subscriber: ``pull_request.synchronize`` (and other
+    actions that move the head) drop the cached entry.
+    """
+
+    def __init__(self, ttl: float = 30.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: dict[tuple[str, int], tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, repo_slug: str, pr_number: int) -> str | None:
+        """Return the cached head SHA, or None when missing or expired."""
+        key = (repo_slug, pr_number)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        sha, expires_at = entry
+        if self._clock() >= expires_at:
+            with self._lock:
+                if self._entries.get(key) == entry:
+                    del self._entries[key]
+            return None
+        return sha
+
+    def set(self, repo_slug: str, pr_number: int, head_sha: str) -> None:
+        with self._lock:
+            self._entries[(repo_slug, pr_number)] = (head_sha, self._clock() + self.ttl)
+
+    def invalidate(self, repo_slug: str, pr_number: int) -> None:
+        with self._lock:
+            self._entries.pop((repo_slug, pr_number), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def handle(self, event: WebhookEvent) -> None:
+        """Invalidate entries for PRs whose head may have moved."""
+        if event.event_type != "pull_request":
+            return
+        if event.payload.get("action") not in INVALIDATING_ACTIONS:
+            return
+        repo_slug = event.payload.get("repository", {}).get("full_name")
+        pr_number = event.payload.get("number") or event.payload.get("pull_request", {}).get(
+            "number"
+        )
+        if repo_slug and pr_number:
+            self.invalidate(repo_slug, int(pr_number))
@@ -0,0 +1,241 @@
+"""Per-endpoint instrumentation for the GitHub adapter's HTTP client.
+
+``request_hook`` and ``response_hook`` are installed as httpx event hooks.
+Every request is recorded against its endpoint template (for example
+``/repos/{owner}/{repo}/pulls/{number}``) so metrics have bounded
+cardinality:
+
+- ``github_request_duration_seconds``: time to response headers
+- ``github_responses_total``: responses by status code
+- ``github_request_bytes_total``: bytes sent and received
+- ``github_rate_limit_remaining``: remaining budget after each response
+- ``github_endpoint_retries_total``: attempts after the first, via the retrier
+
+``trace_requests(run_id)`` additionally attributes calls made in the current
+context (including adapter worker threads) to a run.
+"""
+
+import contextvars
+import re
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import httpx
+
+from packages.core.metrics import BoundMetric, registry
+
+request_duration = registry.histogram(
+    "github_request_duration_seconds", "GitHub API latency to response headers, by endpoint"
+)
+responses_total = registry.counter(
+    "github_responses_total", "GitHub API responses, by method, endpoint and status"
+)
+request_bytes = registry.counter(
+    "github_request_bytes_total", "Bytes exchanged with the GitHub API, by endpoint and direction"
+)
+rate_limit_remaining = registry.gauge(
+    "github_rate_limit_remaining", "Remaining GitHub rate limit after the last response"
+)
+endpoint_retries = registry.counter(
+    "github_endpoint_retries_total", "Retried GitHub requests, by method and endpoint"
+)
+
+# 1-based attempt number of the request being sent; set by the retrier.
+current_attempt: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "github_request_attempt", default=1
+)
+
+_START = "flowbiz.started"
+
+_REPO = r"^/repos/[^/]+/[^/]+"
+_TEMPLATES = [
+    (re.compile(pattern), template)
+    for pattern, template in [
+        (_REPO + r"/git/(ref|refs)/heads/.+$", "/repos/{owner}/{repo}/git/\\1/heads/{branch}"),
+        (_REPO + r"/git/(blobs|commits|trees)/[^/]+$", "/repos/{owner}/{repo}/git/\\1/{sha}"),
+        (_REPO + r"/commits/[^/]+(/.*)?$", "/repos/{owner}/{repo}/commits/{ref}\\1"),
+        (_REPO + r"/contents/.+$", "/repos/{owner}/{repo}/contents/{path}"),
+        (_REPO + r"(/.*)?$", "/repos/{owner}/{repo}\\1"),
+        (r"^/app/installations/\d+(/.*)?$", "/app/installations/{installation_id}\\1"),
+    ]
+]
+_NUMBER_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+@lru_cache(maxsize=1024)
+def endpoint_template(path: str) -> str:
+    """Collapse owners, numbers, SHAs, branches and file paths in an API path."""
+    for pattern, template in _TEMPLATES:
+        match = pattern.match(path)
+        if match:
+            path = match.expand(template)
+            break
+    return _NUMBER_SEGMENT.sub("/{number}", path)
+
+
+@dataclass
+class RequestTrace:
+    """GitHub API usage attributed to one run."""
+
+    run_id: str
+    calls: int = 0
+    retries: int = 0
+    seconds: float = 0.0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    by_endpoint: dict[str, int] = field(default_factory=dict)
+    rate_limit_remaining: int | None = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+
+_current_trace: contextvars.ContextVar[RequestTrace | None] = contextvars.ContextVar(
+    "github_request_trace", default=None
+)
+
+
+@contextmanager
+def trace_requests(run_id: str) -> Iterator[RequestTrace]:
+    """Attribute GitHub calls made in this context to ``run_id``."""
+    trace = RequestTrace(run_id=run_id)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def current_trace() -> RequestTrace | None:
+    return _current_trace.get()
+
+
+class _EndpointSeries:
+    """Pre-bound metric series for one (method, endpoint) pair."""
+
+    __slots__ = ("endpoint", "duration", "sent", "received", "retries", "statuses")
+
+    def __init__(self, method: str, endpoint: str) -> None:
+        self.endpoint = endpoint
+        self.duration = request_duration.labels(method=method, endpoint=endpoint)
+        self.sent = request_bytes.labels(endpoint=endpoint, direction="sent")
+        self.received = request_bytes.labels(endpoint=endpoint, direction="received")
+        self.retries = endpoint_retries.labels(method=method, endpoint=endpoint)
+        self.statuses: dict[int, BoundMetric] = {}
+
+    def status(self, method: str, status_code: int) -> BoundMetric:
+        bound = self.statuses.get(status_code)
+        if bound is None:
+            bound = responses_total.labels(
+                method=method, endpoint=self.endpoint, status=status_code
+            )
+            self.statuses[status_code] = bound
+        return bound
+
+
+class _CountingStream(httpx.SyncByteStream):
+    """Response body without a Content-Length, counted as received once read."""
+
+    def __init__(
+        self, stream: httpx.SyncByteStream, received: BoundMetric, trace: RequestTrace | None
+    ) -> None:
+        self._stream = stream
+        self._received = received
+        self._trace = trace
+
+    def __iter__(self) -> Iterator[bytes]:
+        size = 0
+        try:
+            for chunk in self._stream:
+                size += len(chunk)
+                yield chunk
+        finally:
+            if size:
+                self._received.inc(size)
+                trace = self._trace
+                if trace is not None:
+                    with trace._lock:
+                        trace.bytes_received += size
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+# Keyed by (method, raw path); bounded like the endpoint_template cache.
+_series: dict[tuple[str, str], _EndpointSeries] = {}
+_rate_limit_gauges: dict[str, BoundMetric] = {}
+
+
+def _series_for(method: str, path: str) -> _EndpointSeries:
+    series = _series.get((method, path))
+    if series is None:
+        if len(_series) >= 4096:
+            _series.clear()
+        series = _EndpointSeries(method, endpoint_template(path))
+        _series[(method, path)] = series
+    return series
+
+
+def request_hook(request: httpx.Request) -> None:
+    request.extensions[_START] = time.perf_counter()
+
+
+def response_hook(response: httpx.Response) -> None:
+    request = response.request
+    elapsed = time.perf_counter() - request.extensions.get(_START, time.perf_counter())
+    method = request.method
+    series = _series_for(method, request.url.path)
+
+    received = remaining = None
+    resource = "core"
+    # One pass over the raw headers; Headers.get rescans the list on every call.
+    for name, value in response.headers.raw:
+        name = name.lower()
+        if name == b"content-length":
+            received = int(value)
+        elif name == b"x-ratelimit-remaining":
+            remaining = int(value)
+        elif name == b"x-ratelimit-resource":
+            resource = value.decode("ascii")
+    trace = _current_trace.get()
+    if received is None:
+        # The body is read after this hook; count it as it is read.
+        response.stream = _CountingStream(response.stream, series.received, trace)
+        received = 0
+    sent = 0
+    if method not in ("GET", "HEAD"):
+        length = request.headers.get("content-length")
+        sent = int(length) if length is not None else 0
+    retry = current_attempt.get() > 1
+
+    series.duration.observe(elapsed)
+    series.status(method, response.status_code).inc()
+    if sent:
+        series.sent.inc(sent)
+    if received:
+        series.received.inc(received)
+    if retry:
+        series.retries.inc()
+    if remaining is not None:
+        gauge = _rate_limit_gauges.get(resource)
+        if gauge is None:
+            gauge = _rate_limit_gauges[resource] = rate_limit_remaining.labels(resource=resource)
+        gauge.set(remaining)
+
+    if trace is not None:
+        with trace._lock:
+            trace.calls += 1
+            trace.retries += retry
+            trace.seconds += elapsed
+            trace.bytes_sent += sent
+            trace.bytes_received += received
+            trace.by_endpoint[series.endpoint] = trace.by_endpoint.get(series.endpoint, 0) + 1
+            if remaining is not None:
+                trace.rate_limit_remaining = remaining
+
+
+def event_hooks() -> dict[str, list]:
+    """Event hooks for an ``httpx.Client``."""
+    return {"request": [request_hook], "response": [response_hook]}
@@ -0,0 +1,349 @@
+"""Local bare git mirrors serving tree listings, file reads and diffs from disk.
+
+Readiness and policy checks read many files across many repositories; through
+the contents API each file costs a request and rate-limit budget. A
+``MirrorCache`` keeps a ``git clone --mirror`` per registered repository under
+``root`` and answers reads with local git commands instead.
+
+Mirrors are refreshed with an incremental ``git fetch`` when a ``push``
+webhook arrives. Reads by commit SHA are exact: a SHA missing from the mirror
+triggers one fetch. Reads by branch name first wait for any fetch owed to a
+push that has been received. Every read returns None when the mirror cannot
+answer, so callers fall back to the API.
+"""
+
+import base64
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from packages.core.adapters.auth import TokenProvider
+from packages.core.adapters.singleflight import SingleFlight
+from packages.core.logging import get_logger
+from packages.core.metrics import registry
+from packages.core.schemas.github import FileChange, TreeEntry
+from packages.core.schemas.webhooks import WebhookEvent
+
+mirror_reads = registry.counter(
+    "github_mirror_reads_total", "Mirror content reads, by operation and result (hit or miss)"
+)
+mirror_syncs = registry.counter(
+    "github_mirror_syncs_total", "Mirror clones and fetches, by kind and outcome"
+)
+mirror_sync_duration = registry.histogram(
+    "github_mirror_sync_seconds", "Duration of mirror clones and fetches, by kind"
+)
+
+_SHA = re.compile(r"[0-9a-f]{40}")
+
+# ``git diff --name-status`` letters -> GitHub compare API file statuses.
+_DIFF_STATUS = {
+    "A": "added",
+    "D": "removed",
+    "M": "modified",
+    "T": "changed",
+    "R": "renamed",
+    "C": "copied",
+}
+
+
+class MirrorError(Exception):
+    """A mirror could not be created or git is unavailable."""
+
+
+class MirrorCache:
+    """Bare git mirrors of GitHub repositories, kept current by push webhooks.
+
+    Register the instance as a webhook subscriber and pass it to
+    ``GitHubAdapter(mirror_cache=...)``. Repositories are mirrored explicitly
+    with ``add``; reads for any other repository return None.
+    """
+
+    def __init__(
+        self,
+        root: str | os.PathLike[str],
+        remote_url: Callable[[str], str] | None = None,
+        token_provider: TokenProvider | None = None,
+        fetch_workers: int = 2,
+        git: str = "git",
+    ) -> None:
+        """
+        Initialize the mirror cache.
+
+        Args:
+            root: Directory holding the mirrors, as ``<root>/<owner>/<repo>.git``.
+            remote_url: Maps a repo slug to its clone URL. Default:
+                ``https://github.com/<slug>.git``.
+            token_provider: Token sent as HTTP basic auth on clones and fetches.
+                It is passed through the environment, never stored in the mirror.
+            fetch_workers: Threads running webhook-triggered fetches.
+            git: The git executable.
+        """
+        git_path = shutil.which(git)
+        if git_path is None:
+            raise MirrorError(f"git executable {git!r} not found; mirrors need the git CLI")
+        self.root = Path(root)
+        self._git_path = git_path
+        self._remote_url = remote_url or (lambda slug: f"https://github.com/{slug}.git")
+        self._token_provider = token_provider
+        self._syncs = SingleFlight("mirror")
+        self._executor = ThreadPoolExecutor(
+            max_workers=fetch_workers, thread_name_prefix="mirror-fetch"
+        )
+        self._lock = threading.Lock()
+        # repo_slug -> pushes received, and pushes covered by a completed fetch.
+        self._pushes: dict[str, int] = {}
+        self._fetched: dict[str, int] = {}
+        self._logger = get_logger("github_mirror")
+
+    def path(self, repo_slug: str) -> Path:
+        return self.root / f"{repo_slug}.git"
+
+    def has(self, repo_slug: str) -> bool:
+        return (self.path(repo_slug) / "HEAD").is_file()
+
+    def add(self, repo_slug: str) -> None:
+        """Mirror ``repo_slug`` if it is not mirrored yet.
+
+        Raises:
+            MirrorError: The clone failed.
+        """
+        if not self.has(repo_slug):
+            self._syncs.do(("clone", repo_slug), lambda: self._clone(repo_slug))
+
+    def fetch(self, repo_slug: str) -> None:
+        """Fetch new objects and refs into an existing mirror.
+
+        Raises:
+            MirrorError: The fetch failed.
+        """
+        self._syncs.do(("fetch", repo_slug), lambda: self._fetch(repo_slug))
+
+    def handle(self, event: WebhookEvent) -> None:
+        """Schedule a background fetch for ``push`` events on mirrored repositories."""
+        if event.event_type != "push":
+            return
+        repo_slug = event.payload.get("repository", {}).get("full_name")
+        if not repo_slug or not self.has(repo_slug):
+            return
+        with self._lock:
+            self._pushes[repo_slug] = self._pushes.get(repo_slug, 0) + 1
+        self._executor.submit(self._catch_up, repo_slug)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def list_tree(self, repo_slug: str, ref: str) -> list[TreeEntry] | None:
+        """Files in the tree of ``ref``, or None if the mirror cannot answer."""
+        sha = self._resolve(repo_slug, ref)
+        result = None
+        if sha is not None:
+            output = self._git(repo_slug, "ls-tree", "-r", "-l", "-z", sha)
+            if output is not None:
+                result = []
+                for record in output.split(b"\0"):
+                    if not record:
+                        continue
+                    meta, path = record.split(b"\t", 1)
+                    mode, kind, blob_sha, size = meta.split()
+                    if kind == b"blob":
+                        result.append(
+                            TreeEntry(
+                                path=path.decode("utf-8", "surrogateescape"),
+                                mode=mode.decode(),
+                                sha=blob_sha.decode(),
+                                size=int(size),
+                            )
+                        )
+        mirror_reads.inc(operation="list_tree", result="miss" if result is None else "hit")
+        return result
+
+    def read_files(self, repo_slug: str, paths: Iterable[str], ref: str) -> dict[str, bytes] | None:
+        """Contents of ``paths`` at ``ref``, or None if the mirror cannot answer.
+
+        Paths that do not exist at ``ref`` (or are directories) are left out.
+        All paths are read by a single ``git cat-file --batch`` process.
+        """
+        sha = self._resolve(repo_slug, ref)
+        result = None
+        if sha is not None:
+            paths = [path for path in paths if "\n" not in path]
+            request = b"".join(f"{sha}:{path}\n".encode() for path in paths)
+            output = self._git(repo_slug, "cat-file", f"--batch={_BATCH_FORMAT}", stdin=request)
+            if output is not None:
+                result = _parse_batch(output, paths)
+        mirror_reads.inc(operation="read_files", result="miss" if result is None else "hit")
+        return result
+
+    def compare(self, repo_slug: str, base: str, head: str) -> list[FileChange] | None:
+        """Files changed from the merge base of ``base`` and ``head`` to ``head``."""
+        base_sha = self._resolve(repo_slug, base)
+        head_sha = self._resolve(repo_slug, head) if base_sha is not None else None
+        result = None
+        if head_sha is not None:
+            output = self._git(
+                repo_slug, "diff", "--name-status", "-z", "-M", f"{base_sha}...{head_sha}"
+            )
+            if output is not None:
+                result = _parse_name_status(output)
+        mirror_reads.inc(operation="compare", result="miss" if result is None else "hit")
+        return result
+
+    def _resolve(self, repo_slug: str, ref: str) -> str | None:
+        """Commit SHA for ``ref`` if the mirror has it, fetching once if needed."""
+        if not self.has(repo_slug) or ref.startswith("-"):
+            return None
+        if _SHA.fullmatch(ref):
+            if self._has_commit(repo_slug, ref):
+                return ref
+            # Pushed but not fetched yet, e.g. the webhook is still in flight.
+            self._fetch_quietly(repo_slug)
+            return ref if self._has_commit(repo_slug, ref) else None
+        if not self._catch_up(repo_slug):
+            return None
+        output = self._git(repo_slug, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}")
+        return output.decode().strip() if output else None
+
+    def _has_commit(self, repo_slug: str, sha: str) -> bool:
+        return self._git(repo_slug, "cat-file", "-e", f"{sha}^{{commit}}") is not None
+
+    def _stale(self, repo_slug: str) -> bool:
+        with self._lock:
+            return self._fetched.get(repo_slug, 0) < self._pushes.get(repo_slug, 0)
+
+    def _catch_up(self, repo_slug: str) -> bool:
+        """Fetch until every received push is covered; False if the mirror is still behind."""
+        # A fetch joined mid-flight may predate the latest push, hence the retry.
+        for _ in range(3):
+            if not self._stale(repo_slug):
+                return True
+            if not self._fetch_quietly(repo_slug):
+                return False
+        return not self._stale(repo_slug)
+
+    def _fetch_quietly(self, repo_slug: str) -> bool:
+        try:
+            self.fetch(repo_slug)
+        except MirrorError as exc:
+            self._logger.warning("repo=%s mirror fetch failed: %s", repo_slug, exc)
+            return False
+        return True
+
+    def _clone(self, repo_slug: str) -> None:
+        target = self.path(repo_slug)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Clone beside the target and rename, so a half-written mirror is never read.
+        staging = target.with_name(f".{target.name}.{uuid.uuid4().hex}")
+        try:
+            self._sync(
+                "clone",
+                "clone",
+                "--mirror",
+                "--quiet",
+                self._remote_url(repo_slug),
+                str(staging),
+            )
+            os.replace(staging, target)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _fetch(self, repo_slug: str) -> None:
+        with self._lock:
+            pushes = self._pushes.get(repo_slug, 0)
+        self._sync("fetch", f"--git-dir={self.path(repo_slug)}", "fetch", "--prune", "--quiet")
+        with self._lock:
+            self._fetched[repo_slug] = max(self._fetched.get(repo_slug, 0), pushes)
+
+    def _sync(self, kind: str, *args: str) -> None:
+        started = time.perf_counter()
+        try:
+            completed = subprocess.run(
+                [self._git_path, *args], capture_output=True, env=self._sync_env()
+            )
+        except OSError as exc:
+            mirror_syncs.inc(kind=kind, outcome="error")
+            raise MirrorError(f"git {kind} failed: {exc}") from exc
+        mirror_sync_duration.observe(time.perf_counter() - started, kind=kind)
+        if completed.returncode != 0:
+            mirror_syncs.inc(kind=kind, outcome="error")
+            stderr = completed.stderr.decode(errors="replace").strip()
+            raise MirrorError(f"git {kind} failed: {stderr}")
+        mirror_syncs.inc(kind=kind, outcome="success")
+
+    def _sync_env(self) -> dict[str, str]:
+        env = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+        if self._token_provider is not None:
+            credentials = f"x-access-token:{self._token_provider.get_token()}"
+            # Config from the environment keeps the token out of argv and the mirror config.
+            env.update(
+                {
+                    "GIT_CONFIG_COUNT": "1",
+                    "GIT_CONFIG_KEY_0": "http.extraHeader",
+                    "GIT_CONFIG_VALUE_0": "Authorization: Basic "
+                    + base64.b64encode(credentials.encode()).decode(),
+                }
+            )
+        return env
+
+    def _git(self, repo_slug: str, *args: str, stdin: bytes | None = None) -> bytes | None:
+        """Run a read-only git command in the mirror; None on failure."""
+        try:
+            completed = subprocess.run(
+                [self._git_path, f"--git-dir={self.path(repo_slug)}", *args],
+                input=stdin,
+                capture_output=True,
+            )
+        except OSError:
+            return None
+        return completed.stdout if completed.returncode == 0 else None
+
+
+_BATCH_FORMAT = "%(objectname) %(objecttype) %(objectsize)"
+
+
+def _parse_batch(output: bytes, paths: list[str]) -> dict[str, bytes]:
+    """Parse ``git cat-file --batch`` output, one response per requested path."""
+    contents = {}
+    offset = 0
+    for path in paths:
+        newline = output.index(b"\n", offset)
+        header = output[offset:newline]
+        offset = newline + 1
+        # "<object> missing" or "<object> ambiguous" echoes the request, which
+        # may contain spaces; found objects use _BATCH_FORMAT.
+        if header.endswith((b" missing", b" ambiguous")):
+            continue
+        _, object_type, size = header.split(b" ")
+        size = int(size)
+        if object_type == b"blob":
+            contents[path] = output[offset : offset + size]
+        offset += size + 1
+    return contents
+
+
+def _parse_name_status(output: bytes) -> list[FileChange]:
+    """Parse ``git diff --name-status -z`` output."""
+    fields = output.decode("utf-8", "surrogateescape").split("\0")
+    changes = []
+    index = 0
+    while index < len(fields) and fields[index]:
+        letter = fields[index][0]
+        if letter in ("R", "C"):
+            previous, path = fields[index + 1], fields[index + 2]
+            index += 3
+        else:
+            previous, path = None, fields[index + 1]
+            index += 2
+        changes.append(
+            FileChange(
+                path=path, status=_DIFF_STATUS.get(letter, "changed"), previous_path=previous
+            )
+        )
+    return changes
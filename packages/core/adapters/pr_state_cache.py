@@ -0,0 +1,264 @@
+"""Webhook-maintained cache of PR state consulted before GitHub reads.
+
+``pull_request`` events carry the head SHA and merge state, and ``check_run``
+events carry per-check status and conclusion, so once an entry is seeded from
+the API it can be kept current from webhooks alone. ``check_suite`` events
+that (re)request a suite mark the checks for that head as incomplete so the
+next read refreshes them from the API.
+
+The current head SHA of each PR is tracked in a ``HeadShaCache``, shared with
+the adapter, so there is one head per PR: cached check runs are only served
+while that head is the one they were read for. Check runs are keyed by id, so
+re-runs and same-name runs from different apps are all kept.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from packages.core.adapters.head_sha_cache import HeadShaCache
+from packages.core.metrics import registry
+from packages.core.schemas.github import CheckRunSummary
+from packages.core.schemas.webhooks import WebhookEvent
+
+cache_lookups = registry.counter(
+    "github_pr_state_cache_lookups_total", "PR state cache lookups, by kind and result"
+)
+
+
+@dataclass
+class PRState:
+    """Cached state of one pull request."""
+
+    # Head the check runs were read for; the current head is in the HeadShaCache.
+    head_sha: str | None = None
+    status: dict[str, Any] | None = None
+    status_updated_at: float = 0.0
+    # Check runs for ``head_sha`` keyed by id; only complete once seeded from the API.
+    check_runs: dict[int, CheckRunSummary] = field(default_factory=dict)
+    checks_seeded: bool = False
+    checks_updated_at: float = 0.0
+
+
+class PRStateCache:
+    """In-memory PR state keyed by ``(repo_slug, pr_number)``.
+
+    Entries are written by adapter reads (API responses) and by webhook events
+    via ``handle``. Reads return None on a miss or once an entry is older than
+    ``max_age``, which bounds staleness if a webhook delivery is lost. Closed
+    PRs are dropped, and the least recently used entries are evicted beyond
+    ``max_entries``.
+
+    Args:
+        max_age: Seconds an entry is served without a refresh.
+        clock: Monotonic time source.
+        head_sha_cache: Head SHA cache to track PR heads in; by default one
+            with a ``max_age`` TTL. Pass the instance given to the adapter
+            and registered as a webhook subscriber.
+        max_entries: Maximum number of PRs kept.
+    """
+
+    def __init__(
+        self,
+        max_age: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        head_sha_cache: HeadShaCache | None = None,
+        max_entries: int = 10_000,
+    ) -> None:
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._clock = clock
+        self.head_sha_cache = (
+            head_sha_cache if head_sha_cache is not None else HeadShaCache(max_age, clock)
+        )
+        self._entries: OrderedDict[tuple[str, int], PRState] = OrderedDict()
+        # (repo_slug, head_sha) -> PR numbers, for check runs without PR links (forks).
+        self._by_head: dict[tuple[str, str], set[int]] = {}
+        self._lock = threading.Lock()
+
+    def get_head_sha(self, repo_slug: str, pr_number: int) -> str | None:
+        return self.head_sha_cache.get(repo_slug, pr_number)
+
+    def get_status(self, repo_slug: str, pr_number: int) -> dict[str, Any] | None:
+        """Return the cached status in the shape of ``GitHubAdapter.get_pr_status``."""
+        with self._lock:
+            entry = self._get(repo_slug, pr_number)
+            if entry is None or entry.status is None:
+                result = "miss"
+            elif not self._fresh(entry.status_updated_at):
+                result = "stale"
+            elif entry.status["state"] == "open" and entry.status["mergeable"] is None:
+                # GitHub computes mergeability lazily; an API read triggers it.
+                result = "pending"
+            else:
+                result = "hit"
+            cache_lookups.inc(kind="status", result=result)
+            return dict(entry.status) if result == "hit" else None
+
+    def get_check_runs(self, repo_slug: str, pr_number: int) -> list[CheckRunSummary] | None:
+        """Return the cached check runs for the PR head, or None unless complete and fresh."""
+        head_sha = self.head_sha_cache.get(repo_slug, pr_number)
+        with self._lock:
+            entry = self._get(repo_slug, pr_number)
+            if entry is None or not entry.checks_seeded:
+                result = "miss"
+            elif entry.head_sha != head_sha or not self._fresh(entry.checks_updated_at):
+                result = "stale"
+            else:
+                result = "hit"
+            cache_lookups.inc(kind="check_runs", result=result)
+            if result != "hit":
+                return None
+            return [run.model_copy() for run in entry.check_runs.values()]
+
+    def store_pull_request(
+        self, repo_slug: str, pr_number: int, pull_request: dict[str, Any]
+    ) -> None:
+        """Record a PR object from the REST API or a ``pull_request`` webhook."""
+        status = {
+            "state": pull_request["state"],
+            "mergeable": pull_request.get("mergeable"),
+            "merged": pull_request.get("merged", False),
+            "mergeable_state": pull_request.get("mergeable_state"),
+            "draft": pull_request.get("draft", False),
+        }
+        head_sha = pull_request.get("head", {}).get("sha")
+        with self._lock:
+            entry = self._entry(repo_slug, pr_number)
+            if head_sha:
+                self._move_head(repo_slug, pr_number, entry, head_sha)
+            entry.status = status
+            entry.status_updated_at = self._clock()
+
+    def store_check_runs(
+        self,
+        repo_slug: str,
+        pr_number: int,
+        head_sha: str,
+        check_runs: list[CheckRunSummary],
+    ) -> None:
+        """Seed the complete check run list for the PR head from the API."""
+        with self._lock:
+            entry = self._entry(repo_slug, pr_number)
+            self._move_head(repo_slug, pr_number, entry, head_sha)
+            entry.check_runs = {run.id: run for run in check_runs}
+            entry.checks_seeded = True
+            entry.checks_updated_at = self._clock()
+
+    def invalidate(self, repo_slug: str, pr_number: int) -> None:
+        self.head_sha_cache.invalidate(repo_slug, pr_number)
+        with self._lock:
+            entry = self._entries.pop((repo_slug, pr_number), None)
+            if entry is not None and entry.head_sha:
+                self._unindex(repo_slug, pr_number, entry.head_sha)
+
+    def clear(self) -> None:
+        self.head_sha_cache.clear()
+        with self._lock:
+            self._entries.clear()
+            self._by_head.clear()
+
+    def handle(self, event: WebhookEvent) -> None:
+        """Apply a ``pull_request``, ``check_run`` or ``check_suite`` event."""
+        repo_slug = event.payload.get("repository", {}).get("full_name")
+        if not repo_slug:
+            return
+        if event.event_type == "pull_request":
+            pull_request = event.payload.get("pull_request")
+            if not pull_request or "number" not in pull_request:
+                return
+            if event.payload.get("action") == "closed":
+                self.invalidate(repo_slug, int(pull_request["number"]))
+            else:
+                self.store_pull_request(repo_slug, int(pull_request["number"]), pull_request)
+        elif event.event_type == "check_run":
+            self._apply_check_run(repo_slug, event.payload.get("check_run") or {})
+        elif event.event_type == "check_suite":
+            self._apply_check_suite(
+                repo_slug, event.payload.get("action"), event.payload.get("check_suite") or {}
+            )
+
+    def _apply_check_run(self, repo_slug: str, check_run: dict[str, Any]) -> None:
+        head_sha = check_run.get("head_sha")
+        if not head_sha or "name" not in check_run:
+            return
+        run = CheckRunSummary(
+            id=check_run["id"],
+            name=check_run["name"],
+            status=check_run["status"],
+            conclusion=check_run.get("conclusion"),
+            html_url=check_run.get("html_url"),
+        )
+        with self._lock:
+            for pr_number in self._prs_for(repo_slug, head_sha, check_run):
+                entry = self._entries.get((repo_slug, pr_number))
+                if entry is None or entry.head_sha != head_sha:
+                    continue
+                if _supersedes(run, entry.check_runs.get(run.id)):
+                    entry.check_runs[run.id] = run
+                if entry.checks_seeded:
+                    entry.checks_updated_at = self._clock()
+
+    def _apply_check_suite(
+        self, repo_slug: str, action: str | None, check_suite: dict[str, Any]
+    ) -> None:
+        head_sha = check_suite.get("head_sha")
+        if not head_sha or action not in ("requested", "rerequested"):
+            return
+        with self._lock:
+            for pr_number in self._prs_for(repo_slug, head_sha, check_suite):
+                entry = self._entries.get((repo_slug, pr_number))
+                if entry is not None and entry.head_sha == head_sha:
+                    # New runs may be created without us having seen their check_run events.
+                    entry.checks_seeded = False
+
+    def _prs_for(self, repo_slug: str, head_sha: str, payload: dict[str, Any]) -> set[int]:
+        numbers = {int(pr["number"]) for pr in payload.get("pull_requests") or [] if "number" in pr}
+        return numbers | self._by_head.get((repo_slug, head_sha), set())
+
+    def _get(self, repo_slug: str, pr_number: int) -> PRState | None:
+        key = (repo_slug, pr_number)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _entry(self, repo_slug: str, pr_number: int) -> PRState:
+        entry = self._get(repo_slug, pr_number)
+        if entry is None:
+            entry = self._entries[(repo_slug, pr_number)] = PRState()
+            while len(self._entries) > self.max_entries:
+                (evicted_repo, evicted_pr), evicted = self._entries.popitem(last=False)
+                if evicted.head_sha:
+                    self._unindex(evicted_repo, evicted_pr, evicted.head_sha)
+        return entry
+
+    def _move_head(self, repo_slug: str, pr_number: int, entry: PRState, head_sha: str) -> None:
+        self.head_sha_cache.set(repo_slug, pr_number, head_sha)
+        if entry.head_sha == head_sha:
+            return
+        if entry.head_sha:
+            self._unindex(repo_slug, pr_number, entry.head_sha)
+        entry.head_sha = head_sha
+        entry.check_runs = {}
+        entry.checks_seeded = False
+        self._by_head.setdefault((repo_slug, head_sha), set()).add(pr_number)
+
+    def _unindex(self, repo_slug: str, pr_number: int, head_sha: str) -> None:
+        numbers = self._by_head.get((repo_slug, head_sha))
+        if numbers is not None:
+            numbers.discard(pr_number)
+            if not numbers:
+                del self._by_head[(repo_slug, head_sha)]
+
+    def _fresh(self, updated_at: float) -> bool:
+        return self._clock() - updated_at < self.max_age
+
+
+def _supersedes(run: CheckRunSummary, current: CheckRunSummary | None) -> bool:
+    # Deliveries can arrive out of order: never replace a completed run with an
+    # earlier in-progress update.
+    return current is None or current.status != "completed" or run.status == "completed"
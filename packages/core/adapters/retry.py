@@ -0,0 +1,178 @@
+"""Retry policy with jittered exponential backoff for transient GitHub failures.
+
+Only transient failures are retried: 502/503/504 responses and transport
+errors such as connection resets. Delays use "full jitter" (a uniform draw
+between zero and the exponential cap), every call is bounded by a total
+deadline, and a shared retry budget caps retries to a fraction of recent
+requests so an outage does not turn into a retry storm.
+"""
+
+import random
+import threading
+import time
+from collections.abc import Callable
+
+import httpx
+from pydantic import BaseModel, Field
+
+from packages.core.adapters.instrumentation import current_attempt
+from packages.core.metrics import registry
+
+retries_total = registry.counter(
+    "github_retries_total", "Retried GitHub requests, by method and reason"
+)
+retries_exhausted = registry.counter(
+    "github_retries_exhausted_total",
+    "GitHub requests that still failed after retrying, by method and cause",
+)
+retry_added_latency = registry.histogram(
+    "github_retry_added_latency_seconds",
+    "Latency added to a request by failed attempts and backoff",
+)
+
+
+class RetryPolicy(BaseModel):
+    """Configuration for retrying transient GitHub failures."""
+
+    max_attempts: int = Field(default=4, ge=1, description="Attempts including the first")
+    base_delay: float = Field(default=0.25, ge=0, description="Backoff cap for the first retry")
+    max_delay: float = Field(default=8.0, ge=0, description="Upper bound on a single backoff")
+    deadline: float = Field(
+        default=30.0, gt=0, description="Total seconds a call may spend including retries"
+    )
+    retry_statuses: frozenset[int] = Field(default=frozenset({502, 503, 504}))
+    budget_ratio: float = Field(
+        default=0.2, ge=0, description="Retries allowed per request in the budget window"
+    )
+    budget_min_per_second: float = Field(
+        default=1.0, ge=0, description="Retries always allowed per second, even at low traffic"
+    )
+
+    def backoff(self, retry_number: int, rand: Callable[[], float] = random.random) -> float:
+        """Full-jitter delay before retry ``retry_number`` (1-based)."""
+        cap = min(self.max_delay, self.base_delay * (2 ** (retry_number - 1)))
+        return rand() * cap
+
+
+class RetryBudget:
+    """Token bucket limiting retries to a fraction of requests.
+
+    Each request deposits ``ratio`` tokens and each retry withdraws one; a
+    small time-based refill guarantees a minimum retry rate. Tokens are
+    capped so a quiet period cannot bank an unbounded burst.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_per_second: float = 1.0,
+        max_tokens: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._clock = clock
+        self._tokens = max_tokens
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.max_tokens, self._tokens + elapsed * self.min_per_second)
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+
+class Retrier:
+    """Execute an HTTP call under a ``RetryPolicy``."""
+
+    def __init__(
+        self,
+        policy: RetryPolicy | None = None,
+        budget: RetryBudget | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        rand: Callable[[], float] = random.random,
+    ) -> None:
+        self.policy = policy or RetryPolicy()
+        self.budget = budget or RetryBudget(
+            ratio=self.policy.budget_ratio, min_per_second=self.policy.budget_min_per_second
+        )
+        self._sleep = sleep
+        self._clock = clock
+        self._rand = rand
+
+    def call(self, fn: Callable[[], httpx.Response], method: str) -> httpx.Response:
+        """Call ``fn`` and retry transient failures.
+
+        Args:
+            fn: Performs one attempt and returns the response. It must be safe
+                to repeat (idempotent, or self-reconciling).
+            method: HTTP method, used for metric labels.
+
+        Returns:
+            The last response, which may still carry an error status.
+
+        Raises:
+            httpx.TransportError: The last attempt failed at the transport level.
+        """
+        policy = self.policy
+        started = self._clock()
+        self.budget.record_request()
+        attempt = 1
+        while True:
+            attempt_started = self._clock()
+            attempt_token = current_attempt.set(attempt)
+            try:
+                response = fn()
+                error = None
+                reason = str(response.status_code)
+                retryable = response.status_code in policy.retry_statuses
+            except httpx.TransportError as exc:
+                response = None
+                error = exc
+                reason = type(exc).__name__
+                retryable = True
+            finally:
+                current_attempt.reset(attempt_token)
+
+            if retryable:
+                delay = policy.backoff(attempt, self._rand)
+                if attempt >= policy.max_attempts:
+                    retryable, cause = False, "attempts"
+                elif self._clock() - started + delay >= policy.deadline:
+                    retryable, cause = False, "deadline"
+                elif not self.budget.try_acquire():
+                    retryable, cause = False, "budget"
+                if not retryable:
+                    retries_exhausted.inc(method=method, cause=cause)
+
+            if not retryable:
+                if attempt > 1:
+                    # Time spent on failed attempts and backoff before the final one.
+                    retry_added_latency.observe(attempt_started - started, method=method)
+                if error is not None:
+                    raise error
+                return response
+
+            retries_total.inc(method=method, reason=reason)
+            self._sleep(delay)
+            attempt += 1
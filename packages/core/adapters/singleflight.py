@@ -0,0 +1,128 @@
+"""Single-flight coalescing of identical in-flight requests.
+
+Concurrent callers asking for the same key share one underlying call: the
+first caller (the leader) executes it and every waiter receives the same
+result or exception. Entries are removed as soon as the call finishes, so
+this is de-duplication of in-flight work, not a cache. When an asyncio
+leader is cancelled, its waiters are not: one of them runs the call again.
+"""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable, Mapping
+from typing import Any, TypeVar
+
+from packages.core.metrics import registry
+
+T = TypeVar("T")
+
+coalesced_requests = registry.counter(
+    "github_coalesced_requests_total",
+    "Requests served by joining an identical in-flight request",
+)
+
+
+def request_key(method: str, url: str, params: Mapping[str, Any] | None = None) -> Hashable:
+    """Build a coalescing key from method, URL and query parameters."""
+    items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return (method.upper(), url, items)
+
+
+class _LeaderCancelledError(Exception):
+    """Set on a shared future whose leader task was cancelled."""
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Thread-based single-flight group used by the synchronous adapter."""
+
+    def __init__(self, name: str = "github") -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run ``fn`` once for all concurrent callers with the same key."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            coalesced_requests.inc(group=self.name, mode="thread")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        """Number of distinct keys currently being executed."""
+        return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """Task-based single-flight group for asyncio callers."""
+
+    def __init__(self, name: str = "github") -> None:
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await ``fn`` once for all concurrent tasks with the same key.
+
+        If the leader is cancelled, the first waiter to resume becomes the new
+        leader and runs ``fn`` again for the others.
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            coalesced_requests.inc(group=self.name, mode="task")
+        while future is not None:
+            try:
+                # Shield so a cancelled waiter does not cancel the shared call.
+                return await asyncio.shield(future)
+            except _LeaderCancelledError:
+                future = self._calls.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelledError())
+            future.exception()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so an unobserved failure does not log a warning.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._calls.pop(key, None)
+
+    def in_flight(self) -> int:
+        """Number of distinct keys currently being awaited."""
+        return len(self._calls)
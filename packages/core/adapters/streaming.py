@@ -0,0 +1,94 @@
+"""Streamed request bodies for committing large or binary files.
+
+``create_commit`` used to build the whole base64 string and JSON document in
+memory. The helpers here read content in fixed-size chunks and base64-encode
+them on the fly into a git blob request body, so memory use stays bounded by
+the chunk size rather than the file size.
+"""
+
+import base64
+import os
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+# Read size for streamed content; a multiple of 3 so chunks base64-encode without padding.
+CHUNK_SIZE = 3 * 64 * 1024
+
+# Content above this size goes through the blob API instead of the contents API.
+BLOB_THRESHOLD = 1024 * 1024
+
+FileContent = str | bytes | os.PathLike[str] | Iterable[bytes]
+
+_BODY_PREFIX = b'{"encoding":"base64","content":"'
+_BODY_SUFFIX = b'"}'
+
+
+def is_binary(sample: bytes) -> bool:
+    """Heuristic used by git: NUL bytes or invalid UTF-8 in the leading sample."""
+    if b"\0" in sample:
+        return True
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        # A multi-byte character cut off at the end of the sample is still text.
+        return exc.start < len(sample) - 3
+    return False
+
+
+def content_size(content: FileContent) -> int | None:
+    """Size in bytes when known without reading the content."""
+    if isinstance(content, bytes):
+        return len(content)
+    if isinstance(content, os.PathLike):
+        return Path(content).stat().st_size
+    return None
+
+
+def chunk_source(content: FileContent) -> tuple[Callable[[], Iterator[bytes]], bool]:
+    """Return a factory of content chunk iterators and whether it can be replayed.
+
+    Bytes and paths can be re-read for a retried request; a caller-supplied
+    iterator can only be consumed once.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    if isinstance(content, bytes):
+        view = memoryview(content)
+        return lambda: (
+            bytes(view[i : i + CHUNK_SIZE]) for i in range(0, len(view), CHUNK_SIZE)
+        ), True
+    if isinstance(content, os.PathLike):
+        return lambda: _read_file(Path(content)), True
+    iterator = iter(content)
+    return lambda: iterator, False
+
+
+def _read_file(path: Path) -> Iterator[bytes]:
+    with path.open("rb") as handle:
+        while chunk := handle.read(CHUNK_SIZE):
+            yield chunk
+
+
+def encode_base64_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Base64-encode a byte stream incrementally (output equals one-shot encoding)."""
+    carry = b""
+    for chunk in chunks:
+        data = carry + chunk if carry else chunk
+        cut = len(data) - len(data) % 3
+        carry = data[cut:]
+        if cut:
+            yield base64.b64encode(data[:cut])
+    if carry:
+        yield base64.b64encode(carry)
+
+
+def blob_request_body(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """JSON body for ``POST /git/blobs`` with streamed base64 content."""
+    yield _BODY_PREFIX
+    yield from encode_base64_chunks(chunks)
+    yield _BODY_SUFFIX
+
+
+def blob_request_length(size: int) -> int:
+    """Content-Length of ``blob_request_body`` for ``size`` bytes of content."""
+    return len(_BODY_PREFIX) + 4 * -(-size // 3) + len(_BODY_SUFFIX)
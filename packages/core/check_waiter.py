@@ -0,0 +1,272 @@
+"""Await CI completion on a PR from check webhooks instead of polling.
+
+Each ``wait_for_checks`` call registers a lightweight waiter (a future and a
+timer handle, no task) indexed by repository and head SHA. ``check_run``
+webhooks update matching waiters in place; ``check_suite`` completion and a
+single slow fallback poll per waiter re-read check runs from the API to cover
+missed deliveries. Concurrent reads for the same PR are coalesced, so many
+waiters on one PR cost one read.
+"""
+
+import asyncio
+from typing import Any
+
+from packages.core.adapters.github_adapter import GitHubAdapter
+from packages.core.adapters.singleflight import AsyncSingleFlight
+from packages.core.logging import get_logger
+from packages.core.metrics import registry
+from packages.core.schemas.github import CheckRunSummary, CheckWaitResult
+from packages.core.schemas.webhooks import WebhookEvent
+
+check_waits = registry.counter("check_waits_total", "Completed check waits, by outcome")
+check_reads = registry.counter(
+    "check_waiter_reads_total", "Check run reads issued by waiters, by trigger"
+)
+
+
+class _Waiter:
+    __slots__ = ("repo_slug", "pr_number", "head_sha", "required", "runs", "fail_fast", "future")
+
+    def __init__(
+        self,
+        repo_slug: str,
+        pr_number: int,
+        required: list[str],
+        fail_fast: bool,
+        future: asyncio.Future,
+    ) -> None:
+        self.repo_slug = repo_slug
+        self.pr_number = pr_number
+        self.head_sha: str | None = None
+        self.required = required
+        self.runs: dict[str, CheckRunSummary] = {}
+        self.fail_fast = fail_fast
+        self.future = future
+
+    def result(self, timed_out: bool = False) -> CheckWaitResult:
+        return CheckWaitResult(
+            repo_slug=self.repo_slug,
+            pr_number=self.pr_number,
+            head_sha=self.head_sha,
+            required=self.required,
+            check_runs=list(self.runs.values()),
+            timed_out=timed_out,
+        )
+
+    def update(self, run: CheckRunSummary) -> None:
+        current = self.runs.get(run.name)
+        if current is not None:
+            # Ignore out-of-order deliveries for an older rerun or an earlier status.
+            if run.id < current.id:
+                return
+            if run.id == current.id and current.status == "completed" and run.status != "completed":
+                return
+        self.runs[run.name] = run
+
+    def try_resolve(self) -> bool:
+        if self.future.done():
+            return True
+        result = self.result()
+        if result.passed or (result.failed and (self.fail_fast or not result.pending)):
+            self.future.set_result(result)
+            return True
+        return False
+
+
+class CheckWaiter:
+    """Resolve CI waits from ``check_run``/``check_suite`` webhooks.
+
+    Register the instance as a webhook subscriber (``register_subscriber``).
+    All waiter state lives on the event loop of the first ``wait_for_checks``
+    call; events delivered from other threads are handed to that loop.
+
+    Args:
+        adapter: Adapter used for the initial read and fallback polls. Give it a
+            ``PRStateCache`` so the initial read is usually free.
+        fallback_poll_after: Seconds before a waiter re-reads check runs once from
+            the API. Defaults to half of each wait's timeout.
+    """
+
+    def __init__(self, adapter: GitHubAdapter, fallback_poll_after: float | None = None) -> None:
+        self._adapter = adapter
+        self._fallback_poll_after = fallback_poll_after
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._by_pr: dict[tuple[str, int], set[_Waiter]] = {}
+        self._by_head: dict[tuple[str, str], set[_Waiter]] = {}
+        self._reads = AsyncSingleFlight(name="check_waiter")
+        # The loop only keeps weak references to tasks, so polls are held here until done.
+        self._polls: set[asyncio.Future] = set()
+        self._logger = get_logger("check_waiter")
+
+    def waiting(self) -> int:
+        """Number of registered waiters."""
+        return sum(len(waiters) for waiters in self._by_pr.values())
+
+    async def wait_for_checks(
+        self,
+        repo_slug: str,
+        pr_number: int,
+        required: list[str] | None = None,
+        timeout: float = 3600.0,
+        fail_fast: bool = True,
+    ) -> CheckWaitResult:
+        """Wait until the required checks on the PR head have completed.
+
+        Args:
+            repo_slug: Repository in format "owner/repo"
+            pr_number: PR number
+            required: Check run names to wait for. None waits for every check run
+                reported for the head commit.
+            timeout: Seconds to wait before returning a ``timed_out`` result.
+            fail_fast: Return as soon as any required check fails.
+
+        Returns:
+            CheckWaitResult with the latest known check runs.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is None or self._loop.is_closed():
+            self._loop = loop
+        waiter = _Waiter(
+            repo_slug, pr_number, list(required or []), fail_fast, loop.create_future()
+        )
+        key = (repo_slug, pr_number)
+        self._by_pr.setdefault(key, set()).add(waiter)
+        poll_after = self._fallback_poll_after
+        timer = loop.call_later(
+            timeout / 2 if poll_after is None else poll_after,
+            self._start_poll,
+            waiter,
+            "fallback",
+        )
+        try:
+            await self._refresh(waiter, trigger="initial")
+            result = await asyncio.wait_for(waiter.future, timeout)
+            check_waits.inc(outcome="passed" if result.passed else "failed")
+            return result
+        except TimeoutError:
+            check_waits.inc(outcome="timed_out")
+            return waiter.result(timed_out=True)
+        finally:
+            timer.cancel()
+            if not waiter.future.done():
+                waiter.future.cancel()
+            _discard(self._by_pr, key, waiter)
+            if waiter.head_sha:
+                _discard(self._by_head, (repo_slug, waiter.head_sha), waiter)
+
+    def handle(self, event: WebhookEvent) -> None:
+        """Apply a webhook event to matching waiters."""
+        loop = self._loop
+        if loop is None or loop.is_closed() or not self._by_pr:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._apply(event)
+        else:
+            loop.call_soon_threadsafe(self._apply, event)
+
+    def _apply(self, event: WebhookEvent) -> None:
+        repo_slug = event.payload.get("repository", {}).get("full_name")
+        if not repo_slug:
+            return
+        if event.event_type == "check_run":
+            check_run = event.payload.get("check_run") or {}
+            if "name" not in check_run:
+                return
+            run = CheckRunSummary(
+                id=check_run["id"],
+                name=check_run["name"],
+                status=check_run["status"],
+                conclusion=check_run.get("conclusion"),
+                html_url=check_run.get("html_url"),
+            )
+            for waiter in self._matching(repo_slug, check_run):
+                waiter.update(run)
+                waiter.try_resolve()
+        elif event.event_type == "check_suite" and event.payload.get("action") == "completed":
+            # Suites only carry an aggregate conclusion; re-read the individual runs.
+            for waiter in self._matching(repo_slug, event.payload.get("check_suite") or {}):
+                self._start_poll(waiter, "check_suite")
+        elif event.event_type == "pull_request":
+            pull_request = event.payload.get("pull_request") or {}
+            head_sha = pull_request.get("head", {}).get("sha")
+            if not head_sha:
+                return
+            for waiter in list(self._by_pr.get((repo_slug, pull_request.get("number")), ())):
+                # New commits were pushed; wait for the checks on the new head.
+                self._set_head(waiter, head_sha)
+
+    def _matching(self, repo_slug: str, payload: dict[str, Any]) -> list[_Waiter]:
+        head_sha = payload.get("head_sha")
+        if not head_sha:
+            return []
+        matches = list(self._by_head.get((repo_slug, head_sha), ()))
+        # Waiters whose head is not known yet match on the linked PR numbers.
+        for pr in payload.get("pull_requests") or []:
+            for waiter in self._by_pr.get((repo_slug, pr.get("number")), ()):
+                if waiter.head_sha is None:
+                    self._set_head(waiter, head_sha)
+                    matches.append(waiter)
+        return matches
+
+    def _set_head(self, waiter: _Waiter, head_sha: str | None) -> None:
+        if not head_sha or head_sha == waiter.head_sha:
+            return
+        if waiter.head_sha:
+            _discard(self._by_head, (waiter.repo_slug, waiter.head_sha), waiter)
+        waiter.head_sha = head_sha
+        waiter.runs = {}
+        self._by_head.setdefault((waiter.repo_slug, head_sha), set()).add(waiter)
+
+    def _start_poll(self, waiter: _Waiter, trigger: str) -> None:
+        if not waiter.future.done():
+            task = asyncio.ensure_future(self._refresh(waiter, trigger, bypass_cache=True))
+            self._polls.add(task)
+            task.add_done_callback(self._polls.discard)
+            task.add_done_callback(self._log_poll_failure)
+
+    def _log_poll_failure(self, task: asyncio.Future) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            self._logger.warning("check_waiter poll failed: %s", task.exception())
+
+    async def _refresh(self, waiter: _Waiter, trigger: str, bypass_cache: bool = False) -> None:
+        """Re-read the PR's check runs and head SHA through the adapter.
+
+        Waiters refreshing the same PR at the same time share one read.
+        """
+        repo_slug, pr_number = waiter.repo_slug, waiter.pr_number
+        runs = await self._reads.do(
+            (repo_slug, pr_number, bypass_cache),
+            lambda: self._read(repo_slug, pr_number, trigger, bypass_cache),
+        )
+        if waiter.future.done():
+            return
+        self._set_head(waiter, self._head_sha(waiter.repo_slug, waiter.pr_number))
+        for run in runs:
+            waiter.update(CheckRunSummary(**run))
+        waiter.try_resolve()
+
+    async def _read(
+        self, repo_slug: str, pr_number: int, trigger: str, bypass_cache: bool
+    ) -> list[dict[str, Any]]:
+        check_reads.inc(trigger=trigger)
+        adapter = self._adapter
+        if bypass_cache and adapter.pr_state_cache is not None:
+            # A missed delivery would also have left the shared cache stale.
+            adapter.pr_state_cache.invalidate(repo_slug, pr_number)
+        return await asyncio.to_thread(adapter.get_check_runs, repo_slug, pr_number)
+
+    def _head_sha(self, repo_slug: str, pr_number: int) -> str | None:
+        head_sha_cache = self._adapter.head_sha_cache
+        return head_sha_cache.get(repo_slug, pr_number) if head_sha_cache is not None else None
+
+
+def _discard(index: dict[Any, set[_Waiter]], key: Any, waiter: _Waiter) -> None:
+    waiters = index.get(key)
+    if waiters is not None:
+        waiters.discard(waiter)
+        if not waiters:
+            del index[key]
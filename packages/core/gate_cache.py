@@ -0,0 +1,128 @@
+"""Content-addressed cache of passed gate results.
+
+Re-triggers, webhook redeliveries and retries re-run gates for a head SHA
+that was already gated. A gate's result depends only on the commit, the
+checks that ran and the run options, so ``GateFramework.run_gate`` looks up
+``(gate, head_sha, fingerprint)`` before evaluating checks and reuses a
+passed result when one is cached. The fingerprint hashes the gate's check
+definitions and the run options that affect gate outcomes.
+
+Only passed results are cached: a failure may be transient, and re-running
+it is the point of a retry.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Optional
+
+from pydantic import BaseModel
+
+from packages.core.metrics import registry
+from packages.core.schemas.gates import GateType
+
+cache_lookups = registry.counter(
+    "gate_result_cache_lookups_total", "Gate result cache lookups, by gate and result"
+)
+cache_saved_seconds = registry.counter(
+    "gate_result_cache_saved_seconds_total", "Gate execution time saved by cache hits, by gate"
+)
+
+GateCacheKey = tuple[GateType, str, str]
+
+
+def fingerprint(*parts: object) -> str:
+    """Stable hash of JSON-serializable ``parts``."""
+    encoded = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+@dataclass(slots=True)
+class _Entry:
+    result: BaseModel
+    duration: float
+    stored_at: float
+
+
+class GateResultCache:
+    """LRU cache of passed gate results with a TTL.
+
+    Args:
+        max_entries: Entries kept; the least recently used is evicted first.
+        ttl: Seconds an entry stays valid.
+        clock: Time source, for tests.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl: float = 24 * 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[GateCacheKey, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def get(self, key: GateCacheKey) -> Optional[BaseModel]:
+        """Cached result for ``key`` (a copy), or None on a miss or expiry."""
+        gate = key[0].value
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() - entry.stored_at > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                cache_lookups.inc(gate=gate, result="miss")
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_seconds += entry.duration
+        cache_lookups.inc(gate=gate, result="hit")
+        cache_saved_seconds.inc(entry.duration, gate=gate)
+        return entry.result.model_copy(deep=True)
+
+    def put(self, key: GateCacheKey, result: BaseModel, duration: float) -> None:
+        """Store ``result``, which took ``duration`` seconds to compute."""
+        with self._lock:
+            self._entries[key] = _Entry(result.model_copy(deep=True), duration, self._clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, head_sha: Optional[str] = None, gate: Optional[GateType] = None) -> int:
+        """Drop entries matching every given filter; all entries without filters.
+
+        Returns:
+            Number of entries dropped.
+        """
+        with self._lock:
+            keys = [
+                key
+                for key in self._entries
+                if (head_sha is None or key[1] == head_sha) and (gate is None or key[0] == gate)
+            ]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def stats(self) -> dict[str, float]:
+        """Entries, hits, misses, hit rate and seconds of gate time saved."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "saved_seconds": self.saved_seconds,
+            }
@@ -5,12 +5,19 @@ providing a unified system for running all gates (Safety, Planning, CI, Staging,
 Production, Learning) with a state machine to track run execution.
 """
 
+import time
+from array import array
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Protocol
 
 from pydantic import BaseModel, Field
 
+from packages.core.gate_cache import GateCacheKey, GateResultCache, fingerprint
+from packages.core.gate_graph import GateGraph, gate_sequence, next_gates
+from packages.core.metrics import registry
 from packages.core.schemas.gates import (
     CIGateResult,
     GatePipeline,
@@ -48,11 +55,62 @@ class RunResult(str, Enum):
     BLOCKED = "blocked"
 
 
+GATE_STATES = {
+    GateType.SAFETY: RunState.RUNNING_SAFETY,
+    GateType.PLANNING: RunState.RUNNING_PLANNING,
+    GateType.CI: RunState.RUNNING_CI,
+    GateType.STAGING: RunState.RUNNING_STAGING,
+    GateType.PRODUCTION: RunState.RUNNING_PRODUCTION,
+    GateType.LEARNING: RunState.RUNNING_LEARNING,
+}
+
+GATE_LABELS = {
+    GateType.SAFETY: "Safety",
+    GateType.PLANNING: "Planning",
+    GateType.CI: "CI",
+    GateType.STAGING: "Staging",
+    GateType.PRODUCTION: "Production",
+    GateType.LEARNING: "Learning",
+}
+
+
+@lru_cache(maxsize=None)
+def compile_transitions(
+    skip_staging: bool, skip_production: bool
+) -> dict[GateType, tuple[RunState, Optional[GateType]]]:
+    """Compile the gate graph into a transition table for one skip configuration.
+
+    Returns:
+        Gate that just passed -> (next run state, next gate).
+    """
+    skipped = _skipped_gates(skip_staging, skip_production)
+    transitions = {
+        gate: (GATE_STATES[next_gate], next_gate) if next_gate else (RunState.COMPLETED, None)
+        for gate, next_gate in next_gates(skipped).items()
+    }
+    if skip_staging:
+        # Skipping staging still enters the production gate, which records its
+        # own SKIPPED result when production is skipped too.
+        transitions[GateType.CI] = (RunState.RUNNING_PRODUCTION, GateType.PRODUCTION)
+    return transitions
+
+
+def _skipped_gates(skip_staging: bool, skip_production: bool) -> frozenset[GateType]:
+    skipped = set()
+    if skip_staging:
+        skipped.add(GateType.STAGING)
+    if skip_production:
+        skipped.add(GateType.PRODUCTION)
+    return frozenset(skipped)
+
+
 class GateRunConfig(BaseModel):
     """Configuration for a gate run."""
 
     pr_number: int
     run_id: str
+    repo_slug: Optional[str] = Field(default=None, description="Repository in format owner/repo")
+    head_sha: Optional[str] = Field(default=None, description="PR head commit being gated")
     skip_staging: bool = Field(
         default=False,
         description="Skip staging gate (for local dev environments)",
@@ -65,6 +123,42 @@ class GateRunConfig(BaseModel):
         default=True,
         description="Run in mock mode (no actual deployments)",
     )
+    collect_all_failures: bool = Field(
+        default=False,
+        description="Run every check of a failing gate instead of failing fast (diagnostics)",
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class GateTiming:
+    """Timestamps of a run's latest visit to one gate.
+
+    Times are ``time.monotonic()`` readings of the process that ran the gate,
+    so only differences between them are meaningful. They are not restored
+    with a persisted run.
+
+    Attributes:
+        entered_at: Run reached the gate.
+        started_at: Gate execution started, or None if it never did.
+        exited_at: Run left the gate, or None while it is still there.
+    """
+
+    entered_at: float
+    started_at: Optional[float] = None
+    exited_at: Optional[float] = None
+
+    @property
+    def queue_wait(self) -> Optional[float]:
+        """Seconds between reaching the gate and its execution starting."""
+        end = self.started_at if self.started_at is not None else self.exited_at
+        return end - self.entered_at if end is not None else None
+
+    @property
+    def execution(self) -> Optional[float]:
+        """Seconds between the gate's execution starting and the run leaving it."""
+        if self.started_at is None or self.exited_at is None:
+            return None
+        return self.exited_at - self.started_at
 
 
 class GateRun(BaseModel):
@@ -103,6 +197,314 @@ class GateRun(BaseModel):
         return state_progress.get(self.state, 0)
 
 
+# Blocked reason of a run replaced by a run for a newer head commit of its PR.
+SUPERSEDED_REASON = "Superseded by a new head commit"
+
+# Terminal state -> result recorded with it.
+TERMINAL_RESULTS = {
+    RunState.COMPLETED: RunResult.PASSED,
+    RunState.FAILED: RunResult.FAILED,
+    RunState.BLOCKED: RunResult.BLOCKED,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class RunTransition:
+    """One state change of a gate run.
+
+    Attributes:
+        run_id: Run that changed state.
+        from_state: State before the transition.
+        to_state: State after the transition.
+        gate: The run's ``current_gate`` after the transition.
+        at: Epoch seconds; also the run's ``completed_at`` for terminal states.
+        reason: Error message or blocked reason for FAILED and BLOCKED.
+    """
+
+    run_id: str
+    from_state: RunState
+    to_state: RunState
+    gate: Optional[GateType]
+    at: float
+    reason: Optional[str] = None
+
+    def apply(self, run: GateRun) -> None:
+        """Apply this transition to ``run`` in place."""
+        run.state = self.to_state
+        run.current_gate = self.gate
+        result = TERMINAL_RESULTS.get(self.to_state)
+        if result is None and self.from_state in TERMINAL_RESULTS:
+            # Resumed: the run is pending again.
+            run.result = RunResult.PENDING
+            run.completed_at = None
+            run.error_message = None
+            run.blocked_reason = None
+        elif result is not None:
+            run.result = result
+            run.completed_at = datetime.fromtimestamp(self.at, timezone.utc)
+            if self.to_state == RunState.FAILED:
+                run.error_message = self.reason
+            elif self.to_state == RunState.BLOCKED:
+                run.blocked_reason = self.reason
+
+
+# Small-int codes stored by ``RunCore``: indexes into these tuples.
+STATES: tuple[RunState, ...] = tuple(RunState)
+RESULTS: tuple[RunResult, ...] = tuple(RunResult)
+GATES: tuple[GateType, ...] = tuple(GateType)
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
+RESULT_CODES = {result: code for code, result in enumerate(RESULTS)}
+GATE_CODES = {gate: code for code, gate in enumerate(GATES)}
+NO_GATE = -1
+
+# State code -> result code recorded with it, -1 for non-terminal states.
+_TERMINAL_RESULT_CODES = tuple(
+    RESULT_CODES[TERMINAL_RESULTS[state]] if state in TERMINAL_RESULTS else -1 for state in STATES
+)
+_RUNNING_CODES = tuple(state.value.startswith("running_") for state in STATES)
+_INITIALIZED = STATE_CODES[RunState.INITIALIZED]
+_RUNNING_STAGING = STATE_CODES[RunState.RUNNING_STAGING]
+_RUNNING_PRODUCTION = STATE_CODES[RunState.RUNNING_PRODUCTION]
+_FAILED = STATE_CODES[RunState.FAILED]
+_BLOCKED = STATE_CODES[RunState.BLOCKED]
+_PASSED = RESULT_CODES[RunResult.PASSED]
+_PENDING = RESULT_CODES[RunResult.PENDING]
+# ``GateType.value`` is a slow enum property, so ``execute_gate`` looks names up here.
+_EXECUTE_METHODS = {gate: f"execute_{gate.value}_gate" for gate in GATES}
+
+# Graph of frameworks built without checks, shared as graphs do not change once built.
+_NO_CHECKS = GateGraph()
+
+# ``RunCore.timings`` holds these three timestamps per gate code.
+_ENTERED, _STARTED, _EXITED = range(3)
+_NO_TIMINGS = array("d", bytes(8 * 3 * len(GATES)))
+
+GATE_TIME_BUCKETS = (
+    0.001,
+    0.01,
+    0.1,
+    1.0,
+    5.0,
+    15.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+    600.0,
+    1800.0,
+    3600.0,
+)
+gate_wait = registry.histogram(
+    "gate_wait_seconds",
+    "Time runs wait at a gate before its execution starts, by gate",
+    buckets=GATE_TIME_BUCKETS,
+)
+gate_execution = registry.histogram(
+    "gate_execution_seconds",
+    "Time from a gate's execution start until the run leaves it, by gate",
+    buckets=GATE_TIME_BUCKETS,
+)
+# Every gate exit observes these, so they are buffered rather than locked per call.
+_GATE_WAIT = tuple(gate_wait.buffered(gate=gate.value) for gate in GATES)
+_GATE_EXECUTION = tuple(gate_execution.buffered(gate=gate.value) for gate in GATES)
+
+
+@lru_cache(maxsize=None)
+def compile_state_table(skip_staging: bool, skip_production: bool) -> tuple[tuple[int, int], ...]:
+    """``compile_transitions`` in codes, indexed by gate code.
+
+    Returns:
+        Gate code that just passed -> (next state code, next gate code or ``NO_GATE``).
+    """
+    transitions = compile_transitions(skip_staging, skip_production)
+    return tuple(
+        (STATE_CODES[state], GATE_CODES[gate] if gate is not None else NO_GATE)
+        for state, gate in (transitions[gate] for gate in GATES)
+    )
+
+
+class RunCore:
+    """Compact mutable state of a gate run, used by ``GateFramework``.
+
+    State, result and gate are small-int codes into ``STATES``, ``RESULTS``
+    and ``GATES``, and ``completed_at`` is epoch seconds, so a transition is a
+    few slot writes instead of validated pydantic assignments. ``to_run``
+    builds the ``GateRun`` handed to API callers and recorders.
+
+    ``timings`` is a fixed array of entry, execution start and exit
+    ``time.monotonic()`` readings per gate code, so timing a transition writes
+    into it instead of allocating. An entry of 0.0 means the gate was not
+    reached; a start or exit older than the entry belongs to an earlier visit
+    and counts as unset, so entering a gate is a single write. It stays off the
+    ``GateRun``; ``GateFramework.gate_timings`` reads it.
+    """
+
+    __slots__ = (
+        "state",
+        "result",
+        "gate",
+        "started_at",
+        "completed_at",
+        "error_message",
+        "blocked_reason",
+        "pipeline",
+        "timings",
+    )
+
+    def __init__(self, started_at: datetime) -> None:
+        self.state = 0
+        self.result = 0
+        self.gate = NO_GATE
+        self.started_at = started_at
+        self.completed_at: Optional[float] = None
+        self.error_message: Optional[str] = None
+        self.blocked_reason: Optional[str] = None
+        self.pipeline: Optional[GatePipeline] = None
+        self.timings = _NO_TIMINGS[:]
+
+    @classmethod
+    def from_run(cls, run: GateRun) -> "RunCore":
+        """Compact state of ``run``.
+
+        Gate timings are not carried over: they are monotonic clock readings
+        of the process that recorded them.
+        """
+        core = cls(run.started_at)
+        core.state = STATE_CODES[run.state]
+        core.result = RESULT_CODES[run.result]
+        core.gate = GATE_CODES[run.current_gate] if run.current_gate is not None else NO_GATE
+        core.completed_at = run.completed_at.timestamp() if run.completed_at else None
+        core.error_message = run.error_message
+        core.blocked_reason = run.blocked_reason
+        core.pipeline = run.pipeline
+        return core
+
+    def move(
+        self, state: int, gate: int, reason: Optional[str] = None, executed: bool = True
+    ) -> Optional[float]:
+        """Apply a transition, with the semantics of ``RunTransition.apply``.
+
+        Also records the exit of the gate being left and the entry of the
+        gate being reached, and adds the visit to the gate left to the gate
+        histograms. A visit that began before the run was restored has no
+        entry time and is not observed. A gate executed without a recorded
+        start took no measurable time, so only its wait is observed.
+
+        Args:
+            state: New run state code.
+            gate: New gate code.
+            reason: Error message or blocked reason for terminal states.
+            executed: The gate being left was executed. Its execution counts
+                as starting now unless ``start_gate`` recorded an earlier start.
+
+        Returns:
+            Completion time for terminal states, otherwise None.
+        """
+        now = time.monotonic()
+        timings = self.timings
+        if _RUNNING_CODES[self.state]:
+            left = self.gate
+            index = left * 3
+            timings[index + _EXITED] = now
+            entered = timings[index + _ENTERED]
+            if entered:
+                started = timings[index + _STARTED]
+                if started >= entered:
+                    _GATE_WAIT[left].observe(started - entered)
+                    _GATE_EXECUTION[left].observe(now - started)
+                else:
+                    if executed:
+                        timings[index + _STARTED] = now
+                    _GATE_WAIT[left].observe(now - entered)
+        if _RUNNING_CODES[state]:
+            timings[gate * 3 + _ENTERED] = now
+        left_terminal = _TERMINAL_RESULT_CODES[self.state] != -1
+        self.state = state
+        self.gate = gate
+        result = _TERMINAL_RESULT_CODES[state]
+        if result == -1:
+            if left_terminal:
+                self.result = _PENDING
+                self.completed_at = None
+                self.error_message = None
+                self.blocked_reason = None
+            return None
+        self.result = result
+        self.completed_at = at = time.time()
+        if state == _FAILED:
+            self.error_message = reason
+        elif state == _BLOCKED:
+            self.blocked_reason = reason
+        return at
+
+    def start_gate(self, gate: int) -> bool:
+        """Record that execution of ``gate`` started, once per visit.
+
+        Only needed when execution takes time before the run moves on, as
+        with ``run_gate``'s checks.
+
+        Returns:
+            False if the run is not at ``gate`` or its start is already recorded.
+        """
+        timings = self.timings
+        index = gate * 3
+        if (
+            self.gate != gate
+            or not _RUNNING_CODES[self.state]
+            or timings[index + _STARTED] >= timings[index + _ENTERED]
+        ):
+            return False
+        timings[index + _STARTED] = time.monotonic()
+        return True
+
+    def to_run(self, config: GateRunConfig) -> GateRun:
+        """The pydantic ``GateRun`` for this state."""
+        return GateRun(
+            run_id=config.run_id,
+            pr_number=config.pr_number,
+            config=config,
+            state=STATES[self.state],
+            result=RESULTS[self.result],
+            current_gate=GATES[self.gate] if self.gate != NO_GATE else None,
+            pipeline=self.pipeline,
+            started_at=self.started_at,
+            completed_at=(
+                datetime.fromtimestamp(self.completed_at, timezone.utc)
+                if self.completed_at is not None
+                else None
+            ),
+            error_message=self.error_message,
+            blocked_reason=self.blocked_reason,
+        )
+
+
+def _gate_timing(timings: array, gate: int) -> Optional[GateTiming]:
+    """Timestamps of the latest visit to ``gate``, or None if not reached."""
+    index = gate * 3
+    entered = timings[index + _ENTERED]
+    if not entered:
+        return None
+    started = timings[index + _STARTED]
+    exited = timings[index + _EXITED]
+    return GateTiming(
+        entered, started if started >= entered else None, exited if exited >= entered else None
+    )
+
+
+class TransitionRecorder(Protocol):
+    """Appends run transitions, e.g. ``packages.core.run_events.TransitionLog``."""
+
+    def append(self, transition: RunTransition, run: GateRun) -> None:
+        """Record ``transition``; ``run`` is the run state after it."""
+
+
+class RunRecorder(Protocol):
+    """Persists run snapshots, e.g. ``packages.core.run_store.RunStore``."""
+
+    def save(self, run: GateRun) -> None:
+        """Record the current state of ``run``."""
+
+
 class GateFramework:
     """Unified gate validation framework with state machine.
 
@@ -111,7 +513,7 @@ class GateFramework:
 
     Attributes:
         config: Configuration for the gate run.
-        run: The current gate run being executed.
+        run: The current gate run being executed, as a pydantic model.
 
     Example:
         >>> config = GateRunConfig(pr_number=123, run_id="run-001", mock_mode=True)
@@ -128,18 +530,110 @@ class GateFramework:
         tracking the current state and advancing only when a gate passes.
     """
 
-    def __init__(self, config: GateRunConfig) -> None:
+    def __init__(
+        self,
+        config: GateRunConfig,
+        graph: Optional[GateGraph] = None,
+        store: Optional[RunRecorder] = None,
+        log: Optional[TransitionRecorder] = None,
+        cache: Optional[GateResultCache] = None,
+    ) -> None:
         """Initialize the gate framework.
 
         Args:
             config: Configuration for the gate run.
+            graph: Check callables per gate, used by ``run_gate`` and
+                ``run_graph``. Gates without checks use the ``execute_*``
+                defaults.
+            store: Receives a snapshot of the run after every state
+                transition.
+            log: Receives every state transition as a ``RunTransition``.
+            cache: Passed gate results reused by ``run_gate`` for the same
+                head SHA, checks and run options.
         """
         self.config = config
-        self.run = GateRun(
-            run_id=config.run_id,
-            pr_number=config.pr_number,
-            config=config,
-        )
+        self.graph = graph or _NO_CHECKS
+        self.store = store
+        self.log = log
+        self.cache = cache
+        self._table = compile_state_table(config.skip_staging, config.skip_production)
+        self._core = RunCore(datetime.now(timezone.utc))
+        self._run: Optional[GateRun] = None
+        # Latest result of each gate executed through ``execute_gate``; created on first use.
+        self._results: Optional[dict[GateType, BaseModel]] = None
+
+    @classmethod
+    def restore(
+        cls,
+        run: GateRun,
+        graph: Optional[GateGraph] = None,
+        store: Optional[RunRecorder] = None,
+        log: Optional[TransitionRecorder] = None,
+        cache: Optional[GateResultCache] = None,
+    ) -> "GateFramework":
+        """Rebuild a framework around a previously persisted run.
+
+        Args:
+            run: Stored run; execution continues at its ``current_gate``.
+            graph: Check callables per gate.
+            store: Receives snapshots of later transitions.
+            log: Receives later transitions.
+            cache: Passed gate results to reuse.
+
+        Returns:
+            GateFramework whose ``run`` is ``run``.
+        """
+        framework = cls(run.config, graph=graph, store=store, log=log, cache=cache)
+        framework.run = run
+        return framework
+
+    @property
+    def run(self) -> GateRun:
+        """The run as a ``GateRun``.
+
+        Transitions update a compact ``RunCore``; the model is built the first
+        time it is read and kept up to date from then on, so runs nobody reads
+        never pay for pydantic assignments. Change the run through the
+        framework: direct changes to the model are not seen by it.
+        """
+        if self._run is None:
+            self._run = self._core.to_run(self.config)
+        return self._run
+
+    @run.setter
+    def run(self, run: GateRun) -> None:
+        self._core = RunCore.from_run(run)
+        self._run = run
+
+    @property
+    def state(self) -> RunState:
+        """Current run state, without building the ``GateRun``."""
+        return STATES[self._core.state]
+
+    @property
+    def current_gate(self) -> Optional[GateType]:
+        """Gate the run is at, without building the ``GateRun``."""
+        gate = self._core.gate
+        return GATES[gate] if gate != NO_GATE else None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the run is in one of the ``running_*`` states."""
+        return _RUNNING_CODES[self._core.state]
+
+    @property
+    def gate_timings(self) -> dict[GateType, GateTiming]:
+        """Timestamps of each gate the run reached in this process, built when read.
+
+        Not part of the ``GateRun``: ``time.monotonic()`` readings mean nothing
+        to another process, so persisted runs and API payloads leave them out.
+        """
+        timings = self._core.timings
+        return {
+            GATES[code]: timing
+            for code in range(len(GATES))
+            if (timing := _gate_timing(timings, code)) is not None
+        }
 
     def start_run(self) -> GateRun:
         """Start a new gate run.
@@ -147,36 +641,215 @@ class GateFramework:
         Returns:
             The initialized GateRun object.
         """
-        self.run.state = RunState.RUNNING_SAFETY
-        self.run.current_gate = GateType.SAFETY
+        self._start()
         return self.run
 
+    def _start(self) -> None:
+        """Start the run without building its ``GateRun``."""
+        self._transition(STATE_CODES[RunState.RUNNING_SAFETY], GATE_CODES[GateType.SAFETY])
+
+    def _transition(
+        self, state: int, gate: int, reason: Optional[str] = None, executed: bool = True
+    ) -> None:
+        """Move the run to ``state``, recording the transition.
+
+        Args:
+            state: New run state code.
+            gate: Code of the run's ``current_gate`` after the transition.
+            reason: Error message or blocked reason for terminal states.
+            executed: The gate being left was executed, rather than left
+                while waiting (see ``RunCore.move``).
+        """
+        from_state = self._core.state
+        at = self._core.move(state, gate, reason, executed)
+        if self._run is None and self.log is None:
+            self._persist()
+            return
+        transition = RunTransition(
+            self.config.run_id,
+            STATES[from_state],
+            STATES[state],
+            GATES[gate] if gate != NO_GATE else None,
+            at if at is not None else time.time(),
+            reason,
+        )
+        if self._run is not None:
+            transition.apply(self._run)
+        if self.log is not None:
+            self.log.append(transition, self.run)
+        self._persist()
+
+    def _persist(self) -> None:
+        if self.store is not None:
+            self.store.save(self.run)
+
+    def _start_gate(self, gate: GateType) -> None:
+        """Record that execution of ``gate`` started, if the run is waiting at it."""
+        self._core.start_gate(GATE_CODES[gate])
+
     def _advance_to_next_gate(self, current_gate: GateType) -> None:
         """Advance the run state to the next gate in sequence.
 
         Args:
             current_gate: The gate that just completed successfully.
         """
-        gate_transitions = {
-            GateType.SAFETY: (RunState.RUNNING_PLANNING, GateType.PLANNING),
-            GateType.PLANNING: (RunState.RUNNING_CI, GateType.CI),
-            GateType.CI: (
-                (RunState.RUNNING_PRODUCTION, GateType.PRODUCTION)
-                if self.config.skip_staging
-                else (RunState.RUNNING_STAGING, GateType.STAGING)
-            ),
-            GateType.STAGING: (
-                (RunState.RUNNING_LEARNING, GateType.LEARNING)
-                if self.config.skip_production
-                else (RunState.RUNNING_PRODUCTION, GateType.PRODUCTION)
-            ),
-            GateType.PRODUCTION: (RunState.RUNNING_LEARNING, GateType.LEARNING),
-            GateType.LEARNING: (RunState.COMPLETED, None),
-        }
+        next_state, next_gate = self._table[GATE_CODES[current_gate]]
+        self._transition(next_state, next_gate)
+
+    def execute_gate(self, gate: GateType, **inputs: bool) -> BaseModel:
+        """Execute ``gate`` through its ``execute_*_gate`` method.
+
+        The result is kept, so ``run_graph`` can build the pipeline of a
+        resumed run without executing the gate again.
+
+        Args:
+            gate: Gate to execute.
+            **inputs: Keyword arguments for the gate's ``execute_*_gate`` method.
+
+        Returns:
+            The gate's result model.
+        """
+        result = getattr(self, _EXECUTE_METHODS[gate])(**inputs)
+        if self._results is None:
+            self._results = {}
+        self._results[gate] = result
+        return result
+
+    async def run_gate(self, gate: GateType) -> BaseModel:
+        """Evaluate the graph's checks for ``gate`` concurrently, then execute it.
 
-        next_state, next_gate = gate_transitions[current_gate]
-        self.run.state = next_state
-        self.run.current_gate = next_gate
+        The first failing check fails the run immediately with its reason and
+        cancels the remaining checks, which are listed in the result's
+        ``cancelled_checks``. With ``config.collect_all_failures`` every check
+        runs and the error message lists all failures. Skipped gates are
+        executed without running their checks.
+
+        With a cache and a ``config.head_sha``, a passed result cached for
+        the same gate, commit, checks and run options is applied instead of
+        evaluating the checks; newly passed results are cached.
+
+        Args:
+            gate: Gate to run.
+
+        Returns:
+            The gate's result model.
+        """
+        self._start_gate(gate)
+        skipped = _skipped_gates(self.config.skip_staging, self.config.skip_production)
+        if gate in skipped:
+            return self.execute_gate(gate)
+
+        key = self._cache_key(gate)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return self.execute_gate(
+                    gate, **cached.model_dump(exclude={"status", "cancelled_checks"})
+                )
+
+        started = time.perf_counter()
+        label = GATE_LABELS[gate]
+        if self.config.collect_all_failures:
+            evaluation = await self.graph.evaluate(gate, fail_fast=False)
+            if evaluation.failures:
+                self._fail_run(f"{label} gate failed: {'; '.join(evaluation.failures)}")
+        else:
+            evaluation = await self.graph.evaluate(
+                gate, on_failure=lambda reason: self._fail_run(f"{label} gate failed: {reason}")
+            )
+        result = self.execute_gate(gate, **evaluation.passed)
+        result.cancelled_checks = evaluation.cancelled
+        if key is not None and result.status == GateStatus.PASSED:
+            self.cache.put(key, result, time.perf_counter() - started)
+        return result
+
+    def _cache_key(self, gate: GateType) -> Optional[GateCacheKey]:
+        if self.cache is None or not self.config.head_sha:
+            return None
+        inputs = fingerprint(
+            self.config.repo_slug, self.config.mock_mode, self.graph.signature(gate)
+        )
+        return gate, self.config.head_sha, inputs
+
+    async def run_graph(self) -> GateRun:
+        """Run every gate in graph order, stopping at the first failure.
+
+        A run that already started, such as one put back on its failed gate
+        by ``resume``, continues at its current gate: gates before it are not
+        executed again.
+
+        Returns:
+            The GateRun; its pipeline is built when all gates passed and the
+            result of every gate is known.
+        """
+        if self._core.state == _INITIALIZED:
+            self._start()
+        if self.is_running:
+            order = gate_sequence()
+            for gate in order[order.index(self.current_gate) :]:
+                if not self.is_running:
+                    break
+                await self.run_gate(gate)
+
+        if self._core.result == _PASSED and self._core.pipeline is None:
+            results = self._known_results()
+            if results is not None:
+                self.build_pipeline(
+                    **{f"{gate.value}_result": result for gate, result in results.items()}
+                )
+        return self.run
+
+    def _known_results(self) -> Optional[dict[GateType, BaseModel]]:
+        """Result of every gate, from this framework or else the cache.
+
+        Returns:
+            None if the result of some gate is unknown, e.g. for a run
+            resumed in another process without a cache.
+        """
+        known = self._results or {}
+        results = {}
+        for gate in gate_sequence():
+            result = known.get(gate)
+            if result is None:
+                key = self._cache_key(gate)
+                result = self.cache.get(key) if key is not None else None
+                if result is None:
+                    return None
+            results[gate] = result
+        return results
+
+    def resume(self, head_sha: Optional[str] = None) -> GateRun:
+        """Put a failed or blocked run back on the gate where it stopped.
+
+        Gates that already passed are not executed again: continue with
+        ``run_graph`` or the gate's ``execute_*`` method. Their results are
+        reused for the pipeline. A different ``head_sha`` invalidates them,
+        so the run restarts at the safety gate for the new commit.
+
+        Args:
+            head_sha: Commit to gate; None keeps ``config.head_sha``.
+
+        Returns:
+            The GateRun, running again.
+
+        Raises:
+            ValueError: If the run is not failed or blocked at a gate, or was
+                superseded by a run for a newer head commit.
+        """
+        core = self._core
+        if core.state not in (_FAILED, _BLOCKED) or core.gate == NO_GATE:
+            raise ValueError(f"Run {self.config.run_id} is {self.state.value}, not resumable")
+        if core.state == _BLOCKED and core.blocked_reason == SUPERSEDED_REASON:
+            raise ValueError(f"Run {self.config.run_id} was superseded, not resumable")
+        gate = core.gate
+        if head_sha is not None and head_sha != self.config.head_sha:
+            self.config = self.config.model_copy(update={"head_sha": head_sha})
+            if self._run is not None:
+                self._run.config = self.config
+            self._results = None
+            gate = GATE_CODES[GateType.SAFETY]
+        self._transition(STATE_CODES[GATE_STATES[GATES[gate]]], gate)
+        return self.run
 
     def execute_safety_gate(
         self,
@@ -302,7 +975,7 @@ class GateFramework:
             # CI gate already advanced state when skip_staging=True, but handle
             # the case where staging gate is called anyway for completeness.
             # This ensures the state machine advances correctly.
-            if self.run.state == RunState.RUNNING_STAGING:
+            if self._core.state == _RUNNING_STAGING:
                 self._advance_to_next_gate(GateType.STAGING)
             return StagingGateResult(
                 deployed_to_staging=False,
@@ -345,8 +1018,10 @@ class GateFramework:
             ProductionGateResult with the gate outcome.
         """
         if self.config.skip_production:
-            # Advance state machine even when skipping
-            self._advance_to_next_gate(GateType.PRODUCTION)
+            # Staging already advanced past production when skip_production=True;
+            # only a run still waiting at production is advanced.
+            if self._core.state == _RUNNING_PRODUCTION:
+                self._advance_to_next_gate(GateType.PRODUCTION)
             return ProductionGateResult(
                 deployed_to_production=False,
                 verification_passed=False,
@@ -411,27 +1086,24 @@ class GateFramework:
         Args:
             reason: Reason why the run is blocked.
         """
-        self.run.state = RunState.BLOCKED
-        self.run.result = RunResult.BLOCKED
-        self.run.blocked_reason = reason
-        self.run.completed_at = datetime.now(timezone.utc)
+        self._transition(_BLOCKED, self._core.gate, reason, executed=False)
 
     def _fail_run(self, message: str) -> None:
         """Mark the run as failed.
 
+        A run fails once: later calls keep the first message, so a gate that
+        failed fast on a check keeps that check's reason.
+
         Args:
             message: Error message describing the failure.
         """
-        self.run.state = RunState.FAILED
-        self.run.result = RunResult.FAILED
-        self.run.error_message = message
-        self.run.completed_at = datetime.now(timezone.utc)
+        if self._core.state == _FAILED:
+            return
+        self._transition(_FAILED, self._core.gate, message)
 
     def _complete_run(self) -> None:
         """Mark the run as completed successfully."""
-        self.run.state = RunState.COMPLETED
-        self.run.result = RunResult.PASSED
-        self.run.completed_at = datetime.now(timezone.utc)
+        self._transition(STATE_CODES[RunState.COMPLETED], self._core.gate)
 
     def build_pipeline(
         self,
@@ -455,7 +1127,7 @@ class GateFramework:
         Returns:
             GatePipeline containing all gate results.
         """
-        self.run.pipeline = GatePipeline(
+        self._core.pipeline = GatePipeline(
             pr_number=self.config.pr_number,
             safety_gate=safety_result,
             planning_gate=planning_result,
@@ -464,7 +1136,10 @@ class GateFramework:
             production_gate=production_result,
             learning_gate=learning_result,
         )
-        return self.run.pipeline
+        if self._run is not None:
+            self._run.pipeline = self._core.pipeline
+        self._persist()
+        return self._core.pipeline
 
     def execute_full_mock_run(self) -> GateRun:
         """Execute a complete mock run through all gates.
@@ -478,7 +1153,7 @@ class GateFramework:
         if not self.config.mock_mode:
             raise ValueError("Full mock run requires mock_mode=True in config")
 
-        self.start_run()
+        self._start()
 
         # Execute all gates with passing mock data
         safety_result = self.execute_safety_gate()
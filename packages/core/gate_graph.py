@@ -0,0 +1,278 @@
+"""Declarative gate graph: gate ordering and per-gate check DAGs.
+
+Gates form a dependency graph (``GATE_DEPENDENCIES``); skipped gates are
+compiled out of it once per skip configuration, producing the transition
+table ``GateFramework`` follows. Within a gate, each ``GateCheck`` computes
+one boolean field of the gate's result model. Checks declare dependencies on
+other checks of the same gate and run concurrently when independent; a check
+whose dependency failed is not run and counts as failed.
+
+Evaluation is fail-fast by default: the first failing check cancels its
+still-running siblings. Coroutine checks receive ``CancelledError`` at their
+next await and may clean up in ``finally``; checks running in worker threads
+cannot be interrupted, so their results are discarded. Pass
+``fail_fast=False`` to run every check and collect all failures.
+"""
+
+import asyncio
+import inspect
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import lru_cache
+from typing import Optional
+
+from pydantic import BaseModel
+
+from packages.core.schemas.gates import (
+    CIGateResult,
+    GateType,
+    LearningGateResult,
+    PlanningGateResult,
+    ProductionGateResult,
+    SafetyGateResult,
+    StagingGateResult,
+)
+
+# Gate -> gates that must pass before it runs.
+GATE_DEPENDENCIES: dict[GateType, tuple[GateType, ...]] = {
+    GateType.SAFETY: (),
+    GateType.PLANNING: (GateType.SAFETY,),
+    GateType.CI: (GateType.PLANNING,),
+    GateType.STAGING: (GateType.CI,),
+    GateType.PRODUCTION: (GateType.STAGING,),
+    GateType.LEARNING: (GateType.PRODUCTION,),
+}
+
+GATE_RESULT_MODELS: dict[GateType, type[BaseModel]] = {
+    GateType.SAFETY: SafetyGateResult,
+    GateType.PLANNING: PlanningGateResult,
+    GateType.CI: CIGateResult,
+    GateType.STAGING: StagingGateResult,
+    GateType.PRODUCTION: ProductionGateResult,
+    GateType.LEARNING: LearningGateResult,
+}
+
+CheckFn = Callable[[], bool | Awaitable[bool]]
+
+
+class CheckOutcome(str, Enum):
+    """Outcome of one check in a gate evaluation."""
+
+    PASSED = "passed"
+    FAILED = "failed"
+    SKIPPED = "skipped"  # A dependency failed.
+    CANCELLED = "cancelled"  # Another check failed first.
+
+
+@dataclass(frozen=True)
+class GateCheck:
+    """One check of a gate.
+
+    Attributes:
+        field: Boolean field of the gate's result model set by this check,
+            e.g. ``"lint_passed"``.
+        run: Callable returning whether the check passed. Coroutine functions
+            are awaited; plain callables run in a worker thread.
+        depends_on: Fields of checks in the same gate that must pass first.
+    """
+
+    field: str
+    run: CheckFn
+    depends_on: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class GateEvaluation:
+    """Outcomes of a gate's checks.
+
+    Attributes:
+        outcomes: Result field -> outcome, for every declared check.
+        failures: Reasons of failed checks in the order they failed.
+    """
+
+    outcomes: dict[str, CheckOutcome] = field(default_factory=dict)
+    failures: tuple[str, ...] = ()
+
+    @property
+    def passed(self) -> dict[str, bool]:
+        """Result field -> passed, the gate's ``execute_*`` inputs."""
+        return {name: outcome == CheckOutcome.PASSED for name, outcome in self.outcomes.items()}
+
+    @property
+    def cancelled(self) -> list[str]:
+        """Fields of checks cancelled after another check failed."""
+        return [
+            name for name, outcome in self.outcomes.items() if outcome == CheckOutcome.CANCELLED
+        ]
+
+
+def _toposort(nodes: Iterable[str], edges: dict[str, tuple[str, ...]]) -> tuple[str, ...]:
+    """Order ``nodes`` so every node follows its dependencies (stable for ties)."""
+    order: list[str] = []
+    state: dict[str, int] = {}
+
+    def visit(node: str, path: tuple[str, ...]) -> None:
+        if state.get(node) == 2:
+            return
+        if state.get(node) == 1:
+            raise ValueError(f"Dependency cycle: {' -> '.join((*path, node))}")
+        state[node] = 1
+        for dependency in edges.get(node, ()):
+            visit(dependency, (*path, node))
+        state[node] = 2
+        order.append(node)
+
+    for node in nodes:
+        visit(node, ())
+    return tuple(order)
+
+
+@lru_cache(maxsize=None)
+def gate_sequence(skipped: frozenset[GateType] = frozenset()) -> tuple[GateType, ...]:
+    """Gates in execution order with ``skipped`` gates removed."""
+    order = _toposort(GATE_DEPENDENCIES, GATE_DEPENDENCIES)
+    return tuple(gate for gate in order if gate not in skipped)
+
+
+@lru_cache(maxsize=None)
+def next_gates(skipped: frozenset[GateType] = frozenset()) -> dict[GateType, GateType | None]:
+    """Gate -> gate that runs after it passes, None after the last gate.
+
+    Skipped gates keep an entry pointing at the next gate that runs, so a
+    skipped gate that is executed anyway still advances the run correctly.
+    """
+    full = _toposort(GATE_DEPENDENCIES, GATE_DEPENDENCIES)
+    transitions: dict[GateType, GateType | None] = {}
+    for index, gate in enumerate(full):
+        transitions[gate] = next(
+            (later for later in full[index + 1 :] if later not in skipped), None
+        )
+    return transitions
+
+
+class GateGraph:
+    """Check callables per gate, validated and ordered once at construction.
+
+    Example:
+        >>> graph = GateGraph({
+        ...     GateType.CI: [
+        ...         GateCheck("lint_passed", run_lint),
+        ...         GateCheck("unit_tests_passed", run_tests),
+        ...         GateCheck("security_scan_passed", run_scan, depends_on=("lint_passed",)),
+        ...     ]
+        ... })
+        >>> await framework.run_gate(GateType.CI)  # lint and tests run concurrently
+    """
+
+    def __init__(self, checks: dict[GateType, Iterable[GateCheck]] | None = None) -> None:
+        self._checks: dict[GateType, dict[str, GateCheck]] = {}
+        self._order: dict[GateType, tuple[str, ...]] = {}
+        self._signatures: dict[GateType, tuple[tuple[str, str, tuple[str, ...]], ...]] = {}
+        for gate, gate_checks in (checks or {}).items():
+            by_field = {check.field: check for check in gate_checks}
+            fields = GATE_RESULT_MODELS[gate].model_fields
+            for check in by_field.values():
+                if check.field not in fields or fields[check.field].annotation is not bool:
+                    raise ValueError(f"{gate.value} gate has no result field {check.field!r}")
+                unknown = set(check.depends_on) - by_field.keys()
+                if unknown:
+                    raise ValueError(
+                        f"{gate.value} check {check.field!r} depends on unknown "
+                        f"checks {sorted(unknown)}"
+                    )
+            edges = {field: check.depends_on for field, check in by_field.items()}
+            self._order[gate] = _toposort(by_field, edges)
+            self._checks[gate] = by_field
+            self._signatures[gate] = tuple(
+                (name, _qualified_name(by_field[name].run), by_field[name].depends_on)
+                for name in self._order[gate]
+            )
+
+    def signature(self, gate: GateType) -> tuple[tuple[str, str, tuple[str, ...]], ...]:
+        """Identity of ``gate``'s checks: (field, callable name, dependencies) each.
+
+        Used in gate result cache keys, so a changed check set is a cache miss.
+        """
+        return self._signatures.get(gate, ())
+
+    def checks(self, gate: GateType) -> tuple[GateCheck, ...]:
+        """Checks of ``gate`` in dependency order."""
+        return tuple(self._checks[gate][field] for field in self._order.get(gate, ()))
+
+    async def evaluate(
+        self,
+        gate: GateType,
+        fail_fast: bool = True,
+        on_failure: Optional[Callable[[str], None]] = None,
+    ) -> GateEvaluation:
+        """Run the checks of ``gate`` concurrently where independent.
+
+        Args:
+            gate: Gate whose checks to run.
+            fail_fast: Cancel the remaining checks as soon as one fails.
+                False runs every check, for diagnostics.
+            on_failure: Called with the failure reason as soon as the first
+                check fails, before the remaining checks are cancelled.
+
+        Returns:
+            GateEvaluation with an outcome for every declared check.
+        """
+        tasks: dict[str, asyncio.Task[tuple[CheckOutcome, Optional[str]]]] = {}
+        for check in self.checks(gate):
+            dependencies = [tasks[name] for name in check.depends_on]
+            tasks[check.field] = asyncio.ensure_future(_run_check(check, dependencies))
+        if not tasks:
+            return GateEvaluation()
+
+        failures: list[str] = []
+        pending = set(tasks.values())
+        try:
+            while pending and not (failures and fail_fast):
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in tasks.values():
+                    if task in done and (reason := task.result()[1]) is not None:
+                        if not failures and on_failure is not None:
+                            on_failure(reason)
+                        failures.append(reason)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+
+        outcomes = {
+            name: CheckOutcome.CANCELLED if task.cancelled() else task.result()[0]
+            for name, task in tasks.items()
+        }
+        return GateEvaluation(outcomes, tuple(failures))
+
+
+def _qualified_name(fn: CheckFn) -> str:
+    return f"{getattr(fn, '__module__', '')}.{getattr(fn, '__qualname__', repr(fn))}"
+
+
+async def _run_check(
+    check: GateCheck, dependencies: list[asyncio.Task[tuple[CheckOutcome, Optional[str]]]]
+) -> tuple[CheckOutcome, Optional[str]]:
+    """Run one check once its dependencies finished.
+
+    Returns:
+        (outcome, failure reason); the reason is None unless the check failed.
+    """
+    if dependencies:
+        await asyncio.wait(dependencies)
+        if any(
+            task.cancelled() or task.result()[0] != CheckOutcome.PASSED for task in dependencies
+        ):
+            return CheckOutcome.SKIPPED, None
+    try:
+        if inspect.iscoroutinefunction(check.run):
+            passed = await check.run()
+        else:
+            passed = await asyncio.to_thread(check.run)
+    except Exception as e:
+        return CheckOutcome.FAILED, f"{check.field}: {e}"
+    if passed:
+        return CheckOutcome.PASSED, None
+    return CheckOutcome.FAILED, check.field
@@ -0,0 +1,358 @@
+"""Reactive gate orchestration driven by GitHub webhooks.
+
+``GateOrchestrator`` is a webhook subscriber and an internal event bus in
+front of ``GateFramework``. Events are partitioned by pull request: each PR
+has a FIFO queue drained by at most one task, so events for one PR apply in
+delivery order while different PRs progress concurrently.
+
+- ``pull_request`` opened, reopened or synchronize starts a new ``GateRun``
+  for the head SHA. Gates that need no external signal (safety, planning,
+  learning) run as soon as the run reaches them.
+- ``check_suite`` completed reads the head commit's check runs and executes
+  the CI gate once every mapped check has concluded, or one has failed.
+- ``deployment_status`` for the staging or production environment executes
+  the matching gate.
+
+Time from webhook receipt to each gate decision is recorded in the
+``gate_event_decision_seconds`` histogram.
+
+With a ``RunStore``, every transition is persisted and runs that were in
+flight when the process stopped are resumed on construction, so later
+webhooks for those PRs continue where the run left off.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import deque
+from typing import Any, Protocol
+
+from packages.core.adapters.github_adapter import GitHubAdapter
+from packages.core.gate_framework import (
+    SUPERSEDED_REASON,
+    GateFramework,
+    GateRun,
+    GateRunConfig,
+)
+from packages.core.logging import get_logger
+from packages.core.metrics import registry
+from packages.core.run_events import TransitionLog
+from packages.core.run_store import RunStore
+from packages.core.schemas.gates import GateStatus, GateType
+from packages.core.schemas.github import CheckRunSummary, CheckWaitResult
+from packages.core.schemas.webhooks import WebhookEvent
+
+gate_events = registry.counter(
+    "gate_events_total", "Webhook events seen by the gate orchestrator, by event and outcome"
+)
+decision_latency = registry.histogram(
+    "gate_event_decision_seconds", "Time from webhook receipt to gate decision, by event and gate"
+)
+queue_wait = registry.histogram(
+    "gate_event_queue_seconds", "Time webhook events wait in their PR queue"
+)
+
+START_ACTIONS = frozenset({"opened", "reopened", "synchronize"})
+
+# Deployment environment -> gate decided by its deployment statuses.
+DEFAULT_ENVIRONMENTS = {"staging": GateType.STAGING, "production": GateType.PRODUCTION}
+
+# Gates executed as soon as a run reaches them, from ``GateInputProvider`` inputs.
+AUTOMATIC_GATES = frozenset({GateType.SAFETY, GateType.PLANNING, GateType.LEARNING})
+
+_FINAL_DEPLOYMENT_STATES = frozenset({"success", "failure", "error"})
+
+PRKey = tuple[str, int]
+
+
+class GateInputProvider(Protocol):
+    """Source of gate inputs that webhooks do not carry."""
+
+    def inputs(self, run: GateRun, gate: GateType) -> dict[str, bool]:
+        """Keyword arguments for the gate's ``execute_*_gate`` method."""
+
+
+class GateOrchestrator:
+    """Drive ``GateFramework`` runs from webhook events.
+
+    Register the instance as a webhook subscriber (``register_subscriber``).
+    Queues and runs live on the event loop of the first ``handle`` call made
+    from a running loop (the webhook endpoint); events delivered from other
+    threads are handed to that loop.
+
+    Args:
+        adapter: Adapter used to read check runs when a check suite completes.
+        inputs: Inputs for gates not decided by webhooks. Without one, those
+            gates use the ``GateFramework`` defaults.
+        ci_checks: ``CIGateResult`` field -> check run name, overriding
+            ``DEFAULT_CI_CHECKS``.
+        environments: Deployment environment -> gate, replacing
+            ``DEFAULT_ENVIRONMENTS``.
+        skip_staging: Passed to every ``GateRunConfig``.
+        skip_production: Passed to every ``GateRunConfig``.
+        mock_mode: Passed to every ``GateRunConfig``.
+        max_concurrency: PR queues processed at the same time.
+        store: Persists runs; its non-terminal runs are resumed at construction.
+        log: Records every run transition.
+    """
+
+    def __init__(
+        self,
+        adapter: GitHubAdapter,
+        inputs: GateInputProvider | None = None,
+        ci_checks: dict[str, str] | None = None,
+        environments: dict[str, GateType] | None = None,
+        skip_staging: bool = False,
+        skip_production: bool = False,
+        mock_mode: bool = True,
+        max_concurrency: int = 64,
+        store: RunStore | None = None,
+        log: TransitionLog | None = None,
+    ) -> None:
+        self._adapter = adapter
+        self._inputs = inputs
+        self._ci_checks = ci_checks
+        self._environments = environments or DEFAULT_ENVIRONMENTS
+        self._run_options = {
+            "skip_staging": skip_staging,
+            "skip_production": skip_production,
+            "mock_mode": mock_mode,
+        }
+        self._max_concurrency = max_concurrency
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queues: dict[PRKey, deque[tuple[WebhookEvent, float]]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._runs: dict[PRKey, GateFramework] = {}
+        self._by_head: dict[tuple[str, str], PRKey] = {}
+        self._logger = get_logger("gate_orchestrator")
+        self._store = store
+        self._log = log
+        if store is not None:
+            for framework in store.resume(log=log):
+                if framework.config.repo_slug is not None:
+                    self._track(framework)
+
+    def get_run(self, repo_slug: str, pr_number: int) -> GateRun | None:
+        """Latest run for a PR, or None if no run was started."""
+        framework = self._runs.get((repo_slug, pr_number))
+        return framework.run if framework is not None else None
+
+    def runs(self) -> list[GateRun]:
+        """Latest run of every tracked PR."""
+        return [framework.run for framework in self._runs.values()]
+
+    def handle(self, event: WebhookEvent) -> None:
+        """Queue a webhook event behind earlier events for the same PR."""
+        received = time.perf_counter()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if self._loop is None or self._loop.is_closed():
+            if running is None:
+                gate_events.inc(event=event.event_type, outcome="dropped")
+                self._logger.warning(
+                    "webhook_event_id=%s dropped: no event loop bound", event.event_id
+                )
+                return
+            self._loop = running
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        if running is self._loop:
+            self._dispatch(event, received)
+        else:
+            self._loop.call_soon_threadsafe(self._dispatch, event, received)
+
+    async def drain(self) -> None:
+        """Wait until every queued event has been processed."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _dispatch(self, event: WebhookEvent, received: float) -> None:
+        keys = self._route(event)
+        if not keys:
+            gate_events.inc(event=event.event_type, outcome="ignored")
+            return
+        for key in keys:
+            queue = self._queues.get(key)
+            if queue is None:
+                queue = self._queues[key] = deque()
+                task = asyncio.ensure_future(self._drain_queue(key, queue))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            queue.append((event, received))
+
+    def _route(self, event: WebhookEvent) -> list[PRKey]:
+        """PRs an event applies to."""
+        payload = event.payload
+        repo_slug = payload.get("repository", {}).get("full_name")
+        if not repo_slug:
+            return []
+        if event.event_type == "pull_request":
+            pull_request = payload.get("pull_request") or {}
+            number = pull_request.get("number")
+            action = payload.get("action")
+            if number is None or (action not in START_ACTIONS and action != "closed"):
+                return []
+            key = (repo_slug, int(number))
+            head_sha = pull_request.get("head", {}).get("sha")
+            if action in START_ACTIONS and head_sha:
+                # Indexed on arrival so unlinked events queued behind this one find the PR.
+                self._by_head[(repo_slug, head_sha)] = key
+            return [key]
+        elif event.event_type == "check_suite" and payload.get("action") == "completed":
+            suite = payload.get("check_suite") or {}
+            numbers = [pr["number"] for pr in suite.get("pull_requests") or [] if "number" in pr]
+            if numbers:
+                return [(repo_slug, int(number)) for number in numbers]
+            # Suites on fork PRs carry no PR links; match on the head commit instead.
+            key = self._by_head.get((repo_slug, suite.get("head_sha")))
+            return [key] if key else []
+        elif event.event_type == "deployment_status":
+            deployment = payload.get("deployment") or {}
+            extra = deployment.get("payload")
+            if isinstance(extra, dict) and extra.get("pr_number") is not None:
+                return [(repo_slug, int(extra["pr_number"]))]
+            key = self._by_head.get((repo_slug, deployment.get("sha")))
+            return [key] if key else []
+        return []
+
+    async def _drain_queue(self, key: PRKey, queue: deque[tuple[WebhookEvent, float]]) -> None:
+        try:
+            while queue:
+                event, received = queue.popleft()
+                queue_wait.observe(time.perf_counter() - received)
+                async with self._semaphore:
+                    await self._process(key, event, received)
+        finally:
+            del self._queues[key]
+
+    async def _process(self, key: PRKey, event: WebhookEvent, received: float) -> None:
+        try:
+            if event.event_type == "pull_request":
+                decided = self._on_pull_request(key, event.payload)
+            elif event.event_type == "check_suite":
+                decided = await self._on_check_suite(key, event.payload)
+            else:
+                decided = self._on_deployment_status(key, event.payload)
+        except Exception:
+            gate_events.inc(event=event.event_type, outcome="error")
+            self._logger.exception(
+                "webhook_event_id=%s pr=%s#%s processing failed", event.event_id, *key
+            )
+            return
+        gate_events.inc(event=event.event_type, outcome="applied" if decided else "ignored")
+        elapsed = time.perf_counter() - received
+        for gate in decided:
+            decision_latency.observe(elapsed, event=event.event_type, gate=gate.value)
+
+    def _on_pull_request(self, key: PRKey, payload: dict[str, Any]) -> list[GateType]:
+        framework = self._runs.get(key)
+        if payload.get("action") == "closed":
+            if framework is not None:
+                if framework.is_running:
+                    framework.block_run("Pull request closed")
+                self._forget(key, framework)
+            return []
+
+        head_sha = (payload.get("pull_request") or {}).get("head", {}).get("sha")
+        if framework is not None:
+            if framework.config.head_sha == head_sha:
+                # Redelivery or reopen of the commit already being gated.
+                return []
+            if framework.is_running:
+                framework.block_run(SUPERSEDED_REASON)
+            self._forget(key, framework)
+        config = GateRunConfig(
+            pr_number=key[1],
+            run_id=uuid.uuid4().hex,
+            repo_slug=key[0],
+            head_sha=head_sha,
+            **self._run_options,
+        )
+        framework = GateFramework(config, store=self._store, log=self._log)
+        self._track(framework)
+        framework.start_run()
+        return self._run_automatic(framework)
+
+    async def _on_check_suite(self, key: PRKey, payload: dict[str, Any]) -> list[GateType]:
+        framework = self._runs.get(key)
+        suite = payload.get("check_suite") or {}
+        if (
+            framework is None
+            or not _at_gate(framework, GateType.CI)
+            or suite.get("head_sha") != framework.config.head_sha
+        ):
+            return []
+
+        runs = await asyncio.to_thread(self._adapter.get_check_runs, *key)
+        if self._runs.get(key) is not framework or not _at_gate(framework, GateType.CI):
+            return []
+        checks = CheckWaitResult(
+            repo_slug=key[0],
+            pr_number=key[1],
+            head_sha=framework.config.head_sha,
+            check_runs=[CheckRunSummary(**run) for run in runs],
+        ).to_ci_gate_result(self._ci_checks)
+        if checks.status == GateStatus.PENDING:
+            # Another suite is still running; its completion triggers the next read.
+            return []
+        framework.execute_ci_gate(**checks.model_dump(exclude={"status", "cancelled_checks"}))
+        return [GateType.CI, *self._run_automatic(framework)]
+
+    def _on_deployment_status(self, key: PRKey, payload: dict[str, Any]) -> list[GateType]:
+        framework = self._runs.get(key)
+        deployment = payload.get("deployment") or {}
+        status = payload.get("deployment_status") or {}
+        gate = self._environments.get(deployment.get("environment"))
+        state = status.get("state")
+        if (
+            framework is None
+            or gate is None
+            or state not in _FINAL_DEPLOYMENT_STATES
+            or not _at_gate(framework, gate)
+        ):
+            return []
+
+        succeeded = state == "success"
+        evidence = bool(
+            status.get("log_url") or status.get("target_url") or status.get("environment_url")
+        )
+        if gate == GateType.STAGING:
+            observed = {
+                "deployed_to_staging": succeeded,
+                "smoke_tests_passed": succeeded,
+                "evidence_attached": succeeded and evidence,
+            }
+        else:
+            observed = {"deployed_to_production": succeeded, "verification_passed": succeeded}
+        self._execute(framework, gate, observed)
+        return [gate, *self._run_automatic(framework)]
+
+    def _run_automatic(self, framework: GateFramework) -> list[GateType]:
+        decided = []
+        while framework.is_running and framework.current_gate in AUTOMATIC_GATES:
+            gate = framework.current_gate
+            self._execute(framework, gate, {})
+            decided.append(gate)
+        return decided
+
+    def _execute(self, framework: GateFramework, gate: GateType, observed: dict[str, bool]) -> None:
+        inputs = self._inputs.inputs(framework.run, gate) if self._inputs is not None else {}
+        framework.execute_gate(gate, **{**inputs, **observed})
+
+    def _track(self, framework: GateFramework) -> None:
+        key = (framework.config.repo_slug, framework.config.pr_number)
+        self._runs[key] = framework
+        if framework.config.head_sha:
+            self._by_head[(key[0], framework.config.head_sha)] = key
+
+    def _forget(self, key: PRKey, framework: GateFramework) -> None:
+        self._runs.pop(key, None)
+        head_sha = framework.config.head_sha
+        if head_sha and self._by_head.get((key[0], head_sha)) == key:
+            del self._by_head[(key[0], head_sha)]
+
+
+def _at_gate(framework: GateFramework, gate: GateType) -> bool:
+    return framework.is_running and framework.current_gate == gate
@@ -0,0 +1,367 @@
+"""Scheduling of many concurrent gate runs on a bounded worker pool.
+
+``GateRunManager`` owns every active ``GateFramework``. Work is scheduled one
+gate at a time: a run waits in its repository's queue, a worker executes its
+current gate with ``GateFramework.run_gate`` and, if the run is still
+running, queues it again for the next gate. Because each gate is a separate
+turn, long pipelines interleave with short ones instead of holding a worker
+from start to finish.
+
+Workers pick from the highest priority that has queued work and, within a
+priority, rotate across repositories, so a repository with thousands of
+queued runs gets the same share of workers as one with a single run. Within
+a repository, runs are served in submission order.
+
+Time each run waits in the queue before a gate starts is recorded in the
+``gate_queue_wait_seconds`` histogram, labelled by gate.
+
+A run submitted with a ``head_sha`` supersedes the active runs of the same
+pull request for other commits: they are stopped and blocked with
+``SUPERSEDED_REASON``, and a ``LockHolder`` releases their locks. The time
+from the new push being received to each superseded run stopping is recorded
+in ``gate_run_supersede_seconds``. The latest head of each pull request is
+kept, ordered by push time, so a late or redelivered push for an older head
+is refused instead of superseding the run for a newer one.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Optional, Protocol
+
+from packages.core.gate_cache import GateResultCache
+from packages.core.gate_framework import (
+    SUPERSEDED_REASON,
+    GateFramework,
+    GateRun,
+    GateRunConfig,
+    RunRecorder,
+    TransitionRecorder,
+)
+from packages.core.gate_graph import GateGraph
+from packages.core.logging import get_logger
+from packages.core.metrics import registry
+
+gate_queue_wait = registry.histogram(
+    "gate_queue_wait_seconds", "Time gate runs wait for a worker before a gate, by gate"
+)
+active_runs = registry.gauge("gate_runs_active", "Gate runs owned by the run manager")
+supersede_latency = registry.histogram(
+    "gate_run_supersede_seconds",
+    "Time from receiving a push to stopping the runs it superseded",
+)
+
+CANCELLED_REASON = "Cancelled"
+
+PRKey = tuple[str, int]
+
+
+class SupersededHeadError(ValueError):
+    """A run was submitted for a head older than its pull request's latest."""
+
+
+class LockHolder(Protocol):
+    """Holds locks on behalf of runs, e.g. deployment locks per environment."""
+
+    def release(self, run: GateRun) -> None:
+        """Release every lock held for ``run``, which was stopped."""
+
+
+@dataclass(slots=True)
+class _Entry:
+    framework: GateFramework
+    repo: str
+    priority: int
+    queued_at: float = 0.0
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+    # Set by cancel and supersession, so a stop is not confused with close().
+    stop_requested: bool = False
+    stop_reason: str = CANCELLED_REASON
+    # perf_counter() reading when the stop was requested (or its push received).
+    stop_requested_at: float = 0.0
+
+
+class GateRunManager:
+    """Own active gate runs and execute their gates on a bounded worker pool.
+
+    The manager binds to the event loop of its first ``submit``; call its
+    methods from that loop.
+
+    Args:
+        max_workers: Gates executing at the same time.
+        graph: Check graph for every run.
+        store: Persists every run's transitions.
+        log: Records every run's transitions.
+        cache: Passed gate results shared by every run.
+        locks: Releases the locks of runs the manager stops.
+        max_finished: Finished runs kept for ``status`` (oldest dropped first),
+            and pull requests whose latest head is remembered.
+
+    Example:
+        >>> manager = GateRunManager(max_workers=32)
+        >>> run_id = manager.submit(GateRunConfig(pr_number=1, run_id="", repo_slug="o/r"))
+        >>> await manager.join()
+        >>> manager.status(run_id).state
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 32,
+        graph: Optional[GateGraph] = None,
+        store: Optional[RunRecorder] = None,
+        log: Optional[TransitionRecorder] = None,
+        cache: Optional[GateResultCache] = None,
+        locks: Optional[LockHolder] = None,
+        max_finished: int = 10_000,
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_finished = max_finished
+        self._graph = graph
+        self._store = store
+        self._log = log
+        self._cache = cache
+        self._locks = locks
+        self._active: dict[str, _Entry] = {}
+        # Active run ids per pull request, for supersession.
+        self._by_pr: dict[PRKey, set[str]] = {}
+        # Latest (pushed_at, head_sha) per pull request, least recently pushed first.
+        self._heads: OrderedDict[PRKey, tuple[float, str]] = OrderedDict()
+        self._finished: OrderedDict[str, GateRun] = OrderedDict()
+        # priority -> repositories with queued runs, in rotation order.
+        self._ready: dict[int, deque[str]] = {}
+        # (priority, repo) -> queued runs in submission order.
+        self._queues: dict[tuple[int, str], deque[_Entry]] = {}
+        self._queued = 0
+        self._busy = 0
+        # One release per queued entry; released entries of cancelled runs are skipped.
+        self._available: Optional[asyncio.Semaphore] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._workers: list[asyncio.Task] = []
+        self._logger = get_logger("gate_run_manager")
+
+    def submit(
+        self,
+        config: GateRunConfig,
+        priority: int = 0,
+        received_at: Optional[float] = None,
+        pushed_at: Optional[float] = None,
+    ) -> str:
+        """Start a run and queue its first gate.
+
+        With a ``config.head_sha``, active runs of the same pull request for
+        other commits are superseded, unless a later push of another head was
+        already submitted.
+
+        Args:
+            config: Run configuration. An empty ``run_id`` is replaced by a
+                generated one.
+            priority: Higher runs first; runs of equal priority share workers
+                fairly across repositories.
+            received_at: ``time.perf_counter()`` reading when the push that
+                triggered the run was received; defaults to now.
+            pushed_at: Epoch seconds of the push that produced ``head_sha``,
+                e.g. from the webhook payload; defaults to now. Orders the
+                heads of a pull request.
+
+        Returns:
+            The run id.
+
+        Raises:
+            SupersededHeadError: If a later push of another head of the pull
+                request was already submitted.
+        """
+        self._ensure_workers()
+        if not config.run_id:
+            config = config.model_copy(update={"run_id": uuid.uuid4().hex})
+        if config.run_id in self._active:
+            raise ValueError(f"Run {config.run_id} is already active")
+        if config.head_sha:
+            self._advance_head(config, time.time() if pushed_at is None else pushed_at)
+            self._supersede(config, time.perf_counter() if received_at is None else received_at)
+        framework = GateFramework(
+            config, graph=self._graph, store=self._store, log=self._log, cache=self._cache
+        )
+        framework.start_run()
+        entry = _Entry(framework, config.repo_slug or "", priority)
+        self._active[config.run_id] = entry
+        self._by_pr.setdefault(_pr_key(config), set()).add(config.run_id)
+        active_runs.set(len(self._active))
+        self._enqueue(entry)
+        return config.run_id
+
+    def status(self, run_id: str) -> Optional[GateRun]:
+        """Current state of an active or recently finished run."""
+        entry = self._active.get(run_id)
+        return entry.framework.run if entry is not None else self._finished.get(run_id)
+
+    def cancel(self, run_id: str, reason: str = CANCELLED_REASON) -> bool:
+        """Block an active run, interrupting its gate if one is executing.
+
+        Args:
+            run_id: Run to cancel.
+            reason: Blocked reason recorded on the run.
+
+        Returns:
+            False if the run is not active.
+        """
+        return self._request_stop(run_id, reason, time.perf_counter())
+
+    def _advance_head(self, config: GateRunConfig, pushed_at: float) -> None:
+        """Record ``config.head_sha`` as its pull request's latest head."""
+        key = _pr_key(config)
+        latest = self._heads.get(key)
+        if latest is not None and latest[1] != config.head_sha and pushed_at < latest[0]:
+            raise SupersededHeadError(
+                f"Head {config.head_sha} of {key[0]}#{key[1]} is older than {latest[1]}"
+            )
+        if latest is None or pushed_at >= latest[0]:
+            self._heads[key] = (pushed_at, config.head_sha)
+            self._heads.move_to_end(key)
+            while len(self._heads) > self.max_finished:
+                self._heads.popitem(last=False)
+
+    def _supersede(self, config: GateRunConfig, received_at: float) -> None:
+        for run_id in list(self._by_pr.get(_pr_key(config), ())):
+            if self._active[run_id].framework.config.head_sha != config.head_sha:
+                self._request_stop(run_id, SUPERSEDED_REASON, received_at)
+
+    def _request_stop(self, run_id: str, reason: str, requested_at: float) -> bool:
+        entry = self._active.get(run_id)
+        if entry is None:
+            return False
+        entry.stop_requested = True
+        entry.stop_reason = reason
+        entry.stop_requested_at = requested_at
+        if entry.task is None or not entry.task.cancel():
+            # Queued (the worker that pops it skips it) or its gate just finished.
+            self._stop(entry)
+            self._finish(entry)
+        return True
+
+    def _stop(self, entry: _Entry) -> None:
+        """Block a run whose stop was requested and release its locks."""
+        framework = entry.framework
+        if framework.is_running:
+            framework.block_run(entry.stop_reason)
+        if entry.stop_reason == SUPERSEDED_REASON:
+            supersede_latency.observe(time.perf_counter() - entry.stop_requested_at)
+        if self._locks is not None:
+            self._locks.release(framework.run)
+
+    def stats(self) -> dict[str, int]:
+        """Active, queued and executing run counts."""
+        return {"active": len(self._active), "queued": self._queued, "executing": self._busy}
+
+    async def join(self) -> None:
+        """Wait until no run is queued or executing."""
+        if self._idle is not None:
+            await self._idle.wait()
+
+    async def close(self) -> None:
+        """Stop the workers; runs still active stay at their current gate."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def _ensure_workers(self) -> None:
+        if self._workers:
+            return
+        self._available = asyncio.Semaphore(0)
+        self._idle = asyncio.Event()
+        self._workers = [
+            asyncio.get_running_loop().create_task(self._work()) for _ in range(self.max_workers)
+        ]
+
+    def _enqueue(self, entry: _Entry) -> None:
+        entry.queued_at = time.perf_counter()
+        key = (entry.priority, entry.repo)
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = deque()
+            self._ready.setdefault(entry.priority, deque()).append(entry.repo)
+        queue.append(entry)
+        self._queued += 1
+        self._idle.clear()
+        self._available.release()
+
+    def _pop(self) -> Optional[_Entry]:
+        """Next queued run: highest priority, rotating across repositories."""
+        while self._ready:
+            priority = max(self._ready)
+            repos = self._ready[priority]
+            repo = repos.popleft()
+            queue = self._queues[(priority, repo)]
+            entry = queue.popleft()
+            self._queued -= 1
+            if queue:
+                repos.append(repo)
+            else:
+                del self._queues[(priority, repo)]
+            if not repos:
+                del self._ready[priority]
+            if self._active.get(entry.framework.config.run_id) is entry:
+                return entry
+        return None
+
+    async def _work(self) -> None:
+        while True:
+            await self._available.acquire()
+            entry = self._pop()
+            if entry is None:
+                self._check_idle()
+                continue
+            self._busy += 1
+            try:
+                await self._execute(entry)
+            finally:
+                self._busy -= 1
+                self._check_idle()
+
+    async def _execute(self, entry: _Entry) -> None:
+        framework = entry.framework
+        gate = framework.current_gate
+        gate_queue_wait.observe(time.perf_counter() - entry.queued_at, gate=gate.value)
+        entry.task = asyncio.ensure_future(framework.run_gate(gate))
+        try:
+            await entry.task
+        except asyncio.CancelledError:
+            if not entry.stop_requested or asyncio.current_task().cancelling():
+                # The worker itself is being cancelled: leave the run at its gate.
+                entry.task.cancel()
+                raise
+            self._stop(entry)
+        except Exception as e:
+            self._logger.exception("run_id=%s gate=%s raised", framework.config.run_id, gate.value)
+            framework.block_run(f"{gate.value} gate raised {type(e).__name__}: {e}")
+        finally:
+            entry.task = None
+
+        if framework.is_running:
+            self._enqueue(entry)
+        else:
+            self._finish(entry)
+
+    def _finish(self, entry: _Entry) -> None:
+        run = entry.framework.run
+        if self._active.pop(run.run_id, None) is None:
+            return
+        key = _pr_key(entry.framework.config)
+        run_ids = self._by_pr[key]
+        run_ids.discard(run.run_id)
+        if not run_ids:
+            del self._by_pr[key]
+        active_runs.set(len(self._active))
+        self._finished[run.run_id] = run
+        while len(self._finished) > self.max_finished:
+            self._finished.popitem(last=False)
+
+    def _check_idle(self) -> None:
+        if not self._queued and not self._busy:
+            self._idle.set()
+
+
+def _pr_key(config: GateRunConfig) -> PRKey:
+    return config.repo_slug or "", config.pr_number
@@ -0,0 +1,219 @@
+"""Merge queue that gates ready pull requests through staging in batches.
+
+Gating every pull request through staging and production on its own
+serializes the release train. ``MergeQueue`` takes runs that are ready for
+merge and gates up to ``batch_size`` of them with one combined staging and
+production run. A run waiting at the staging gate, or at the production
+gate when it skips staging, has passed safety, planning and CI, which is
+what ``GatePipeline.is_ready_for_merge`` checks. Each combined gate holds
+only the runs that still need it, so runs skipping a gate are not deployed
+to it; a run that skips both merges without a combined run.
+
+When a combined run fails, the batch is bisected. The first half is gated
+on its own: if it passes, it merges and the failure must come from the
+second half, which is split further without another run; if it fails,
+both halves are resolved separately. A single bad pull request in a batch
+of ``n`` therefore costs at most ``2 * log2(n)`` extra runs, and the good pull
+requests still merge. Combined runs are counted in
+``merge_queue_batch_runs_total``, labelled by result.
+
+If the gate raises, the runs of the batch that were not merged or rejected
+are put back at the head of the queue before the error propagates.
+"""
+
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Optional, Protocol
+
+from packages.core.gate_framework import GateFramework, GateRun, RunState
+from packages.core.metrics import registry
+from packages.core.schemas.gates import GateType
+
+batch_runs = registry.counter(
+    "merge_queue_batch_runs_total", "Combined staging/production runs, by result"
+)
+
+# States of a run that passed CI and is waiting at a batch gate.
+_READY = (RunState.RUNNING_STAGING, RunState.RUNNING_PRODUCTION)
+
+# Inputs that fail each batch gate for a rejected pull request.
+_FAILED_INPUTS = {
+    GateType.STAGING: {"smoke_tests_passed": False},
+    GateType.PRODUCTION: {"verification_passed": False},
+}
+
+
+class BatchGate(Protocol):
+    """Deploys and verifies the combined changes of several pull requests."""
+
+    async def run(self, gate: GateType, runs: Sequence[GateRun]) -> bool:
+        """Run ``gate`` (staging or production) for ``runs`` together.
+
+        Returns:
+            True if the gate passed for the combined changes.
+        """
+
+
+@dataclass(slots=True)
+class BatchResult:
+    """Outcome of gating one batch.
+
+    Attributes:
+        merged: Run ids that passed staging and production, in queue order.
+        rejected: Run ids isolated as failing, in queue order.
+        runs: Combined runs executed, including the first one.
+    """
+
+    merged: list[str] = field(default_factory=list)
+    rejected: list[str] = field(default_factory=list)
+    runs: int = 0
+
+
+class MergeQueue:
+    """Gate runs waiting at the staging gate in batches, bisecting failures.
+
+    Args:
+        gate: Runs the combined staging and production gates.
+        batch_size: Most runs gated by one combined run.
+
+    Example:
+        >>> queue = MergeQueue(deployer, batch_size=8)
+        >>> for framework in ready:
+        ...     queue.enqueue(framework)
+        >>> results = await queue.drain()
+    """
+
+    def __init__(self, gate: BatchGate, batch_size: int = 8) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.batch_size = batch_size
+        self._gate = gate
+        self._queue: deque[GateFramework] = deque()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self, framework: GateFramework) -> None:
+        """Queue a run that is ready for merge.
+
+        Raises:
+            ValueError: If the run is not waiting at the staging or production gate.
+        """
+        if framework.state not in _READY:
+            raise ValueError(
+                f"Run {framework.config.run_id} is {framework.state.value}, not ready for merge"
+            )
+        self._queue.append(framework)
+
+    async def run_batch(self) -> Optional[BatchResult]:
+        """Gate the next batch of queued runs.
+
+        Returns:
+            The batch outcome, or None if the queue is empty.
+
+        Raises:
+            Exception: Whatever the gate raised, after putting the runs it left
+                unresolved back at the head of the queue.
+        """
+        if not self._queue:
+            return None
+        count = min(self.batch_size, len(self._queue))
+        batch = [self._queue.popleft() for _ in range(count)]
+        result = BatchResult()
+        try:
+            await self._settle(batch, None, result)
+        except BaseException:
+            resolved = {*result.merged, *result.rejected}
+            self._queue.extendleft(
+                framework
+                for framework in reversed(batch)
+                if framework.config.run_id not in resolved and framework.state in _READY
+            )
+            raise
+        order = {framework.config.run_id: index for index, framework in enumerate(batch)}
+        result.merged.sort(key=order.__getitem__)
+        result.rejected.sort(key=order.__getitem__)
+        return result
+
+    async def drain(self) -> list[BatchResult]:
+        """Gate batches until the queue is empty."""
+        results = []
+        while (result := await self.run_batch()) is not None:
+            results.append(result)
+        return results
+
+    async def _settle(
+        self, batch: list[GateFramework], failed: Optional[GateType], result: BatchResult
+    ) -> None:
+        """Merge or reject every run in ``batch``.
+
+        Args:
+            batch: Runs to resolve.
+            failed: Gate the combined ``batch`` is known to fail; None if untested.
+            result: Receives merged and rejected run ids and the run count.
+        """
+        if failed is None:
+            failed = await self._verify(batch, result)
+            if failed is None:
+                self._merge(batch, result)
+                return
+        if len(batch) == 1:
+            self._reject(batch[0], failed, result)
+            return
+        middle = len(batch) // 2
+        first, second = batch[:middle], batch[middle:]
+        first_failed = await self._verify(first, result)
+        if first_failed is None:
+            self._merge(first, result)
+            # The whole batch failed and its first half passed on its own, so
+            # the second half fails too if any of its runs took that gate.
+            if not any(failed in _pending_gates(framework) for framework in second):
+                failed = None
+            await self._settle(second, failed, result)
+        else:
+            await self._settle(first, first_failed, result)
+            await self._settle(second, None, result)
+
+    async def _verify(self, batch: list[GateFramework], result: BatchResult) -> Optional[GateType]:
+        """Run the combined gates; returns the first that failed, or None.
+
+        Each gate runs for the runs of ``batch`` that still need it.
+        """
+        pending = [(framework.run, _pending_gates(framework)) for framework in batch]
+        gates = [gate for gate in _FAILED_INPUTS if any(gate in needs for _, needs in pending)]
+        if not gates:
+            return None
+        result.runs += 1
+        for gate in gates:
+            if not await self._gate.run(gate, [run for run, needs in pending if gate in needs]):
+                batch_runs.inc(result="failed")
+                return gate
+        batch_runs.inc(result="passed")
+        return None
+
+    def _merge(self, batch: list[GateFramework], result: BatchResult) -> None:
+        for framework in batch:
+            for gate in _pending_gates(framework):
+                framework.execute_gate(gate)
+            if framework.state in _READY:
+                # It skips every batch gate and waits at a skipped one, which advances it.
+                framework.execute_gate(framework.current_gate)
+            result.merged.append(framework.config.run_id)
+
+    def _reject(self, framework: GateFramework, gate: GateType, result: BatchResult) -> None:
+        if gate == GateType.PRODUCTION and GateType.STAGING in _pending_gates(framework):
+            framework.execute_gate(GateType.STAGING)
+        framework.execute_gate(gate, **_FAILED_INPUTS[gate])
+        result.rejected.append(framework.config.run_id)
+
+
+def _pending_gates(framework: GateFramework) -> tuple[GateType, ...]:
+    """Batch gates ``framework`` still has to pass, in order."""
+    config = framework.config
+    gates = ()
+    if framework.state == RunState.RUNNING_STAGING and not config.skip_staging:
+        gates += (GateType.STAGING,)
+    if not config.skip_production:
+        gates += (GateType.PRODUCTION,)
+    return gates
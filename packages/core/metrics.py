@@ -0,0 +1,305 @@
+"""In-process metrics registry for adapter and framework instrumentation."""
+
+import bisect
+import threading
+from array import array
+from typing import Any
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _label_key(labels: dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class Counter:
+    """Monotonically increasing counter with optional labels."""
+
+    def __init__(self, name: str, description: str = "") -> None:
+        self.name = name
+        self.description = description
+        self._values: dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        """Increment the counter for the given label set."""
+        self._inc(_label_key(labels), amount)
+
+    def labels(self, **labels: Any) -> "BoundMetric":
+        """Bind a label set once so hot paths skip per-call label handling."""
+        return BoundMetric(self, _label_key(labels))
+
+    def _inc(self, key: LabelKey, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """Return the current value for the given label set."""
+        return self._values.get(_label_key(labels), 0.0)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            values = [{"labels": dict(key), "value": value} for key, value in self._values.items()]
+        return {"type": "counter", "description": self.description, "values": values}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge:
+    """Last-value gauge with optional labels."""
+
+    def __init__(self, name: str, description: str = "") -> None:
+        self.name = name
+        self.description = description
+        self._values: dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels: Any) -> None:
+        """Set the gauge for the given label set."""
+        self._set(_label_key(labels), value)
+
+    def labels(self, **labels: Any) -> "BoundMetric":
+        """Bind a label set once so hot paths skip per-call label handling."""
+        return BoundMetric(self, _label_key(labels))
+
+    def _set(self, key: LabelKey, value: float) -> None:
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels: Any) -> float | None:
+        """Return the last value for the given label set, or None if never set."""
+        return self._values.get(_label_key(labels))
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            values = [{"labels": dict(key), "value": value} for key, value in self._values.items()]
+        return {"type": "gauge", "description": self.description, "values": values}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+SNAPSHOT_QUANTILES = {"p50": 0.5, "p95": 0.95, "p99": 0.99}
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram with optional labels."""
+
+    def __init__(
+        self, name: str, description: str = "", buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts (+Inf last)..., count, sum]
+        self._values: dict[LabelKey, list[float]] = {}
+        self._buffers: list[BufferedObserver] = []
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Record one observation for the given label set."""
+        self._observe(_label_key(labels), value)
+
+    def labels(self, **labels: Any) -> "BoundMetric":
+        """Bind a label set once so hot paths skip per-call label handling."""
+        return BoundMetric(self, _label_key(labels))
+
+    def buffered(self, flush_at: int = 256, **labels: Any) -> "BufferedObserver":
+        """Bind a label set whose observations skip the lock until read.
+
+        For paths where even a bound ``observe`` is too slow: values are
+        appended to a buffer that is added to the histogram before every read
+        of it, and whenever ``flush_at`` values are pending.
+        """
+        observer = BufferedObserver(self, _label_key(labels), flush_at)
+        with self._lock:
+            self._buffers.append(observer)
+        return observer
+
+    def _observe(self, key: LabelKey, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series(key)
+            series[index] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def _series(self, key: LabelKey) -> list[float]:
+        series = self._values.get(key)
+        if series is None:
+            series = [0.0] * (len(self.buckets) + 3)
+            self._values[key] = series
+        return series
+
+    def _drain(self, observer: "BufferedObserver") -> None:
+        """Add an observer's pending values, counting each bucket once per batch."""
+        with self._lock:
+            pending = observer.pending
+            count = len(pending)
+            if not count:
+                return
+            values = sorted(pending[:count])
+            # Values appended meanwhile stay pending.
+            del pending[:count]
+            series = self._series(observer.key)
+            below = 0
+            for index, bound in enumerate(self.buckets):
+                upto = bisect.bisect_right(values, bound, below)
+                series[index] += upto - below
+                below = upto
+            series[-3] += count - below
+            series[-2] += count
+            series[-1] += sum(values)
+
+    def _flush(self) -> None:
+        for observer in self._buffers:
+            if observer.pending:
+                self._drain(observer)
+
+    def count(self, **labels: Any) -> int:
+        self._flush()
+        series = self._values.get(_label_key(labels))
+        return int(series[-2]) if series else 0
+
+    def sum(self, **labels: Any) -> float:
+        self._flush()
+        series = self._values.get(_label_key(labels))
+        return series[-1] if series else 0.0
+
+    def quantile(self, q: float, **labels: Any) -> float:
+        """Estimate the ``q`` quantile (0..1) from the bucket counts.
+
+        Interpolates linearly within the bucket holding the quantile, like
+        Prometheus ``histogram_quantile``; observations above the last bucket
+        report its bound.
+        """
+        self._flush()
+        series = self._values.get(_label_key(labels))
+        return self._quantile(list(series), q) if series else 0.0
+
+    def _quantile(self, series: list[float], q: float) -> float:
+        rank = q * series[-2]
+        seen = 0.0
+        for index, bound in enumerate(self.buckets):
+            count = series[index]
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def snapshot(self) -> dict[str, Any]:
+        self._flush()
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._values.items()]
+        values = []
+        for key, series in items:
+            bounds = [*(str(bound) for bound in self.buckets), "+Inf"]
+            values.append(
+                {
+                    "labels": dict(key),
+                    "buckets": dict(zip(bounds, series[:-2])),
+                    "count": int(series[-2]),
+                    "sum": series[-1],
+                    "quantiles": {
+                        name: self._quantile(series, q) for name, q in SNAPSHOT_QUANTILES.items()
+                    },
+                }
+            )
+        return {"type": "histogram", "description": self.description, "values": values}
+
+    def reset(self) -> None:
+        with self._lock:
+            for observer in self._buffers:
+                del observer.pending[:]
+            self._values.clear()
+
+
+class BufferedObserver:
+    """A histogram label set observed without locking, as returned by ``buffered()``."""
+
+    __slots__ = ("histogram", "key", "pending", "flush_at")
+
+    def __init__(self, histogram: Histogram, key: LabelKey, flush_at: int) -> None:
+        self.histogram = histogram
+        self.key = key
+        self.pending = array("d")
+        self.flush_at = flush_at
+
+    def observe(self, value: float) -> None:
+        pending = self.pending
+        pending.append(value)
+        if len(pending) >= self.flush_at:
+            self.histogram._drain(self)
+
+
+class BoundMetric:
+    """A metric with a fixed label set, as returned by ``labels()``."""
+
+    __slots__ = ("_metric", "_key")
+
+    def __init__(self, metric: Any, key: LabelKey) -> None:
+        self._metric = metric
+        self._key = key
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._metric._inc(self._key, amount)
+
+    def set(self, value: float) -> None:
+        self._metric._set(self._key, value)
+
+    def observe(self, value: float) -> None:
+        self._metric._observe(self._key, value)
+
+
+class MetricsRegistry:
+    """Registry of named metrics exported via the metrics endpoint."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Gauge | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        """Get or create a counter by name."""
+        return self._get_or_create(name, Counter, lambda: Counter(name, description))
+
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        """Get or create a gauge by name."""
+        return self._get_or_create(name, Gauge, lambda: Gauge(name, description))
+
+    def histogram(
+        self, name: str, description: str = "", buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Get or create a histogram by name."""
+        return self._get_or_create(name, Histogram, lambda: Histogram(name, description, buckets))
+
+    def _get_or_create(self, name: str, kind: type, factory: Any) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = factory()
+                self._metrics[name] = metric
+            elif not isinstance(metric, kind):
+                raise ValueError(f"Metric {name!r} is already registered with another type")
+            return metric
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a JSON-serializable view of every registered metric."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+    def reset(self) -> None:
+        """Reset all metric values (primarily for tests)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,221 @@
+"""Append-only log of gate run transitions with periodic snapshots.
+
+Every state change of a ``GateRun`` is appended as a compact
+``RunTransition`` (run, from, to, gate, time, reason). A run's first
+transition and every ``snapshot_every``-th one after it also store a full
+``GateRun`` snapshot, so rebuilding a run replays only the transitions since
+the nearest snapshot. ``replay`` reconstructs a run as it was at any point in
+time, which makes audits a lookup instead of a reconstruction from logs.
+
+With a ``path``, the log is also written to a JSON-lines file: one
+``["t", run_id, from, to, gate, at, reason]`` line per transition and one
+``["s", run_id, index, run_json]`` line per snapshot. Writes are buffered;
+``flush`` forces them to the OS. Opening an existing file loads it back.
+
+Only the ``max_finished`` most recently finished runs (completed, failed or
+blocked) are kept in memory; older ones are dropped, oldest first, and
+remain only in the file. A dropped run that is resumed starts a new history
+with a snapshot.
+"""
+
+import bisect
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Optional
+
+from packages.core.gate_framework import TERMINAL_RESULTS, GateRun, RunState, RunTransition
+from packages.core.schemas.gates import GateType
+
+
+class _RunHistory:
+    """Transitions of one run and its snapshots (transition index -> run JSON)."""
+
+    __slots__ = ("transitions", "snapshot_indexes", "snapshots")
+
+    def __init__(self) -> None:
+        self.transitions: list[RunTransition] = []
+        self.snapshot_indexes: list[int] = []
+        self.snapshots: list[str] = []
+
+
+class TransitionLog:
+    """Transition history of gate runs, kept in memory and optionally on disk.
+
+    Args:
+        path: JSON-lines file to append to; loaded first if it exists.
+        snapshot_every: Transitions between snapshots of the same run.
+        max_finished: Finished runs kept in memory (oldest dropped first).
+
+    Example:
+        >>> log = TransitionLog("transitions.jsonl")
+        >>> framework = GateFramework(config, log=log)
+        >>> framework.execute_full_mock_run()
+        >>> log.replay(config.run_id, at=started_at).state
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        snapshot_every: int = 32,
+        max_finished: int = 10_000,
+    ) -> None:
+        self.path = Path(path) if path is not None else None
+        self.snapshot_every = snapshot_every
+        self.max_finished = max_finished
+        self._runs: dict[str, _RunHistory] = {}
+        # Runs whose last transition finished them, least recently finished first.
+        self._finished: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+        self._file: Optional[IO[str]] = None
+        if self.path is not None:
+            if self.path.exists():
+                self._load(self.path)
+            self._file = self.path.open("a", encoding="utf-8")
+
+    def append(self, transition: RunTransition, run: GateRun) -> None:
+        """Append ``transition``; ``run`` is snapshotted when one is due."""
+        with self._lock:
+            history = self._runs.get(transition.run_id)
+            if history is None:
+                history = self._runs[transition.run_id] = _RunHistory()
+            index = len(history.transitions)
+            history.transitions.append(transition)
+            snapshot = None
+            if index % self.snapshot_every == 0:
+                snapshot = run.model_dump_json()
+                history.snapshot_indexes.append(index)
+                history.snapshots.append(snapshot)
+            if self._file is not None:
+                self._file.write(_encode(transition))
+                if snapshot is not None:
+                    self._file.write(json.dumps(["s", transition.run_id, index, snapshot]) + "\n")
+            if transition.to_state in TERMINAL_RESULTS or transition.from_state in TERMINAL_RESULTS:
+                self._track(transition)
+
+    def transitions(self, run_id: str) -> list[RunTransition]:
+        """Every transition of ``run_id`` in order."""
+        with self._lock:
+            history = self._runs.get(run_id)
+            return list(history.transitions) if history else []
+
+    def replay(self, run_id: str, at: Optional[datetime] = None) -> Optional[GateRun]:
+        """Reconstruct a run from its nearest snapshot and later transitions.
+
+        Args:
+            run_id: Run to reconstruct.
+            at: Point in time; None for the current state.
+
+        Returns:
+            The run as it was at ``at``, or None if it had no transition yet.
+            Fields that transitions do not change, such as the pipeline, are
+            as of the snapshot used.
+        """
+        with self._lock:
+            history = self._runs.get(run_id)
+            if history is None:
+                return None
+            transitions = history.transitions
+            end = len(transitions)
+            if at is not None:
+                cutoff = at.timestamp()
+                end = bisect.bisect_right(transitions, cutoff, key=lambda t: t.at)
+            if end == 0:
+                return None
+            # Nearest snapshot taken at or before the last transition to apply.
+            position = bisect.bisect_right(history.snapshot_indexes, end - 1) - 1
+            start = history.snapshot_indexes[position]
+            snapshot = history.snapshots[position]
+            pending = transitions[start + 1 : end]
+        run = GateRun.model_validate_json(snapshot)
+        for transition in pending:
+            transition.apply(run)
+        return run
+
+    def run_ids(self) -> list[str]:
+        """Runs kept in memory, in order of first transition."""
+        with self._lock:
+            return list(self._runs)
+
+    def flush(self) -> None:
+        """Write buffered lines to the file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _load(self, path: Path) -> None:
+        data = path.read_bytes()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            # Drop a torn final write from a crash so appends start on a new line.
+            with path.open("r+b") as f:
+                f.truncate(end)
+        for line in data[:end].decode("utf-8").splitlines():
+            record = json.loads(line)
+            history = self._runs.get(record[1])
+            if history is None:
+                history = self._runs[record[1]] = _RunHistory()
+            if record[0] == "t":
+                transition = _decode(record)
+                history.transitions.append(transition)
+                self._track(transition)
+                continue
+            index = record[2]
+            if index != len(history.transitions) - 1:
+                # The run was dropped and resumed; its history restarts here.
+                restarted = self._runs[record[1]] = _RunHistory()
+                restarted.transitions.append(history.transitions[-1])
+                history = restarted
+            history.snapshot_indexes.append(index)
+            history.snapshots.append(record[3])
+
+    def _track(self, transition: RunTransition) -> None:
+        """Record whether the run is finished and drop the oldest finished runs."""
+        run_id = transition.run_id
+        if transition.to_state in TERMINAL_RESULTS:
+            self._finished[run_id] = None
+            self._finished.move_to_end(run_id)
+            while len(self._finished) > self.max_finished:
+                evicted, _ = self._finished.popitem(last=False)
+                del self._runs[evicted]
+        elif transition.from_state in TERMINAL_RESULTS:
+            self._finished.pop(run_id, None)
+
+
+def _encode(transition: RunTransition) -> str:
+    gate = transition.gate.value if transition.gate is not None else None
+    return (
+        json.dumps(
+            [
+                "t",
+                transition.run_id,
+                transition.from_state.value,
+                transition.to_state.value,
+                gate,
+                transition.at,
+                transition.reason,
+            ]
+        )
+        + "\n"
+    )
+
+
+def _decode(record: list) -> RunTransition:
+    _, run_id, from_state, to_state, gate, at, reason = record
+    return RunTransition(
+        run_id,
+        RunState(from_state),
+        RunState(to_state),
+        GateType(gate) if gate is not None else None,
+        at,
+        reason,
+    )
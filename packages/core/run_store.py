@@ -0,0 +1,318 @@
+"""SQLite-backed persistence for gate runs.
+
+``GateRun`` objects otherwise live only inside their ``GateFramework``, so a
+restart loses every in-flight run. A ``RunStore`` keeps the latest snapshot
+of each run in a SQLite database in WAL mode, with indexes for the common
+queries (by PR, state, result and start time).
+
+Saves are cheap for the caller: the run is serialized and queued, and a
+writer thread commits queued snapshots in batches, one transaction per
+batch. Several transitions of the same run between batches collapse into a
+single row write. ``flush`` waits for queued snapshots to be committed;
+queries flush first so they always see every saved transition. A failed
+commit stops the writer, and later saves raise its error instead of being
+dropped.
+
+On startup, ``resume`` rebuilds a ``GateFramework`` for every run that had
+not reached a terminal state.
+"""
+
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from packages.core.gate_framework import (
+    TERMINAL_RESULTS,
+    GateFramework,
+    GateRun,
+    RunResult,
+    RunState,
+    TransitionRecorder,
+)
+from packages.core.gate_graph import GateGraph
+from packages.core.metrics import registry
+
+run_store_batch_size = registry.histogram(
+    "gate_run_store_batch_size", "Run snapshots committed per write transaction"
+)
+run_store_commit_duration = registry.histogram(
+    "gate_run_store_commit_seconds", "Duration of run store write transactions"
+)
+
+TERMINAL_STATES = frozenset(TERMINAL_RESULTS)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    pr_number INTEGER NOT NULL,
+    repo_slug TEXT,
+    state TEXT NOT NULL,
+    result TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    completed_at REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_pr_number ON runs (pr_number, started_at);
+CREATE INDEX IF NOT EXISTS runs_state ON runs (state, started_at);
+CREATE INDEX IF NOT EXISTS runs_result ON runs (result, started_at);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs (started_at);
+"""
+
+_UPSERT = """
+INSERT INTO runs (run_id, pr_number, repo_slug, state, result, started_at, completed_at, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (run_id) DO UPDATE SET
+    state = excluded.state,
+    result = excluded.result,
+    completed_at = excluded.completed_at,
+    data = excluded.data
+"""
+
+Row = tuple[str, int, Optional[str], str, str, float, Optional[float], str]
+
+
+class RunStore:
+    """Gate run snapshots in a SQLite database with batched background writes.
+
+    Args:
+        path: Database file; created with its schema if missing. ``":memory:"``
+            is not supported because reads and writes use separate connections.
+        flush_interval: Seconds the writer waits to gather more snapshots
+            before committing a batch.
+        batch_size: Snapshots that trigger a commit without waiting.
+
+    Example:
+        >>> store = RunStore("runs.db")
+        >>> framework = GateFramework(config, store=store)
+        >>> framework.start_run()  # queued, committed by the writer thread
+        >>> store.query(state=RunState.BLOCKED)
+    """
+
+    def __init__(
+        self, path: str | Path, flush_interval: float = 0.05, batch_size: int = 500
+    ) -> None:
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._writer = self._connect()
+        self._writer.executescript(_SCHEMA)
+        self._reader = self._connect()
+        self._read_lock = threading.Lock()
+
+        self._cond = threading.Condition()
+        self._pending: dict[str, Row] = {}
+        self._submitted = 0
+        self._committed = 0
+        self._flushing = 0
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._write_loop, name="run-store", daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        # WAL with synchronous=NORMAL survives process crashes; only an OS
+        # crash can lose the last committed batches.
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def save(self, run: GateRun) -> None:
+        """Queue a snapshot of ``run`` for the next batch.
+
+        Raises:
+            RuntimeError: The store is closed.
+            sqlite3.Error: The writer failed to commit an earlier batch.
+        """
+        row = (
+            run.run_id,
+            run.pr_number,
+            run.config.repo_slug,
+            run.state.value,
+            run.result.value,
+            run.started_at.timestamp(),
+            run.completed_at.timestamp() if run.completed_at else None,
+            run.model_dump_json(),
+        )
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("RunStore is closed")
+            if self._error is not None:
+                raise self._error
+            self._pending[run.run_id] = row
+            self._submitted += 1
+            # Wake the writer to start a batch, and again once the batch is full.
+            if len(self._pending) in (1, self.batch_size):
+                self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Block until every snapshot queued so far is committed.
+
+        Raises:
+            sqlite3.Error: The writer failed to commit a batch.
+        """
+        with self._cond:
+            target = self._submitted
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                self._cond.wait_for(lambda: self._committed >= target or self._error is not None)
+            finally:
+                self._flushing -= 1
+            if self._error is not None:
+                raise self._error
+
+    def get(self, run_id: str) -> Optional[GateRun]:
+        """Latest snapshot of a run, including one still queued."""
+        with self._cond:
+            row = self._pending.get(run_id)
+        if row is not None:
+            return GateRun.model_validate_json(row[-1])
+        with self._read_lock:
+            found = self._reader.execute(
+                "SELECT data FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return GateRun.model_validate_json(found[0]) if found else None
+
+    def query(
+        self,
+        pr_number: Optional[int] = None,
+        state: Optional[RunState] = None,
+        result: Optional[RunResult] = None,
+        started_after: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> list[GateRun]:
+        """Runs matching every given filter, newest first.
+
+        Args:
+            pr_number: Only runs for this PR.
+            state: Only runs in this state.
+            result: Only runs with this result.
+            started_after: Only runs started after this time.
+            limit: Maximum number of runs returned.
+
+        Returns:
+            Matching runs ordered by ``started_at`` descending.
+        """
+        clauses, params = _filters(pr_number, state, result, started_after)
+        sql = "SELECT data FROM runs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY started_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        rows = self._read(sql, params)
+        return [GateRun.model_validate_json(data) for (data,) in rows]
+
+    def count(
+        self,
+        pr_number: Optional[int] = None,
+        state: Optional[RunState] = None,
+        result: Optional[RunResult] = None,
+        started_after: Optional[datetime] = None,
+    ) -> int:
+        """Number of runs matching every given filter."""
+        clauses, params = _filters(pr_number, state, result, started_after)
+        sql = "SELECT COUNT(*) FROM runs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return self._read(sql, params)[0][0]
+
+    def active(self) -> list[GateRun]:
+        """Runs that have not reached a terminal state, oldest first."""
+        placeholders = ", ".join("?" for _ in TERMINAL_STATES)
+        rows = self._read(
+            f"SELECT data FROM runs WHERE state NOT IN ({placeholders}) ORDER BY started_at",
+            [state.value for state in TERMINAL_STATES],
+        )
+        return [GateRun.model_validate_json(data) for (data,) in rows]
+
+    def resume(
+        self, graph: Optional[GateGraph] = None, log: Optional[TransitionRecorder] = None
+    ) -> list[GateFramework]:
+        """Rebuild frameworks for every non-terminal run, persisting to this store.
+
+        Args:
+            graph: Check graph for the rebuilt frameworks.
+            log: Receives later transitions of the rebuilt runs.
+
+        Returns:
+            One framework per active run, positioned at its stored gate.
+        """
+        return [
+            GateFramework.restore(run, graph=graph, store=self, log=log) for run in self.active()
+        ]
+
+    def close(self) -> None:
+        """Commit queued snapshots and close the database."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        self._writer.close()
+        self._reader.close()
+
+    def _read(self, sql: str, params: Iterable) -> list[tuple]:
+        self.flush()
+        with self._read_lock:
+            return self._reader.execute(sql, list(params)).fetchall()
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                self._cond.wait_for(
+                    lambda: len(self._pending) >= self.batch_size or self._flushing or self._closed,
+                    timeout=self.flush_interval,
+                )
+                batch, self._pending = self._pending, {}
+                target = self._submitted
+
+            started = time.perf_counter()
+            try:
+                with self._writer:
+                    self._writer.execute("BEGIN")
+                    self._writer.executemany(_UPSERT, batch.values())
+            except sqlite3.Error as e:
+                with self._cond:
+                    self._error = e
+                    self._cond.notify_all()
+                return
+            run_store_commit_duration.observe(time.perf_counter() - started)
+            run_store_batch_size.observe(len(batch))
+
+            with self._cond:
+                self._committed = target
+                self._cond.notify_all()
+
+
+def _filters(
+    pr_number: Optional[int],
+    state: Optional[RunState],
+    result: Optional[RunResult],
+    started_after: Optional[datetime],
+) -> tuple[list[str], list]:
+    clauses: list[str] = []
+    params: list = []
+    if pr_number is not None:
+        clauses.append("pr_number = ?")
+        params.append(pr_number)
+    if state is not None:
+        clauses.append("state = ?")
+        params.append(state.value)
+    if result is not None:
+        clauses.append("result = ?")
+        params.append(result.value)
+    if started_after is not None:
+        clauses.append("started_at > ?")
+        params.append(started_after.timestamp())
+    return clauses, params
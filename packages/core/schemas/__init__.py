@@ -18,6 +18,7 @@ from packages.core.schemas.error import ErrorResponse
 from packages.core.schemas.gates import (
     CIGateResult,
     GatePipeline,
+    GateResult,
     GateStatus,
     GateType,
     LearningGateResult,
@@ -26,6 +27,14 @@ from packages.core.schemas.gates import (
     SafetyGateResult,
     StagingGateResult,
 )
+from packages.core.schemas.github import (
+    CheckRunSummary,
+    CheckWaitResult,
+    CommitStatusSummary,
+    FileChange,
+    PRSnapshot,
+    TreeEntry,
+)
 from packages.core.schemas.health import HealthResponse, MetaResponse
 from packages.core.schemas.knowledge import (
     AutomationSuggestion,
@@ -84,6 +93,7 @@ __all__ = [
     # Gate schemas
     "CIGateResult",
     "GatePipeline",
+    "GateResult",
     "GateStatus",
     "GateType",
     "LearningGateResult",
@@ -91,6 +101,13 @@ __all__ = [
     "ProductionGateResult",
     "SafetyGateResult",
     "StagingGateResult",
+    # GitHub schemas
+    "CheckRunSummary",
+    "CheckWaitResult",
+    "CommitStatusSummary",
+    "FileChange",
+    "PRSnapshot",
+    "TreeEntry",
     # Knowledge schemas
     "AutomationSuggestion",
     "DeployNotes",
@@ -25,7 +25,15 @@ class GateStatus(str, Enum):
     SKIPPED = "skipped"
 
 
-class SafetyGateResult(BaseModel):
+class GateResult(BaseModel):
+    """Fields shared by the results of every gate."""
+
+    cancelled_checks: list[str] = Field(
+        default_factory=list, description="Checks cancelled after another check failed"
+    )
+
+
+class SafetyGateResult(GateResult):
     """Results from Safety Gate (Gate -1)."""
 
     forbidden_paths_checked: bool = Field(..., description="No forbidden paths were touched")
@@ -34,7 +42,7 @@ class SafetyGateResult(BaseModel):
     status: GateStatus = GateStatus.PENDING
 
 
-class PlanningGateResult(BaseModel):
+class PlanningGateResult(GateResult):
     """Results from Planning Gate (Gate 0)."""
 
     prd_provided: bool = Field(..., description="PRD or DoD provided by BA")
@@ -43,7 +51,7 @@ class PlanningGateResult(BaseModel):
     status: GateStatus = GateStatus.PENDING
 
 
-class CIGateResult(BaseModel):
+class CIGateResult(GateResult):
     """Results from CI Gate (Gate 1)."""
 
     lint_passed: bool = Field(..., description="Linting passed")
@@ -55,7 +63,7 @@ class CIGateResult(BaseModel):
     status: GateStatus = GateStatus.PENDING
 
 
-class StagingGateResult(BaseModel):
+class StagingGateResult(GateResult):
     """Results from Staging Gate (Gate 2)."""
 
     deployed_to_staging: bool = Field(..., description="PR SHA deployed to staging")
@@ -64,7 +72,7 @@ class StagingGateResult(BaseModel):
     status: GateStatus = GateStatus.PENDING
 
 
-class ProductionGateResult(BaseModel):
+class ProductionGateResult(GateResult):
     """Results from Production Gate (Gate 3)."""
 
     deployed_to_production: bool = Field(..., description="Main SHA deployed to production")
@@ -73,7 +81,7 @@ class ProductionGateResult(BaseModel):
     status: GateStatus = GateStatus.PENDING
 
 
-class LearningGateResult(BaseModel):
+class LearningGateResult(GateResult):
     """Results from Learning Gate (Gate 4)."""
 
     post_run_report_generated: bool = Field(..., description="Post-run report generated")
@@ -0,0 +1,159 @@
+"""GitHub read-model schemas returned by the adapter."""
+
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field
+
+from packages.core.schemas.gates import CIGateResult, GateStatus
+
+# Check run conclusions that count as passing.
+PASSING_CONCLUSIONS = frozenset({"success", "neutral", "skipped"})
+
+# CIGateResult field -> check run name used by ``CheckWaitResult.to_ci_gate_result``.
+DEFAULT_CI_CHECKS = {
+    "lint_passed": "lint",
+    "unit_tests_passed": "unit-tests",
+    "security_scan_passed": "security-scan",
+    "dependency_check_passed": "dependency-check",
+}
+
+
+class CheckRunSummary(BaseModel):
+    """A single check run on a commit."""
+
+    id: int
+    name: str
+    status: str = Field(..., description="queued, in_progress or completed")
+    conclusion: Optional[str] = Field(None, description="Conclusion once completed")
+    html_url: Optional[str] = None
+
+
+class CommitStatusSummary(BaseModel):
+    """A single commit status context (legacy statuses API)."""
+
+    context: str
+    state: str = Field(..., description="error, failure, pending or success")
+    target_url: Optional[str] = None
+    description: Optional[str] = None
+
+
+class TreeEntry(BaseModel):
+    """A file in a commit's tree."""
+
+    path: str
+    mode: str = Field(..., description="Git file mode, e.g. 100644 or 100755")
+    sha: str = Field(..., description="Blob SHA")
+    size: int
+
+
+class FileChange(BaseModel):
+    """A file changed between two commits."""
+
+    path: str
+    status: str = Field(..., description="added, removed, modified or renamed")
+    previous_path: Optional[str] = Field(None, description="Old path of a renamed file")
+
+
+class PRSnapshot(BaseModel):
+    """Point-in-time view of a PR, its head commit checks and combined status."""
+
+    repo_slug: str
+    pr_number: int
+    head_sha: str
+    state: str
+    mergeable: Optional[bool] = None
+    merged: bool = False
+    mergeable_state: Optional[str] = None
+    draft: bool = False
+    check_runs: list[CheckRunSummary] = Field(default_factory=list)
+    combined_state: Optional[str] = Field(
+        None, description="Combined commit status state for the head SHA"
+    )
+    statuses: list[CommitStatusSummary] = Field(default_factory=list)
+    fetched_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def pr_status(self) -> dict[str, Any]:
+        """Return the PR status in the shape of ``GitHubAdapter.get_pr_status``."""
+        return {
+            "state": self.state,
+            "mergeable": self.mergeable,
+            "merged": self.merged,
+            "mergeable_state": self.mergeable_state,
+            "draft": self.draft,
+        }
+
+    def check_run_dicts(self) -> list[dict[str, Any]]:
+        """Return check runs in the shape of ``GitHubAdapter.get_check_runs``."""
+        return [run.model_dump() for run in self.check_runs]
+
+
+class CheckWaitResult(BaseModel):
+    """Outcome of waiting for the check runs of a PR head commit."""
+
+    repo_slug: str
+    pr_number: int
+    head_sha: Optional[str] = None
+    required: list[str] = Field(
+        default_factory=list, description="Check names waited for; empty means all reported"
+    )
+    check_runs: list[CheckRunSummary] = Field(default_factory=list)
+    timed_out: bool = False
+
+    def _required_runs(self) -> dict[str, Optional[CheckRunSummary]]:
+        runs = {run.name: run for run in self.check_runs}
+        names = self.required or list(runs)
+        return {name: runs.get(name) for name in names}
+
+    @property
+    def failed(self) -> list[str]:
+        """Required checks that completed without a passing conclusion."""
+        return [
+            name
+            for name, run in self._required_runs().items()
+            if run is not None
+            and run.status == "completed"
+            and run.conclusion not in PASSING_CONCLUSIONS
+        ]
+
+    @property
+    def pending(self) -> list[str]:
+        """Required checks that have not reported or not completed."""
+        return [
+            name
+            for name, run in self._required_runs().items()
+            if run is None or run.status != "completed"
+        ]
+
+    @property
+    def passed(self) -> bool:
+        return bool(self._required_runs()) and not self.failed and not self.pending
+
+    def to_ci_gate_result(self, field_map: Optional[dict[str, str]] = None) -> CIGateResult:
+        """Convert to a ``CIGateResult``.
+
+        Args:
+            field_map: ``CIGateResult`` field name -> check run name, overriding
+                entries of ``DEFAULT_CI_CHECKS``.
+
+        Returns:
+            CIGateResult that is PASSED when every mapped check passed, FAILED
+            when any completed unsuccessfully, and PENDING otherwise.
+        """
+        field_map = {**DEFAULT_CI_CHECKS, **(field_map or {})}
+        runs = {run.name: run for run in self.check_runs}
+        fields = {}
+        any_failed = False
+        for field_name, check_name in field_map.items():
+            run = runs.get(check_name)
+            completed = run is not None and run.status == "completed"
+            fields[field_name] = completed and run.conclusion in PASSING_CONCLUSIONS
+            any_failed = any_failed or (completed and not fields[field_name])
+
+        if all(fields.values()):
+            status = GateStatus.PASSED
+        elif any_failed:
+            status = GateStatus.FAILED
+        else:
+            status = GateStatus.PENDING
+        return CIGateResult(**fields, status=status)
@@ -0,0 +1,5 @@
+"""Test doubles for exercising adapters offline."""
+
+from packages.core.testing.fake_github import FakeGitHub, FakeRepo
+
+__all__ = ["FakeGitHub", "FakeRepo"]
@@ -0,0 +1,555 @@
+"""In-memory stand-in for the GitHub REST API.
+
+``FakeGitHub`` implements the subset of endpoints the adapter uses (refs,
+contents, git data, pulls, check runs, commit statuses, installation tokens)
+with GitHub-like rate-limit headers, ETags and Link-header pagination. Latency and error
+rates can be injected to make adapter behaviour measurable offline.
+
+It can be mounted three ways:
+
+- ``fake.transport()``: ``httpx.MockTransport`` for ``httpx.Client``.
+- ``fake.async_transport()``: ``httpx.MockTransport`` for ``httpx.AsyncClient``.
+- ``fake.asgi``: an ASGI app, e.g. ``uvicorn`` or ``httpx.ASGITransport``.
+
+Example:
+    >>> fake = FakeGitHub(latency=0.005)
+    >>> fake.add_repo("owner/repo")
+    >>> adapter = GitHubAdapter(token="t", transport=fake.transport())
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+from urllib.parse import urlencode
+
+import httpx
+
+
+def git_sha(kind: str, content: bytes) -> str:
+    """Compute a git object id for ``content``."""
+    header = f"{kind} {len(content)}\0".encode()
+    return hashlib.sha1(header + content).hexdigest()
+
+
+class FakeRepo:
+    """State for one fake repository."""
+
+    def __init__(self, slug: str, default_branch: str = "main") -> None:
+        self.slug = slug
+        self.default_branch = default_branch
+        self.blobs: dict[str, bytes] = {}
+        self.trees: dict[str, dict[str, str]] = {}
+        self.commits: dict[str, dict[str, Any]] = {}
+        self.refs: dict[str, str] = {}
+        self.pulls: dict[int, dict[str, Any]] = {}
+        self.check_runs: dict[str, list[dict[str, Any]]] = {}
+        self.statuses: dict[str, list[dict[str, Any]]] = {}
+
+        root_tree = self.put_tree({})
+        self.refs[default_branch] = self.put_commit(root_tree, [], "Initial commit")
+
+    def put_blob(self, content: bytes) -> str:
+        sha = git_sha("blob", content)
+        self.blobs[sha] = content
+        return sha
+
+    def put_tree(self, entries: dict[str, str]) -> str:
+        sha = git_sha("tree", json.dumps(sorted(entries.items())).encode())
+        self.trees[sha] = dict(entries)
+        return sha
+
+    def put_commit(self, tree: str, parents: list[str], message: str) -> str:
+        body = json.dumps({"tree": tree, "parents": parents, "message": message}).encode()
+        sha = git_sha("commit", body + str(len(self.commits)).encode())
+        self.commits[sha] = {"tree": tree, "parents": parents, "message": message}
+        return sha
+
+    def tree_for_ref(self, ref: str) -> dict[str, str]:
+        sha = self.refs.get(ref, ref)
+        commit = self.commits.get(sha)
+        return self.trees[commit["tree"]] if commit else {}
+
+
+_Handler = Callable[..., httpx.Response]
+
+
+class FakeGitHub:
+    """Fake GitHub API server with injectable latency and errors."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        rate_limit: int = 5000,
+        seed: int | None = None,
+        token_ttl: float = 3600.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limit = rate_limit
+        self.rate_remaining = rate_limit
+        self.token_ttl = token_ttl
+        self.clock = clock
+        # Installation token -> (installation_id, expiry epoch seconds).
+        self.installation_tokens: dict[str, tuple[int, float]] = {}
+        self.repos: dict[str, FakeRepo] = {}
+        self.requests: list[tuple[str, str]] = []
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._routes: list[tuple[str, re.Pattern[str], _Handler]] = []
+        self._register_routes()
+
+    def add_repo(self, slug: str, default_branch: str = "main") -> FakeRepo:
+        repo = FakeRepo(slug, default_branch)
+        self.repos[slug] = repo
+        return repo
+
+    def add_pull_request(
+        self, slug: str, head: str, base: str = "main", title: str = "PR", **fields: Any
+    ) -> dict[str, Any]:
+        repo = self.repos[slug]
+        if head not in repo.refs:
+            repo.refs[head] = repo.refs[base]
+        number = len(repo.pulls) + 1
+        pr = {
+            "number": number,
+            "title": title,
+            "body": fields.pop("body", ""),
+            "state": "open",
+            "merged": False,
+            "mergeable": True,
+            "mergeable_state": "clean",
+            "draft": False,
+            "html_url": f"https://github.com/{slug}/pull/{number}",
+            "user": {"login": "fake-bot", "id": 1},
+            "head": {"ref": head, "sha": repo.refs[head], "label": self._label(slug, head)},
+            "base": {"ref": base, "sha": repo.refs[base]},
+        }
+        pr.update(fields)
+        repo.pulls[number] = pr
+        return pr
+
+    def add_check_run(
+        self,
+        slug: str,
+        sha: str,
+        name: str,
+        status: str = "completed",
+        conclusion: str | None = "success",
+    ) -> dict[str, Any]:
+        runs = self.repos[slug].check_runs.setdefault(sha, [])
+        run = {
+            "id": sum(len(r) for r in self.repos[slug].check_runs.values()) + 1,
+            "name": name,
+            "head_sha": sha,
+            "status": status,
+            "conclusion": conclusion,
+            "html_url": f"https://github.com/{slug}/runs/{name}",
+        }
+        runs.append(run)
+        return run
+
+    def revoke_installation_tokens(self) -> None:
+        """Invalidate every issued installation token (requests get 401)."""
+        self.installation_tokens.clear()
+
+    def add_status(self, slug: str, sha: str, context: str, state: str = "success") -> None:
+        self.repos[slug].statuses.setdefault(sha, []).append(
+            {"context": context, "state": state, "target_url": None, "description": None}
+        )
+
+    def transport(self) -> httpx.MockTransport:
+        """Transport for a synchronous ``httpx.Client``."""
+        return httpx.MockTransport(self.handle)
+
+    def async_transport(self) -> httpx.MockTransport:
+        """Transport for an ``httpx.AsyncClient`` (latency uses ``asyncio.sleep``)."""
+        return httpx.MockTransport(self.handle_async)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        request.read()
+        return self._dispatch(request)
+
+    async def handle_async(self, request: httpx.Request) -> httpx.Response:
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        await request.aread()
+        return self._dispatch(request)
+
+    async def asgi(self, scope: dict, receive: Callable, send: Callable) -> None:
+        """ASGI entry point serving the fake API over HTTP."""
+        if scope["type"] != "http":
+            return
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        query = scope.get("query_string", b"").decode()
+        url = f"http://fake-github{scope['path']}" + (f"?{query}" if query else "")
+        headers = [(k.decode(), v.decode()) for k, v in scope.get("headers", [])]
+        request = httpx.Request(scope["method"], url, headers=headers, content=body)
+        response = await self.handle_async(request)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": [(k.encode(), v.encode()) for k, v in response.headers.items()],
+            }
+        )
+        await send({"type": "http.response.body", "body": response.content})
+
+    def _delay(self) -> float:
+        if not self.latency and not self.jitter:
+            return 0.0
+        return self.latency + self._random.uniform(0, self.jitter)
+
+    def _dispatch(self, request: httpx.Request) -> httpx.Response:
+        method = request.method
+        path = request.url.path
+        with self._lock:
+            self.requests.append((method, path))
+            if not self._authorized(request):
+                return self._respond(request, 401, {"message": "Bad credentials"}, charge=False)
+            if self.error_rate and self._random.random() < self.error_rate:
+                return self._respond(request, self.error_status, {"message": "Injected failure"})
+
+            for route_method, pattern, handler in self._routes:
+                if route_method != method:
+                    continue
+                match = pattern.fullmatch(path)
+                if match:
+                    if self.rate_remaining <= 0:
+                        return self._respond(
+                            request, 403, {"message": "API rate limit exceeded"}, charge=False
+                        )
+                    try:
+                        return handler(request, **match.groupdict())
+                    except KeyError:
+                        return self._respond(request, 404, {"message": "Not Found"})
+        return self._respond(request, 404, {"message": "Not Found"})
+
+    def _respond(
+        self,
+        request: httpx.Request,
+        status_code: int,
+        data: Any,
+        headers: dict[str, str] | None = None,
+        charge: bool = True,
+    ) -> httpx.Response:
+        body = json.dumps(data).encode()
+        response_headers = {"Content-Type": "application/json"}
+        if request.method == "GET" and status_code == 200:
+            etag = f'W/"{hashlib.sha256(body).hexdigest()[:32]}"'
+            response_headers["ETag"] = etag
+            if request.headers.get("If-None-Match") == etag:
+                # Conditional hits are free on GitHub.
+                charge = False
+                status_code, body = 304, b""
+        if charge and self.rate_remaining > 0:
+            self.rate_remaining -= 1
+        response_headers.update(
+            {
+                "X-RateLimit-Limit": str(self.rate_limit),
+                "X-RateLimit-Remaining": str(self.rate_remaining),
+                "X-RateLimit-Used": str(self.rate_limit - self.rate_remaining),
+                "X-RateLimit-Reset": str(int(time.time()) + 3600),
+                "X-RateLimit-Resource": "core",
+            }
+        )
+        response_headers.update(headers or {})
+        return httpx.Response(status_code, content=body, headers=response_headers)
+
+    def _paginate(self, request: httpx.Request, items: list[Any]) -> tuple[list[Any], dict]:
+        params = request.url.params
+        per_page = min(int(params.get("per_page", 30)), 100)
+        page = max(int(params.get("page", 1)), 1)
+        last = max(1, -(-len(items) // per_page))
+        links = []
+        for rel, number in (("next", page + 1), ("last", last)):
+            if rel == "next" and page >= last:
+                continue
+            query = dict(params)
+            query.update({"per_page": str(per_page), "page": str(number)})
+            links.append(f'<{request.url.copy_with(query=urlencode(query).encode())}>; rel="{rel}"')
+        headers = {"Link": ", ".join(links)} if links else {}
+        return items[(page - 1) * per_page : page * per_page], headers
+
+    @staticmethod
+    def _label(slug: str, branch: str) -> str:
+        return f"{slug.split('/')[0]}:{branch}"
+
+    def _repo(self, owner: str, repo: str) -> FakeRepo:
+        return self.repos[f"{owner}/{repo}"]
+
+    def _ref_payload(self, repo: FakeRepo, branch: str) -> dict[str, Any]:
+        return {
+            "ref": f"refs/heads/{branch}",
+            "url": f"https://api.github.com/repos/{repo.slug}/git/refs/heads/{branch}",
+            "object": {"sha": repo.refs[branch], "type": "commit"},
+        }
+
+    def _register_routes(self) -> None:
+        repo = r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)"
+        routes = [
+            ("GET", r"/rate_limit", self._get_rate_limit),
+            (
+                "POST",
+                r"/app/installations/(?P<installation_id>\d+)/access_tokens",
+                self._create_installation_token,
+            ),
+            ("GET", repo + r"/git/ref/heads/(?P<branch>.+)", self._get_ref),
+            ("POST", repo + r"/git/refs", self._create_ref),
+            ("PATCH", repo + r"/git/refs/heads/(?P<branch>.+)", self._update_ref),
+            ("GET", repo + r"/contents/(?P<path>.+)", self._get_contents),
+            ("PUT", repo + r"/contents/(?P<path>.+)", self._put_contents),
+            ("POST", repo + r"/git/blobs", self._create_blob),
+            ("GET", repo + r"/git/blobs/(?P<sha>\w+)", self._get_blob),
+            ("POST", repo + r"/git/trees", self._create_tree),
+            ("GET", repo + r"/git/trees/(?P<ref>.+)", self._get_tree),
+            ("POST", repo + r"/git/commits", self._create_commit),
+            ("GET", repo + r"/git/commits/(?P<sha>\w+)", self._get_commit),
+            ("GET", repo + r"/pulls", self._list_pulls),
+            ("POST", repo + r"/pulls", self._create_pull),
+            ("GET", repo + r"/pulls/(?P<number>\d+)", self._get_pull),
+            ("GET", repo + r"/commits/(?P<sha>\w+)/check-runs", self._list_check_runs),
+            ("GET", repo + r"/commits/(?P<sha>\w+)/status", self._get_combined_status),
+            ("GET", repo + r"/compare/(?P<base>.+?)\.\.\.(?P<head>.+)", self._compare),
+        ]
+        self._routes = [
+            (method, re.compile(pattern), handler) for method, pattern, handler in routes
+        ]
+
+    def _authorized(self, request: httpx.Request) -> bool:
+        # Only installation tokens are validated; any other credential is accepted.
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not token.startswith("ghs_"):
+            return True
+        issued = self.installation_tokens.get(token)
+        return issued is not None and issued[1] > self.clock()
+
+    def _create_installation_token(self, request: httpx.Request, installation_id: str):
+        if not request.headers.get("Authorization", "").startswith("Bearer "):
+            return self._respond(request, 401, {"message": "A JSON web token is required"})
+        token = f"ghs_{self._random.getrandbits(128):032x}"
+        expires_at = self.clock() + self.token_ttl
+        self.installation_tokens[token] = (int(installation_id), expires_at)
+        expires = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(expires_at))
+        return self._respond(request, 201, {"token": token, "expires_at": expires}, charge=False)
+
+    def _get_rate_limit(self, request: httpx.Request) -> httpx.Response:
+        core = {"limit": self.rate_limit, "remaining": self.rate_remaining}
+        return self._respond(request, 200, {"resources": {"core": core}}, charge=False)
+
+    def _get_ref(self, request: httpx.Request, owner: str, repo: str, branch: str):
+        fake_repo = self._repo(owner, repo)
+        return self._respond(request, 200, self._ref_payload(fake_repo, branch))
+
+    def _create_ref(self, request: httpx.Request, owner: str, repo: str):
+        fake_repo = self._repo(owner, repo)
+        data = json.loads(request.content)
+        branch = data["ref"].removeprefix("refs/heads/")
+        if branch in fake_repo.refs:
+            return self._respond(
+                request,
+                422,
+                {
+                    "message": "Validation Failed",
+                    "errors": [{"message": "Reference already exists"}],
+                },
+            )
+        fake_repo.refs[branch] = data["sha"]
+        return self._respond(request, 201, self._ref_payload(fake_repo, branch))
+
+    def _update_ref(self, request: httpx.Request, owner: str, repo: str, branch: str):
+        fake_repo = self._repo(owner, repo)
+        data = json.loads(request.content)
+        fake_repo.refs[branch] = data["sha"]
+        return self._respond(request, 200, self._ref_payload(fake_repo, branch))
+
+    def _get_contents(self, request: httpx.Request, owner: str, repo: str, path: str):
+        fake_repo = self._repo(owner, repo)
+        ref = request.url.params.get("ref", fake_repo.default_branch)
+        blob_sha = fake_repo.tree_for_ref(ref)[path]
+        content = fake_repo.blobs[blob_sha]
+        return self._respond(
+            request,
+            200,
+            {
+                "type": "file",
+                "path": path,
+                "sha": blob_sha,
+                "size": len(content),
+                "encoding": "base64",
+                "content": base64.b64encode(content).decode(),
+            },
+        )
+
+    def _put_contents(self, request: httpx.Request, owner: str, repo: str, path: str):
+        fake_repo = self._repo(owner, repo)
+        data = json.loads(request.content)
+        branch = data.get("branch", fake_repo.default_branch)
+        tree = dict(fake_repo.tree_for_ref(branch))
+        if path in tree and data.get("sha") != tree[path]:
+            return self._respond(request, 409, {"message": f"{path} does not match"})
+        tree[path] = fake_repo.put_blob(base64.b64decode(data["content"]))
+        commit_sha = fake_repo.put_commit(
+            fake_repo.put_tree(tree), [fake_repo.refs[branch]], data["message"]
+        )
+        fake_repo.refs[branch] = commit_sha
+        commit = {
+            "sha": commit_sha,
+            "message": data["message"],
+            "html_url": f"https://github.com/{fake_repo.slug}/commit/{commit_sha}",
+        }
+        return self._respond(request, 201, {"content": {"path": path}, "commit": commit})
+
+    def _create_blob(self, request: httpx.Request, owner: str, repo: str):
+        fake_repo = self._repo(owner, repo)
+        data = json.loads(request.content)
+        if data.get("encoding") == "base64":
+            content = base64.b64decode(data["content"])
+        else:
+            content = data["content"].encode()
+        sha = fake_repo.put_blob(content)
+        return self._respond(request, 201, {"sha": sha, "size": len(content)})
+
+    def _get_blob(self, request: httpx.Request, owner: str, repo: str, sha: str):
+        content = self._repo(owner, repo).blobs[sha]
+        payload = {"sha": sha, "size": len(content), "encoding": "base64"}
+        payload["content"] = base64.b64encode(content).decode()
+        return self._respond(request, 200, payload)
+
+    def _create_tree(self, request: httpx.Request, owner: str, repo: str):
+        fake_repo = self._repo(owner, repo)
+        data = json.loads(request.content)
+        entries = dict(fake_repo.trees.get(data.get("base_tree"), {}))
+        for entry in data["tree"]:
+            if entry.get("sha") is None and "content" not in entry:
+                entries.pop(entry["path"], None)
+            elif "content" in entry:
+                entries[entry["path"]] = fake_repo.put_blob(entry["content"].encode())
+            else:
+                entries[entry["path"]] = entry["sha"]
+        return self._respond(request, 201, {"sha": fake_repo.put_tree(entries)})
+
+    def _get_tree(self, request: httpx.Request, owner: str, repo: str, ref: str):
+        fake_repo = self._repo(owner, repo)
+        if ref in fake_repo.trees:
+            sha, entries = ref, fake_repo.trees[ref]
+        else:
+            commit_sha = fake_repo.refs.get(ref, ref)
+            sha = fake_repo.commits[commit_sha]["tree"]
+            entries = fake_repo.trees[sha]
+        tree = [
+            {
+                "path": path,
+                "mode": "100644",
+                "type": "blob",
+                "sha": blob,
+                "size": len(fake_repo.blobs[blob]),
+            }
+            for path, blob in sorted(entries.items())
+        ]
+        return self._respond(request, 200, {"sha": sha, "tree": tree, "truncated": False})
+
+    def _create_commit(self, request: httpx.Request, owner: str, repo: str):
+        fake_repo = self._repo(owner, repo)
+        data = json.loads(request.content)
+        sha = fake_repo.put_commit(data["tree"], data.get("parents", []), data["message"])
+        payload = {
+            "sha": sha,
+            "message": data["message"],
+            "tree": {"sha": data["tree"]},
+            "html_url": f"https://github.com/{fake_repo.slug}/commit/{sha}",
+        }
+        return self._respond(request, 201, payload)
+
+    def _get_commit(self, request: httpx.Request, owner: str, repo: str, sha: str):
+        commit = self._repo(owner, repo).commits[sha]
+        payload = {"sha": sha, "message": commit["message"], "tree": {"sha": commit["tree"]}}
+        return self._respond(request, 200, payload)
+
+    def _list_pulls(self, request: httpx.Request, owner: str, repo: str):
+        fake_repo = self._repo(owner, repo)
+        params = request.url.params
+        pulls = list(fake_repo.pulls.values())
+        state = params.get("state", "open")
+        if state != "all":
+            pulls = [pr for pr in pulls if pr["state"] == state]
+        if "head" in params:
+            pulls = [pr for pr in pulls if pr["head"]["label"] == params["head"]]
+        if "base" in params:
+            pulls = [pr for pr in pulls if pr["base"]["ref"] == params["base"]]
+        page, headers = self._paginate(request, pulls)
+        return self._respond(request, 200, page, headers=headers)
+
+    def _create_pull(self, request: httpx.Request, owner: str, repo: str):
+        fake_repo = self._repo(owner, repo)
+        data = json.loads(request.content)
+        label = self._label(fake_repo.slug, data["head"])
+        for pr in fake_repo.pulls.values():
+            if pr["state"] == "open" and pr["head"]["label"] == label:
+                message = f"A pull request already exists for {label}."
+                return self._respond(
+                    request, 422, {"message": "Validation Failed", "errors": [{"message": message}]}
+                )
+        pr = self.add_pull_request(
+            fake_repo.slug, data["head"], data["base"], data["title"], body=data.get("body")
+        )
+        return self._respond(request, 201, pr)
+
+    def _get_pull(self, request: httpx.Request, owner: str, repo: str, number: str):
+        fake_repo = self._repo(owner, repo)
+        pr = fake_repo.pulls[int(number)]
+        pr["head"]["sha"] = fake_repo.refs.get(pr["head"]["ref"], pr["head"]["sha"])
+        return self._respond(request, 200, pr)
+
+    def _list_check_runs(self, request: httpx.Request, owner: str, repo: str, sha: str):
+        runs = self._repo(owner, repo).check_runs.get(sha, [])
+        page, headers = self._paginate(request, runs)
+        return self._respond(
+            request, 200, {"total_count": len(runs), "check_runs": page}, headers=headers
+        )
+
+    def _get_combined_status(self, request: httpx.Request, owner: str, repo: str, sha: str):
+        statuses = self._repo(owner, repo).statuses.get(sha, [])
+        states = {status["state"] for status in statuses}
+        if states & {"failure", "error"}:
+            state = "failure"
+        elif "pending" in states or not statuses:
+            state = "pending"
+        else:
+            state = "success"
+        return self._respond(request, 200, {"state": state, "sha": sha, "statuses": statuses})
+
+    def _compare(self, request: httpx.Request, owner: str, repo: str, base: str, head: str):
+        # Diffs the two trees directly; there is no merge-base or rename detection.
+        fake_repo = self._repo(owner, repo)
+        before, after = fake_repo.tree_for_ref(base), fake_repo.tree_for_ref(head)
+        files = []
+        for path in sorted(before.keys() | after.keys()):
+            if path not in before:
+                files.append({"filename": path, "status": "added"})
+            elif path not in after:
+                files.append({"filename": path, "status": "removed"})
+            elif before[path] != after[path]:
+                files.append({"filename": path, "status": "modified"})
+        return self._respond(request, 200, {"status": "ahead", "files": files})
@@ -4,7 +4,7 @@ import hashlib
 import hmac
 import json
 import uuid
-from typing import Any
+from typing import Any, Protocol
 
 from packages.core.logging import get_logger
 from packages.core.notifications import NotificationDispatcher
@@ -12,6 +12,33 @@ from packages.core.schemas.notifications import NotificationChannel, Notificatio
 from packages.core.schemas.webhooks import WebhookEvent, WebhookSource
 
 
+class WebhookSubscriber(Protocol):
+    """Interface for components that react to normalized webhook events."""
+
+    def handle(self, event: WebhookEvent) -> None:
+        """Handle a webhook event."""
+
+
+_registered_subscribers: list[WebhookSubscriber] = []
+
+
+def register_subscriber(subscriber: WebhookSubscriber) -> None:
+    """Register a process-wide subscriber used by the webhook endpoint."""
+    if subscriber not in _registered_subscribers:
+        _registered_subscribers.append(subscriber)
+
+
+def unregister_subscriber(subscriber: WebhookSubscriber) -> None:
+    """Remove a previously registered subscriber."""
+    if subscriber in _registered_subscribers:
+        _registered_subscribers.remove(subscriber)
+
+
+def registered_subscribers() -> list[WebhookSubscriber]:
+    """Return the process-wide subscribers."""
+    return list(_registered_subscribers)
+
+
 class GitHubWebhookVerifier:
     """Verify GitHub webhook signatures when a secret is configured."""
 
@@ -32,8 +59,13 @@ class GitHubWebhookVerifier:
 class WebhookWatcher:
     """Normalize inbound webhooks and dispatch notifications."""
 
-    def __init__(self, dispatcher: NotificationDispatcher | None = None) -> None:
+    def __init__(
+        self,
+        dispatcher: NotificationDispatcher | None = None,
+        subscribers: list[WebhookSubscriber] | None = None,
+    ) -> None:
         self._dispatcher = dispatcher or NotificationDispatcher()
+        self._subscribers = list(subscribers or [])
         self._logger = get_logger("webhook_watcher")
 
     def handle_github_event(
@@ -54,8 +86,21 @@ class WebhookWatcher:
             event.event_type,
         )
         self._dispatch_notification(event, delivery_id)
+        self._notify_subscribers(event)
         return event
 
+    def _notify_subscribers(self, event: WebhookEvent) -> None:
+        for subscriber in self._subscribers:
+            try:
+                subscriber.handle(event)
+            except Exception:
+                # A failing subscriber must not reject the delivery or starve the others.
+                self._logger.exception(
+                    "webhook_event_id=%s subscriber=%s failed",
+                    event.event_id,
+                    type(subscriber).__name__,
+                )
+
     def _dispatch_notification(self, event: WebhookEvent, delivery_id: str | None) -> None:
         subject = self._build_subject(event)
         body = self._build_body(event)
@@ -0,0 +1,203 @@
+"""Tests for the webhook-driven CI completion waiter."""
+
+import asyncio
+
+import pytest
+
+from packages.core.adapters.github_adapter import GitHubAdapter
+from packages.core.adapters.pr_state_cache import PRStateCache
+from packages.core.check_waiter import CheckWaiter, check_reads
+from packages.core.schemas.gates import GateStatus
+from packages.core.schemas.github import CheckRunSummary, CheckWaitResult
+from packages.core.schemas.webhooks import WebhookEvent, WebhookSource
+from packages.core.testing import FakeGitHub
+
+REPO = "owner/repo"
+CHECKS = ["lint", "unit-tests", "security-scan", "dependency-check"]
+
+
+@pytest.fixture
+def fake():
+    fake = FakeGitHub()
+    fake.add_repo(REPO)
+    pr = fake.add_pull_request(REPO, "feature")
+    for name in CHECKS:
+        fake.add_check_run(REPO, pr["head"]["sha"], name, status="in_progress", conclusion=None)
+    return fake
+
+
+@pytest.fixture
+def adapter(fake):
+    adapter = GitHubAdapter(
+        token="test_token", transport=fake.transport(), pr_state_cache=PRStateCache()
+    )
+    yield adapter
+    adapter.client.close()
+
+
+def _head_sha(fake: FakeGitHub) -> str:
+    return fake.repos[REPO].pulls[1]["head"]["sha"]
+
+
+def _runs(fake: FakeGitHub) -> list[dict]:
+    return fake.repos[REPO].check_runs[_head_sha(fake)]
+
+
+def _completed(run: dict, conclusion: str = "success") -> WebhookEvent:
+    check_run = {**run, "status": "completed", "conclusion": conclusion, "pull_requests": []}
+    return WebhookEvent(
+        event_id=f"evt-{run['id']}",
+        event_type="check_run",
+        source=WebhookSource.GITHUB,
+        payload={"action": "completed", "repository": {"full_name": REPO}, "check_run": check_run},
+    )
+
+
+async def _until_registered(waiter: CheckWaiter, count: int = 1) -> None:
+    while waiter.waiting() < count or any(w.head_sha is None for w in _all(waiter)):
+        await asyncio.sleep(0.001)
+
+
+def _all(waiter: CheckWaiter):
+    return [w for waiters in waiter._by_pr.values() for w in waiters]
+
+
+async def test_resolves_from_check_run_webhooks(fake, adapter):
+    """Test completion events resolve the wait without further API reads."""
+    waiter = CheckWaiter(adapter)
+    task = asyncio.create_task(waiter.wait_for_checks(REPO, 1, required=CHECKS, timeout=5))
+    await _until_registered(waiter)
+    reads = len(fake.requests)
+
+    for run in _runs(fake):
+        waiter.handle(_completed(run))
+    result = await task
+
+    assert result.passed
+    assert result.to_ci_gate_result().status == GateStatus.PASSED
+    assert len(fake.requests) == reads
+    assert waiter.waiting() == 0
+
+
+async def test_fail_fast_returns_on_first_failure(fake, adapter):
+    """Test a failed required check ends the wait immediately."""
+    waiter = CheckWaiter(adapter)
+    task = asyncio.create_task(waiter.wait_for_checks(REPO, 1, required=CHECKS, timeout=5))
+    await _until_registered(waiter)
+
+    waiter.handle(_completed(_runs(fake)[1], "failure"))
+    result = await task
+
+    assert result.failed == ["unit-tests"]
+    gate = result.to_ci_gate_result()
+    assert gate.status == GateStatus.FAILED
+    assert gate.unit_tests_passed is False
+
+
+async def test_returns_immediately_when_already_complete(fake, adapter):
+    """Test the initial read resolves waits on finished CI."""
+    for run in _runs(fake):
+        run.update(status="completed", conclusion="success")
+
+    result = await CheckWaiter(adapter).wait_for_checks(REPO, 1, timeout=5)
+
+    assert result.passed
+    assert result.required == []
+    assert len(result.check_runs) == len(CHECKS)
+
+
+async def test_timeout_returns_pending_result(fake, adapter):
+    """Test a timeout yields a timed_out result rather than raising."""
+    result = await CheckWaiter(adapter).wait_for_checks(REPO, 1, required=CHECKS, timeout=0.05)
+
+    assert result.timed_out
+    assert result.to_ci_gate_result().status == GateStatus.PENDING
+
+
+async def test_fallback_poll_recovers_missed_deliveries(fake, adapter):
+    """Test the single fallback poll picks up completions whose webhooks were lost."""
+    waiter = CheckWaiter(adapter, fallback_poll_after=0.05)
+    task = asyncio.create_task(waiter.wait_for_checks(REPO, 1, required=CHECKS, timeout=5))
+    await _until_registered(waiter)
+    for run in _runs(fake):
+        run.update(status="completed", conclusion="success")
+
+    result = await task
+
+    assert result.passed and not result.timed_out
+
+
+async def test_check_suite_poll_is_held_until_done(fake, adapter):
+    """Test a poll started by a suite completion is referenced until it finishes."""
+    waiter = CheckWaiter(adapter)
+    task = asyncio.create_task(waiter.wait_for_checks(REPO, 1, required=CHECKS, timeout=5))
+    await _until_registered(waiter)
+    for run in _runs(fake):
+        run.update(status="completed", conclusion="success")
+    suite = {"head_sha": _head_sha(fake), "pull_requests": [{"number": 1}]}
+
+    waiter.handle(
+        WebhookEvent(
+            event_id="evt-suite",
+            event_type="check_suite",
+            source=WebhookSource.GITHUB,
+            payload={
+                "action": "completed",
+                "repository": {"full_name": REPO},
+                "check_suite": suite,
+            },
+        )
+    )
+
+    assert len(waiter._polls) == 1
+    poll = next(iter(waiter._polls))
+    assert (await task).passed
+    await poll
+    assert not waiter._polls
+
+
+async def test_many_waiters_resolve_from_one_event_stream(fake, adapter):
+    """Test thousands of concurrent waiters share the event-driven resolution."""
+    waiter = CheckWaiter(adapter)
+    tasks = [
+        asyncio.create_task(waiter.wait_for_checks(REPO, 1, required=["lint"], timeout=10))
+        for _ in range(2000)
+    ]
+    await _until_registered(waiter, 2000)
+
+    waiter.handle(_completed(_runs(fake)[0]))
+    results = await asyncio.gather(*tasks)
+
+    assert all(result.passed for result in results)
+    assert waiter.waiting() == 0
+
+
+async def test_concurrent_waiters_share_initial_read(fake, adapter):
+    """Test waiters registering on one PR at the same time issue one check run read."""
+    waiter = CheckWaiter(adapter)
+    reads = check_reads.value(trigger="initial")
+    tasks = [
+        asyncio.create_task(waiter.wait_for_checks(REPO, 1, required=["lint"], timeout=10))
+        for _ in range(50)
+    ]
+    await _until_registered(waiter, 50)
+
+    waiter.handle(_completed(_runs(fake)[0]))
+    await asyncio.gather(*tasks)
+
+    assert check_reads.value(trigger="initial") == reads + 1
+    assert fake.requests.count(("GET", f"/repos/{REPO}/pulls/1")) == 1
+
+
+def test_ci_gate_result_field_map_overrides_defaults():
+    """Test check names can be remapped onto CIGateResult fields."""
+    runs = [
+        CheckRunSummary(id=i, name=name, status="completed", conclusion="success")
+        for i, name in enumerate(["ruff", "unit-tests", "security-scan", "dependency-check"])
+    ]
+    result = CheckWaitResult(repo_slug=REPO, pr_number=1, check_runs=runs)
+
+    assert result.to_ci_gate_result().lint_passed is False
+    gate = result.to_ci_gate_result({"lint_passed": "ruff"})
+    assert gate.lint_passed is True
+    assert gate.status == GateStatus.PASSED
@@ -0,0 +1,141 @@
+"""Tests driving GitHubAdapter against the in-memory fake GitHub API."""
+
+import httpx
+import pytest
+
+from packages.core.adapters.github_adapter import GitHubAdapter, GitHubValidationError
+from packages.core.adapters.retry import RetryBudget, RetryPolicy
+from packages.core.testing import FakeGitHub
+
+
+@pytest.fixture
+def fake():
+    fake = FakeGitHub(seed=1)
+    fake.add_repo("owner/repo")
+    return fake
+
+
+@pytest.fixture
+def adapter(fake):
+    adapter = GitHubAdapter(token="test_token", transport=fake.transport())
+    yield adapter
+    adapter.client.close()
+
+
+def test_branch_commit_pr_workflow(adapter, fake):
+    """Test the full adapter workflow against the fake server."""
+    branch = adapter.create_branch("owner/repo", "main", "feature")
+    commit = adapter.create_commit("owner/repo", "feature", "app.py", "print('hi')", "Add app")
+    pr = adapter.create_pr("owner/repo", "main", "feature", "Feature", "Body")
+
+    assert branch["ref"] == "refs/heads/feature"
+    assert fake.repos["owner/repo"].refs["feature"] == commit["sha"]
+    assert pr["number"] == 1
+    assert adapter.get_pr_status("owner/repo", 1)["mergeable_state"] == "clean"
+
+
+def test_create_commit_updates_existing_file(adapter, fake):
+    """Test a second commit to the same path sends the existing blob SHA."""
+    adapter.create_commit("owner/repo", "main", "README.md", "v1", "First")
+    adapter.create_commit("owner/repo", "main", "README.md", "v2", "Second")
+
+    tree = fake.repos["owner/repo"].tree_for_ref("main")
+    assert fake.repos["owner/repo"].blobs[tree["README.md"]] == b"v2"
+
+
+def test_duplicate_pr_is_reconciled(adapter):
+    """Test create_pr returns the existing PR when GitHub reports a duplicate."""
+    adapter.create_branch("owner/repo", "main", "feature")
+    first = adapter.create_pr("owner/repo", "main", "feature", "Feature", "Body")
+    second = adapter.create_pr("owner/repo", "main", "feature", "Feature", "Body")
+
+    assert second["number"] == first["number"]
+
+
+def test_snapshot_reads_checks_and_statuses(adapter, fake):
+    """Test get_pr_snapshot against seeded check runs and statuses."""
+    pr = fake.add_pull_request("owner/repo", "feature")
+    sha = pr["head"]["sha"]
+    fake.add_check_run("owner/repo", sha, "lint")
+    fake.add_check_run("owner/repo", sha, "tests", status="in_progress", conclusion=None)
+    fake.add_status("owner/repo", sha, "ci/legacy", "success")
+
+    snapshot = adapter.get_pr_snapshot("owner/repo", pr["number"])
+
+    assert [run.name for run in snapshot.check_runs] == ["lint", "tests"]
+    assert snapshot.combined_state == "success"
+
+
+def test_rate_limit_headers_and_etags(fake):
+    """Test responses carry rate-limit headers and honour If-None-Match."""
+    with httpx.Client(transport=fake.transport(), base_url="https://api.github.com") as client:
+        first = client.get("/repos/owner/repo/git/ref/heads/main")
+        second = client.get(
+            "/repos/owner/repo/git/ref/heads/main",
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+
+    assert first.headers["X-RateLimit-Remaining"] == "4999"
+    assert second.status_code == 304
+    assert second.headers["X-RateLimit-Remaining"] == "4999"
+
+
+def test_rate_limit_exhaustion_returns_403():
+    """Test requests beyond the configured limit are rejected."""
+    fake = FakeGitHub(rate_limit=1)
+    fake.add_repo("owner/repo")
+    with httpx.Client(transport=fake.transport(), base_url="https://api.github.com") as client:
+        assert client.get("/repos/owner/repo/git/ref/heads/main").status_code == 200
+        assert client.get("/repos/owner/repo/git/ref/heads/main").status_code == 403
+
+
+def test_pagination_link_headers(fake):
+    """Test list endpoints paginate with GitHub-style Link headers."""
+    for index in range(5):
+        fake.add_pull_request("owner/repo", f"branch-{index}")
+
+    with httpx.Client(transport=fake.transport(), base_url="https://api.github.com") as client:
+        response = client.get("/repos/owner/repo/pulls", params={"per_page": 2})
+        next_page = client.get(response.links["next"]["url"])
+
+    assert [pr["number"] for pr in response.json()] == [1, 2]
+    assert [pr["number"] for pr in next_page.json()] == [3, 4]
+    assert "last" in response.links
+
+
+def test_injected_errors_are_retried(fake):
+    """Test injected 503s are absorbed by the adapter retry policy."""
+    pr = fake.add_pull_request("owner/repo", "feature")
+    fake.error_rate = 0.5
+    adapter = GitHubAdapter(
+        token="t",
+        transport=fake.transport(),
+        retry_policy=RetryPolicy(max_attempts=20, base_delay=0.0),
+        retry_budget=RetryBudget(ratio=10.0, max_tokens=100.0),
+    )
+
+    statuses = [adapter.get_pr_status("owner/repo", pr["number"]) for _ in range(10)]
+    adapter.client.close()
+
+    assert all(status["state"] == "open" for status in statuses)
+    assert len(fake.requests) > 10
+
+
+def test_existing_branch_is_validation_error(adapter):
+    """Test creating an existing branch surfaces a 422."""
+    with pytest.raises(GitHubValidationError):
+        adapter.create_branch("owner/repo", "main", "main")
+
+
+async def test_asgi_app_and_async_transport(fake):
+    """Test the fake is reachable as an ASGI app and via the async transport."""
+    transport = httpx.ASGITransport(app=fake.asgi)
+    async with httpx.AsyncClient(transport=transport, base_url="http://fake") as client:
+        via_asgi = await client.get("/repos/owner/repo/git/ref/heads/main")
+    async with httpx.AsyncClient(
+        transport=fake.async_transport(), base_url="http://fake"
+    ) as client:
+        via_mock = await client.get("/repos/owner/repo/git/ref/heads/main")
+
+    assert via_asgi.status_code == 200
+    assert via_asgi.json() == via_mock.json()
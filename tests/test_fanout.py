@@ -0,0 +1,130 @@
+"""Tests for the multi-repository fan-out executor."""
+
+import threading
+import time
+
+import pytest
+
+from packages.core.adapters.fanout import FanOutExecutor, FanOutJob
+from packages.core.adapters.github_adapter import (
+    GitHubAdapter,
+    GitHubNotFoundError,
+    GitHubValidationError,
+)
+
+
+class ConcurrencyProbe:
+    """Records peak global and per-repository concurrency."""
+
+    def __init__(self, delay: float = 0.01) -> None:
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.active_by_repo: dict[str, int] = {}
+        self.peak = 0
+        self.peak_by_repo: dict[str, int] = {}
+
+    def __call__(self, repo_slug: str, value: int) -> int:
+        with self.lock:
+            self.active += 1
+            self.active_by_repo[repo_slug] = self.active_by_repo.get(repo_slug, 0) + 1
+            self.peak = max(self.peak, self.active)
+            self.peak_by_repo[repo_slug] = max(
+                self.peak_by_repo.get(repo_slug, 0), self.active_by_repo[repo_slug]
+            )
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+            self.active_by_repo[repo_slug] -= 1
+        return value * 2
+
+
+@pytest.fixture
+def adapter():
+    adapter = GitHubAdapter(token="test_token")
+    yield adapter
+    adapter.client.close()
+
+
+def test_respects_global_and_per_repo_caps(adapter):
+    """Test concurrency never exceeds the global or per-repository cap."""
+    probe = ConcurrencyProbe()
+    jobs = [(f"owner/repo{i % 3}", probe, (i,)) for i in range(30)]
+    executor = FanOutExecutor(adapter, max_concurrency=5, per_repo_concurrency=2)
+
+    report = executor.run_all(jobs)
+
+    assert [result.value for result in report.results] == [i * 2 for i in range(30)]
+    assert probe.peak <= 5
+    assert max(probe.peak_by_repo.values()) <= 2
+    assert probe.peak >= 4
+
+
+def test_busy_repo_does_not_starve_others(adapter):
+    """Test jobs for a small repository finish before a large backlog drains."""
+    probe = ConcurrencyProbe(delay=0.005)
+    jobs = [("owner/big", probe, (i,)) for i in range(20)]
+    jobs.append(("owner/small", probe, (99,)))
+    executor = FanOutExecutor(adapter, max_concurrency=4, per_repo_concurrency=2)
+
+    order = [result.job.repo_slug for result in executor.run(jobs)]
+
+    assert order.index("owner/small") < 5
+
+
+def test_errors_are_aggregated_per_job(adapter):
+    """Test typed GitHub errors are captured without aborting the batch."""
+
+    def operation(repo_slug: str) -> str:
+        if repo_slug == "owner/missing":
+            raise GitHubNotFoundError("Not found", status_code=404)
+        if repo_slug == "owner/invalid":
+            raise GitHubValidationError("Validation failed", status_code=422)
+        return repo_slug
+
+    jobs = [
+        FanOutJob("owner/ok", operation),
+        FanOutJob("owner/missing", operation),
+        FanOutJob("owner/invalid", operation),
+    ]
+
+    report = FanOutExecutor(adapter).run_all(jobs)
+
+    assert [result.value for result in report.succeeded] == ["owner/ok"]
+    grouped = report.errors_by_type()
+    assert [r.job.repo_slug for r in grouped["GitHubNotFoundError"]] == ["owner/missing"]
+    assert [r.job.repo_slug for r in grouped["GitHubValidationError"]] == ["owner/invalid"]
+
+
+def test_operation_name_resolves_adapter_method(adapter, monkeypatch):
+    """Test string operations call the adapter method with the repo slug first."""
+    calls = []
+    monkeypatch.setattr(
+        adapter, "get_pr_status", lambda repo, number: calls.append((repo, number)) or {}
+    )
+
+    report = FanOutExecutor(adapter).run_all([("owner/repo", "get_pr_status", (7,))])
+
+    assert report.results[0].ok
+    assert calls == [("owner/repo", 7)]
+
+
+def test_unexpected_exceptions_propagate(adapter):
+    """Test non-GitHub errors are treated as bugs and abort the batch."""
+
+    def broken(repo_slug: str) -> None:
+        raise KeyError("bug")
+
+    with pytest.raises(KeyError):
+        FanOutExecutor(adapter).run_all([("owner/repo", broken)])
+
+
+def test_throughput_scales_with_concurrency(adapter):
+    """Test wall time shrinks roughly linearly with more workers."""
+    jobs = [(f"owner/repo{i}", ConcurrencyProbe(delay=0.02), (i,)) for i in range(16)]
+
+    started = time.perf_counter()
+    FanOutExecutor(adapter, max_concurrency=16, per_repo_concurrency=1).run_all(jobs)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 16 * 0.02 / 4
@@ -0,0 +1,151 @@
+"""Tests for the gate result cache."""
+
+import asyncio
+
+from packages.core.gate_cache import GateResultCache, cache_saved_seconds
+from packages.core.gate_framework import GateFramework, GateRunConfig, RunState
+from packages.core.gate_graph import GateCheck, GateGraph
+from packages.core.schemas.gates import CIGateResult, GateStatus, GateType
+
+SHA = "a" * 40
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _ci_result() -> CIGateResult:
+    return CIGateResult(
+        lint_passed=True,
+        unit_tests_passed=True,
+        security_scan_passed=True,
+        dependency_check_passed=True,
+        status=GateStatus.PASSED,
+    )
+
+
+def _counting_graph(calls: list, passed: bool = True) -> GateGraph:
+    async def unit_tests() -> bool:
+        calls.append("unit_tests")
+        await asyncio.sleep(0.001)
+        return passed
+
+    return GateGraph({GateType.CI: [GateCheck("unit_tests_passed", unit_tests)]})
+
+
+async def _run(graph: GateGraph, cache: GateResultCache, head_sha: str | None = SHA):
+    config = GateRunConfig(pr_number=1, run_id="run", repo_slug="o/r", head_sha=head_sha)
+    return await GateFramework(config, graph=graph, cache=cache).run_graph()
+
+
+async def test_rerun_for_same_head_reuses_passed_results():
+    """Test a re-triggered run skips checks whose results are cached."""
+    calls = []
+    cache = GateResultCache()
+    graph = _counting_graph(calls)
+    saved = cache_saved_seconds.value(gate="ci")
+
+    first = await _run(graph, cache)
+    second = await _run(graph, cache)
+
+    assert first.state == second.state == RunState.COMPLETED
+    assert second.pipeline.ci_gate.unit_tests_passed
+    assert calls == ["unit_tests"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (6, 6)
+    assert stats["hit_rate"] == 0.5
+    assert stats["saved_seconds"] > 0
+    assert cache_saved_seconds.value(gate="ci") > saved
+
+
+async def test_new_head_or_changed_checks_miss():
+    """Test a different commit or check set recomputes the gate."""
+    calls = []
+    cache = GateResultCache()
+
+    await _run(_counting_graph(calls), cache)
+    await _run(_counting_graph(calls), cache, head_sha="b" * 40)
+
+    async def extra_check() -> bool:
+        return True
+
+    changed = GateGraph(
+        {
+            GateType.CI: [
+                *_counting_graph(calls).checks(GateType.CI),
+                GateCheck("lint_passed", extra_check),
+            ]
+        }
+    )
+    await _run(changed, cache)
+
+    assert len(calls) == 3
+
+
+async def test_failed_results_are_not_cached():
+    """Test a failed gate is re-evaluated on retry."""
+    calls = []
+    cache = GateResultCache()
+    graph = _counting_graph(calls, passed=False)
+
+    assert (await _run(graph, cache)).state == RunState.FAILED
+    assert (await _run(graph, cache)).state == RunState.FAILED
+
+    assert len(calls) == 2
+
+
+async def test_cache_requires_head_sha():
+    """Test runs without a head SHA never use the cache."""
+    calls = []
+    cache = GateResultCache()
+
+    await _run(_counting_graph(calls), cache, head_sha=None)
+    await _run(_counting_graph(calls), cache, head_sha=None)
+
+    assert len(calls) == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_ttl_and_size_bounds():
+    """Test entries expire after the TTL and the least recently used is evicted."""
+    clock = _Clock()
+    cache = GateResultCache(max_entries=2, ttl=10, clock=clock)
+    keys = [(GateType.CI, sha, "inputs") for sha in ("a", "b", "c")]
+
+    cache.put(keys[0], _ci_result(), 1.0)
+    cache.put(keys[1], _ci_result(), 1.0)
+    assert cache.get(keys[0]) is not None
+    cache.put(keys[2], _ci_result(), 1.0)
+
+    assert cache.get(keys[1]) is None
+    clock.now = 11
+    assert cache.get(keys[0]) is None
+    assert cache.stats()["entries"] == 1
+
+
+def test_explicit_invalidation():
+    """Test entries can be dropped by head SHA, gate or all at once."""
+    cache = GateResultCache()
+    for gate in (GateType.SAFETY, GateType.CI):
+        for sha in ("a", "b"):
+            cache.put((gate, sha, "inputs"), _ci_result(), 1.0)
+
+    assert cache.invalidate(head_sha="a") == 2
+    assert cache.invalidate(gate=GateType.CI) == 1
+    assert cache.invalidate() == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_cached_results_are_copies():
+    """Test mutating a returned result does not change the cached entry."""
+    cache = GateResultCache()
+    key = (GateType.CI, "a", "inputs")
+    cache.put(key, _ci_result(), 1.0)
+
+    cache.get(key).lint_passed = False
+
+    assert cache.get(key).lint_passed
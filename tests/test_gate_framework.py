@@ -1,17 +1,43 @@
 """Tests for Gate Framework v1."""
 
+import asyncio
+import time
+
 import pytest
 
+import packages.core.gate_framework as gate_framework_module
+from packages.core.gate_cache import GateResultCache
 from packages.core.gate_framework import (
+    GATE_CODES,
+    GATES,
+    NO_GATE,
+    STATES,
+    SUPERSEDED_REASON,
     GateFramework,
+    GateRun,
     GateRunConfig,
+    RunCore,
     RunResult,
     RunState,
+    compile_state_table,
+    compile_transitions,
     create_mock_gate_run,
+    gate_execution,
+    gate_wait,
 )
+from packages.core.gate_graph import GateCheck, GateGraph
+from packages.core.run_events import TransitionLog
 from packages.core.schemas.gates import GateStatus, GateType
 
 
+class _Recorder:
+    def __init__(self) -> None:
+        self.transitions = []
+
+    def append(self, transition, run) -> None:
+        self.transitions.append(transition)
+
+
 class TestGateFramework:
     """Tests for the GateFramework class."""
 
@@ -494,3 +520,309 @@ class TestStateMachineTransitions:
         ]
 
         assert states == expected_states
+
+
+class TestCompactRunState:
+    """Test the compact run state behind GateFramework.run."""
+
+    @pytest.mark.parametrize("skip_staging", [False, True])
+    @pytest.mark.parametrize("skip_production", [False, True])
+    def test_state_table_matches_transitions(self, skip_staging, skip_production):
+        """Test the coded table encodes the same transitions as the enum table."""
+        table = compile_state_table(skip_staging, skip_production)
+
+        for gate, (state, next_gate) in compile_transitions(skip_staging, skip_production).items():
+            state_code, gate_code = table[GATE_CODES[gate]]
+            assert STATES[state_code] == state
+            assert (GATES[gate_code] if gate_code != NO_GATE else None) == next_gate
+
+    def test_run_not_built_until_read(self):
+        """Test transitions leave the pydantic run unbuilt until it is read."""
+        framework = GateFramework(GateRunConfig(pr_number=1, run_id="compact-1"))
+        framework._start()
+        framework.execute_safety_gate()
+
+        assert framework._run is None
+        assert framework.state == RunState.RUNNING_PLANNING
+        assert framework.current_gate == GateType.PLANNING
+        assert framework.is_running
+        assert framework.run.state == RunState.RUNNING_PLANNING
+
+    def test_read_run_follows_later_transitions(self):
+        """Test a run read mid-way reflects transitions made after the read."""
+        framework = GateFramework(GateRunConfig(pr_number=1, run_id="compact-2"))
+        run = framework.start_run()
+
+        framework.execute_safety_gate()
+        framework.execute_planning_gate()
+        framework.block_run("Waiting for approval")
+
+        assert run is framework.run
+        assert run.state == RunState.BLOCKED
+        assert run.result == RunResult.BLOCKED
+        assert run.current_gate == GateType.CI
+        assert run.blocked_reason == "Waiting for approval"
+        assert run.completed_at is not None
+
+    def test_core_round_trips_run(self):
+        """Test converting a run to the compact state and back preserves it."""
+        run = create_mock_gate_run(pr_number=5, run_id="compact-3")
+
+        restored = RunCore.from_run(run).to_run(run.config)
+
+        assert restored.model_dump() == run.model_dump()
+
+
+class TestGateTimings:
+    """Test per-gate entry, execution start and exit timestamps."""
+
+    async def test_queue_wait_is_separated_from_execution(self):
+        """Test time waiting at a gate and time executing it are recorded apart."""
+
+        async def slow_lint() -> bool:
+            await asyncio.sleep(0.05)
+            return True
+
+        graph = GateGraph({GateType.CI: [GateCheck("lint_passed", slow_lint)]})
+        framework = GateFramework(GateRunConfig(pr_number=1, run_id="timing-1"), graph=graph)
+        framework.start_run()
+        framework.execute_safety_gate()
+        framework.execute_planning_gate()
+        waits = gate_wait.count(gate="ci")
+        executions = gate_execution.count(gate="ci")
+
+        time.sleep(0.03)
+        await framework.run_gate(GateType.CI)
+
+        timing = framework.gate_timings[GateType.CI]
+        assert timing.queue_wait >= 0.03
+        assert 0.05 <= timing.execution < timing.queue_wait + 0.05
+        assert timing.exited_at == framework.gate_timings[GateType.STAGING].entered_at
+        assert gate_wait.count(gate="ci") == waits + 1
+        assert gate_execution.count(gate="ci") == executions + 1
+
+    def test_timings_cover_every_gate_reached(self):
+        """Test a full run records each gate it reached, and none it skipped."""
+        framework = GateFramework(GateRunConfig(pr_number=1, run_id="timing-2", skip_staging=True))
+
+        framework.execute_full_mock_run()
+
+        assert GateType.STAGING not in framework.gate_timings
+        timings = [framework.gate_timings[gate] for gate in GATES if gate != GateType.STAGING]
+        for timing in timings:
+            assert timing.entered_at <= timing.started_at <= timing.exited_at
+        assert [t.entered_at for t in timings] == sorted(t.entered_at for t in timings)
+
+    def test_blocked_gate_records_wait_only(self):
+        """Test a gate left before it started executing counts as queue wait."""
+        framework = GateFramework(GateRunConfig(pr_number=1, run_id="timing-3"))
+        framework.start_run()
+
+        framework.block_run("Held")
+
+        timing = framework.gate_timings[GateType.SAFETY]
+        assert timing.started_at is None
+        assert timing.execution is None
+        assert timing.queue_wait == timing.exited_at - timing.entered_at
+
+    def test_resumed_gate_reports_only_its_new_visit(self):
+        """Test readings from before a gate was re-entered count as unset."""
+        framework = GateFramework(GateRunConfig(pr_number=1, run_id="timing-9"))
+        framework.start_run()
+        framework._start_gate(GateType.SAFETY)
+        framework.block_run("Held")
+
+        framework.resume()
+
+        timing = framework.gate_timings[GateType.SAFETY]
+        assert timing.started_at is None
+        assert timing.exited_at is None
+
+    def test_timings_are_not_serialized(self):
+        """Test process-local timings stay out of persisted and API payloads."""
+        framework = GateFramework(GateRunConfig(pr_number=1, run_id="timing-8"))
+        framework.start_run()
+
+        assert GateType.SAFETY in framework.gate_timings
+        assert "gate_timings" not in framework.run.model_dump()
+        assert "gate_timings" not in framework.run.model_dump_json()
+
+    def test_timings_are_not_restored(self):
+        """Test monotonic readings of another process are dropped on restore."""
+        run = create_mock_gate_run(pr_number=1, run_id="timing-4")
+        restored = GateFramework.restore(run.model_copy(deep=True))
+
+        assert restored.gate_timings == {}
+        assert len(restored._core.timings) == 3 * len(GATES)
+
+    def test_visit_begun_before_restore_is_not_observed(self):
+        """Test leaving the gate a restored run was waiting at records no wait."""
+        framework = GateFramework(GateRunConfig(pr_number=1, run_id="timing-5"))
+        framework.start_run()
+        stored = GateRun.model_validate_json(framework.run.model_dump_json())
+        restored = GateFramework.restore(stored)
+        waits = gate_wait.count(gate="safety")
+        planning_waits = gate_wait.count(gate="planning")
+
+        restored.execute_safety_gate()
+        restored.execute_planning_gate()
+
+        assert gate_wait.count(gate="safety") == waits
+        assert gate_wait.count(gate="planning") == planning_waits + 1
+        assert GateType.SAFETY not in restored.gate_timings
+        assert restored.gate_timings[GateType.PLANNING].execution >= 0
+
+    def test_transitions_do_not_build_timing_models(self, monkeypatch):
+        """Test timings are built when read, not on every transition."""
+        built = []
+        monkeypatch.setattr(gate_framework_module, "_gate_timing", lambda *args: built.append(args))
+        log = _Recorder()
+        framework = GateFramework(GateRunConfig(pr_number=1, run_id="timing-6"), log=log)
+
+        framework.execute_full_mock_run()
+
+        assert len(log.transitions) == 7
+
+        assert built == []
+
+    def test_skipped_production_after_staging_is_not_a_transition(self):
+        """Test a run already past a skipped production gate stays where it is."""
+        log = _Recorder()
+        config = GateRunConfig(pr_number=1, run_id="timing-7", skip_production=True)
+        framework = GateFramework(config, log=log)
+        framework.start_run()
+        for gate in (GateType.SAFETY, GateType.PLANNING, GateType.CI, GateType.STAGING):
+            framework.execute_gate(gate)
+        entered = framework.gate_timings[GateType.LEARNING].entered_at
+        transitions = len(log.transitions)
+        waits = gate_wait.count(gate="learning")
+
+        result = framework.execute_production_gate()
+
+        assert result.status == GateStatus.SKIPPED
+        assert framework.state == RunState.RUNNING_LEARNING
+        assert len(log.transitions) == transitions
+        assert gate_wait.count(gate="learning") == waits
+        assert framework.gate_timings[GateType.LEARNING].entered_at == entered
+
+
+class TestResume:
+    """Test resuming failed and blocked runs at the gate where they stopped."""
+
+    @staticmethod
+    def _graph(calls: dict[str, int], outcomes: dict[str, bool]) -> GateGraph:
+        def check(name: str):
+            def run() -> bool:
+                calls[name] = calls.get(name, 0) + 1
+                return outcomes.get(name, True)
+
+            return run
+
+        return GateGraph(
+            {
+                GateType.SAFETY: [GateCheck("secrets_checked", check("secrets"))],
+                GateType.CI: [GateCheck("unit_tests_passed", check("tests"))],
+                GateType.STAGING: [GateCheck("smoke_tests_passed", check("smoke"))],
+            }
+        )
+
+    async def test_resume_reruns_only_the_failed_gate(self):
+        """Test a run failed at staging continues there and reuses earlier results."""
+        calls: dict[str, int] = {}
+        outcomes = {"smoke": False}
+        framework = GateFramework(
+            GateRunConfig(pr_number=1, run_id="resume-1", head_sha="abc"),
+            graph=self._graph(calls, outcomes),
+        )
+        run = await framework.run_graph()
+        assert (run.state, run.current_gate) == (RunState.FAILED, GateType.STAGING)
+
+        outcomes["smoke"] = True
+        resumed = framework.resume()
+        assert resumed.state == RunState.RUNNING_STAGING
+        assert resumed.result == RunResult.PENDING
+        assert resumed.error_message is None
+        assert resumed.completed_at is None
+
+        run = await framework.run_graph()
+
+        assert run.state == RunState.COMPLETED
+        assert calls == {"secrets": 1, "tests": 1, "smoke": 2}
+        assert run.pipeline.staging_gate.status == GateStatus.PASSED
+        assert run.pipeline.ci_gate.status == GateStatus.PASSED
+
+    async def test_new_head_restarts_at_safety(self):
+        """Test resuming for a different commit re-runs every gate."""
+        calls: dict[str, int] = {}
+        framework = GateFramework(
+            GateRunConfig(pr_number=1, run_id="resume-2", head_sha="abc"),
+            graph=self._graph(calls, {"tests": False}),
+        )
+        await framework.run_graph()
+
+        run = framework.resume(head_sha="def")
+
+        assert (run.state, run.current_gate) == (RunState.RUNNING_SAFETY, GateType.SAFETY)
+        assert run.config.head_sha == "def"
+        assert framework.config.head_sha == "def"
+
+    async def test_resumed_elsewhere_reuses_cached_results(self):
+        """Test a restored run builds its pipeline from results cached by the first attempt."""
+        cache = GateResultCache()
+        calls: dict[str, int] = {}
+        outcomes = {"smoke": False}
+        config = GateRunConfig(pr_number=1, run_id="resume-3", head_sha="abc")
+        first = GateFramework(config, graph=self._graph(calls, outcomes), cache=cache)
+        failed = await first.run_graph()
+
+        outcomes["smoke"] = True
+        restored = GateFramework.restore(
+            failed.model_copy(deep=True), graph=self._graph(calls, outcomes), cache=cache
+        )
+        restored.resume()
+        run = await restored.run_graph()
+
+        assert run.state == RunState.COMPLETED
+        assert calls == {"secrets": 1, "tests": 1, "smoke": 2}
+        assert run.pipeline is not None
+
+    def test_resume_blocked_run_is_replayed(self):
+        """Test the transition out of BLOCKED replays to a pending run."""
+        log = TransitionLog()
+        framework = GateFramework(GateRunConfig(pr_number=1, run_id="resume-4"), log=log)
+        framework.start_run()
+        framework.execute_safety_gate()
+        framework.block_run("Waiting for approval")
+
+        framework.resume()
+
+        replayed = log.replay("resume-4")
+        assert (replayed.state, replayed.current_gate) == (
+            RunState.RUNNING_PLANNING,
+            GateType.PLANNING,
+        )
+        assert replayed.result == RunResult.PENDING
+        assert replayed.blocked_reason is None
+        assert framework.execute_planning_gate().status == GateStatus.PASSED
+
+    @pytest.mark.parametrize("head_sha", [None, "def"])
+    def test_superseded_run_is_not_resumed(self, head_sha):
+        """Test a run stopped for a newer commit stays blocked, even for a new head."""
+        framework = GateFramework(GateRunConfig(pr_number=1, run_id="resume-6", head_sha="abc"))
+        framework.start_run()
+        framework.block_run(SUPERSEDED_REASON)
+
+        with pytest.raises(ValueError, match="superseded"):
+            framework.resume(head_sha=head_sha)
+
+        assert (framework.state, framework.config.head_sha) == (RunState.BLOCKED, "abc")
+
+    @pytest.mark.parametrize("finish", ["complete", "fresh"])
+    def test_only_failed_or_blocked_runs_resume(self, finish):
+        """Test completed and unstarted runs cannot be resumed."""
+        framework = GateFramework(GateRunConfig(pr_number=1, run_id="resume-5"))
+        if finish == "complete":
+            framework.execute_full_mock_run()
+
+        with pytest.raises(ValueError):
+            framework.resume()
@@ -0,0 +1,349 @@
+"""Tests for the declarative gate graph."""
+
+import asyncio
+import threading
+
+import pytest
+
+from packages.core.gate_framework import (
+    GateFramework,
+    GateRunConfig,
+    RunResult,
+    RunState,
+    compile_transitions,
+)
+from packages.core.gate_graph import (
+    CheckOutcome,
+    GateCheck,
+    GateGraph,
+    gate_sequence,
+    next_gates,
+)
+from packages.core.schemas.gates import GateStatus, GateType
+
+
+def _framework(graph: GateGraph | None = None, **config) -> GateFramework:
+    return GateFramework(GateRunConfig(pr_number=1, run_id="graph-001", **config), graph)
+
+
+def _passing() -> bool:
+    return True
+
+
+@pytest.mark.parametrize(
+    ("skip_staging", "skip_production", "expected"),
+    [
+        (False, False, {GateType.CI: GateType.STAGING, GateType.STAGING: GateType.PRODUCTION}),
+        (True, False, {GateType.CI: GateType.PRODUCTION, GateType.STAGING: GateType.PRODUCTION}),
+        (False, True, {GateType.CI: GateType.STAGING, GateType.STAGING: GateType.LEARNING}),
+        (True, True, {GateType.CI: GateType.PRODUCTION, GateType.STAGING: GateType.LEARNING}),
+    ],
+)
+def test_compiled_transitions(skip_staging, skip_production, expected):
+    """Test skip rules compile into the same transitions as the original state machine."""
+    transitions = compile_transitions(skip_staging, skip_production)
+
+    for gate, next_gate in expected.items():
+        assert transitions[gate][1] == next_gate
+    assert transitions[GateType.PRODUCTION] == (RunState.RUNNING_LEARNING, GateType.LEARNING)
+    assert transitions[GateType.LEARNING] == (RunState.COMPLETED, None)
+    assert compile_transitions(skip_staging, skip_production) is transitions
+
+
+def test_gate_sequence_drops_skipped_gates():
+    """Test skipped gates are compiled out of the execution order."""
+    skipped = frozenset({GateType.STAGING})
+
+    assert gate_sequence(skipped) == (
+        GateType.SAFETY,
+        GateType.PLANNING,
+        GateType.CI,
+        GateType.PRODUCTION,
+        GateType.LEARNING,
+    )
+    assert next_gates(skipped)[GateType.STAGING] == GateType.PRODUCTION
+
+
+async def test_independent_checks_run_concurrently():
+    """Test checks without dependencies between them overlap."""
+    running = 0
+    peak = 0
+
+    async def check() -> bool:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return True
+
+    graph = GateGraph(
+        {
+            GateType.CI: [
+                GateCheck("lint_passed", check),
+                GateCheck("unit_tests_passed", check),
+                GateCheck("security_scan_passed", check),
+                GateCheck("dependency_check_passed", check),
+            ]
+        }
+    )
+
+    assert all((await graph.evaluate(GateType.CI)).passed.values())
+    assert peak == 4
+
+
+async def test_dependent_check_waits_and_is_skipped_on_failure():
+    """Test a check runs after its dependencies and is skipped when one fails."""
+    calls = []
+
+    async def lint() -> bool:
+        await asyncio.sleep(0.005)
+        calls.append("lint")
+        return False
+
+    async def scan() -> bool:
+        calls.append("scan")
+        return True
+
+    async def tests() -> bool:
+        calls.append("tests")
+        return True
+
+    graph = GateGraph(
+        {
+            GateType.CI: [
+                GateCheck("security_scan_passed", scan, depends_on=("lint_passed",)),
+                GateCheck("lint_passed", lint),
+                GateCheck("unit_tests_passed", tests, depends_on=()),
+            ]
+        }
+    )
+
+    evaluation = await graph.evaluate(GateType.CI, fail_fast=False)
+
+    assert evaluation.outcomes == {
+        "lint_passed": CheckOutcome.FAILED,
+        "security_scan_passed": CheckOutcome.SKIPPED,
+        "unit_tests_passed": CheckOutcome.PASSED,
+    }
+    assert evaluation.failures == ("lint_passed",)
+    assert calls == ["tests", "lint"]
+
+
+async def test_sync_checks_run_in_worker_threads():
+    """Test plain callables do not block the event loop."""
+    loop_thread = threading.get_ident()
+    threads = []
+
+    def check() -> bool:
+        threads.append(threading.get_ident())
+        return True
+
+    graph = GateGraph({GateType.SAFETY: [GateCheck("forbidden_paths_checked", check)]})
+
+    evaluation = await graph.evaluate(GateType.SAFETY)
+
+    assert evaluation.passed == {"forbidden_paths_checked": True}
+    assert threads and threads[0] != loop_thread
+
+
+@pytest.mark.parametrize(
+    ("checks", "message"),
+    [
+        ([GateCheck("no_such_field", _passing)], "no result field"),
+        ([GateCheck("status", _passing)], "no result field"),
+        ([GateCheck("cancelled_checks", _passing)], "no result field"),
+        ([GateCheck("lint_passed", _passing, depends_on=("typo",))], "unknown checks"),
+        (
+            [
+                GateCheck("lint_passed", _passing, depends_on=("unit_tests_passed",)),
+                GateCheck("unit_tests_passed", _passing, depends_on=("lint_passed",)),
+            ],
+            "cycle",
+        ),
+    ],
+)
+def test_invalid_graphs_are_rejected(checks, message):
+    """Test graphs are validated once at construction."""
+    with pytest.raises(ValueError, match=message):
+        GateGraph({GateType.CI: checks})
+
+
+async def test_run_graph_completes_and_builds_pipeline():
+    """Test a graph run passes every gate and records the pipeline."""
+    graph = GateGraph({GateType.CI: [GateCheck("lint_passed", _passing)]})
+
+    run = await _framework(graph).run_graph()
+
+    assert run.state == RunState.COMPLETED
+    assert run.result == RunResult.PASSED
+    assert run.pipeline.ci_gate.lint_passed
+
+
+async def test_run_graph_stops_at_failing_gate():
+    """Test a failing check fails its gate and later gates never run."""
+    later = []
+
+    def staging_check() -> bool:
+        later.append("staging")
+        return True
+
+    async def failing() -> bool:
+        return False
+
+    graph = GateGraph(
+        {
+            GateType.CI: [GateCheck("unit_tests_passed", failing)],
+            GateType.STAGING: [GateCheck("smoke_tests_passed", staging_check)],
+        }
+    )
+
+    run = await _framework(graph).run_graph()
+
+    assert run.state == RunState.FAILED
+    assert run.current_gate == GateType.CI
+    assert run.pipeline is None
+    assert later == []
+
+
+@pytest.mark.parametrize(
+    ("skip_staging", "skip_production"), [(True, False), (False, True), (True, True)]
+)
+async def test_run_graph_with_skipped_gates(skip_staging, skip_production):
+    """Test skipped gates record SKIPPED without running their checks."""
+    ran = []
+
+    def check() -> bool:
+        ran.append(True)
+        return True
+
+    graph = GateGraph(
+        {
+            GateType.STAGING: [GateCheck("smoke_tests_passed", check)],
+            GateType.PRODUCTION: [GateCheck("verification_passed", check)],
+        }
+    )
+    framework = _framework(graph, skip_staging=skip_staging, skip_production=skip_production)
+
+    run = await framework.run_graph()
+
+    assert run.state == RunState.COMPLETED
+    assert len(ran) == (not skip_staging) + (not skip_production)
+    if skip_staging:
+        assert run.pipeline.staging_gate.status == GateStatus.SKIPPED
+    if skip_production:
+        assert run.pipeline.production_gate.status == GateStatus.SKIPPED
+
+
+async def test_first_failure_cancels_running_siblings():
+    """Test a failing check cancels slower siblings and reports them as cancelled."""
+    cleaned_up = []
+
+    async def slow_tests() -> bool:
+        try:
+            await asyncio.sleep(10)
+            return True
+        finally:
+            cleaned_up.append("unit_tests_passed")
+
+    async def failing_scan() -> bool:
+        await asyncio.sleep(0.005)
+        return False
+
+    async def dependent() -> bool:
+        return True
+
+    graph = GateGraph(
+        {
+            GateType.CI: [
+                GateCheck("unit_tests_passed", slow_tests),
+                GateCheck("security_scan_passed", failing_scan),
+                GateCheck("lint_passed", _passing),
+                GateCheck("dependency_check_passed", dependent, depends_on=("unit_tests_passed",)),
+            ]
+        }
+    )
+    reasons = []
+
+    evaluation = await asyncio.wait_for(
+        graph.evaluate(GateType.CI, on_failure=reasons.append), timeout=5
+    )
+
+    assert reasons == ["security_scan_passed"]
+    assert evaluation.outcomes == {
+        "unit_tests_passed": CheckOutcome.CANCELLED,
+        "security_scan_passed": CheckOutcome.FAILED,
+        "lint_passed": CheckOutcome.PASSED,
+        "dependency_check_passed": CheckOutcome.CANCELLED,
+    }
+    assert evaluation.cancelled == ["unit_tests_passed", "dependency_check_passed"]
+    assert cleaned_up == ["unit_tests_passed"]
+
+
+async def test_run_gate_fails_fast_with_check_reason():
+    """Test the run fails with the failing check's reason before siblings finish."""
+    states = []
+
+    async def failing_scan() -> bool:
+        raise RuntimeError("CVE-2024-0001 found")
+
+    async def slow_tests() -> bool:
+        await asyncio.sleep(10)
+        return True
+
+    graph = GateGraph(
+        {
+            GateType.CI: [
+                GateCheck("security_scan_passed", failing_scan),
+                GateCheck("unit_tests_passed", slow_tests),
+            ]
+        }
+    )
+    framework = _framework(graph)
+    framework.start_run()
+    framework.execute_safety_gate()
+    framework.execute_planning_gate()
+    original = framework._fail_run
+
+    def record(message: str) -> None:
+        states.append(framework.run.state)
+        original(message)
+
+    framework._fail_run = record
+
+    result = await asyncio.wait_for(framework.run_gate(GateType.CI), timeout=5)
+
+    assert states[0] == RunState.RUNNING_CI
+    assert framework.run.state == RunState.FAILED
+    assert framework.run.error_message == (
+        "CI gate failed: security_scan_passed: CVE-2024-0001 found"
+    )
+    assert result.status == GateStatus.FAILED
+    assert result.cancelled_checks == ["unit_tests_passed"]
+    assert not result.unit_tests_passed
+
+
+async def test_collect_all_failures_mode_runs_every_check():
+    """Test diagnostics mode waits for every check and reports all failures."""
+
+    async def failing() -> bool:
+        return False
+
+    async def slow_failing() -> bool:
+        await asyncio.sleep(0.01)
+        return False
+
+    graph = GateGraph(
+        {
+            GateType.CI: [
+                GateCheck("lint_passed", failing),
+                GateCheck("unit_tests_passed", slow_failing),
+                GateCheck("security_scan_passed", _passing),
+            ]
+        }
+    )
+
+    run = await _framework(graph, collect_all_failures=True).run_graph()
+
+    assert run.state == RunState.FAILED
+    assert run.error_message == "CI gate failed: lint_passed; unit_tests_passed"
@@ -0,0 +1,206 @@
+"""Tests for webhook-driven gate orchestration."""
+
+import asyncio
+import threading
+
+import pytest
+
+from packages.core.adapters.github_adapter import GitHubAdapter
+from packages.core.gate_framework import RunResult, RunState
+from packages.core.gate_orchestrator import GateOrchestrator, decision_latency
+from packages.core.schemas.gates import GateType
+from packages.core.schemas.webhooks import WebhookEvent, WebhookSource
+from packages.core.testing import FakeGitHub
+
+REPO = "owner/repo"
+CHECKS = ["lint", "unit-tests", "security-scan", "dependency-check"]
+
+
+@pytest.fixture
+def fake():
+    fake = FakeGitHub()
+    fake.add_repo(REPO)
+    fake.add_pull_request(REPO, "feature")
+    return fake
+
+
+@pytest.fixture
+def adapter(fake):
+    adapter = GitHubAdapter(token="test_token", transport=fake.transport())
+    yield adapter
+    adapter.client.close()
+
+
+@pytest.fixture
+def orchestrator(adapter):
+    return GateOrchestrator(adapter)
+
+
+def _event(event_type: str, payload: dict) -> WebhookEvent:
+    return WebhookEvent(
+        event_id=f"evt-{event_type}",
+        event_type=event_type,
+        source=WebhookSource.GITHUB,
+        payload={"repository": {"full_name": REPO}, **payload},
+    )
+
+
+def _head_sha(fake: FakeGitHub) -> str:
+    return fake.repos[REPO].pulls[1]["head"]["sha"]
+
+
+def _pull_request(fake: FakeGitHub, action: str = "opened") -> WebhookEvent:
+    return _event("pull_request", {"action": action, "pull_request": fake.repos[REPO].pulls[1]})
+
+
+def _suite_completed(sha: str, linked: bool = True) -> WebhookEvent:
+    pull_requests = [{"number": 1}] if linked else []
+    suite = {"head_sha": sha, "conclusion": "success", "pull_requests": pull_requests}
+    return _event("check_suite", {"action": "completed", "check_suite": suite})
+
+
+def _deployment(sha: str, environment: str, state: str = "success") -> WebhookEvent:
+    return _event(
+        "deployment_status",
+        {
+            "deployment": {"sha": sha, "environment": environment},
+            "deployment_status": {"state": state, "log_url": "https://ci.example.com/1"},
+        },
+    )
+
+
+def _add_checks(fake: FakeGitHub, conclusions: dict[str, str | None] | None = None) -> None:
+    for name in CHECKS:
+        conclusion = (conclusions or {}).get(name, "success")
+        status = "completed" if conclusion else "in_progress"
+        fake.add_check_run(REPO, _head_sha(fake), name, status=status, conclusion=conclusion)
+
+
+async def test_webhooks_drive_run_to_completion(fake, orchestrator):
+    """Test a PR goes from opened to completed on webhooks alone."""
+    sha = _head_sha(fake)
+    _add_checks(fake)
+
+    orchestrator.handle(_pull_request(fake))
+    await orchestrator.drain()
+    assert orchestrator.get_run(REPO, 1).current_gate == GateType.CI
+
+    orchestrator.handle(_suite_completed(sha))
+    orchestrator.handle(_deployment(sha, "staging"))
+    orchestrator.handle(_deployment(sha, "production"))
+    await orchestrator.drain()
+
+    run = orchestrator.get_run(REPO, 1)
+    assert run.state == RunState.COMPLETED
+    assert run.config.head_sha == sha
+    assert decision_latency.count(event="check_suite", gate="ci") >= 1
+
+
+async def test_pending_checks_keep_run_at_ci(fake, orchestrator):
+    """Test a completed suite with other checks still running does not decide CI."""
+    _add_checks(fake, {"unit-tests": None})
+
+    orchestrator.handle(_pull_request(fake))
+    orchestrator.handle(_suite_completed(_head_sha(fake)))
+    await orchestrator.drain()
+
+    assert orchestrator.get_run(REPO, 1).state == RunState.RUNNING_CI
+
+
+async def test_failed_check_fails_ci_gate(fake, orchestrator):
+    """Test a failing check fails the run even while other checks run."""
+    _add_checks(fake, {"security-scan": "failure", "unit-tests": None})
+
+    orchestrator.handle(_pull_request(fake))
+    orchestrator.handle(_suite_completed(_head_sha(fake)))
+    await orchestrator.drain()
+
+    run = orchestrator.get_run(REPO, 1)
+    assert run.result == RunResult.FAILED
+    assert run.error_message == "CI gate failed"
+
+
+async def test_failed_deployment_fails_staging_gate(fake, orchestrator):
+    """Test a failed staging deployment fails the run."""
+    _add_checks(fake)
+
+    orchestrator.handle(_pull_request(fake))
+    orchestrator.handle(_suite_completed(_head_sha(fake)))
+    orchestrator.handle(_deployment(_head_sha(fake), "staging", state="failure"))
+    await orchestrator.drain()
+
+    assert orchestrator.get_run(REPO, 1).error_message == "Staging gate failed"
+
+
+async def test_synchronize_starts_new_run_and_ignores_stale_suites(fake, orchestrator):
+    """Test a push starts a run for the new head; suites for the old head are ignored."""
+    old_sha = _head_sha(fake)
+    orchestrator.handle(_pull_request(fake))
+    await orchestrator.drain()
+    first = orchestrator.get_run(REPO, 1)
+
+    fake.repos[REPO].pulls[1]["head"]["sha"] = "abc123" * 6 + "abcd"
+    _add_checks(fake)
+    orchestrator.handle(_pull_request(fake, "synchronize"))
+    orchestrator.handle(_suite_completed(old_sha))
+    await orchestrator.drain()
+
+    second = orchestrator.get_run(REPO, 1)
+    assert second.run_id != first.run_id
+    assert second.state == RunState.RUNNING_CI
+
+
+async def test_fork_suite_matched_by_head_sha(fake, orchestrator):
+    """Test suites without PR links are routed through the head SHA index."""
+    _add_checks(fake)
+
+    orchestrator.handle(_pull_request(fake))
+    orchestrator.handle(_suite_completed(_head_sha(fake), linked=False))
+    await orchestrator.drain()
+
+    assert orchestrator.get_run(REPO, 1).state == RunState.RUNNING_STAGING
+
+
+async def test_per_pr_ordering_with_slow_reads(fake, orchestrator):
+    """Test events for one PR apply in order while a CI read is in flight."""
+    fake.latency = 0.02
+    sha = _head_sha(fake)
+    _add_checks(fake)
+
+    for event in (
+        _pull_request(fake),
+        _suite_completed(sha),
+        _deployment(sha, "staging"),
+        _deployment(sha, "production"),
+    ):
+        orchestrator.handle(event)
+    await orchestrator.drain()
+
+    assert orchestrator.get_run(REPO, 1).state == RunState.COMPLETED
+
+
+async def test_events_from_other_threads_are_handed_to_the_loop(fake, orchestrator):
+    """Test deliveries from worker threads are processed on the bound loop."""
+    orchestrator.handle(_event("ping", {}))
+    thread = threading.Thread(target=orchestrator.handle, args=(_pull_request(fake),))
+    thread.start()
+    thread.join()
+
+    while orchestrator.get_run(REPO, 1) is None:
+        await asyncio.sleep(0.001)
+    await orchestrator.drain()
+
+    assert orchestrator.get_run(REPO, 1).state == RunState.RUNNING_CI
+
+
+async def test_closed_pr_blocks_run(fake, orchestrator):
+    """Test closing a PR blocks its in-flight run and stops tracking it."""
+    orchestrator.handle(_pull_request(fake))
+    await orchestrator.drain()
+    run = orchestrator.get_run(REPO, 1)
+
+    orchestrator.handle(_pull_request(fake, "closed"))
+    await orchestrator.drain()
+
+    assert run.state == RunState.BLOCKED
+    assert orchestrator.get_run(REPO, 1) is None
@@ -0,0 +1,229 @@
+"""Tests for the gate run manager."""
+
+import asyncio
+
+import pytest
+
+from packages.core.gate_framework import SUPERSEDED_REASON, GateRunConfig, RunState
+from packages.core.gate_graph import GateCheck, GateGraph
+from packages.core.gate_run_manager import (
+    CANCELLED_REASON,
+    GateRunManager,
+    SupersededHeadError,
+    gate_queue_wait,
+    supersede_latency,
+)
+from packages.core.schemas.gates import GateType
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.transitions = []
+
+    def append(self, transition, run) -> None:
+        self.transitions.append(transition)
+
+
+def _config(repo: str, run_id: str = "") -> GateRunConfig:
+    return GateRunConfig(pr_number=1, run_id=run_id, repo_slug=repo)
+
+
+@pytest.fixture
+def recorder():
+    return _Recorder()
+
+
+async def test_runs_complete_and_finished_runs_are_bounded():
+    """Test submitted runs complete and only the newest finished runs are kept."""
+    manager = GateRunManager(max_workers=4, max_finished=2)
+    waits = gate_queue_wait.count(gate="safety")
+
+    run_ids = [manager.submit(_config("o/a")) for _ in range(3)]
+    await manager.join()
+
+    assert manager.status(run_ids[0]) is None
+    assert all(manager.status(run_id).state == RunState.COMPLETED for run_id in run_ids[1:])
+    assert manager.stats() == {"active": 0, "queued": 0, "executing": 0}
+    assert gate_queue_wait.count(gate="safety") - waits == 3
+    await manager.close()
+
+
+async def test_repositories_share_workers_fairly(recorder):
+    """Test a repository with one run is not starved by a busy repository."""
+    manager = GateRunManager(max_workers=1, log=recorder)
+    for index in range(20):
+        manager.submit(_config("o/busy", f"busy-{index}"))
+    manager.submit(_config("o/quiet", "quiet"))
+
+    await manager.join()
+
+    gates = [t.run_id for t in recorder.transitions if t.from_state != RunState.INITIALIZED]
+    assert gates.index("quiet") == 1
+    await manager.close()
+
+
+async def test_higher_priority_runs_first(recorder):
+    """Test a high-priority run finishes before earlier low-priority runs."""
+    manager = GateRunManager(max_workers=1, log=recorder)
+    for index in range(3):
+        manager.submit(_config("o/a", f"low-{index}"))
+    manager.submit(_config("o/b", "urgent"), priority=10)
+
+    await manager.join()
+
+    completed = [t.run_id for t in recorder.transitions if t.to_state == RunState.COMPLETED]
+    assert completed[0] == "urgent"
+    await manager.close()
+
+
+async def test_cancel_queued_run():
+    """Test cancelling a queued run blocks it without executing gates."""
+    manager = GateRunManager(max_workers=1)
+    run_id = manager.submit(_config("o/a"))
+
+    assert manager.cancel(run_id)
+    await manager.join()
+
+    run = manager.status(run_id)
+    assert (run.state, run.current_gate) == (RunState.BLOCKED, GateType.SAFETY)
+    assert run.blocked_reason == CANCELLED_REASON
+    assert not manager.cancel(run_id)
+    await manager.close()
+
+
+async def test_cancel_interrupts_executing_gate():
+    """Test cancelling a run stops its in-flight checks."""
+    started = asyncio.Event()
+    interrupted = []
+
+    async def slow_tests() -> bool:
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            interrupted.append(True)
+            raise
+        return True
+
+    graph = GateGraph({GateType.CI: [GateCheck("unit_tests_passed", slow_tests)]})
+    manager = GateRunManager(max_workers=2, graph=graph)
+    run_id = manager.submit(_config("o/a"))
+    await asyncio.wait_for(started.wait(), timeout=5)
+
+    assert manager.cancel(run_id)
+    await asyncio.wait_for(manager.join(), timeout=5)
+
+    run = manager.status(run_id)
+    assert (run.state, run.current_gate) == (RunState.BLOCKED, GateType.CI)
+    assert interrupted == [True]
+    await manager.close()
+
+
+async def test_close_leaves_executing_run_at_its_gate():
+    """Test closing the manager mid-gate stops the workers without blocking the run."""
+    started = asyncio.Event()
+
+    async def slow_tests() -> bool:
+        started.set()
+        await asyncio.sleep(10)
+        return True
+
+    graph = GateGraph({GateType.CI: [GateCheck("unit_tests_passed", slow_tests)]})
+    manager = GateRunManager(max_workers=2, graph=graph)
+    run_id = manager.submit(_config("o/a"))
+    await asyncio.wait_for(started.wait(), timeout=5)
+
+    await asyncio.wait_for(manager.close(), timeout=5)
+
+    run = manager.status(run_id)
+    assert (run.state, run.current_gate) == (RunState.RUNNING_CI, GateType.CI)
+    assert run.blocked_reason is None
+
+
+async def test_duplicate_active_run_id_is_rejected():
+    """Test a run id can only be active once."""
+    manager = GateRunManager(max_workers=1)
+    manager.submit(_config("o/a", "run-1"))
+
+    with pytest.raises(ValueError):
+        manager.submit(_config("o/a", "run-1"))
+    await manager.close()
+
+
+class _Locks:
+    def __init__(self) -> None:
+        self.released = []
+
+    def release(self, run) -> None:
+        self.released.append(run.run_id)
+
+
+async def test_new_push_supersedes_in_flight_runs():
+    """Test runs for older heads of a PR are stopped when a newer head is submitted."""
+    checks_started = asyncio.Event()
+
+    async def slow_tests() -> bool:
+        checks_started.set()
+        await asyncio.sleep(0.2)
+        return True
+
+    graph = GateGraph({GateType.CI: [GateCheck("unit_tests_passed", slow_tests)]})
+    locks = _Locks()
+    manager = GateRunManager(max_workers=4, graph=graph, locks=locks)
+    observed = supersede_latency.count()
+
+    def push(sha: str, pr_number: int = 1) -> str:
+        config = GateRunConfig(pr_number=pr_number, run_id="", repo_slug="o/a", head_sha=sha)
+        return manager.submit(config)
+
+    first = push("sha-1")
+    other_pr = push("sha-9", pr_number=2)
+    await asyncio.wait_for(checks_started.wait(), timeout=5)
+    second = push("sha-2")
+    third = push("sha-3")
+    redelivered = push("sha-3")
+    await asyncio.wait_for(manager.join(), timeout=5)
+
+    for run_id in (first, second):
+        run = manager.status(run_id)
+        assert (run.state, run.blocked_reason) == (RunState.BLOCKED, SUPERSEDED_REASON)
+    for run_id in (third, redelivered, other_pr):
+        assert manager.status(run_id).state == RunState.COMPLETED
+    assert sorted(locks.released) == sorted([first, second])
+    assert supersede_latency.count() == observed + 2
+    assert manager._by_pr == {}
+    await manager.close()
+
+
+async def test_late_push_for_older_head_does_not_supersede_newer_run():
+    """Test an out-of-order push for an older head is refused."""
+    manager = GateRunManager(max_workers=1)
+
+    def push(sha: str, pushed_at: float) -> str:
+        config = GateRunConfig(pr_number=1, run_id="", repo_slug="o/a", head_sha=sha)
+        return manager.submit(config, pushed_at=pushed_at)
+
+    newer = push("sha-2", pushed_at=200.0)
+    with pytest.raises(SupersededHeadError):
+        push("sha-1", pushed_at=100.0)
+    redelivered = push("sha-2", pushed_at=200.0)
+    await asyncio.wait_for(manager.join(), timeout=5)
+
+    assert manager.status(newer).state == RunState.COMPLETED
+    assert manager.status(redelivered).state == RunState.COMPLETED
+    assert manager._heads[("o/a", 1)] == (200.0, "sha-2")
+    await manager.close()
+
+
+async def test_cancel_records_reason_and_releases_locks():
+    """Test cancel blocks with the given reason and releases the run's locks."""
+    locks = _Locks()
+    manager = GateRunManager(max_workers=1, locks=locks)
+    run_id = manager.submit(_config("o/a"))
+
+    assert manager.cancel(run_id, reason="Pull request closed")
+    assert not manager.cancel(run_id)
+
+    assert manager.status(run_id).blocked_reason == "Pull request closed"
+    assert locks.released == [run_id]
+    await manager.close()
@@ -14,6 +14,8 @@ from packages.core.adapters.github_adapter import (
     GitHubNotFoundError,
     GitHubValidationError,
 )
+from packages.core.adapters.head_sha_cache import HeadShaCache
+from packages.core.schemas.webhooks import WebhookEvent, WebhookSource
 
 
 @pytest.fixture
@@ -399,3 +401,125 @@ def test_complete_workflow(github_adapter, mock_response):
         status_result = github_adapter.get_pr_status("owner/repo", 1)
         assert status_result["state"] == "open"
         assert status_result["mergeable"] is True
+
+
+def _route_get(mock_response, routes: dict):
+    """Build a client.get side effect that dispatches on the request path."""
+
+    def _get(path, *args, **kwargs):
+        return mock_response(200, routes[path])
+
+    return _get
+
+
+PR_PAYLOAD = {
+    "state": "open",
+    "mergeable": True,
+    "merged": False,
+    "mergeable_state": "clean",
+    "draft": False,
+    "head": {"sha": "head_sha_123"},
+}
+CHECK_RUNS_PAYLOAD = {
+    "check_runs": [
+        {
+            "id": 1,
+            "name": "build",
+            "status": "completed",
+            "conclusion": "success",
+            "html_url": "https://github.com/owner/repo/runs/1",
+        }
+    ]
+}
+STATUS_PAYLOAD = {
+    "state": "pending",
+    "statuses": [{"context": "ci/legacy", "state": "pending", "target_url": None}],
+}
+
+
+def test_get_pr_snapshot_fetches_pr_once(github_adapter, mock_response):
+    """Test snapshot fetches the PR once plus checks and status for its head SHA."""
+    routes = {
+        "/repos/owner/repo/pulls/42": PR_PAYLOAD,
+        "/repos/owner/repo/commits/head_sha_123/check-runs": CHECK_RUNS_PAYLOAD,
+        "/repos/owner/repo/commits/head_sha_123/status": STATUS_PAYLOAD,
+    }
+
+    with patch.object(
+        github_adapter.client, "get", side_effect=_route_get(mock_response, routes)
+    ) as mock_get:
+        snapshot = github_adapter.get_pr_snapshot("owner/repo", 42)
+
+    assert mock_get.call_count == 3
+    requested = [call.args[0] for call in mock_get.call_args_list]
+    assert requested.count("/repos/owner/repo/pulls/42") == 1
+    assert snapshot.head_sha == "head_sha_123"
+    assert snapshot.pr_status()["mergeable_state"] == "clean"
+    assert snapshot.check_run_dicts()[0]["conclusion"] == "success"
+    assert snapshot.combined_state == "pending"
+    assert snapshot.statuses[0].context == "ci/legacy"
+
+
+def test_pr_status_then_check_runs_reuses_head_sha(mock_response):
+    """Test get_check_runs skips the PR fetch when the head SHA is cached."""
+    routes = {
+        "/repos/owner/repo/pulls/42": PR_PAYLOAD,
+        "/repos/owner/repo/commits/head_sha_123/check-runs": CHECK_RUNS_PAYLOAD,
+    }
+    adapter = GitHubAdapter(token="test_token", head_sha_cache=HeadShaCache())
+
+    with patch.object(
+        adapter.client, "get", side_effect=_route_get(mock_response, routes)
+    ) as mock_get:
+        adapter.get_pr_status("owner/repo", 42)
+        checks = adapter.get_check_runs("owner/repo", 42)
+
+    assert mock_get.call_count == 2
+    assert checks[0]["name"] == "build"
+
+
+def test_head_sha_not_cached_without_injected_cache(github_adapter, mock_response):
+    """Test an adapter without a subscriber-registered cache fetches the head every time."""
+    routes = {
+        "/repos/owner/repo/pulls/42": PR_PAYLOAD,
+        "/repos/owner/repo/commits/head_sha_123/check-runs": CHECK_RUNS_PAYLOAD,
+    }
+
+    with patch.object(
+        github_adapter.client, "get", side_effect=_route_get(mock_response, routes)
+    ) as mock_get:
+        github_adapter.get_pr_status("owner/repo", 42)
+        github_adapter.get_check_runs("owner/repo", 42)
+
+    assert github_adapter.head_sha_cache is None
+    assert mock_get.call_count == 3
+
+
+def test_head_sha_cache_invalidated_by_synchronize_webhook():
+    """Test pull_request.synchronize drops the cached head SHA."""
+    cache = HeadShaCache()
+    cache.set("owner/repo", 42, "old_sha")
+    event = WebhookEvent(
+        event_id="delivery-1",
+        event_type="pull_request",
+        source=WebhookSource.GITHUB,
+        payload={
+            "action": "synchronize",
+            "number": 42,
+            "repository": {"full_name": "owner/repo"},
+        },
+    )
+
+    cache.handle(event)
+
+    assert cache.get("owner/repo", 42) is None
+
+
+def test_head_sha_cache_expires():
+    """Test cached head SHAs expire after the TTL."""
+    now = [0.0]
+    cache = HeadShaCache(ttl=5.0, clock=lambda: now[0])
+    cache.set("owner/repo", 1, "sha")
+    assert cache.get("owner/repo", 1) == "sha"
+    now[0] = 5.0
+    assert cache.get("owner/repo", 1) is None
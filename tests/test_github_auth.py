@@ -0,0 +1,172 @@
+"""Tests for GitHub App installation token providers."""
+
+import sys
+import threading
+import time
+
+import httpx
+import pytest
+
+from packages.core.adapters.auth import (
+    InstallationTokenCache,
+    InstallationTokenProvider,
+    StaticTokenProvider,
+    TokenAuth,
+)
+from packages.core.adapters.github_adapter import GitHubAdapter, GitHubAuthError
+from packages.core.testing import FakeGitHub
+
+REPO = "owner/repo"
+
+
+class OffsetClock:
+    def __init__(self) -> None:
+        self.offset = 0.0
+
+    def __call__(self) -> float:
+        return time.time() + self.offset
+
+
+@pytest.fixture
+def fake():
+    fake = FakeGitHub()
+    fake.add_repo(REPO)
+    fake.add_pull_request(REPO, "feature")
+    return fake
+
+
+@pytest.fixture
+def cache():
+    return InstallationTokenCache()
+
+
+def _mints(fake: FakeGitHub) -> int:
+    return sum(1 for _, path in fake.requests if path.endswith("/access_tokens"))
+
+
+def _provider(fake, cache, **kwargs) -> InstallationTokenProvider:
+    return InstallationTokenProvider(
+        app_id=1,
+        installation_id=42,
+        jwt_factory=lambda: "app-jwt",
+        transport=fake.transport(),
+        cache=cache,
+        **kwargs,
+    )
+
+
+def test_adapter_uses_installation_token(fake, cache):
+    """Test requests carry the minted token and one token serves many requests."""
+    adapter = GitHubAdapter(token_provider=_provider(fake, cache), transport=fake.transport())
+
+    for _ in range(5):
+        assert adapter.get_pr_status(REPO, 1)["state"] == "open"
+
+    assert adapter.token is None
+    assert _mints(fake) == 1
+    adapter.client.close()
+
+
+def test_tokens_shared_across_adapters(fake, cache):
+    """Test adapters for the same installation reuse one cached token."""
+    adapters = [
+        GitHubAdapter(token_provider=_provider(fake, cache), transport=fake.transport())
+        for _ in range(3)
+    ]
+
+    for adapter in adapters:
+        adapter.get_pr_status(REPO, 1)
+        adapter.client.close()
+
+    assert _mints(fake) == 1
+
+
+def test_concurrent_cold_start_mints_once(fake, cache):
+    """Test simultaneous first requests share a single mint."""
+    fake.latency = 0.02
+    provider = _provider(fake, cache)
+    tokens = []
+    threads = [
+        threading.Thread(target=lambda: tokens.append(provider.get_token())) for _ in range(20)
+    ]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(tokens)) == 1
+    assert _mints(fake) == 1
+
+
+def test_refreshes_in_background_before_expiry(fake, cache):
+    """Test tokens inside the refresh margin are served while a refresh runs."""
+    clock = fake.clock = OffsetClock()
+    provider = _provider(fake, cache, refresh_margin=600.0, clock=clock)
+    first = provider.get_token()
+
+    fake.latency = 0.05
+    clock.offset = 3600 - 450
+    started = time.perf_counter()
+    assert [provider.get_token() for _ in range(10)] == [first] * 10
+    assert time.perf_counter() - started < 0.05
+    deadline = time.time() + 2
+    while provider.get_token() == first and time.time() < deadline:
+        time.sleep(0.005)
+
+    assert provider.get_token() != first
+    assert _mints(fake) == 2
+
+
+def test_nearly_expired_token_refreshes_synchronously(fake, cache):
+    """Test tokens below min_validity are never handed out."""
+    clock = OffsetClock()
+    provider = _provider(fake, cache, min_validity=120.0, clock=clock)
+    first = provider.get_token()
+
+    clock.offset = 3600 - 60
+
+    assert provider.get_token() != first
+    assert _mints(fake) == 2
+
+
+def test_revoked_token_is_replaced_on_401(fake, cache):
+    """Test a 401 invalidates the cached token and the request is retried once."""
+    adapter = GitHubAdapter(token_provider=_provider(fake, cache), transport=fake.transport())
+    adapter.get_pr_status(REPO, 1)
+    fake.revoke_installation_tokens()
+
+    assert adapter.get_pr_status(REPO, 1)["state"] == "open"
+    assert _mints(fake) == 2
+    adapter.client.close()
+
+
+def test_mint_failure_raises_auth_error(cache):
+    """Test token endpoint errors surface as GitHubAuthError."""
+    transport = httpx.MockTransport(lambda request: httpx.Response(401, json={}))
+    provider = InstallationTokenProvider(
+        app_id=1, installation_id=42, jwt_factory=lambda: "bad", transport=transport, cache=cache
+    )
+
+    with pytest.raises(GitHubAuthError):
+        provider.get_token()
+
+
+def test_private_key_requires_pyjwt(monkeypatch):
+    """Test a clear error is raised when the optional PyJWT package is missing."""
+    monkeypatch.setitem(sys.modules, "jwt", None)
+
+    with pytest.raises(GitHubAuthError, match="PyJWT"):
+        InstallationTokenProvider(app_id=1, installation_id=42, private_key="pem")
+
+
+def test_static_provider_with_token_auth():
+    """Test TokenAuth applies a static token."""
+    seen = []
+    transport = httpx.MockTransport(
+        lambda request: seen.append(request.headers["Authorization"]) or httpx.Response(200)
+    )
+    with httpx.Client(auth=TokenAuth(StaticTokenProvider("pat")), transport=transport) as client:
+        client.get("https://api.github.com/user")
+
+    assert seen == ["Bearer pat"]
@@ -0,0 +1,172 @@
+"""Tests for batched GraphQL PR status lookups."""
+
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from packages.core.adapters import github_graphql
+from packages.core.adapters.github_adapter import (
+    GitHubAdapter,
+    GitHubError,
+    GitHubRateLimitError,
+)
+from packages.core.adapters.head_sha_cache import HeadShaCache
+
+
+def _pr_node(number: int, state: str = "OPEN", conclusion: str | None = "SUCCESS") -> dict:
+    return {
+        "number": number,
+        "state": state,
+        "merged": state == "MERGED",
+        "mergeable": "MERGEABLE",
+        "mergeStateStatus": "CLEAN",
+        "isDraft": False,
+        "headRefOid": f"sha{number}",
+        "commits": {
+            "nodes": [
+                {
+                    "commit": {
+                        "checkSuites": {
+                            "nodes": [
+                                {
+                                    "checkRuns": {
+                                        "nodes": [
+                                            {
+                                                "databaseId": number * 10,
+                                                "name": "build",
+                                                "status": "COMPLETED",
+                                                "conclusion": conclusion,
+                                                "url": f"https://github.com/runs/{number}",
+                                            }
+                                        ]
+                                    }
+                                }
+                            ]
+                        }
+                    }
+                }
+            ]
+        },
+    }
+
+
+def _graphql_response(data: dict, remaining: int = 4999, errors: list | None = None):
+    body = {"data": {"rateLimit": {"cost": 1, "remaining": remaining}, **data}}
+    if errors:
+        body["errors"] = errors
+    response = MagicMock(spec=httpx.Response)
+    response.status_code = 200
+    response.json.return_value = body
+    return response
+
+
+@pytest.fixture
+def adapter():
+    adapter = GitHubAdapter(token="test_token", head_sha_cache=HeadShaCache())
+    yield adapter
+    adapter.client.close()
+
+
+def test_build_batch_query_aliases_repos_and_prs():
+    """Test PRs are grouped per repository with stable aliases."""
+    query, aliases = github_graphql.build_batch_query(
+        [("owner/a", 1), ("owner/b", 2), ("owner/a", 3)], check_suites=5, check_runs=20
+    )
+
+    assert aliases == {"r0": "owner/a", "r1": "owner/b"}
+    assert 'r0: repository(owner: "owner", name: "a")' in query
+    assert "pr1: pullRequest(number: 1)" in query
+    assert "pr3: pullRequest(number: 3)" in query
+    assert "checkSuites(first: 5)" in query
+    assert "rateLimit" in query
+
+
+def test_build_batch_query_rejects_invalid_slug():
+    """Test slugs that could inject GraphQL are rejected."""
+    with pytest.raises(ValueError):
+        github_graphql.build_batch_query([('owner/a") { x }', 1)], 1, 1)
+
+
+def test_cost_estimate_and_chunk_size():
+    """Test chunking respects the points budget."""
+    assert github_graphql.estimate_query_cost(1, 10) == 1
+    assert github_graphql.estimate_query_cost(50, 10) == 6
+    assert github_graphql.max_prs_per_query(100, 1, 10, 50) == 8
+    assert github_graphql.max_prs_per_query(50, 10, 10, 50) == 50
+
+
+def test_map_pull_request_matches_rest_shapes():
+    """Test GraphQL nodes map onto get_pr_status/get_check_runs dicts."""
+    mapped = github_graphql.map_pull_request(_pr_node(7, conclusion=None))
+
+    assert mapped["head_sha"] == "sha7"
+    assert mapped["status"] == {
+        "state": "open",
+        "mergeable": True,
+        "merged": False,
+        "mergeable_state": "clean",
+        "draft": False,
+    }
+    assert mapped["check_runs"] == [
+        {
+            "id": 70,
+            "name": "build",
+            "status": "completed",
+            "conclusion": None,
+            "html_url": "https://github.com/runs/7",
+        }
+    ]
+
+
+def test_batch_chunks_requests_and_skips_missing(adapter):
+    """Test the adapter chunks PRs and omits PRs GitHub could not resolve."""
+    responses = [
+        _graphql_response({"r0": {"pr1": _pr_node(1), "pr2": _pr_node(2, state="MERGED")}}),
+        _graphql_response(
+            {"r0": {"pr3": None}},
+            errors=[{"type": "NOT_FOUND", "message": "Could not resolve"}],
+        ),
+    ]
+
+    with patch.object(adapter.client, "post", side_effect=responses) as mock_post:
+        results = adapter.get_pr_statuses_batch(
+            [("owner/repo", 1), ("owner/repo", 2), ("owner/repo", 3)], max_prs_per_query=2
+        )
+
+    assert mock_post.call_count == 2
+    assert mock_post.call_args_list[0].args[0] == "/graphql"
+    assert set(results) == {("owner/repo", 1), ("owner/repo", 2)}
+    assert results[("owner/repo", 2)]["status"]["merged"] is True
+    assert adapter.head_sha_cache.get("owner/repo", 1) == "sha1"
+
+
+def test_batch_stops_when_points_exhausted(adapter):
+    """Test the next chunk is not sent when remaining points cannot cover it."""
+    first = _graphql_response({"r0": {"pr1": _pr_node(1)}}, remaining=0)
+
+    with patch.object(adapter.client, "post", side_effect=[first]):
+        with pytest.raises(GitHubRateLimitError):
+            adapter.get_pr_statuses_batch(
+                [("owner/repo", 1), ("owner/repo", 2)], max_prs_per_query=1
+            )
+
+
+def test_batch_raises_on_query_errors(adapter):
+    """Test a query returning no data raises GitHubError."""
+    response = MagicMock(spec=httpx.Response)
+    response.status_code = 200
+    response.json.return_value = {"errors": [{"message": "Parse error"}]}
+
+    with patch.object(adapter.client, "post", return_value=response):
+        with pytest.raises(GitHubError) as exc_info:
+            adapter.get_pr_statuses_batch([("owner/repo", 1)])
+
+    assert "Parse error" in str(exc_info.value)
+
+
+def test_enterprise_graphql_url():
+    """Test GitHub Enterprise GraphQL endpoint is derived from the REST root."""
+    adapter = GitHubAdapter(token="t", base_url="https://ghe.example.com/api/v3")
+    assert adapter._graphql_url() == "https://ghe.example.com/api/graphql"
+    adapter.client.close()
@@ -0,0 +1,179 @@
+"""Tests for per-endpoint GitHub adapter instrumentation."""
+
+import httpx
+import pytest
+
+from packages.core.adapters import instrumentation
+from packages.core.adapters.github_adapter import GitHubAdapter
+from packages.core.adapters.instrumentation import endpoint_template, trace_requests
+from packages.core.adapters.retry import RetryBudget, RetryPolicy
+from packages.core.metrics import registry
+from packages.core.testing import FakeGitHub
+
+REPO = "owner/repo"
+PULL = "/repos/{owner}/{repo}/pulls/{number}"
+
+
+@pytest.fixture
+def fake():
+    registry.reset()
+    fake = FakeGitHub(seed=1)
+    fake.add_repo(REPO)
+    fake.add_pull_request(REPO, "feature")
+    return fake
+
+
+@pytest.fixture
+def adapter(fake):
+    adapter = GitHubAdapter(token="test_token", transport=fake.transport())
+    yield adapter
+    adapter.client.close()
+
+
+@pytest.mark.parametrize(
+    "path, template",
+    [
+        ("/repos/o/r/pulls/12", PULL),
+        ("/repos/o/r/pulls", "/repos/{owner}/{repo}/pulls"),
+        ("/repos/o/r/commits/abc123/check-runs", "/repos/{owner}/{repo}/commits/{ref}/check-runs"),
+        ("/repos/o/r/git/ref/heads/feat/x", "/repos/{owner}/{repo}/git/ref/heads/{branch}"),
+        ("/repos/o/r/git/blobs/" + "a" * 40, "/repos/{owner}/{repo}/git/blobs/{sha}"),
+        ("/repos/o/r/contents/src/app.py", "/repos/{owner}/{repo}/contents/{path}"),
+        (
+            "/app/installations/42/access_tokens",
+            "/app/installations/{installation_id}/access_tokens",
+        ),
+        ("/graphql", "/graphql"),
+    ],
+)
+def test_endpoint_template(path, template):
+    """Test owners, numbers, SHAs, branches and file paths are collapsed."""
+    assert endpoint_template(path) == template
+
+
+def test_records_latency_status_and_bytes_per_endpoint(adapter):
+    """Test each call is recorded against its endpoint template."""
+    adapter.get_pr_status(REPO, 1)
+    adapter.get_pr_status(REPO, 1)
+
+    assert instrumentation.request_duration.count(method="GET", endpoint=PULL) == 2
+    assert instrumentation.responses_total.value(method="GET", endpoint=PULL, status=200) == 2
+    assert instrumentation.request_bytes.value(endpoint=PULL, direction="received") > 0
+
+
+def test_records_rate_limit_remaining(adapter, fake):
+    """Test the rate-limit gauge tracks the last response."""
+    adapter.get_pr_status(REPO, 1)
+
+    assert instrumentation.rate_limit_remaining.value(resource="core") == fake.rate_remaining
+
+
+def test_counts_retries_per_endpoint(fake):
+    """Test attempts after the first are counted as retries."""
+    fake.error_rate = 0.5
+    adapter = GitHubAdapter(
+        token="test_token",
+        transport=fake.transport(),
+        retry_policy=RetryPolicy(max_attempts=20, base_delay=0.0),
+        retry_budget=RetryBudget(ratio=10.0, max_tokens=100.0),
+    )
+
+    with trace_requests("run-1") as trace:
+        for _ in range(10):
+            adapter.get_pr_status(REPO, 1)
+    adapter.client.close()
+
+    failures = instrumentation.responses_total.value(method="GET", endpoint=PULL, status=503)
+    assert failures > 0
+    assert instrumentation.endpoint_retries.value(method="GET", endpoint=PULL) == failures
+    assert trace.retries == failures
+
+
+def test_trace_attributes_calls_from_worker_threads(adapter, fake):
+    """Test snapshot reads made on adapter worker threads join the caller's trace."""
+    sha = fake.repos[REPO].refs["feature"]
+    fake.add_check_run(REPO, sha, "lint")
+
+    with trace_requests("run-1") as trace:
+        adapter.get_pr_snapshot(REPO, 1)
+    adapter.get_pr_status(REPO, 1)
+
+    assert trace.run_id == "run-1"
+    assert trace.calls == 3
+    assert trace.by_endpoint[PULL] == 1
+    assert trace.by_endpoint["/repos/{owner}/{repo}/commits/{ref}/check-runs"] == 1
+    assert trace.bytes_received > 0
+    assert trace.rate_limit_remaining is not None
+    assert instrumentation.current_trace() is None
+
+
+def test_counts_body_without_content_length_once_read(fake):
+    """Test a chunked response body is counted as received after it is read."""
+
+    class Chunked(httpx.SyncByteStream):
+        def __iter__(self):
+            yield b'{"state": '
+            yield b'"open"}'
+
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, stream=Chunked()))
+    client = httpx.Client(transport=transport, event_hooks=instrumentation.event_hooks())
+
+    with trace_requests("run-1") as trace:
+        response = client.get("https://api.github.com/repos/o/r/pulls/1")
+    client.close()
+
+    assert "content-length" not in response.headers
+    assert response.json() == {"state": "open"}
+    assert instrumentation.request_bytes.value(endpoint=PULL, direction="received") == 17
+    assert trace.bytes_received == 17
+
+
+def test_bound_metrics_share_series():
+    """Test labels() binds to the same series as keyword-label calls."""
+    counter = registry.counter("test_bound_total")
+    gauge = registry.gauge("test_bound_gauge")
+    histogram = registry.histogram("test_bound_seconds")
+
+    counter.labels(endpoint="/a").inc(2)
+    counter.inc(endpoint="/a")
+    gauge.labels(resource="core").set(7)
+    histogram.labels(endpoint="/a").observe(0.2)
+
+    assert counter.value(endpoint="/a") == 3
+    assert gauge.value(resource="core") == 7
+    assert gauge.value(resource="graphql") is None
+    assert histogram.count(endpoint="/a") == 1
+
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    """Test quantiles are estimated from bucket counts and exported in snapshots."""
+    histogram = registry.histogram("test_quantile_seconds", buckets=(1.0, 2.0, 4.0))
+    for value in (0.5, 1.5, 1.5, 3.0, 10.0):
+        histogram.observe(value, gate="ci")
+
+    assert histogram.quantile(0.5, gate="ci") == 1.75
+    assert histogram.quantile(0.99, gate="ci") == 4.0
+    assert histogram.quantile(0.5, gate="safety") == 0.0
+    [series] = histogram.snapshot()["values"]
+    assert series["quantiles"] == {"p50": 1.75, "p95": 4.0, "p99": 4.0}
+
+
+def test_buffered_observations_match_locked_ones():
+    """Test buffered values land in the same buckets, before reads and when full."""
+    buffered = registry.histogram("test_buffered_seconds", buckets=(1.0, 2.0, 4.0))
+    locked = registry.histogram("test_locked_seconds", buckets=(1.0, 2.0, 4.0))
+    observer = buffered.buffered(flush_at=4, gate="ci")
+    values = (0.5, 1.0, 1.5, 2.0, 3.0, 10.0, 4.0)
+
+    for value in values:
+        observer.observe(value)
+        locked.observe(value, gate="ci")
+
+    assert len(observer.pending) == 3
+    assert buffered.snapshot()["values"] == locked.snapshot()["values"]
+    assert not observer.pending
+    observer.observe(0.1)
+    assert buffered.count(gate="ci") == len(values) + 1
+    observer.observe(0.1)
+    buffered.reset()
+    assert buffered.count(gate="ci") == 0
@@ -0,0 +1,227 @@
+"""Tests for the merge queue."""
+
+import pytest
+
+from packages.core.gate_framework import GateFramework, GateRunConfig, RunState
+from packages.core.merge_queue import MergeQueue, batch_runs
+from packages.core.schemas.gates import GateType
+
+
+class _Deployer:
+    """Fails a gate whenever a bad pull request is part of the combined run."""
+
+    def __init__(self, bad=(), gate=GateType.STAGING, raise_at=None) -> None:
+        self.bad = set(bad)
+        self.gate = gate
+        self.raise_at = raise_at
+        self.calls = []
+
+    async def run(self, gate, runs) -> bool:
+        prs = [run.pr_number for run in runs]
+        self.calls.append((gate, prs))
+        if len(self.calls) == self.raise_at:
+            raise RuntimeError("deploy failed")
+        return not (gate == self.gate and self.bad.intersection(prs))
+
+
+def _ready(pr_number: int, **options) -> GateFramework:
+    framework = GateFramework(GateRunConfig(pr_number=pr_number, run_id=f"r{pr_number}", **options))
+    framework.start_run()
+    for gate in (GateType.SAFETY, GateType.PLANNING, GateType.CI):
+        framework.execute_gate(gate)
+    return framework
+
+
+def _queue(deployer, prs, batch_size=8):
+    frameworks = [_ready(pr) for pr in prs]
+    queue = MergeQueue(deployer, batch_size=batch_size)
+    for framework in frameworks:
+        queue.enqueue(framework)
+    return queue, frameworks
+
+
+async def test_passing_batch_merges_with_one_run():
+    """Test a passing batch gates every run through staging and production at once."""
+    deployer = _Deployer()
+    queue, frameworks = _queue(deployer, range(1, 5))
+    passed = batch_runs.value(result="passed")
+
+    result = await queue.run_batch()
+
+    assert result.merged == ["r1", "r2", "r3", "r4"]
+    assert result.rejected == []
+    assert result.runs == 1
+    assert deployer.calls == [
+        (GateType.STAGING, [1, 2, 3, 4]),
+        (GateType.PRODUCTION, [1, 2, 3, 4]),
+    ]
+    assert batch_runs.value(result="passed") == passed + 1
+    for framework in frameworks:
+        assert framework.state == RunState.RUNNING_LEARNING
+        assert GateType.PRODUCTION in framework.gate_timings
+
+
+async def test_bisection_isolates_single_culprit_in_log_runs():
+    """Test one bad pull request in eight is isolated within 2 * log2(8) extra runs."""
+    queue, frameworks = _queue(_Deployer(bad={6}), range(1, 9))
+
+    result = await queue.run_batch()
+
+    assert result.rejected == ["r6"]
+    assert result.merged == ["r1", "r2", "r3", "r4", "r5", "r7", "r8"]
+    # 1-8 fail, 1-4 pass, 5-6 fail, 5 passes (so 6 is rejected), 7-8 pass.
+    assert result.runs == 5
+    culprit = frameworks[5]
+    assert culprit.state == RunState.FAILED
+    assert culprit.run.error_message == "Staging gate failed"
+    assert all(f.state == RunState.RUNNING_LEARNING for f in frameworks if f is not culprit)
+
+
+async def test_bisection_isolates_several_culprits():
+    """Test every bad pull request is rejected and the others merge."""
+    queue, _ = _queue(_Deployer(bad={1, 4}), range(1, 5))
+
+    result = await queue.run_batch()
+
+    assert result.rejected == ["r1", "r4"]
+    assert result.merged == ["r2", "r3"]
+
+
+async def test_production_failure_passes_staging_for_culprit():
+    """Test a culprit that fails production is recorded at the production gate."""
+    queue, frameworks = _queue(_Deployer(bad={2}, gate=GateType.PRODUCTION), [1, 2])
+
+    result = await queue.run_batch()
+
+    assert result.rejected == ["r2"]
+    culprit = frameworks[1]
+    assert culprit.state == RunState.FAILED
+    assert culprit.current_gate == GateType.PRODUCTION
+    assert culprit.run.error_message == "Production gate failed"
+
+
+async def test_drain_gates_queue_in_batches():
+    """Test the queue is gated in batches of at most batch_size, in order."""
+    deployer = _Deployer()
+    queue, _ = _queue(deployer, range(1, 6), batch_size=2)
+
+    results = await queue.drain()
+
+    assert [r.merged for r in results] == [["r1", "r2"], ["r3", "r4"], ["r5"]]
+    assert len(queue) == 0
+    assert await queue.run_batch() is None
+
+
+async def test_batch_of_production_skipping_runs_skips_production():
+    """Test no combined production run when every run skips production."""
+    deployer = _Deployer()
+    queue = MergeQueue(deployer)
+    framework = _ready(1, skip_production=True)
+    queue.enqueue(framework)
+
+    result = await queue.run_batch()
+
+    assert result.merged == ["r1"]
+    assert deployer.calls == [(GateType.STAGING, [1])]
+    assert framework.state == RunState.RUNNING_LEARNING
+
+
+async def test_staging_skipping_runs_are_ready_at_production():
+    """Test runs that skip staging are queued at production and not deployed to staging."""
+    deployer = _Deployer()
+    queue = MergeQueue(deployer)
+    frameworks = [_ready(1, skip_staging=True), _ready(2), _ready(3, skip_staging=True)]
+    for framework in frameworks:
+        queue.enqueue(framework)
+
+    result = await queue.run_batch()
+
+    assert result.merged == ["r1", "r2", "r3"]
+    assert result.runs == 1
+    assert deployer.calls == [
+        (GateType.STAGING, [2]),
+        (GateType.PRODUCTION, [1, 2, 3]),
+    ]
+    assert all(f.state == RunState.RUNNING_LEARNING for f in frameworks)
+
+
+async def test_batch_of_staging_skipping_runs_skips_staging():
+    """Test no combined staging run when every run skips staging."""
+    deployer = _Deployer()
+    queue = MergeQueue(deployer)
+    queue.enqueue(_ready(1, skip_staging=True))
+
+    await queue.run_batch()
+
+    assert deployer.calls == [(GateType.PRODUCTION, [1])]
+
+
+async def test_run_skipping_both_batch_gates_advances_without_a_run():
+    """Test a run skipping staging and production merges past them without a combined run."""
+    deployer = _Deployer()
+    queue = MergeQueue(deployer)
+    framework = _ready(1, skip_staging=True, skip_production=True)
+    queue.enqueue(framework)
+
+    result = await queue.run_batch()
+
+    assert result.merged == ["r1"]
+    assert result.runs == 0
+    assert deployer.calls == []
+    assert framework.state == RunState.RUNNING_LEARNING
+
+
+async def test_culprit_is_not_inferred_for_runs_skipping_the_failed_gate():
+    """Test a second half that skips the failed gate is gated again, not rejected."""
+
+    class FlakyProduction(_Deployer):
+        async def run(self, gate, runs) -> bool:
+            # The first combined production run fails for no culprit.
+            passed = await super().run(gate, runs)
+            return passed and len(self.calls) != 2
+
+    deployer = FlakyProduction()
+    queue = MergeQueue(deployer)
+    frameworks = [_ready(1), _ready(2, skip_production=True)]
+    for framework in frameworks:
+        queue.enqueue(framework)
+
+    result = await queue.run_batch()
+
+    assert result.merged == ["r1", "r2"]
+    assert result.rejected == []
+    assert deployer.calls[-1] == (GateType.STAGING, [2])
+    assert all(f.state == RunState.RUNNING_LEARNING for f in frameworks)
+
+
+async def test_gate_error_puts_unresolved_runs_back_in_queue():
+    """Test runs a raising gate left unresolved are queued again, in order."""
+    # 1-4 fail staging, 1-2 pass both gates and merge, then gating 3 raises.
+    deployer = _Deployer(bad={4}, raise_at=4)
+    queue, frameworks = _queue(deployer, range(1, 6), batch_size=4)
+
+    with pytest.raises(RuntimeError, match="deploy failed"):
+        await queue.run_batch()
+
+    assert [f.state for f in frameworks[:2]] == [RunState.RUNNING_LEARNING] * 2
+    assert len(queue) == 3
+    deployer.raise_at = None
+    results = await queue.drain()
+    assert [r.merged for r in results] == [["r3", "r5"]]
+    assert [r.rejected for r in results] == [["r4"]]
+
+
+def test_enqueue_requires_run_ready_for_merge():
+    """Test runs that have not passed CI are refused."""
+    queue = MergeQueue(_Deployer())
+    framework = GateFramework(GateRunConfig(pr_number=1, run_id="r1"))
+    framework.start_run()
+
+    with pytest.raises(ValueError, match="not ready for merge"):
+        queue.enqueue(framework)
+
+
+def test_batch_size_must_be_positive():
+    """Test a batch must hold at least one run."""
+    with pytest.raises(ValueError):
+        MergeQueue(_Deployer(), batch_size=0)
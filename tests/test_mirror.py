@@ -0,0 +1,197 @@
+"""Tests for the local bare-mirror repository cache."""
+
+import shutil
+import subprocess
+import time
+
+import pytest
+
+from packages.core.adapters.auth import StaticTokenProvider
+from packages.core.adapters.github_adapter import GitHubAdapter, GitHubNotFoundError
+from packages.core.adapters.mirror import MirrorCache
+from packages.core.schemas.webhooks import WebhookEvent, WebhookSource
+from packages.core.testing import FakeGitHub
+
+REPO = "owner/repo"
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git CLI not installed")
+
+
+def _git(cwd, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+def _commit(source, files: dict[str, str | None], message: str = "change") -> str:
+    for path, content in files.items():
+        target = source / path
+        if content is None:
+            target.unlink()
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(content)
+    _git(source, "add", "-A")
+    _git(source, "commit", "-q", "-m", message)
+    return _git(source, "rev-parse", "HEAD")
+
+
+def _push_event() -> WebhookEvent:
+    return WebhookEvent(
+        event_id="evt",
+        event_type="push",
+        source=WebhookSource.GITHUB,
+        payload={"ref": "refs/heads/main", "repository": {"full_name": REPO}},
+    )
+
+
+@pytest.fixture
+def source(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    _git(source, "init", "-q", "-b", "main")
+    _commit(source, {"README.md": "# Repo\n", "src/app.py": "print('v1')\n"}, "initial")
+    return source
+
+
+@pytest.fixture
+def mirrors(tmp_path, source):
+    cache = MirrorCache(tmp_path / "mirrors", remote_url=lambda slug: str(source))
+    cache.add(REPO)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def fake():
+    fake = FakeGitHub()
+    fake.add_repo(REPO)
+    return fake
+
+
+@pytest.fixture
+def adapter(fake, mirrors):
+    adapter = GitHubAdapter(token="test_token", transport=fake.transport(), mirror_cache=mirrors)
+    yield adapter
+    adapter.client.close()
+
+
+def test_reads_are_served_from_the_mirror(adapter, fake, source):
+    """Test tree listings, file reads and diffs make no API requests."""
+    base = _git(source, "rev-parse", "HEAD")
+    head = _commit(source, {"src/app.py": "print('v2')\n", "docs/guide.md": "guide\n"})
+    adapter.mirror_cache.fetch(REPO)
+
+    tree = adapter.list_tree(REPO, "main")
+    files = adapter.get_files(REPO, ["README.md", "src/app.py", "missing.txt", "src"], head)
+    changes = adapter.compare_commits(REPO, base, head)
+
+    assert [entry.path for entry in tree] == ["README.md", "docs/guide.md", "src/app.py"]
+    assert tree[0].mode == "100644" and tree[0].size == len("# Repo\n")
+    assert files == {"README.md": b"# Repo\n", "src/app.py": b"print('v2')\n"}
+    assert adapter.get_file(REPO, "src/app.py", base) == b"print('v1')\n"
+    assert [(c.path, c.status) for c in changes] == [
+        ("docs/guide.md", "added"),
+        ("src/app.py", "modified"),
+    ]
+    assert fake.requests == []
+
+
+def test_missing_file_raises_not_found_without_api_call(adapter, fake):
+    """Test the mirror answers definitively for files that do not exist."""
+    with pytest.raises(GitHubNotFoundError):
+        adapter.get_file(REPO, "SECURITY.md", "main")
+
+    assert fake.requests == []
+
+
+def test_missing_paths_with_spaces_are_left_out(mirrors, source):
+    """Test a missing path containing a space does not break the batch read."""
+    _commit(source, {"a c": "found\n"})
+    mirrors.fetch(REPO)
+
+    files = mirrors.read_files(REPO, ["a b", "a c", "x missing", "README.md"], "main")
+
+    assert files == {"a c": b"found\n", "README.md": b"# Repo\n"}
+
+
+def test_renames_are_reported(mirrors, source):
+    """Test renames carry the previous path like the compare API."""
+    base = _git(source, "rev-parse", "HEAD")
+    _git(source, "mv", "src/app.py", "src/main.py")
+    head = _commit(source, {})
+    mirrors.fetch(REPO)
+
+    [change] = mirrors.compare(REPO, base, head)
+
+    assert (change.path, change.status, change.previous_path) == (
+        "src/main.py",
+        "renamed",
+        "src/app.py",
+    )
+
+
+def test_push_webhook_refreshes_branch_reads(mirrors, source):
+    """Test branch reads after a push webhook see the pushed commit."""
+    _commit(source, {"README.md": "# Updated\n"})
+
+    mirrors.handle(_push_event())
+
+    assert mirrors.read_files(REPO, ["README.md"], "main") == {"README.md": b"# Updated\n"}
+    deadline = time.time() + 5
+    while mirrors._stale(REPO) and time.time() < deadline:
+        time.sleep(0.01)
+    assert not mirrors._stale(REPO)
+
+
+def test_unknown_sha_is_fetched_on_demand(mirrors, source):
+    """Test a SHA pushed before its webhook arrived is fetched once and served."""
+    head = _commit(source, {"new.txt": "new\n"})
+
+    assert mirrors.read_files(REPO, ["new.txt"], head) == {"new.txt": b"new\n"}
+
+
+def test_unmirrored_repo_falls_back_to_api(fake):
+    """Test repositories without a mirror are read through the API."""
+    fake.repos[REPO].refs["main"] = fake.repos[REPO].put_commit(
+        fake.repos[REPO].put_tree({"README.md": fake.repos[REPO].put_blob(b"# Fake\n")}),
+        [fake.repos[REPO].refs["main"]],
+        "seed",
+    )
+    adapter = GitHubAdapter(token="test_token", transport=fake.transport())
+
+    assert [entry.path for entry in adapter.list_tree(REPO, "main")] == ["README.md"]
+    assert adapter.get_files(REPO, ["README.md", "missing.txt"], "main") == {
+        "README.md": b"# Fake\n"
+    }
+    assert fake.requests
+    adapter.client.close()
+
+
+def test_failed_fetch_falls_back_to_api(adapter, fake, mirrors, source):
+    """Test a mirror that cannot catch up with a push defers to the API."""
+    shutil.rmtree(source)
+    mirrors.handle(_push_event())
+
+    with pytest.raises(GitHubNotFoundError):
+        adapter.get_file(REPO, "README.md", "main")
+
+    assert ("GET", f"/repos/{REPO}/contents/README.md") in fake.requests
+
+
+def test_token_is_not_stored_in_mirror(tmp_path, source):
+    """Test the fetch token is passed through the environment only."""
+    cache = MirrorCache(
+        tmp_path / "mirrors",
+        remote_url=lambda slug: str(source),
+        token_provider=StaticTokenProvider("secret-token"),
+    )
+    cache.add(REPO)
+
+    assert "secret-token" not in (cache.path(REPO) / "config").read_text()
+    assert cache.list_tree(REPO, "main")
+    cache.close()
@@ -0,0 +1,245 @@
+"""Tests for the webhook-maintained PR state cache."""
+
+import pytest
+
+from packages.core.adapters.github_adapter import GitHubAdapter
+from packages.core.adapters.head_sha_cache import HeadShaCache
+from packages.core.adapters.pr_state_cache import PRStateCache
+from packages.core.schemas.webhooks import WebhookEvent, WebhookSource
+from packages.core.testing import FakeGitHub
+from packages.core.webhook_watcher import WebhookWatcher
+
+REPO = "owner/repo"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _event(event_type: str, payload: dict) -> WebhookEvent:
+    payload = {"repository": {"full_name": REPO}, **payload}
+    return WebhookEvent(
+        event_id="evt", event_type=event_type, source=WebhookSource.GITHUB, payload=payload
+    )
+
+
+def _check_run_event(run_id: int, name: str, head_sha: str, status: str, conclusion=None):
+    return _event(
+        "check_run",
+        {
+            "action": "completed" if status == "completed" else "created",
+            "check_run": {
+                "id": run_id,
+                "name": name,
+                "head_sha": head_sha,
+                "status": status,
+                "conclusion": conclusion,
+                "pull_requests": [{"number": 1}],
+            },
+        },
+    )
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def setup(clock):
+    fake = FakeGitHub()
+    fake.add_repo(REPO)
+    pr = fake.add_pull_request(REPO, "feature")
+    fake.add_check_run(REPO, pr["head"]["sha"], "lint", status="in_progress", conclusion=None)
+    cache = PRStateCache(max_age=60.0, clock=clock)
+    adapter = GitHubAdapter(token="test_token", transport=fake.transport(), pr_state_cache=cache)
+    yield fake, adapter, cache, pr["head"]["sha"]
+    adapter.client.close()
+
+
+def test_reads_served_from_cache_after_seeding(setup):
+    """Test steady-state reads do not reach the API."""
+    fake, adapter, _, _ = setup
+    adapter.get_pr_status(REPO, 1)
+    adapter.get_check_runs(REPO, 1)
+    seeded = len(fake.requests)
+
+    for _ in range(5):
+        assert adapter.get_pr_status(REPO, 1)["state"] == "open"
+        assert adapter.get_check_runs(REPO, 1)[0]["name"] == "lint"
+
+    assert len(fake.requests) == seeded
+
+
+def test_check_run_webhook_updates_conclusion(setup):
+    """Test check_run events update the cached conclusion without a fetch."""
+    fake, adapter, cache, head_sha = setup
+    runs = adapter.get_check_runs(REPO, 1)
+    seeded = len(fake.requests)
+
+    cache.handle(_check_run_event(runs[0]["id"], "lint", head_sha, "completed", "failure"))
+
+    assert adapter.get_check_runs(REPO, 1)[0]["conclusion"] == "failure"
+    assert len(fake.requests) == seeded
+
+
+def test_out_of_order_check_run_events_do_not_regress(setup):
+    """Test a late in_progress delivery does not overwrite a completed run."""
+    _, adapter, cache, head_sha = setup
+    run_id = adapter.get_check_runs(REPO, 1)[0]["id"]
+
+    cache.handle(_check_run_event(run_id, "lint", head_sha, "completed", "success"))
+    cache.handle(_check_run_event(run_id, "lint", head_sha, "in_progress"))
+
+    assert cache.get_check_runs(REPO, 1)[0].status == "completed"
+
+
+def test_synchronize_moves_head_and_refetches_checks(setup):
+    """Test a new head SHA drops cached checks so they are re-read from the API."""
+    fake, adapter, cache, _ = setup
+    adapter.get_check_runs(REPO, 1)
+    cache.handle(
+        _event(
+            "pull_request",
+            {
+                "action": "synchronize",
+                "pull_request": {
+                    "number": 1,
+                    "state": "open",
+                    "mergeable": True,
+                    "merged": False,
+                    "head": {"sha": "abc123"},
+                },
+            },
+        )
+    )
+
+    assert cache.get_head_sha(REPO, 1) == "abc123"
+    assert cache.get_check_runs(REPO, 1) is None
+    fake.add_check_run(REPO, "abc123", "lint")
+    fake.requests.clear()
+    assert adapter.get_check_runs(REPO, 1)[0]["conclusion"] == "success"
+    assert fake.requests == [("GET", f"/repos/{REPO}/commits/abc123/check-runs")]
+
+
+def test_check_suite_rerequested_marks_checks_incomplete(setup):
+    """Test a re-requested suite forces the next check run read to the API."""
+    _, adapter, cache, head_sha = setup
+    adapter.get_check_runs(REPO, 1)
+
+    cache.handle(
+        _event(
+            "check_suite",
+            {"action": "rerequested", "check_suite": {"head_sha": head_sha, "pull_requests": []}},
+        )
+    )
+
+    assert cache.get_check_runs(REPO, 1) is None
+
+
+def test_stale_entries_fall_back_to_api(setup, clock):
+    """Test entries older than max_age are refetched."""
+    fake, adapter, _, _ = setup
+    adapter.get_pr_status(REPO, 1)
+    clock.now = 61.0
+    fake.requests.clear()
+
+    adapter.get_pr_status(REPO, 1)
+
+    assert fake.requests == [("GET", f"/repos/{REPO}/pulls/1")]
+
+
+def test_unknown_mergeability_is_not_served_from_cache(clock):
+    """Test open PRs without a computed mergeable flag are fetched."""
+    cache = PRStateCache(clock=clock)
+    cache.store_pull_request(REPO, 1, {"state": "open", "mergeable": None, "merged": False})
+
+    assert cache.get_status(REPO, 1) is None
+
+
+def test_watcher_keeps_cache_current(setup):
+    """Test the cache works as a WebhookWatcher subscriber."""
+    _, adapter, cache, head_sha = setup
+    run_id = adapter.get_check_runs(REPO, 1)[0]["id"]
+    watcher = WebhookWatcher(subscribers=[cache])
+
+    watcher.handle_github_event(
+        "check_run",
+        "delivery-1",
+        _check_run_event(run_id, "lint", head_sha, "completed", "success").payload,
+    )
+
+    assert cache.get_check_runs(REPO, 1)[0].conclusion == "success"
+
+
+def test_same_name_check_runs_are_kept_by_id(setup):
+    """Test a re-run or another app's check with the same name does not replace a run."""
+    _, adapter, cache, head_sha = setup
+    run_id = adapter.get_check_runs(REPO, 1)[0]["id"]
+
+    cache.handle(_check_run_event(run_id + 1, "lint", head_sha, "completed", "success"))
+
+    runs = adapter.get_check_runs(REPO, 1)
+    assert [(run["id"], run["name"]) for run in runs] == [(run_id, "lint"), (run_id + 1, "lint")]
+
+
+def test_head_sha_cache_is_shared_with_adapter(setup):
+    """Test one head SHA cache is used, so invalidating the head drops cached checks."""
+    fake, adapter, cache, _ = setup
+    adapter.get_check_runs(REPO, 1)
+    synchronize = _event("pull_request", {"action": "synchronize", "number": 1})
+
+    adapter.head_sha_cache.handle(synchronize)
+
+    assert adapter.head_sha_cache is cache.head_sha_cache
+    assert cache.get_check_runs(REPO, 1) is None
+    fake.requests.clear()
+    adapter.get_check_runs(REPO, 1)
+    assert fake.requests[0] == ("GET", f"/repos/{REPO}/pulls/1")
+
+
+def test_adapter_refuses_a_second_head_sha_cache():
+    """Test the adapter cannot track heads apart from its PR state cache."""
+    with pytest.raises(ValueError, match="head SHA cache"):
+        GitHubAdapter(
+            token="test_token", pr_state_cache=PRStateCache(), head_sha_cache=HeadShaCache()
+        )
+
+
+def test_closed_pull_request_drops_entry(setup):
+    """Test a closed event drops the PR instead of keeping it until it expires."""
+    _, adapter, cache, head_sha = setup
+    adapter.get_check_runs(REPO, 1)
+
+    cache.handle(
+        _event(
+            "pull_request",
+            {
+                "action": "closed",
+                "pull_request": {"number": 1, "state": "closed", "head": {"sha": head_sha}},
+            },
+        )
+    )
+
+    assert cache.get_status(REPO, 1) is None
+    assert cache.get_head_sha(REPO, 1) is None
+    assert not cache._entries
+    assert not cache._by_head
+
+
+def test_least_recently_used_entries_are_evicted(clock):
+    """Test entries beyond max_entries are evicted along with their head index."""
+    cache = PRStateCache(clock=clock, max_entries=2)
+    for number in (1, 2):
+        cache.store_check_runs(REPO, number, f"sha{number}", [])
+    cache.get_check_runs(REPO, 1)
+
+    cache.store_check_runs(REPO, 3, "sha3", [])
+
+    assert cache.get_check_runs(REPO, 2) is None
+    assert cache.get_check_runs(REPO, 1) == []
+    assert list(cache._by_head) == [(REPO, "sha1"), (REPO, "sha3")]
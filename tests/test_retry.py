@@ -0,0 +1,206 @@
+"""Tests for transient-failure retries in the GitHub adapter."""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from packages.core.adapters.github_adapter import (
+    GitHubAdapter,
+    GitHubError,
+    GitHubValidationError,
+)
+from packages.core.adapters.retry import (
+    Retrier,
+    RetryBudget,
+    RetryPolicy,
+    retries_exhausted,
+    retries_total,
+    retry_added_latency,
+)
+
+
+def _response(status_code: int, json_data=None) -> httpx.Response:
+    return httpx.Response(status_code, json=json_data if json_data is not None else {})
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def adapter(clock):
+    adapter = GitHubAdapter(token="test_token")
+    adapter._retrier = Retrier(
+        RetryPolicy(max_attempts=4, base_delay=1.0), sleep=clock.sleep, clock=clock
+    )
+    yield adapter
+    adapter.client.close()
+
+
+PR_STATUS = {"state": "open", "mergeable": True, "merged": False, "mergeable_state": "clean"}
+
+
+def test_backoff_uses_full_jitter():
+    """Test delays are drawn uniformly up to an exponential, capped bound."""
+    policy = RetryPolicy(base_delay=0.5, max_delay=3.0)
+
+    assert policy.backoff(1, rand=lambda: 1.0) == 0.5
+    assert policy.backoff(3, rand=lambda: 1.0) == 2.0
+    assert policy.backoff(10, rand=lambda: 1.0) == 3.0
+    assert policy.backoff(3, rand=lambda: 0.25) == 0.5
+
+
+def test_get_retries_transient_status(adapter, clock):
+    """Test 502/503 responses are retried until success."""
+    responses = [_response(502), _response(503), _response(200, PR_STATUS)]
+
+    with patch.object(adapter.client, "get", side_effect=responses) as mock_get:
+        result = adapter.get_pr_status("owner/repo", 1)
+
+    assert result["state"] == "open"
+    assert mock_get.call_count == 3
+    assert retries_total.value(method="GET", reason="502") >= 1
+    assert retry_added_latency.count(method="GET") >= 1
+    assert clock.now <= 1.0 + 2.0
+
+
+def test_get_retries_connection_reset(adapter):
+    """Test transport errors are retried for GETs."""
+    side_effect = [httpx.ReadError("connection reset"), _response(200, PR_STATUS)]
+
+    with patch.object(adapter.client, "get", side_effect=side_effect) as mock_get:
+        adapter.get_pr_status("owner/repo", 1)
+
+    assert mock_get.call_count == 2
+
+
+def test_non_transient_errors_are_not_retried(adapter):
+    """Test 404s fail immediately."""
+    with patch.object(adapter.client, "get", return_value=_response(404)) as mock_get:
+        with pytest.raises(GitHubError):
+            adapter.get_pr_status("owner/repo", 1)
+
+    assert mock_get.call_count == 1
+
+
+def test_gives_up_after_max_attempts(adapter):
+    """Test the final transient failure surfaces as an error."""
+    with patch.object(adapter.client, "get", return_value=_response(504)) as mock_get:
+        with pytest.raises(GitHubError) as exc_info:
+            adapter.get_pr_status("owner/repo", 1)
+
+    assert mock_get.call_count == 4
+    assert exc_info.value.status_code == 504
+    assert retries_exhausted.value(method="GET", cause="attempts") >= 1
+
+
+def test_deadline_stops_retries(clock):
+    """Test no retry is attempted when its backoff would pass the deadline."""
+    retrier = Retrier(
+        RetryPolicy(max_attempts=10, base_delay=4.0, deadline=3.0),
+        sleep=clock.sleep,
+        clock=clock,
+        rand=lambda: 1.0,
+    )
+    calls = []
+
+    def attempt():
+        calls.append(clock.now)
+        return _response(503)
+
+    response = retrier.call(attempt, "GET")
+
+    assert response.status_code == 503
+    assert calls == [0.0]
+
+
+def test_retry_budget_prevents_retry_storms(clock):
+    """Test retries stop once the shared budget is spent."""
+    budget = RetryBudget(ratio=0.0, min_per_second=0.0, max_tokens=2.0, clock=clock)
+    retrier = Retrier(RetryPolicy(max_attempts=10), budget=budget, sleep=clock.sleep, clock=clock)
+    calls = []
+
+    retrier.call(lambda: calls.append(1) or _response(503), "GET")
+
+    assert len(calls) == 3
+    assert budget.tokens < 1.0
+
+
+def test_create_pr_returns_existing_pr_on_422(adapter):
+    """Test a retried create_pr that already succeeded server-side is reconciled."""
+    pr = {
+        "number": 7,
+        "title": "Feature",
+        "body": "Body",
+        "state": "open",
+        "html_url": "https://github.com/owner/repo/pull/7",
+        "user": {"login": "bot", "id": 1},
+    }
+    posts = [httpx.ReadError("reset"), _response(422, {"message": "Validation Failed"})]
+
+    with patch.object(adapter.client, "post", side_effect=posts):
+        with patch.object(adapter.client, "get", return_value=_response(200, [pr])) as mock_get:
+            result = adapter.create_pr("owner/repo", "main", "feature", "Feature", "Body")
+
+    assert result["number"] == 7
+    assert mock_get.call_args.kwargs["params"]["head"] == "owner:feature"
+
+
+def test_create_pr_422_without_existing_pr_raises(adapter):
+    """Test genuine validation errors still raise."""
+    with patch.object(adapter.client, "post", return_value=_response(422, {"message": "Bad"})):
+        with patch.object(adapter.client, "get", return_value=_response(200, [])):
+            with pytest.raises(GitHubValidationError):
+                adapter.create_pr("owner/repo", "main", "feature", "Feature", "Body")
+
+
+def _ref(sha: str) -> httpx.Response:
+    return _response(
+        200,
+        {"ref": "refs/heads/feature", "object": {"sha": sha}, "url": "https://api/ref"},
+    )
+
+
+def test_update_ref_with_expected_sha_is_retry_safe(adapter):
+    """Test a PATCH that succeeded before a reset is not reapplied."""
+    gets = [_ref("old"), _ref("new")]
+    patches = [httpx.ReadError("reset")]
+
+    with patch.object(adapter.client, "get", side_effect=gets):
+        with patch.object(adapter.client, "patch", side_effect=patches) as mock_patch:
+            result = adapter.update_ref("owner/repo", "feature", "new", expected_sha="old")
+
+    assert result["sha"] == "new"
+    assert mock_patch.call_count == 1
+
+
+def test_update_ref_refuses_when_branch_moved(adapter):
+    """Test the update is refused when the branch is not at the expected SHA."""
+    with patch.object(adapter.client, "get", return_value=_ref("other")):
+        with patch.object(adapter.client, "patch") as mock_patch:
+            with pytest.raises(GitHubValidationError):
+                adapter.update_ref("owner/repo", "feature", "new", expected_sha="old")
+
+    mock_patch.assert_not_called()
+
+
+def test_update_ref_without_expected_sha_is_not_retried(adapter):
+    """Test blind ref updates are sent once."""
+    with patch.object(adapter.client, "patch", return_value=_response(502)) as mock_patch:
+        with pytest.raises(GitHubError):
+            adapter.update_ref("owner/repo", "feature", "new")
+
+    assert mock_patch.call_count == 1
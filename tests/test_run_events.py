@@ -0,0 +1,127 @@
+"""Tests for the gate run transition log."""
+
+import time
+from datetime import datetime, timezone
+
+from packages.core.gate_framework import GateFramework, GateRunConfig, RunResult, RunState
+from packages.core.run_events import TransitionLog
+from packages.core.schemas.gates import GateType
+
+
+def _framework(log: TransitionLog, run_id: str = "run-1") -> GateFramework:
+    return GateFramework(GateRunConfig(pr_number=1, run_id=run_id), log=log)
+
+
+def test_every_transition_is_appended():
+    """Test start, gate advances and completion are each one transition."""
+    log = TransitionLog()
+
+    _framework(log).execute_full_mock_run()
+
+    transitions = log.transitions("run-1")
+    assert [(t.from_state, t.to_state) for t in transitions][:2] == [
+        (RunState.INITIALIZED, RunState.RUNNING_SAFETY),
+        (RunState.RUNNING_SAFETY, RunState.RUNNING_PLANNING),
+    ]
+    assert transitions[-1].to_state == RunState.COMPLETED
+    assert transitions[-1].gate == GateType.LEARNING
+    assert len(transitions) == 7
+
+
+def test_replay_reconstructs_run_at_any_time():
+    """Test replaying to a past instant returns the run as it was then."""
+    log = TransitionLog(snapshot_every=2)
+    framework = _framework(log)
+    framework.start_run()
+    framework.execute_safety_gate()
+    framework.execute_planning_gate()
+    time.sleep(0.01)
+    at_ci = datetime.now(timezone.utc)
+    time.sleep(0.01)
+    framework.execute_ci_gate(unit_tests_passed=False)
+
+    past = log.replay("run-1", at=at_ci)
+    current = log.replay("run-1")
+
+    assert (past.state, past.current_gate) == (RunState.RUNNING_CI, GateType.CI)
+    assert past.result == RunResult.PENDING
+    assert current.state == RunState.FAILED
+    assert current.error_message == "CI gate failed"
+    assert current.completed_at == framework.run.completed_at
+    assert log.replay("run-1", at=datetime(2000, 1, 1, tzinfo=timezone.utc)) is None
+    assert log.replay("unknown") is None
+
+
+def test_replay_matches_live_run_across_snapshots():
+    """Test replay from the nearest snapshot equals the live state after every step."""
+    log = TransitionLog(snapshot_every=3)
+    framework = _framework(log)
+    framework.start_run()
+    for gate in (GateType.SAFETY, GateType.PLANNING, GateType.CI, GateType.STAGING):
+        framework.execute_gate(gate)
+        replayed = log.replay("run-1")
+        assert (replayed.state, replayed.current_gate) == (
+            framework.run.state,
+            framework.run.current_gate,
+        )
+    framework.block_run("Manual hold")
+
+    replayed = log.replay("run-1")
+    assert replayed.blocked_reason == "Manual hold"
+    assert replayed.result == RunResult.BLOCKED
+
+
+def test_log_file_is_reloaded(tmp_path):
+    """Test a reopened log file restores transitions and snapshots."""
+    path = tmp_path / "transitions.jsonl"
+    log = TransitionLog(path)
+    _framework(log, "run-a").execute_full_mock_run()
+    framework = _framework(log, "run-b")
+    framework.start_run()
+    framework.block_run("Waiting for approval")
+    log.close()
+    with path.open("a") as f:
+        f.write('["t", "run-b", "blo')  # Torn final write.
+
+    reopened = TransitionLog(path)
+
+    assert reopened.run_ids() == ["run-a", "run-b"]
+    assert reopened.transitions("run-a") == log.transitions("run-a")
+    assert reopened.replay("run-a").state == RunState.COMPLETED
+    assert reopened.replay("run-b").blocked_reason == "Waiting for approval"
+    _framework(reopened, "run-c").start_run()
+    reopened.close()
+    assert TransitionLog(path).run_ids() == ["run-a", "run-b", "run-c"]
+
+
+def test_oldest_finished_runs_are_dropped():
+    """Test only max_finished finished runs are kept, while active runs stay."""
+    log = TransitionLog(max_finished=2)
+    _framework(log, "run-1").execute_full_mock_run()
+    _framework(log, "run-2").execute_full_mock_run()
+    _framework(log, "active").start_run()
+    _framework(log, "run-3").execute_full_mock_run()
+
+    assert log.run_ids() == ["run-2", "active", "run-3"]
+    assert log.transitions("run-1") == []
+    assert log.replay("run-1") is None
+
+
+def test_dropped_run_resumed_restarts_history(tmp_path):
+    """Test a run resumed after being dropped replays from its new snapshot, also on reload."""
+    path = tmp_path / "transitions.jsonl"
+    log = TransitionLog(path, max_finished=1)
+    blocked = _framework(log, "run-a")
+    blocked.start_run()
+    blocked.block_run("Held")
+    _framework(log, "run-b").execute_full_mock_run()
+
+    blocked.resume()
+    log.close()
+
+    assert log.replay("run-a").state == RunState.RUNNING_SAFETY
+    reopened = TransitionLog(path)
+    assert [t.to_state for t in reopened.transitions("run-a")] == [RunState.RUNNING_SAFETY]
+    replayed = reopened.replay("run-a")
+    assert replayed.state == RunState.RUNNING_SAFETY
+    assert replayed.blocked_reason is None
@@ -0,0 +1,162 @@
+"""Tests for the SQLite gate run store."""
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from packages.core.adapters.github_adapter import GitHubAdapter
+from packages.core.gate_framework import (
+    GateFramework,
+    GateRun,
+    GateRunConfig,
+    RunResult,
+    RunState,
+)
+from packages.core.gate_orchestrator import GateOrchestrator
+from packages.core.run_store import RunStore, run_store_batch_size
+from packages.core.schemas.gates import GateType
+from packages.core.schemas.webhooks import WebhookEvent, WebhookSource
+from packages.core.testing import FakeGitHub
+
+REPO = "owner/repo"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = RunStore(tmp_path / "runs.db")
+    yield store
+    store.close()
+
+
+def _run(run_id: str, pr_number: int = 1, **fields) -> GateRun:
+    config = GateRunConfig(pr_number=pr_number, run_id=run_id, repo_slug=REPO)
+    return GateRun(run_id=run_id, pr_number=pr_number, config=config, **fields)
+
+
+def test_query_filters_and_orders_newest_first(store):
+    """Test queries by PR, state and result return matching runs newest first."""
+    now = datetime.now(timezone.utc)
+    store.save(_run("a", 1, state=RunState.BLOCKED, started_at=now - timedelta(hours=2)))
+    store.save(_run("b", 1, state=RunState.RUNNING_CI, started_at=now - timedelta(hours=1)))
+    store.save(_run("c", 2, state=RunState.BLOCKED, started_at=now))
+    store.save(_run("d", 2, state=RunState.FAILED, result=RunResult.FAILED, started_at=now))
+
+    assert [run.run_id for run in store.query(state=RunState.BLOCKED)] == ["c", "a"]
+    assert [run.run_id for run in store.query(pr_number=1)] == ["b", "a"]
+    assert [run.run_id for run in store.query(result=RunResult.FAILED)] == ["d"]
+    assert len(store.query(started_after=now - timedelta(minutes=90))) == 3
+    assert len(store.query(limit=2)) == 2
+    assert store.count(state=RunState.BLOCKED) == 2
+
+
+def test_transitions_between_batches_collapse_into_one_write(tmp_path):
+    """Test repeated saves of one run are committed as its latest snapshot."""
+    store = RunStore(tmp_path / "runs.db", flush_interval=60)
+    framework = GateFramework(GateRunConfig(pr_number=1, run_id="run-1"), store=store)
+    committed = run_store_batch_size.sum()
+
+    framework.execute_full_mock_run()
+
+    assert store.get("run-1").state == RunState.COMPLETED
+    store.flush()
+    assert run_store_batch_size.sum() - committed == 1
+    assert store.query()[0].pipeline is not None
+    store.close()
+
+
+def test_queries_use_indexes(store):
+    """Test the common filters are served by an index rather than a table scan."""
+    for column, value in (("state", "blocked"), ("pr_number", 1), ("result", "failed")):
+        plan = store._reader.execute(
+            f"EXPLAIN QUERY PLAN SELECT data FROM runs WHERE {column} = ? ORDER BY started_at DESC",
+            (value,),
+        ).fetchall()
+        assert f"USING INDEX runs_{column}" in " ".join(row[-1] for row in plan)
+
+
+def test_runs_survive_restart_and_resume(tmp_path):
+    """Test a run interrupted mid-pipeline resumes at its gate after reopening."""
+    store = RunStore(tmp_path / "runs.db")
+    framework = GateFramework(
+        GateRunConfig(pr_number=7, run_id="run-7", repo_slug=REPO), store=store
+    )
+    framework.start_run()
+    framework.execute_safety_gate()
+    framework.execute_planning_gate()
+    finished = GateFramework(GateRunConfig(pr_number=8, run_id="run-8"), store=store)
+    finished.execute_full_mock_run()
+    store.close()
+
+    reopened = RunStore(tmp_path / "runs.db")
+    [resumed] = reopened.resume()
+
+    assert resumed.run.run_id == "run-7"
+    assert resumed.run.current_gate == GateType.CI
+    resumed.execute_ci_gate()
+    resumed.execute_staging_gate()
+    resumed.execute_production_gate()
+    resumed.execute_learning_gate()
+    assert reopened.get("run-7").state == RunState.COMPLETED
+    assert reopened.resume() == []
+    reopened.close()
+
+
+def test_save_after_close_raises(tmp_path):
+    """Test a closed store rejects new snapshots."""
+    store = RunStore(tmp_path / "runs.db")
+    store.close()
+
+    with pytest.raises(RuntimeError):
+        store.save(_run("late"))
+
+
+def test_save_after_failed_commit_raises(store):
+    """Test snapshots are refused, not dropped, once the writer failed."""
+    with sqlite3.connect(store.path) as connection:
+        connection.execute("DROP TABLE runs")
+    store.save(_run("lost"))
+    store._thread.join(timeout=5)
+
+    with pytest.raises(sqlite3.OperationalError, match="no such table"):
+        store.save(_run("dropped"))
+    with pytest.raises(sqlite3.OperationalError):
+        store.flush()
+
+
+async def test_orchestrator_resumes_in_flight_runs(tmp_path):
+    """Test a restarted orchestrator continues runs on later webhooks."""
+    fake = FakeGitHub()
+    fake.add_repo(REPO)
+    pull = fake.add_pull_request(REPO, "feature")
+    sha = pull["head"]["sha"]
+    for name in ("lint", "unit-tests", "security-scan", "dependency-check"):
+        fake.add_check_run(REPO, sha, name)
+    adapter = GitHubAdapter(token="test_token", transport=fake.transport())
+
+    def event(event_type: str, payload: dict) -> WebhookEvent:
+        return WebhookEvent(
+            event_id=f"evt-{event_type}",
+            event_type=event_type,
+            source=WebhookSource.GITHUB,
+            payload={"repository": {"full_name": REPO}, **payload},
+        )
+
+    store = RunStore(tmp_path / "runs.db")
+    orchestrator = GateOrchestrator(adapter, store=store)
+    orchestrator.handle(event("pull_request", {"action": "opened", "pull_request": pull}))
+    await orchestrator.drain()
+    run_id = orchestrator.get_run(REPO, 1).run_id
+    store.close()
+
+    store = RunStore(tmp_path / "runs.db")
+    restarted = GateOrchestrator(adapter, store=store)
+    suite = {"head_sha": sha, "conclusion": "success", "pull_requests": []}
+    restarted.handle(event("check_suite", {"action": "completed", "check_suite": suite}))
+    await restarted.drain()
+
+    assert restarted.get_run(REPO, 1).run_id == run_id
+    assert restarted.get_run(REPO, 1).state == RunState.RUNNING_STAGING
+    assert store.get(run_id).state == RunState.RUNNING_STAGING
+    store.close()
+    adapter.client.close()
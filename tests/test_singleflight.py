@@ -0,0 +1,193 @@
+"""Tests for single-flight request coalescing."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+from fastapi.testclient import TestClient
+
+from apps.api.main import app
+from packages.core.adapters.github_adapter import GitHubAdapter
+from packages.core.adapters.singleflight import (
+    AsyncSingleFlight,
+    SingleFlight,
+    coalesced_requests,
+    request_key,
+)
+
+
+def test_request_key_ignores_param_order():
+    """Test keys are stable regardless of parameter ordering."""
+    assert request_key("get", "/a", {"x": 1, "y": 2}) == request_key("GET", "/a", {"y": 2, "x": 1})
+    assert request_key("GET", "/a") != request_key("GET", "/a", {"ref": "main"})
+
+
+def test_thread_callers_share_one_call():
+    """Test concurrent threads with the same key execute the call once."""
+    group = SingleFlight(name="test-threads")
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        release.wait(timeout=2)
+        return {"sha": "abc"}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(group.do("key", fetch))) for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    while group.in_flight() == 0:
+        time.sleep(0.001)
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 5
+    assert all(result is results[0] for result in results)
+    assert coalesced_requests.value(group="test-threads", mode="thread") == 4
+    assert group.in_flight() == 0
+
+
+def test_thread_callers_share_exception():
+    """Test waiters receive the leader's exception."""
+    group = SingleFlight(name="test-errors")
+    release = threading.Event()
+    errors = []
+
+    def fetch():
+        release.wait(timeout=2)
+        raise RuntimeError("boom")
+
+    def worker():
+        try:
+            group.do("key", fetch)
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 3
+    assert group.in_flight() == 0
+
+
+def test_sequential_calls_are_not_cached():
+    """Test finished calls are not reused by later callers."""
+    group = SingleFlight(name="test-sequential")
+    counter = iter(range(10))
+    assert group.do("key", lambda: next(counter)) == 0
+    assert group.do("key", lambda: next(counter)) == 1
+
+
+async def test_async_tasks_share_one_call():
+    """Test concurrent tasks with the same key await the call once."""
+    group = AsyncSingleFlight(name="test-tasks")
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"sha": "abc"}
+
+    results = await asyncio.gather(*(group.do("key", fetch) for _ in range(10)))
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert coalesced_requests.value(group="test-tasks", mode="task") == 9
+    assert group.in_flight() == 0
+
+
+async def test_async_tasks_share_exception():
+    """Test waiting tasks receive the leader's exception."""
+    group = AsyncSingleFlight(name="test-task-errors")
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("bad")
+
+    results = await asyncio.gather(
+        *(group.do("key", fetch) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+async def test_cancelled_leader_does_not_cancel_waiters():
+    """Test a waiter re-runs the call when the leader task is cancelled."""
+    group = AsyncSingleFlight(name="test-task-cancel")
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    leader = asyncio.create_task(group.do("key", fetch))
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(group.do("key", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    results = await asyncio.gather(*waiters)
+
+    assert leader.cancelled()
+    assert results == [2, 2, 2]
+    assert len(calls) == 2
+    assert group.in_flight() == 0
+
+
+def test_adapter_coalesces_identical_gets():
+    """Test concurrent identical adapter reads issue one HTTP request."""
+    adapter = GitHubAdapter(token="test_token")
+    release = threading.Event()
+    response = MagicMock(spec=httpx.Response)
+    response.status_code = 200
+    response.json.return_value = {
+        "state": "open",
+        "mergeable": True,
+        "merged": False,
+        "mergeable_state": "clean",
+        "draft": False,
+    }
+
+    def slow_get(*args, **kwargs):
+        release.wait(timeout=2)
+        return response
+
+    results = []
+    with patch.object(adapter.client, "get", side_effect=slow_get) as mock_get:
+        threads = [
+            threading.Thread(target=lambda: results.append(adapter.get_pr_status("owner/repo", 42)))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+    assert mock_get.call_count == 1
+    assert [result["state"] for result in results] == ["open"] * 4
+    adapter.client.close()
+
+
+def test_metrics_endpoint_exports_coalesced_counts():
+    """Test coalesced counts are exported via the metrics endpoint."""
+    client = TestClient(app)
+    response = client.get("/v1/metrics")
+
+    assert response.status_code == 200
+    assert "github_coalesced_requests_total" in response.json()
@@ -0,0 +1,162 @@
+"""Tests for streamed large-file commits."""
+
+import base64
+import os
+import tracemalloc
+
+import httpx
+import pytest
+
+from packages.core.adapters.auth import StaticTokenProvider
+from packages.core.adapters.errors import GitHubAuthError
+from packages.core.adapters.github_adapter import GitHubAdapter
+from packages.core.adapters.streaming import (
+    BLOB_THRESHOLD,
+    blob_request_body,
+    blob_request_length,
+    encode_base64_chunks,
+    is_binary,
+)
+from packages.core.testing import FakeGitHub
+
+REPO = "owner/repo"
+
+
+@pytest.fixture
+def fake():
+    fake = FakeGitHub()
+    fake.add_repo(REPO)
+    return fake
+
+
+@pytest.fixture
+def adapter(fake):
+    adapter = GitHubAdapter(token="test_token", transport=fake.transport())
+    yield adapter
+    adapter.client.close()
+
+
+def _committed(fake: FakeGitHub, path: str, branch: str = "main") -> bytes:
+    repo = fake.repos[REPO]
+    return repo.blobs[repo.tree_for_ref(branch)[path]]
+
+
+def _paths(fake: FakeGitHub) -> list[str]:
+    return [f"{method} {path.split(REPO)[-1]}" for method, path in fake.requests]
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 100, 65537])
+@pytest.mark.parametrize("chunk", [1, 2, 5, 4096])
+def test_chunked_base64_matches_one_shot(size, chunk):
+    """Test incremental encoding is byte-identical for any chunking."""
+    data = os.urandom(size)
+    chunks = [data[i : i + chunk] for i in range(0, size, chunk)]
+
+    assert b"".join(encode_base64_chunks(chunks)) == base64.b64encode(data)
+    assert len(b"".join(blob_request_body(chunks))) == blob_request_length(size)
+
+
+def test_is_binary():
+    """Test NUL bytes and invalid UTF-8 are treated as binary."""
+    assert not is_binary("héllo".encode())
+    assert is_binary(b"PK\x03\x04\x00")
+    assert is_binary(b"\xff\xfe\xfa text")
+
+
+def test_small_text_uses_contents_api(fake, adapter):
+    """Test small text files keep the single-request contents API path."""
+    adapter.create_commit(REPO, "main", "README.md", "# Hello", "Add readme")
+
+    assert _committed(fake, "README.md") == b"# Hello"
+    assert "POST /git/blobs" not in _paths(fake)
+
+
+def test_large_bytes_are_streamed_through_blob_api(fake, adapter):
+    """Test large content is uploaded as a blob and committed via the git data API."""
+    content = os.urandom(BLOB_THRESHOLD + 7)
+    head = fake.repos[REPO].refs["main"]
+
+    result = adapter.create_commit(REPO, "main", "dist/app.bin", content, "Add artifact")
+
+    assert _committed(fake, "dist/app.bin") == content
+    assert fake.repos[REPO].refs["main"] == result["sha"]
+    assert fake.repos[REPO].commits[result["sha"]]["parents"] == [head]
+    assert not any(entry.startswith("PUT /contents") for entry in _paths(fake))
+
+
+def test_binary_file_path_uses_blob_api(fake, adapter, tmp_path):
+    """Test file paths are read in chunks and binary files skip the contents API."""
+    path = tmp_path / "logo.png"
+    path.write_bytes(b"\x89PNG\r\n\x1a\n\x00" * 100)
+
+    adapter.create_commit(REPO, "main", "assets/logo.png", path, "Add logo")
+
+    assert _committed(fake, "assets/logo.png") == path.read_bytes()
+    assert "POST /git/blobs" in _paths(fake)
+
+
+def test_iterator_content_preserves_other_files(fake, adapter):
+    """Test iterator content is committed on top of the existing tree."""
+    adapter.create_commit(REPO, "main", "keep.txt", "keep", "Add keep")
+
+    adapter.create_commit(REPO, "main", "log.txt", iter([b"line 1\n", b"line 2\n"]), "Add log")
+
+    assert _committed(fake, "log.txt") == b"line 1\nline 2\n"
+    assert _committed(fake, "keep.txt") == b"keep"
+
+
+class _BlobSink(httpx.BaseTransport):
+    """Consumes blob bodies chunk by chunk and answers with ``status``."""
+
+    def __init__(self, status: int = 201) -> None:
+        self.status = status
+        self.requests = 0
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        for _ in request.stream:
+            pass
+        return httpx.Response(self.status, json={"sha": "b" * 40, "message": "Bad credentials"})
+
+
+def test_token_provider_streams_blob_without_buffering(tmp_path):
+    """Test a token provider does not hold a streamed blob body in memory."""
+    size = 8 * 2**20
+    path = tmp_path / "artifact.bin"
+    path.write_bytes(os.urandom(size))
+    adapter = GitHubAdapter(token_provider=StaticTokenProvider("t"), transport=_BlobSink())
+
+    tracemalloc.start()
+    adapter._create_blob(REPO, path, size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    adapter.client.close()
+
+    assert peak < size // 4
+
+
+class _RotatingTokens:
+    def __init__(self) -> None:
+        self.minted = 0
+
+    def get_token(self) -> str:
+        return f"token-{self.minted}"
+
+    def invalidate(self, token: str) -> None:
+        self.minted += 1
+
+
+def test_streamed_blob_is_not_replayed_on_401(tmp_path):
+    """Test a 401 on a streamed body fails instead of re-sending it."""
+    path = tmp_path / "artifact.bin"
+    path.write_bytes(b"x" * 1024)
+    sink = _BlobSink(status=401)
+    tokens = _RotatingTokens()
+    adapter = GitHubAdapter(token_provider=tokens, transport=sink)
+
+    with pytest.raises(GitHubAuthError):
+        adapter._create_blob(REPO, path, 1024)
+
+    assert sink.requests == 1
+    assert tokens.minted == 1
+    adapter.client.close()
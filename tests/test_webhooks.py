@@ -7,7 +7,12 @@ from fastapi.testclient import TestClient
 from apps.api.main import app
 from packages.core.config import settings
 from packages.core.notifications import NotificationDispatcher
-from packages.core.webhook_watcher import GitHubWebhookVerifier, WebhookWatcher
+from packages.core.webhook_watcher import (
+    GitHubWebhookVerifier,
+    WebhookWatcher,
+    register_subscriber,
+    unregister_subscriber,
+)
 
 client = TestClient(app)
 
@@ -106,3 +111,45 @@ def test_github_webhook_endpoint_accepts_valid_signature(monkeypatch):
         content=body,
     )
     assert response.status_code == 202
+
+
+class RecordingSubscriber:
+    def __init__(self) -> None:
+        self.events = []
+
+    def handle(self, event) -> None:
+        self.events.append(event)
+
+
+class FailingSubscriber:
+    def handle(self, event) -> None:
+        raise RuntimeError("subscriber failure")
+
+
+def test_webhook_watcher_notifies_subscribers_despite_failures():
+    recorder = RecordingSubscriber()
+    watcher = WebhookWatcher(
+        NotificationDispatcher([DummySink()]),
+        subscribers=[FailingSubscriber(), recorder],
+    )
+
+    event = watcher.handle_github_event("pull_request", "delivery-2", {"action": "synchronize"})
+
+    assert recorder.events == [event]
+
+
+def test_github_webhook_endpoint_notifies_registered_subscribers(monkeypatch):
+    monkeypatch.setattr(settings, "github_webhook_secret", None)
+    recorder = RecordingSubscriber()
+    register_subscriber(recorder)
+    try:
+        response = client.post(
+            "/v1/webhooks/github",
+            headers={"X-GitHub-Event": "pull_request"},
+            json={"action": "synchronize"},
+        )
+    finally:
+        unregister_subscriber(recorder)
+
+    assert response.status_code == 202
+    assert recorder.events[0].event_type == "pull_request"